@@ -0,0 +1,50 @@
+"""add cc pair indexed document count
+
+Revision ID: 4b7ad1e5c3f9
+Revises: 0816326d83aa
+Create Date: 2025-07-02 10:12:31.482915
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "4b7ad1e5c3f9"
+down_revision = "0816326d83aa"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "connector_credential_pair",
+        sa.Column(
+            "indexed_document_count",
+            sa.Integer(),
+            nullable=False,
+            server_default="0",
+        ),
+    )
+
+    # backfill from the document by cc pair rows, from here on the count is
+    # maintained by the indexing pipeline, pruning and deletion
+    op.execute(
+        """
+        UPDATE connector_credential_pair AS cc_pair
+        SET indexed_document_count = counts.cnt
+        FROM (
+            SELECT connector_id, credential_id, COUNT(*) AS cnt
+            FROM document_by_connector_credential_pair
+            WHERE has_been_indexed = TRUE
+            GROUP BY connector_id, credential_id
+        ) AS counts
+        WHERE cc_pair.connector_id = counts.connector_id
+        AND cc_pair.credential_id = counts.credential_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("connector_credential_pair", "indexed_document_count")
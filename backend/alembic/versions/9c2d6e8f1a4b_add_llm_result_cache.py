@@ -0,0 +1,36 @@
+"""add llm result cache
+
+Revision ID: 9c2d6e8f1a4b
+Revises: 4b7ad1e5c3f9
+Create Date: 2025-07-09 14:27:05.613204
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "9c2d6e8f1a4b"
+down_revision = "4b7ad1e5c3f9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_result_cache",
+        sa.Column("cache_key", sa.String(), nullable=False),
+        sa.Column("result", sa.Text(), nullable=False),
+        sa.Column(
+            "time_created",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("cache_key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("llm_result_cache")
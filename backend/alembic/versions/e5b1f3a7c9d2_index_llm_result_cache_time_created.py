@@ -0,0 +1,30 @@
+"""index llm result cache time created
+
+Revision ID: e5b1f3a7c9d2
+Revises: 9c2d6e8f1a4b
+Create Date: 2025-07-10 09:41:22.358107
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "e5b1f3a7c9d2"
+down_revision = "9c2d6e8f1a4b"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        op.f("ix_llm_result_cache_time_created"),
+        "llm_result_cache",
+        ["time_created"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_llm_result_cache_time_created"), table_name="llm_result_cache"
+    )
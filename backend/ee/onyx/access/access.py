@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 
+from ee.onyx.access.user_acl_cache import get_cached_group_acl_for_user
 from ee.onyx.db.external_perm import fetch_external_groups_for_user
 from ee.onyx.db.external_perm import fetch_public_external_group_ids
 from ee.onyx.db.user_group import fetch_user_groups_for_documents
@@ -12,6 +13,7 @@ from onyx.access.access import _get_acl_for_user as get_acl_for_user_without_gro
 from onyx.access.models import DocumentAccess
 from onyx.access.utils import prefix_external_group
 from onyx.access.utils import prefix_user_group
+from onyx.configs.app_configs import ENABLE_USER_ACL_CACHE
 from onyx.db.document import get_document_sources
 from onyx.db.document import get_documents_by_ids
 from onyx.db.models import User
@@ -124,20 +126,32 @@ def _get_acl_for_user(user: User | None, db_session: Session) -> set[str]:
 
     NOTE: is imported in onyx.access.access by `fetch_versioned_implementation`
     DO NOT REMOVE."""
-    db_user_groups = fetch_user_groups_for_user(db_session, user.id) if user else []
+    user_acl = get_acl_for_user_without_groups(user, db_session)
+    if not user:
+        return user_acl
+
+    if ENABLE_USER_ACL_CACHE:
+        user_acl.update(
+            get_cached_group_acl_for_user(
+                user.id, lambda: _get_group_acl_for_user(user, db_session)
+            )
+        )
+    else:
+        user_acl.update(_get_group_acl_for_user(user, db_session))
+
+    return user_acl
+
+
+def _get_group_acl_for_user(user: User, db_session: Session) -> set[str]:
+    db_user_groups = fetch_user_groups_for_user(db_session, user.id)
     prefixed_user_groups = [
         prefix_user_group(db_user_group.name) for db_user_group in db_user_groups
     ]
 
-    db_external_groups = (
-        fetch_external_groups_for_user(db_session, user.id) if user else []
-    )
+    db_external_groups = fetch_external_groups_for_user(db_session, user.id)
     prefixed_external_groups = [
         prefix_external_group(db_external_group.external_user_group_id)
         for db_external_group in db_external_groups
     ]
 
-    user_acl = set(prefixed_user_groups + prefixed_external_groups)
-    user_acl.update(get_acl_for_user_without_groups(user, db_session))
-
-    return user_acl
+    return set(prefixed_user_groups + prefixed_external_groups)
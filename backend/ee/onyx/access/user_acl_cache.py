@@ -0,0 +1,123 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from uuid import UUID
+
+from prometheus_client import Counter
+
+from onyx.configs.app_configs import USER_ACL_CACHE_LOCAL_MAX_ENTRIES
+from onyx.configs.app_configs import USER_ACL_CACHE_TTL_SECONDS
+from onyx.redis.redis_pool import get_redis_client
+from onyx.utils.logger import setup_logger
+from shared_configs.contextvars import get_current_tenant_id
+
+logger = setup_logger()
+
+
+# bumped whenever user group or external group membership changes, cache entries of
+# older versions are never read again
+USER_ACL_VERSION_KEY = "user_acl_cache:version"
+USER_ACL_CACHE_KEY_PREFIX = "user_acl_cache:entry"
+
+user_acl_cache_requests = Counter(
+    "onyx_user_acl_cache_requests",
+    "User ACL cache lookups by result (local hit, redis hit or miss)",
+    ["result"],
+)
+
+# (tenant id, user id) -> (version, expiry time, group ACL entries)
+_local_acl_cache: OrderedDict[tuple[str, UUID], tuple[str, float, frozenset[str]]] = (
+    OrderedDict()
+)
+_local_acl_cache_lock = threading.Lock()
+
+
+def bump_user_acl_version() -> None:
+    """Invalidates every cached user ACL of the current tenant. Call this after
+    committing any change to user group or external group membership."""
+    try:
+        get_redis_client().incr(USER_ACL_VERSION_KEY)
+    except Exception:
+        # entries still expire through the TTL
+        logger.exception("Failed to bump the user ACL cache version")
+
+
+def _get_local(key: tuple[str, UUID], version: str) -> frozenset[str] | None:
+    with _local_acl_cache_lock:
+        entry = _local_acl_cache.get(key)
+        if entry is None:
+            return None
+
+        entry_version, expires_at, acl = entry
+        if entry_version != version or expires_at <= time.monotonic():
+            del _local_acl_cache[key]
+            return None
+
+        _local_acl_cache.move_to_end(key)
+        return acl
+
+
+def _set_local(key: tuple[str, UUID], version: str, acl: frozenset[str]) -> None:
+    if USER_ACL_CACHE_LOCAL_MAX_ENTRIES <= 0:
+        return
+
+    with _local_acl_cache_lock:
+        _local_acl_cache[key] = (
+            version,
+            time.monotonic() + USER_ACL_CACHE_TTL_SECONDS,
+            acl,
+        )
+        _local_acl_cache.move_to_end(key)
+        while len(_local_acl_cache) > USER_ACL_CACHE_LOCAL_MAX_ENTRIES:
+            _local_acl_cache.popitem(last=False)
+
+
+def get_cached_group_acl_for_user(
+    user_id: UUID, fetch_group_acl: Callable[[], set[str]]
+) -> set[str]:
+    """Returns the group derived ACL entries of the user, from the in-process cache,
+    then Redis, and only calls `fetch_group_acl` (the Postgres lookup) if both miss.
+
+    A single Redis round trip (reading the version) is made on the hot path. Any
+    Redis failure falls back to `fetch_group_acl`."""
+    try:
+        redis_client = get_redis_client()
+        raw_version = redis_client.get(USER_ACL_VERSION_KEY)
+    except Exception:
+        logger.exception("Failed to read the user ACL cache version")
+        user_acl_cache_requests.labels("miss").inc()
+        return fetch_group_acl()
+
+    version = raw_version.decode("utf-8") if isinstance(raw_version, bytes) else "0"
+    local_key = (get_current_tenant_id(), user_id)
+
+    local_acl = _get_local(local_key, version)
+    if local_acl is not None:
+        user_acl_cache_requests.labels("local_hit").inc()
+        return set(local_acl)
+
+    redis_key = f"{USER_ACL_CACHE_KEY_PREFIX}:{version}:{user_id}"
+    try:
+        raw_acl = redis_client.get(redis_key)
+        if isinstance(raw_acl, bytes):
+            acl = frozenset(json.loads(raw_acl))
+            _set_local(local_key, version, acl)
+            user_acl_cache_requests.labels("redis_hit").inc()
+            return set(acl)
+    except Exception:
+        logger.exception(f"Failed to read the cached ACL for user {user_id}")
+
+    user_acl_cache_requests.labels("miss").inc()
+    group_acl = fetch_group_acl()
+
+    _set_local(local_key, version, frozenset(group_acl))
+    try:
+        redis_client.set(
+            redis_key, json.dumps(sorted(group_acl)), ex=USER_ACL_CACHE_TTL_SECONDS
+        )
+    except Exception:
+        logger.exception(f"Failed to cache the ACL for user {user_id}")
+
+    return group_acl
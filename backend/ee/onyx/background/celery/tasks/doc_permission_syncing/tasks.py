@@ -22,7 +22,8 @@ from tenacity import stop_after_delay
 from tenacity import wait_random_exponential
 
 from ee.onyx.db.connector_credential_pair import get_all_auto_sync_cc_pairs
-from ee.onyx.db.document import upsert_document_external_perms
+from ee.onyx.configs.app_configs import DOC_PERMISSION_SYNC_BATCH_SIZE
+from ee.onyx.db.document import bulk_upsert_document_external_perms
 from ee.onyx.external_permissions.sync_params import get_source_perm_sync_config
 from onyx.access.models import DocExternalAccess
 from onyx.background.celery.apps.app_base import task_logger
@@ -68,6 +69,7 @@ from onyx.redis.redis_pool import get_redis_replica_client
 from onyx.redis.redis_pool import redis_lock_dump
 from onyx.server.runtime.onyx_runtime import OnyxRuntime
 from onyx.server.utils import make_short_id
+from onyx.utils.batching import batch_generator
 from onyx.utils.logger import doc_permission_sync_ctx
 from onyx.utils.logger import format_error_for_logging
 from onyx.utils.logger import LoggerContextVars
@@ -514,17 +516,21 @@ def connector_permission_sync_generator_task(
                 f"RedisConnector.permissions.generate_tasks starting. cc_pair={cc_pair_id}"
             )
 
+            # results are buffered and written in batches, documents whose
+            # permissions didn't change are not written at all
             tasks_generated = 0
-            for doc_external_access in document_external_accesses:
+            for doc_external_access_batch in batch_generator(
+                document_external_accesses, DOC_PERMISSION_SYNC_BATCH_SIZE
+            ):
                 redis_connector.permissions.update_db(
                     lock=lock,
-                    new_permissions=[doc_external_access],
+                    new_permissions=doc_external_access_batch,
                     source_string=source_type,
                     connector_id=cc_pair.connector.id,
                     credential_id=cc_pair.credential.id,
                     task_logger=task_logger,
                 )
-                tasks_generated += 1
+                tasks_generated += len(doc_external_access_batch)
 
             task_logger.info(
                 f"RedisConnector.permissions.generate_tasks finished. "
@@ -566,60 +572,71 @@ def connector_permission_sync_generator_task(
 )
 def document_update_permissions(
     tenant_id: str,
-    permissions: DocExternalAccess,
+    permissions: list[DocExternalAccess],
     source_type_str: str,
     connector_id: int,
     credential_id: int,
-) -> bool:
+) -> int:
+    """Writes the permissions of a batch of documents. Only documents whose external
+    access actually changed are written and marked for a Vespa sync.
+    Returns the number of updated or created documents."""
     start = time.monotonic()
 
-    doc_id = permissions.doc_id
-    external_access = permissions.external_access
+    # the last permissions yielded for a document win
+    doc_id_to_external_access = {
+        doc_permissions.doc_id: doc_permissions.external_access
+        for doc_permissions in permissions
+    }
+    if not doc_id_to_external_access:
+        return 0
 
     try:
         with get_session_with_tenant(tenant_id=tenant_id) as db_session:
             # Add the users to the DB if they don't exist
             batch_add_ext_perm_user_if_not_exists(
                 db_session=db_session,
-                emails=list(external_access.external_user_emails),
+                emails=list(
+                    {
+                        email
+                        for external_access in doc_id_to_external_access.values()
+                        for email in external_access.external_user_emails
+                    }
+                ),
                 continue_on_error=True,
             )
-            # Then upsert the document's external permissions
-            created_new_doc = upsert_document_external_perms(
+            # Then upsert the documents' external permissions
+            updated_doc_ids, created_doc_ids = bulk_upsert_document_external_perms(
                 db_session=db_session,
-                doc_id=doc_id,
-                external_access=external_access,
+                doc_id_to_external_access=doc_id_to_external_access,
                 source_type=DocumentSource(source_type_str),
             )
 
-            if created_new_doc:
-                # If a new document was created, we associate it with the cc_pair
+            if created_doc_ids:
+                # If new documents were created, we associate them with the cc_pair
                 upsert_document_by_connector_credential_pair(
                     db_session=db_session,
                     connector_id=connector_id,
                     credential_id=credential_id,
-                    document_ids=[doc_id],
+                    document_ids=created_doc_ids,
                 )
 
             elapsed = time.monotonic() - start
             task_logger.info(
                 f"connector_id={connector_id} "
-                f"doc={doc_id} "
+                f"docs={len(doc_id_to_external_access)} "
+                f"updated={len(updated_doc_ids)} "
+                f"created={len(created_doc_ids)} "
                 f"action=update_permissions "
                 f"elapsed={elapsed:.2f}"
             )
     except Exception as e:
         task_logger.exception(
             f"document_update_permissions exceptioned: "
-            f"connector_id={connector_id} doc_id={doc_id}"
+            f"connector_id={connector_id} docs={len(doc_id_to_external_access)}"
         )
         raise e
-    finally:
-        task_logger.info(
-            f"document_update_permissions completed: connector_id={connector_id} doc={doc_id}"
-        )
 
-    return True
+    return len(updated_doc_ids) + len(created_doc_ids)
 
 
 def validate_permission_sync_fences(
@@ -14,6 +14,7 @@ from pydantic import ValidationError
 from redis import Redis
 from redis.lock import Lock as RedisLock
 
+from ee.onyx.access.user_acl_cache import bump_user_acl_version
 from ee.onyx.background.celery.tasks.external_group_syncing.group_sync_utils import (
     mark_all_relevant_cc_pairs_as_external_group_synced,
 )
@@ -511,11 +512,15 @@ def _perform_external_group_sync(
                 f"Error syncing external groups for {source_type} for cc_pair: {cc_pair_id} {e}"
             )
             raise e
+        finally:
+            # memberships upserted so far are committed, cached ACLs must see them
+            bump_user_acl_version()
 
         logger.info(
             f"Removing stale external groups for {source_type} for cc_pair: {cc_pair_id}"
         )
         remove_stale_external_groups(db_session, cc_pair_id)
+        bump_user_acl_version()
 
         mark_all_relevant_cc_pairs_as_external_group_synced(db_session, cc_pair)
 
@@ -32,6 +32,12 @@ DEFAULT_PERMISSION_DOC_SYNC_FREQUENCY = int(
     os.environ.get("DEFAULT_PERMISSION_DOC_SYNC_FREQUENCY") or 5 * 60
 )
 
+# Number of documents whose permissions are compared against the stored ones and
+# written together during doc permission syncs. Only changed documents are written
+DOC_PERMISSION_SYNC_BATCH_SIZE = int(
+    os.environ.get("DOC_PERMISSION_SYNC_BATCH_SIZE") or 500
+)
+
 
 #####
 # Confluence
@@ -90,6 +96,22 @@ TEAMS_PERMISSION_DOC_SYNC_FREQUENCY = int(
 )
 
 
+#####
+# Post Query Censoring
+#####
+# Sources are censored in parallel, chunks of any source that hasn't finished
+# within this many seconds are dropped from the results
+POST_QUERY_CENSORING_TIMEOUT_SECONDS = float(
+    os.environ.get("POST_QUERY_CENSORING_TIMEOUT_SECONDS") or 10
+)
+# How long a (user, object) access decision fetched from the source is reused
+# across queries, 0 disables the cache. Access changes in the source can take
+# this long to be reflected in search results
+CENSORING_ACCESS_CACHE_TTL_SECONDS = int(
+    os.environ.get("CENSORING_ACCESS_CACHE_TTL_SECONDS") or 5 * 60
+)
+
+
 ####
 # Celery Job Frequency
 ####
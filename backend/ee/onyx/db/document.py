@@ -2,6 +2,8 @@ from datetime import datetime
 from datetime import timezone
 
 from sqlalchemy import select
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from onyx.access.models import ExternalAccess
@@ -101,3 +103,95 @@ def upsert_document_external_perms(
         db_session.commit()
 
     return False
+
+
+def bulk_upsert_document_external_perms(
+    db_session: Session,
+    doc_id_to_external_access: dict[str, ExternalAccess],
+    source_type: DocumentSource,
+) -> tuple[list[str], list[str]]:
+    """Batch version of upsert_document_external_perms. The new external access is
+    compared against the stored one with a single query and only documents whose
+    access changed are written (with multi-row statements). Changed documents get
+    their last_modified bumped so that only they are picked up by the Vespa sync.
+
+    Returns the ids of the (updated, created) documents.
+    NOTE: this will replace any existing external access, it will not do a union
+    """
+    if not doc_id_to_external_access:
+        return [], []
+
+    doc_id_to_prefixed_groups: dict[str, set[str]] = {
+        doc_id: {
+            build_ext_group_name_for_onyx(
+                ext_group_name=group_id,
+                source=source_type,
+            )
+            for group_id in external_access.external_user_group_ids
+        }
+        for doc_id, external_access in doc_id_to_external_access.items()
+    }
+
+    existing_rows = db_session.execute(
+        select(
+            DbDocument.id,
+            DbDocument.external_user_emails,
+            DbDocument.external_user_group_ids,
+            DbDocument.is_public,
+        ).where(DbDocument.id.in_(list(doc_id_to_external_access)))
+    ).all()
+
+    now = datetime.now(timezone.utc)
+    updates: list[dict] = []
+    for doc_id, emails, group_ids, is_public in existing_rows:
+        external_access = doc_id_to_external_access[doc_id]
+        prefixed_groups = doc_id_to_prefixed_groups[doc_id]
+        if (
+            external_access.external_user_emails == set(emails or [])
+            and prefixed_groups == set(group_ids or [])
+            and external_access.is_public == is_public
+        ):
+            continue
+
+        updates.append(
+            {
+                "id": doc_id,
+                "external_user_emails": list(external_access.external_user_emails),
+                "external_user_group_ids": list(prefixed_groups),
+                "is_public": external_access.is_public,
+                "last_modified": now,
+            }
+        )
+
+    existing_doc_ids = {row[0] for row in existing_rows}
+    new_rows = [
+        {
+            "id": doc_id,
+            "semantic_id": "",
+            "external_user_emails": list(external_access.external_user_emails),
+            "external_user_group_ids": list(doc_id_to_prefixed_groups[doc_id]),
+            "is_public": external_access.is_public,
+        }
+        for doc_id, external_access in doc_id_to_external_access.items()
+        if doc_id not in existing_doc_ids
+    ]
+
+    if updates:
+        # bulk UPDATE by primary key
+        db_session.execute(update(DbDocument), updates)
+
+    created_doc_ids: list[str] = []
+    if new_rows:
+        # If the document does not exist, still store the external access
+        # So that if the document is added later, the external access is already stored
+        # The upsert function in the indexing pipeline does not overwrite the permissions fields
+        insert_stmt = (
+            insert(DbDocument)
+            .values(new_rows)
+            .on_conflict_do_nothing(index_elements=["id"])
+            .returning(DbDocument.id)
+        )
+        created_doc_ids = list(db_session.scalars(insert_stmt).all())
+
+    db_session.commit()
+    return [update_row["id"] for update_row in updates], created_doc_ids
@@ -0,0 +1,69 @@
+from ee.onyx.configs.app_configs import CENSORING_ACCESS_CACHE_TTL_SECONDS
+from onyx.configs.constants import DocumentSource
+from onyx.redis.redis_pool import get_raw_redis_client
+from onyx.utils.logger import setup_logger
+from shared_configs.contextvars import get_current_tenant_id
+
+logger = setup_logger()
+
+
+CENSORING_ACCESS_CACHE_PREFIX = "censoring_access"
+
+
+def _cache_key(
+    tenant_id: str, source: DocumentSource, user_key: str, object_id: str
+) -> str:
+    # keys are prefixed manually (in the same format as TenantRedis) since mget and
+    # pipelines on the tenant client are not prefixed
+    return (
+        f"{tenant_id}:{CENSORING_ACCESS_CACHE_PREFIX}:"
+        f"{source.value}:{user_key}:{object_id}"
+    )
+
+
+def get_cached_object_access(
+    source: DocumentSource, user_key: str, object_ids: list[str]
+) -> dict[str, bool]:
+    """Returns the cached access decisions of the user for the given source objects.
+    Objects without a cached decision are left out. `user_key` identifies the user in
+    the source (e.g. the source's user id)."""
+    if CENSORING_ACCESS_CACHE_TTL_SECONDS <= 0 or not object_ids:
+        return {}
+
+    tenant_id = get_current_tenant_id()
+    try:
+        raw_values = get_raw_redis_client().mget(
+            [
+                _cache_key(tenant_id, source, user_key, object_id)
+                for object_id in object_ids
+            ]
+        )
+    except Exception:
+        logger.exception(f"Failed to read cached {source} object access")
+        return {}
+
+    return {
+        object_id: raw_value == b"1"
+        for object_id, raw_value in zip(object_ids, raw_values)
+        if raw_value is not None
+    }
+
+
+def cache_object_access(
+    source: DocumentSource, user_key: str, object_id_to_access: dict[str, bool]
+) -> None:
+    if CENSORING_ACCESS_CACHE_TTL_SECONDS <= 0 or not object_id_to_access:
+        return
+
+    tenant_id = get_current_tenant_id()
+    try:
+        pipe = get_raw_redis_client().pipeline(transaction=False)
+        for object_id, has_access in object_id_to_access.items():
+            pipe.set(
+                _cache_key(tenant_id, source, user_key, object_id),
+                b"1" if has_access else b"0",
+                ex=CENSORING_ACCESS_CACHE_TTL_SECONDS,
+            )
+        pipe.execute()
+    except Exception:
+        logger.exception(f"Failed to cache {source} object access")
@@ -1,4 +1,10 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+from ee.onyx.configs.app_configs import POST_QUERY_CENSORING_TIMEOUT_SECONDS
 from ee.onyx.db.connector_credential_pair import get_all_auto_sync_cc_pairs
+from ee.onyx.external_permissions.perm_sync_types import CensoringFuncType
 from ee.onyx.external_permissions.sync_params import get_all_censoring_enabled_sources
 from ee.onyx.external_permissions.sync_params import get_source_perm_sync_config
 from onyx.configs.constants import DocumentSource
@@ -56,26 +62,56 @@ def _post_query_chunk_censoring(
         else:
             final_chunk_dict[chunk.unique_id] = chunk
 
-    # For each source, filter out the chunks using the permission
-    # check function for that source
-    # TODO: Use a threadpool/multiprocessing to process the sources in parallel
-    for source, chunks_for_source in chunks_to_process.items():
+    # For each source, filter out the chunks using the permission check function for
+    # that source. Sources are checked in parallel, a source that fails or doesn't
+    # finish before the deadline has all of its chunks thrown out
+    censor_funcs: dict[DocumentSource, CensoringFuncType] = {}
+    for source in chunks_to_process:
         sync_config = get_source_perm_sync_config(source)
         if sync_config is None or sync_config.censoring_config is None:
             raise ValueError(f"No sync config found for {source}")
+        censor_funcs[source] = sync_config.censoring_config.chunk_censoring_func
 
-        censor_chunks_for_source = sync_config.censoring_config.chunk_censoring_func
+    if chunks_to_process:
+        executor = ThreadPoolExecutor(max_workers=len(chunks_to_process))
         try:
-            censored_chunks = censor_chunks_for_source(chunks_for_source, user.email)
-        except Exception as e:
-            logger.exception(
-                f"Failed to censor chunks for source {source} so throwing out all"
-                f" chunks for this source and continuing: {e}"
+            # contextvars are copied so the censoring functions see the tenant id
+            future_to_source = {
+                executor.submit(
+                    contextvars.copy_context().run,
+                    censor_funcs[source],
+                    chunks_for_source,
+                    user.email,
+                ): source
+                for source, chunks_for_source in chunks_to_process.items()
+            }
+            done, not_done = wait(
+                future_to_source, timeout=POST_QUERY_CENSORING_TIMEOUT_SECONDS
+            )
+        finally:
+            # don't block the search on sources that missed the deadline
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        for future in not_done:
+            logger.error(
+                f"Censoring chunks for source {future_to_source[future]} did not finish "
+                f"within {POST_QUERY_CENSORING_TIMEOUT_SECONDS} seconds so throwing out "
+                "all chunks for this source and continuing"
             )
-            continue
 
-        for censored_chunk in censored_chunks:
-            final_chunk_dict[censored_chunk.unique_id] = censored_chunk
+        for future in done:
+            source = future_to_source[future]
+            try:
+                censored_chunks = future.result()
+            except Exception as e:
+                logger.exception(
+                    f"Failed to censor chunks for source {source} so throwing out all"
+                    f" chunks for this source and continuing: {e}"
+                )
+                continue
+
+            for censored_chunk in censored_chunks:
+                final_chunk_dict[censored_chunk.unique_id] = censored_chunk
 
     # IMPORTANT: make sure to retain the same ordering as the original `chunks` passed in
     final_chunk_list: list[InferenceChunk] = []
@@ -1,6 +1,10 @@
 import time
 
 from ee.onyx.db.external_perm import fetch_external_groups_for_user_email_and_group_ids
+from ee.onyx.external_permissions.censoring_access_cache import cache_object_access
+from ee.onyx.external_permissions.censoring_access_cache import (
+    get_cached_object_access,
+)
 from ee.onyx.external_permissions.salesforce.utils import (
     get_any_salesforce_client_for_doc_id,
 )
@@ -9,6 +13,7 @@ from ee.onyx.external_permissions.salesforce.utils import (
     get_salesforce_user_id_from_email,
 )
 from onyx.configs.app_configs import BLURB_SIZE
+from onyx.configs.constants import DocumentSource
 from onyx.context.search.models import InferenceChunk
 from onyx.db.engine.sql_engine import get_session_with_current_tenant
 from onyx.utils.logger import setup_logger
@@ -61,12 +66,28 @@ def _get_objects_access_for_user_email_from_salesforce(
         logger.warning(f"User '{user_email}' not found in Salesforce")
         return None
 
-    # This is the only query that is not cached in the function
-    # so it takes 0.1-0.2 seconds total
-    object_id_to_access = get_objects_access_for_user_id(
-        salesforce_client, user_id, list(object_ids)
+    # Access decisions are shared through Redis for a short time, so only objects
+    # that haven't been checked for this user recently go to Salesforce
+    # (0.1-0.2 seconds)
+    object_id_to_access = get_cached_object_access(
+        DocumentSource.SALESFORCE, user_id, list(object_ids)
+    )
+    uncached_object_ids = [
+        object_id for object_id in object_ids if object_id not in object_id_to_access
+    ]
+    if uncached_object_ids:
+        fetched_object_id_to_access = get_objects_access_for_user_id(
+            salesforce_client, user_id, uncached_object_ids
+        )
+        cache_object_access(
+            DocumentSource.SALESFORCE, user_id, fetched_object_id_to_access
+        )
+        object_id_to_access.update(fetched_object_id_to_access)
+
+    logger.debug(
+        f"Object ID to access: {object_id_to_access} "
+        f"({len(object_ids) - len(uncached_object_ids)} cached)"
     )
-    logger.debug(f"Object ID to access: {object_id_to_access}")
     return object_id_to_access
 
 
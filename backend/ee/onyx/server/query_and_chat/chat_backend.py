@@ -239,7 +239,10 @@ def handle_simplified_chat_message(
 
     try:
         parent_message, _ = create_chat_chain(
-            chat_session_id=chat_message_req.chat_session_id, db_session=db_session
+            chat_session_id=chat_message_req.chat_session_id,
+            db_session=db_session,
+            # only the latest message is needed
+            max_history_messages=0,
         )
     except Exception:
         parent_message = get_or_create_root_message(
@@ -0,0 +1,197 @@
+import asyncio
+import time
+from collections.abc import Callable
+from collections.abc import Hashable
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Generic
+from typing import TypeVar
+
+from prometheus_client import Gauge
+from prometheus_client import Histogram
+
+from onyx.utils.logger import setup_logger
+from shared_configs.configs import MODEL_SERVER_BATCH_MAX_WAIT_MS
+from shared_configs.configs import MODEL_SERVER_MAX_BATCH_SIZE
+
+logger = setup_logger()
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# seconds a worker waits for new requests before exiting
+_IDLE_TIMEOUT = 60
+
+
+micro_batch_queue_depth = Gauge(
+    "model_server_micro_batch_queue_depth",
+    "Number of inputs waiting to be batched for a local model",
+    ["batcher"],
+)
+micro_batch_fill_ratio = Histogram(
+    "model_server_micro_batch_fill_ratio",
+    "Inputs per executed batch divided by the max batch size",
+    ["batcher"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0),
+)
+micro_batch_requests = Histogram(
+    "model_server_micro_batch_requests",
+    "Number of requests coalesced into one executed batch",
+    ["batcher"],
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+
+
+@dataclass
+class _PendingRequest(Generic[T, R]):
+    items: list[T]
+    process_batch: Callable[[list[T]], Any]
+    future: "asyncio.Future[list[R]]"
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class _BatchQueue(Generic[T, R]):
+    """Queue and worker for one batch key, bound to the event loop it was created on."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.queue: asyncio.Queue[_PendingRequest[T, R]] = asyncio.Queue()
+        # a request that didn't fit in the previous batch, it starts the next one
+        self.carry_over: _PendingRequest[T, R] | None = None
+        self.worker: asyncio.Task | None = None
+
+
+class MicroBatcher(Generic[T, R]):
+    """Coalesces concurrent calls to a CPU/GPU bound batch function.
+
+    Each call to `submit` enqueues its inputs under a batch key (e.g. the model and
+    its encode options). A single worker per key waits for the first request, then
+    keeps pulling requests until `max_batch_size` inputs are collected or
+    `max_wait_ms` has passed, runs `process_batch` once in the default executor and
+    hands every caller back its own slice of the outputs. While a batch is running
+    new requests keep queueing, so under load batches fill up on their own.
+
+    Requests sharing a key must pass equivalent `process_batch` functions, the one
+    from the first request of a batch is used for all of it. A request larger than
+    `max_batch_size` is never split, it is just run in a batch of its own."""
+
+    def __init__(
+        self,
+        name: str,
+        max_batch_size: int = MODEL_SERVER_MAX_BATCH_SIZE,
+        max_wait_ms: int = MODEL_SERVER_BATCH_MAX_WAIT_MS,
+    ) -> None:
+        self.name = name
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max(0, max_wait_ms) / 1000
+        self._queues: dict[Hashable, _BatchQueue[T, R]] = {}
+
+    async def submit(
+        self,
+        key: Hashable,
+        items: list[T],
+        process_batch: Callable[[list[T]], Any],
+    ) -> list[R]:
+        """`process_batch` must return one output per input, in input order. Any
+        sequence supporting slicing works (list, numpy array, tensor), each caller
+        gets back a list."""
+        if not items:
+            return []
+
+        loop = asyncio.get_running_loop()
+        batch_queue = self._queues.get(key)
+        if batch_queue is None or batch_queue.loop is not loop:
+            batch_queue = _BatchQueue(loop)
+            self._queues[key] = batch_queue
+
+        if batch_queue.worker is None or batch_queue.worker.done():
+            batch_queue.worker = loop.create_task(self._run_worker(batch_queue))
+
+        request: _PendingRequest[T, R] = _PendingRequest(
+            items=items, process_batch=process_batch, future=loop.create_future()
+        )
+        batch_queue.queue.put_nowait(request)
+        micro_batch_queue_depth.labels(self.name).inc(len(items))
+
+        return await request.future
+
+    async def _collect_batch(
+        self, batch_queue: _BatchQueue[T, R]
+    ) -> list[_PendingRequest[T, R]] | None:
+        queue = batch_queue.queue
+        first = batch_queue.carry_over
+        batch_queue.carry_over = None
+        if first is None:
+            try:
+                first = await asyncio.wait_for(queue.get(), timeout=_IDLE_TIMEOUT)
+            except asyncio.TimeoutError:
+                # nothing to do, let the worker exit. A new one is started on demand
+                return None
+
+        batch = [first]
+        batch_size = len(first.items)
+        deadline = first.enqueued_at + self.max_wait_seconds
+
+        while batch_size < self.max_batch_size:
+            try:
+                next_request = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    next_request = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+
+            if batch_size + len(next_request.items) > self.max_batch_size:
+                batch_queue.carry_over = next_request
+                break
+
+            batch.append(next_request)
+            batch_size += len(next_request.items)
+
+        return batch
+
+    async def _run_worker(self, batch_queue: _BatchQueue[T, R]) -> None:
+        while True:
+            batch = await self._collect_batch(batch_queue)
+            if batch is None:
+                if batch_queue.queue.empty():
+                    return
+                continue
+
+            inputs = [item for request in batch for item in request.items]
+            micro_batch_queue_depth.labels(self.name).dec(len(inputs))
+            micro_batch_fill_ratio.labels(self.name).observe(
+                min(len(inputs) / self.max_batch_size, 1.0)
+            )
+            micro_batch_requests.labels(self.name).observe(len(batch))
+            logger.debug(
+                f"event=micro_batch batcher={self.name} "
+                f"requests={len(batch)} inputs={len(inputs)} "
+                f"queue_depth={batch_queue.queue.qsize()}"
+            )
+
+            try:
+                outputs = await batch_queue.loop.run_in_executor(
+                    None, batch[0].process_batch, inputs
+                )
+                if len(outputs) != len(inputs):
+                    raise ValueError(
+                        f"Batch function returned {len(outputs)} outputs "
+                        f"for {len(inputs)} inputs"
+                    )
+            except Exception as e:
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+                continue
+
+            offset = 0
+            for request in batch:
+                request_outputs = outputs[offset : offset + len(request.items)]
+                offset += len(request.items)
+                if not request.future.done():
+                    request.future.set_result(list(request_outputs))
@@ -7,6 +7,7 @@ from typing import Optional
 
 import aioboto3  # type: ignore
 import httpx
+import numpy as np
 import openai
 import vertexai  # type: ignore
 import voyageai  # type: ignore
@@ -14,6 +15,7 @@ from cohere import AsyncClient as CohereAsyncClient
 from fastapi import APIRouter
 from fastapi import HTTPException
 from fastapi import Request
+from fastapi import Response
 from google.oauth2 import service_account  # type: ignore
 from litellm import aembedding
 from litellm.exceptions import RateLimitError
@@ -23,6 +25,7 @@ from sentence_transformers import SentenceTransformer  # type: ignore
 from vertexai.language_models import TextEmbeddingInput  # type: ignore
 from vertexai.language_models import TextEmbeddingModel  # type: ignore
 
+from model_server.batching import MicroBatcher
 from model_server.constants import DEFAULT_COHERE_MODEL
 from model_server.constants import DEFAULT_OPENAI_MODEL
 from model_server.constants import DEFAULT_VERTEX_MODEL
@@ -33,9 +36,11 @@ from model_server.utils import pass_aws_key
 from model_server.utils import simple_log_function_time
 from onyx.utils.logger import setup_logger
 from shared_configs.configs import API_BASED_EMBEDDING_TIMEOUT
+from shared_configs.configs import DISABLE_MODEL_SERVER_MICRO_BATCHING
 from shared_configs.configs import INDEXING_ONLY
 from shared_configs.configs import OPENAI_EMBEDDING_TIMEOUT
 from shared_configs.configs import VERTEXAI_EMBEDDING_LOCAL_BATCH_SIZE
+from shared_configs.enums import EmbeddingTransportFormat
 from shared_configs.enums import EmbedTextType
 from shared_configs.enums import RerankerProvider
 from shared_configs.model_server_models import Embedding
@@ -44,6 +49,9 @@ from shared_configs.model_server_models import EmbedResponse
 from shared_configs.model_server_models import RerankRequest
 from shared_configs.model_server_models import RerankResponse
 from shared_configs.utils import batch_list
+from shared_configs.utils import EMBEDDING_BINARY_MEDIA_TYPE
+from shared_configs.utils import EMBEDDING_FORMAT_HEADER
+from shared_configs.utils import encode_embeddings
 
 
 logger = setup_logger()
@@ -53,6 +61,10 @@ router = APIRouter(prefix="/encoder")
 _GLOBAL_MODELS_DICT: dict[str, "SentenceTransformer"] = {}
 _RERANK_MODEL: Optional["CrossEncoder"] = None
 
+# Coalesce concurrent requests to local models into shared forward passes
+_EMBEDDING_BATCHER: MicroBatcher[str, Embedding] = MicroBatcher("embedding")
+_RERANK_BATCHER: MicroBatcher[tuple[str, str], float] = MicroBatcher("rerank")
+
 # If we are not only indexing, dont want retry very long
 _RETRY_DELAY = 10 if INDEXING_ONLY else 0.1
 _RETRY_TRIES = 10 if INDEXING_ONLY else 2
@@ -419,7 +431,10 @@ async def embed_text(
     api_version: str | None,
     reduced_dimension: int | None,
     gpu_type: str = "UNKNOWN",
-) -> list[Embedding]:
+) -> list[Embedding] | np.ndarray:
+    """Local models return a (num_texts, dim) array so it can be sent over the
+    binary transport without going through Python float lists."""
+    embeddings: list[Embedding] | np.ndarray
     if not all(texts):
         logger.error("Empty strings provided for embedding")
         raise ValueError("Empty strings are not allowed for embedding.")
@@ -489,17 +504,29 @@ async def embed_text(
         local_model = get_embedding_model(
             model_name=model_name, max_context_length=max_context_length
         )
-        # Run CPU-bound embedding in a thread pool
-        embeddings_vectors = await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: local_model.encode(
-                prefixed_texts, normalize_embeddings=normalize_embeddings
-            ),
+
+        def _encode(batch_texts: list[str]) -> list[Embedding]:
+            return local_model.encode(
+                batch_texts, normalize_embeddings=normalize_embeddings
+            )
+
+        # Run CPU-bound embedding in a thread pool, batched together with any
+        # concurrent requests for the same model and settings
+        if DISABLE_MODEL_SERVER_MICRO_BATCHING:
+            embeddings_vectors = await asyncio.get_event_loop().run_in_executor(
+                None, _encode, prefixed_texts
+            )
+        else:
+            embeddings_vectors = await _EMBEDDING_BATCHER.submit(
+                key=(model_name, max_context_length, normalize_embeddings),
+                items=prefixed_texts,
+                process_batch=_encode,
+            )
+        embeddings = (
+            embeddings_vectors
+            if isinstance(embeddings_vectors, np.ndarray)
+            else np.asarray(embeddings_vectors)
         )
-        embeddings = [
-            embedding if isinstance(embedding, list) else embedding.tolist()
-            for embedding in embeddings_vectors
-        ]
 
         elapsed = time.monotonic() - start
         logger.info(
@@ -526,10 +553,17 @@ async def embed_text(
 @simple_log_function_time()
 async def local_rerank(query: str, docs: list[str], model_name: str) -> list[float]:
     cross_encoder = get_local_reranking_model(model_name)
-    # Run CPU-bound reranking in a thread pool
-    return await asyncio.get_event_loop().run_in_executor(
-        None,
-        lambda: cross_encoder.predict([(query, doc) for doc in docs]).tolist(),  # type: ignore
+
+    def _predict(pairs: list[tuple[str, str]]) -> list[float]:
+        return cross_encoder.predict(pairs).tolist()  # type: ignore
+
+    pairs = [(query, doc) for doc in docs]
+    # Run CPU-bound reranking in a thread pool, batched together with any
+    # concurrent rerank requests
+    if DISABLE_MODEL_SERVER_MICRO_BATCHING:
+        return await asyncio.get_event_loop().run_in_executor(None, _predict, pairs)
+    return await _RERANK_BATCHER.submit(
+        key=model_name, items=pairs, process_batch=_predict
     )
 
 
@@ -604,17 +638,51 @@ async def litellm_rerank(
         ]
 
 
-@router.post("/bi-encoder-embed")
+@router.post("/bi-encoder-embed", response_model=EmbedResponse)
 async def route_bi_encoder_embed(
     request: Request,
     embed_request: EmbedRequest,
-) -> EmbedResponse:
-    return await process_embed_request(embed_request, request.app.state.gpu_type)
+) -> EmbedResponse | Response:
+    embeddings = await _embed_request(embed_request, request.app.state.gpu_type)
+
+    # clients can ask for a raw binary buffer instead of JSON float lists, which is
+    # much cheaper to produce and parse for large batches
+    requested_format = request.headers.get(EMBEDDING_FORMAT_HEADER)
+    if requested_format:
+        try:
+            transport_format = EmbeddingTransportFormat(requested_format)
+        except ValueError:
+            logger.warning(f"Unknown embedding format requested: {requested_format}")
+            return EmbedResponse(embeddings=_embeddings_to_list(embeddings))
+
+        encoded = encode_embeddings(embeddings, transport_format)
+        if encoded is not None:
+            body, headers = encoded
+            return Response(
+                content=body,
+                media_type=EMBEDDING_BINARY_MEDIA_TYPE,
+                headers=headers,
+            )
+
+    return EmbedResponse(embeddings=_embeddings_to_list(embeddings))
+
+
+def _embeddings_to_list(embeddings: list[Embedding] | np.ndarray) -> list[Embedding]:
+    if isinstance(embeddings, np.ndarray):
+        return embeddings.tolist()
+    return embeddings
 
 
 async def process_embed_request(
     embed_request: EmbedRequest, gpu_type: str = "UNKNOWN"
 ) -> EmbedResponse:
+    embeddings = await _embed_request(embed_request, gpu_type)
+    return EmbedResponse(embeddings=_embeddings_to_list(embeddings))
+
+
+async def _embed_request(
+    embed_request: EmbedRequest, gpu_type: str
+) -> list[Embedding] | np.ndarray:
     if not embed_request.texts:
         raise HTTPException(status_code=400, detail="No texts to be embedded")
 
@@ -629,7 +697,7 @@ async def process_embed_request(
         else:
             prefix = None
 
-        embeddings = await embed_text(
+        return await embed_text(
             texts=embed_request.texts,
             model_name=embed_request.model_name,
             deployment_name=embed_request.deployment_name,
@@ -644,7 +712,6 @@ async def process_embed_request(
             prefix=prefix,
             gpu_type=gpu_type,
         )
-        return EmbedResponse(embeddings=embeddings)
     except AuthenticationError as e:
         # Handle authentication errors consistently
         logger.error(f"Authentication error: {e.provider}")
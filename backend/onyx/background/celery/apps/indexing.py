@@ -12,6 +12,8 @@ from celery.signals import worker_ready
 from celery.signals import worker_shutdown
 
 import onyx.background.celery.apps.app_base as app_base
+from onyx.background.indexing.job_client import get_warm_job_pool
+from onyx.background.indexing.job_client import shutdown_warm_job_pool
 from onyx.configs.constants import POSTGRES_CELERY_WORKER_INDEXING_APP_NAME
 from onyx.db.engine.sql_engine import SqlEngine
 from onyx.utils.logger import setup_logger
@@ -82,11 +84,17 @@ def on_worker_init(sender: Worker, **kwargs: Any) -> None:
 
 @worker_ready.connect
 def on_worker_ready(sender: Any, **kwargs: Any) -> None:
+    # start the warm indexing processes (if enabled) so that they are initialized
+    # by the time the first attempt arrives
+    get_warm_job_pool()
+
     app_base.on_worker_ready(sender, **kwargs)
 
 
 @worker_shutdown.connect
 def on_worker_shutdown(sender: Any, **kwargs: Any) -> None:
+    shutdown_warm_job_pool()
+
     app_base.on_worker_shutdown(sender, **kwargs)
 
 
@@ -3,6 +3,7 @@ import os
 import time
 import traceback
 from datetime import datetime
+from datetime import timedelta
 from datetime import timezone
 from enum import Enum
 from http import HTTPStatus
@@ -35,10 +36,13 @@ from onyx.background.indexing.checkpointing_utils import cleanup_checkpoint
 from onyx.background.indexing.checkpointing_utils import (
     get_index_attempts_with_old_checkpoints,
 )
+from onyx.background.indexing.job_client import get_warm_job_pool
 from onyx.background.indexing.job_client import SimpleJob
 from onyx.background.indexing.job_client import SimpleJobClient
 from onyx.background.indexing.job_client import SimpleJobException
+from onyx.background.indexing.job_client import WarmJobPool
 from onyx.background.indexing.run_indexing import run_indexing_entrypoint
+from onyx.configs.app_configs import LLM_RESULT_CACHE_RETENTION_DAYS
 from onyx.configs.app_configs import MANAGED_VESPA
 from onyx.configs.app_configs import VESPA_CLOUD_CERT_PATH
 from onyx.configs.app_configs import VESPA_CLOUD_KEY_PATH
@@ -64,6 +68,7 @@ from onyx.db.enums import IndexingStatus
 from onyx.db.index_attempt import get_index_attempt
 from onyx.db.index_attempt import mark_attempt_canceled
 from onyx.db.index_attempt import mark_attempt_failed
+from onyx.db.llm_result_cache import delete_llm_results_older_than
 from onyx.db.search_settings import get_active_search_settings_list
 from onyx.db.search_settings import get_current_search_settings
 from onyx.db.swap_index import check_and_perform_index_swap
@@ -953,8 +958,7 @@ def process_job_result(
     result = SimpleJobResult()
     result.connector_source = connector_source
 
-    if job.process:
-        result.exit_code = job.process.exitcode
+    result.exit_code = job.exit_code
 
     if job.status != "error":
         result.status = IndexingWatchdogTerminalStatus.SUCCEEDED
@@ -1038,7 +1042,8 @@ def connector_indexing_proxy_task(
     if not self.request.id:
         task_logger.error("self.request.id is None!")
 
-    client = SimpleJobClient()
+    # reuse an already initialized process if the warm pool is enabled
+    client: SimpleJobClient | WarmJobPool = get_warm_job_pool() or SimpleJobClient()
     task_logger.info(f"submitting connector_indexing_task with tenant_id={tenant_id}")
 
     job = client.submit(
@@ -1401,3 +1406,50 @@ def cleanup_checkpoint_task(
             f"index_attempt_id={index_attempt_id} "
             f"elapsed={elapsed:.2f}"
         )
+
+
+# primary
+@shared_task(
+    name=OnyxCeleryTask.CHECK_FOR_LLM_RESULT_CACHE_CLEANUP,
+    soft_time_limit=300,
+    bind=True,
+)
+def check_for_llm_result_cache_cleanup(self: Task, *, tenant_id: str) -> None:
+    """Delete cached LLM results older than LLM_RESULT_CACHE_RETENTION_DAYS."""
+    if LLM_RESULT_CACHE_RETENTION_DAYS <= 0:
+        return None
+
+    locked = False
+    redis_client = get_redis_client(tenant_id=tenant_id)
+    lock: RedisLock = redis_client.lock(
+        OnyxRedisLocks.CHECK_LLM_RESULT_CACHE_CLEANUP_BEAT_LOCK,
+        timeout=CELERY_GENERIC_BEAT_LOCK_TIMEOUT,
+    )
+
+    # these tasks should never overlap
+    if not lock.acquire(blocking=False):
+        return None
+
+    try:
+        locked = True
+        cutoff = datetime.now(timezone.utc) - timedelta(
+            days=LLM_RESULT_CACHE_RETENTION_DAYS
+        )
+        with get_session_with_current_tenant() as db_session:
+            num_deleted = delete_llm_results_older_than(db_session, cutoff)
+        task_logger.info(
+            f"Deleted {num_deleted} cached LLM results older than {cutoff}: "
+            f"tenant={tenant_id}"
+        )
+    except Exception:
+        task_logger.exception("Unexpected exception during LLM result cache cleanup")
+        return None
+    finally:
+        if locked:
+            if lock.owned():
+                lock.release()
+            else:
+                task_logger.error(
+                    "check_for_llm_result_cache_cleanup - Lock not owned on "
+                    f"completion: tenant={tenant_id}"
+                )
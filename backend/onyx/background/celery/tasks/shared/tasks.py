@@ -1,5 +1,12 @@
+import contextvars
 import time
+from collections.abc import Callable
+from concurrent.futures import as_completed
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
 from enum import Enum
+from functools import partial
 from http import HTTPStatus
 
 import httpx
@@ -10,18 +17,27 @@ from redis import Redis
 from tenacity import RetryError
 
 from onyx.access.access import get_access_for_document
+from onyx.access.access import get_access_for_documents
 from onyx.background.celery.apps.app_base import task_logger
 from onyx.background.celery.tasks.shared.RetryDocumentIndex import RetryDocumentIndex
+from onyx.configs.app_configs import VESPA_SYNC_BATCH_NUM_THREADS
 from onyx.configs.constants import ONYX_CELERY_BEAT_HEARTBEAT_KEY
 from onyx.configs.constants import OnyxCeleryTask
 from onyx.db.document import delete_document_by_connector_credential_pair__no_commit
+from onyx.db.document import delete_documents_by_connector_credential_pair__no_commit
 from onyx.db.document import delete_documents_complete__no_commit
 from onyx.db.document import fetch_chunk_count_for_document
+from onyx.db.document import fetch_chunk_counts_for_documents
 from onyx.db.document import get_document
 from onyx.db.document import get_document_connector_count
+from onyx.db.document import get_document_connector_counts
+from onyx.db.document import get_documents_by_ids
 from onyx.db.document import mark_document_as_modified
 from onyx.db.document import mark_document_as_synced
+from onyx.db.document import mark_documents_as_modified__no_commit
+from onyx.db.document import mark_documents_as_synced__no_commit
 from onyx.db.document_set import fetch_document_sets_for_document
+from onyx.db.document_set import fetch_document_sets_for_documents
 from onyx.db.engine.sql_engine import get_session_with_current_tenant
 from onyx.db.relationships import delete_document_references_from_kg
 from onyx.db.search_settings import get_active_search_settings
@@ -57,6 +73,70 @@ class OnyxCeleryTaskCompletionStatus(str, Enum):
     RETRYABLE_EXCEPTION = "retryable_exception"
 
 
+@dataclass
+class DocumentIndexBatchResult:
+    """Outcome of running one document index operation per document of a batch."""
+
+    # document id -> number of chunks affected
+    succeeded: dict[str, int] = field(default_factory=dict)
+    # failed with an error that may go away on retry
+    failed: list[str] = field(default_factory=list)
+    # failed with an error that will never go away (e.g. a 400 from Vespa)
+    non_retryable: list[str] = field(default_factory=list)
+    last_exception: Exception | None = None
+
+
+def _is_non_retryable_index_error(ex: BaseException) -> bool:
+    e: BaseException | None = ex
+    if isinstance(ex, RetryError):
+        e = ex.last_attempt.exception()
+
+    return (
+        isinstance(e, httpx.HTTPStatusError)
+        and e.response.status_code == HTTPStatus.BAD_REQUEST
+    )
+
+
+def run_document_index_ops_in_parallel(
+    doc_id_to_op: dict[str, Callable[[], int]],
+    num_threads: int = VESPA_SYNC_BATCH_NUM_THREADS,
+) -> DocumentIndexBatchResult:
+    """Runs the per document index operations (e.g. update_single / delete_single
+    through a RetryDocumentIndex) concurrently and sorts the documents by outcome.
+    The operations should share the pooled Vespa http client."""
+    result = DocumentIndexBatchResult()
+    if not doc_id_to_op:
+        return result
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(num_threads, len(doc_id_to_op)))
+    ) as executor:
+        future_to_doc_id = {
+            executor.submit(contextvars.copy_context().run, op): doc_id
+            for doc_id, op in doc_id_to_op.items()
+        }
+        for future in as_completed(future_to_doc_id):
+            doc_id = future_to_doc_id[future]
+            exception = future.exception()
+            if exception is None:
+                result.succeeded[doc_id] = future.result()
+            elif _is_non_retryable_index_error(exception):
+                task_logger.error(
+                    f"Non-retryable document index error: doc={doc_id} "
+                    f"exception={exception!r}"
+                )
+                result.non_retryable.append(doc_id)
+            else:
+                task_logger.warning(
+                    f"Document index error: doc={doc_id} exception={exception!r}"
+                )
+                result.failed.append(doc_id)
+                if isinstance(exception, Exception):
+                    result.last_exception = exception
+
+    return result
+
+
 @shared_task(
     name=OnyxCeleryTask.DOCUMENT_BY_CC_PAIR_CLEANUP_TASK,
     soft_time_limit=LIGHT_SOFT_TIME_LIMIT,
@@ -268,6 +348,201 @@ def document_by_cc_pair_cleanup_task(
     return True
 
 
+@shared_task(
+    name=OnyxCeleryTask.DOCUMENT_BY_CC_PAIR_CLEANUP_BATCH_TASK,
+    soft_time_limit=LIGHT_SOFT_TIME_LIMIT,
+    time_limit=LIGHT_TIME_LIMIT,
+    max_retries=DOCUMENT_BY_CC_PAIR_CLEANUP_MAX_RETRIES,
+    bind=True,
+)
+def document_by_cc_pair_cleanup_batch_task(
+    self: Task,
+    document_ids: list[str],
+    connector_id: int,
+    credential_id: int,
+    tenant_id: str,
+) -> bool:
+    """Batch variant of document_by_cc_pair_cleanup_task, created by connection
+    deletion and connector pruning parent tasks.
+
+    The documents are split into deletes (this cc_pair is the last reference) and
+    updates (other cc_pairs still reference them) with one query. The Vespa deletes
+    and updates run concurrently and the db changes of the batch are committed once.
+    On retryable failures the task is retried with only the documents that failed."""
+    task_logger.debug(f"Task start: docs={len(document_ids)}")
+
+    start = time.monotonic()
+
+    completion_status = OnyxCeleryTaskCompletionStatus.UNDEFINED
+    failed_doc_ids: list[str] = []
+    cc_pair_identifier = ConnectorCredentialPairIdentifier(
+        connector_id=connector_id,
+        credential_id=credential_id,
+    )
+
+    try:
+        with get_session_with_current_tenant() as db_session:
+            active_search_settings = get_active_search_settings(db_session)
+            doc_index = get_default_document_index(
+                active_search_settings.primary,
+                active_search_settings.secondary,
+                httpx_client=HttpxPool.get("vespa"),
+            )
+
+            retry_index = RetryDocumentIndex(doc_index)
+
+            doc_id_to_count = dict(
+                get_document_connector_counts(db_session, document_ids)
+            )
+            # count == 1 means this is the only remaining cc_pair reference to the doc
+            # count > 1 means the document still has cc_pair references
+            delete_doc_ids = [
+                doc_id for doc_id in document_ids if doc_id_to_count.get(doc_id) == 1
+            ]
+            update_doc_ids = [
+                doc_id for doc_id in document_ids if doc_id_to_count.get(doc_id, 0) > 1
+            ]
+
+            doc_id_to_op: dict[str, Callable[[], int]] = {}
+
+            for doc_id, chunk_count in fetch_chunk_counts_for_documents(
+                delete_doc_ids, db_session
+            ):
+                doc_id_to_op[doc_id] = partial(
+                    retry_index.delete_single,
+                    doc_id,
+                    tenant_id=tenant_id,
+                    chunk_count=chunk_count,
+                )
+
+            if update_doc_ids:
+                # the below functions do not include cc_pairs being deleted.
+                # i.e. they will correctly omit access for the current cc_pair
+                doc_id_to_access = get_access_for_documents(
+                    document_ids=update_doc_ids, db_session=db_session
+                )
+                doc_id_to_doc_sets = dict(
+                    fetch_document_sets_for_documents(update_doc_ids, db_session)
+                )
+                for doc in get_documents_by_ids(db_session, update_doc_ids):
+                    fields = VespaDocumentFields(
+                        document_sets=set(doc_id_to_doc_sets.get(doc.id, [])),
+                        access=doc_id_to_access[doc.id],
+                        boost=doc.boost,
+                        hidden=doc.hidden,
+                    )
+                    # update Vespa. OK if doc doesn't exist. Raises exception otherwise.
+                    doc_id_to_op[doc.id] = partial(
+                        retry_index.update_single,
+                        doc.id,
+                        tenant_id=tenant_id,
+                        chunk_count=doc.chunk_count,
+                        fields=fields,
+                        user_fields=None,
+                    )
+
+            result = run_document_index_ops_in_parallel(doc_id_to_op)
+            failed_doc_ids = result.failed
+
+            deleted_doc_ids = [
+                doc_id for doc_id in delete_doc_ids if doc_id in result.succeeded
+            ]
+            updated_doc_ids = [
+                doc_id for doc_id in update_doc_ids if doc_id in result.succeeded
+            ]
+
+            delete_documents_complete__no_commit(
+                db_session=db_session,
+                document_ids=deleted_doc_ids,
+            )
+
+            # there are still other cc_pair references to the docs, so just resync
+            # to Vespa
+            delete_documents_by_connector_credential_pair__no_commit(
+                db_session=db_session,
+                document_ids=updated_doc_ids,
+                connector_credential_pair_identifier=cc_pair_identifier,
+            )
+            mark_documents_as_synced__no_commit(updated_doc_ids, db_session)
+            db_session.commit()
+
+            elapsed = time.monotonic() - start
+            task_logger.info(
+                f"docs={len(document_ids)} "
+                f"deleted={len(deleted_doc_ids)} "
+                f"updated={len(updated_doc_ids)} "
+                f"skipped={len(document_ids) - len(doc_id_to_count)} "
+                f"failed={len(result.failed)} "
+                f"non_retryable={len(result.non_retryable)} "
+                f"chunks={sum(result.succeeded.values())} "
+                f"elapsed={elapsed:.2f}"
+            )
+
+            if result.last_exception is not None:
+                raise result.last_exception
+
+            if result.non_retryable:
+                completion_status = (
+                    OnyxCeleryTaskCompletionStatus.NON_RETRYABLE_EXCEPTION
+                )
+            elif doc_id_to_op:
+                completion_status = OnyxCeleryTaskCompletionStatus.SUCCEEDED
+            else:
+                completion_status = OnyxCeleryTaskCompletionStatus.SKIPPED
+    except SoftTimeLimitExceeded:
+        task_logger.info(f"SoftTimeLimitExceeded exception. docs={len(document_ids)}")
+        completion_status = OnyxCeleryTaskCompletionStatus.SOFT_TIME_LIMIT
+    except Exception as e:
+        task_logger.exception(
+            f"document_by_cc_pair_cleanup_batch_task exceptioned: "
+            f"docs={len(document_ids)}"
+        )
+
+        # only the documents that still need a cleanup (all of them if we
+        # failed before touching Vespa)
+        retry_doc_ids = failed_doc_ids or document_ids
+
+        completion_status = OnyxCeleryTaskCompletionStatus.RETRYABLE_EXCEPTION
+        if self.max_retries is not None and self.request.retries >= self.max_retries:
+            # This is the last attempt! mark the documents as dirty in the db so that
+            # they eventually get fixed out of band via stale document reconciliation
+            task_logger.warning(
+                f"Max celery task retries reached. Marking docs as dirty for "
+                f"reconciliation: docs={len(retry_doc_ids)}"
+            )
+            with get_session_with_current_tenant() as db_session:
+                # delete the cc pair relationship now and let reconciliation clean
+                # it up in vespa
+                delete_documents_by_connector_credential_pair__no_commit(
+                    db_session=db_session,
+                    document_ids=retry_doc_ids,
+                    connector_credential_pair_identifier=cc_pair_identifier,
+                )
+                mark_documents_as_modified__no_commit(retry_doc_ids, db_session)
+                db_session.commit()
+            completion_status = OnyxCeleryTaskCompletionStatus.NON_RETRYABLE_EXCEPTION
+        else:
+            # Exponential backoff from 2^4 to 2^6 ... i.e. 16, 32, 64
+            countdown = 2 ** (self.request.retries + 4)
+            self.retry(
+                exc=e,
+                countdown=countdown,
+                kwargs=dict(
+                    document_ids=retry_doc_ids,
+                    connector_id=connector_id,
+                    credential_id=credential_id,
+                    tenant_id=tenant_id,
+                ),
+            )  # this will raise a celery exception
+    finally:
+        task_logger.info(
+            f"document_by_cc_pair_cleanup_batch_task completed: "
+            f"status={completion_status.value} docs={len(document_ids)}"
+        )
+
+    return completion_status == OnyxCeleryTaskCompletionStatus.SUCCEEDED
+
+
 @shared_task(name=OnyxCeleryTask.CELERY_BEAT_HEARTBEAT, ignore_result=True, bind=True)
 def celery_beat_heartbeat(self: Task, *, tenant_id: str) -> None:
     """When this task runs, it writes a key to Redis with a TTL.
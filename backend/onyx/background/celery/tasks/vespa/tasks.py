@@ -1,5 +1,6 @@
 import time
 from collections.abc import Callable
+from functools import partial
 from http import HTTPStatus
 from typing import Any
 from typing import cast
@@ -15,11 +16,15 @@ from sqlalchemy.orm import Session
 from tenacity import RetryError
 
 from onyx.access.access import get_access_for_document
+from onyx.access.access import get_access_for_documents
 from onyx.background.celery.apps.app_base import task_logger
 from onyx.background.celery.tasks.shared.RetryDocumentIndex import RetryDocumentIndex
 from onyx.background.celery.tasks.shared.tasks import LIGHT_SOFT_TIME_LIMIT
 from onyx.background.celery.tasks.shared.tasks import LIGHT_TIME_LIMIT
 from onyx.background.celery.tasks.shared.tasks import OnyxCeleryTaskCompletionStatus
+from onyx.background.celery.tasks.shared.tasks import (
+    run_document_index_ops_in_parallel,
+)
 from onyx.configs.app_configs import JOB_TIMEOUT
 from onyx.configs.app_configs import VESPA_SYNC_MAX_TASKS
 from onyx.configs.constants import CELERY_VESPA_SYNC_BEAT_LOCK_TIMEOUT
@@ -29,10 +34,13 @@ from onyx.configs.constants import OnyxRedisLocks
 from onyx.db.connector_credential_pair import get_connector_credential_pairs
 from onyx.db.document import count_documents_by_needs_sync
 from onyx.db.document import get_document
+from onyx.db.document import get_documents_by_ids
 from onyx.db.document import mark_document_as_synced
+from onyx.db.document import mark_documents_as_synced
 from onyx.db.document_set import delete_document_set
 from onyx.db.document_set import fetch_document_sets
 from onyx.db.document_set import fetch_document_sets_for_document
+from onyx.db.document_set import fetch_document_sets_for_documents
 from onyx.db.document_set import get_document_set_by_id
 from onyx.db.document_set import mark_document_set_as_synced
 from onyx.db.engine.sql_engine import get_session_with_current_tenant
@@ -641,3 +649,125 @@ def vespa_metadata_sync_task(self: Task, document_id: str, *, tenant_id: str) ->
         )
 
     return completion_status == OnyxCeleryTaskCompletionStatus.SUCCEEDED
+
+
+@shared_task(
+    name=OnyxCeleryTask.VESPA_METADATA_SYNC_BATCH_TASK,
+    bind=True,
+    soft_time_limit=LIGHT_SOFT_TIME_LIMIT,
+    time_limit=LIGHT_TIME_LIMIT,
+    max_retries=3,
+)
+def vespa_metadata_sync_batch_task(
+    self: Task, document_ids: list[str], *, tenant_id: str
+) -> bool:
+    """Batch variant of vespa_metadata_sync_task. Document sets, access and the
+    documents themselves are fetched with one query each and the Vespa updates of
+    the documents run concurrently over the pooled Vespa client.
+
+    On retryable failures the task is retried with only the documents that failed,
+    keeping its task id (and so its taskset entry) until the whole batch is done."""
+    start = time.monotonic()
+
+    completion_status = OnyxCeleryTaskCompletionStatus.UNDEFINED
+    failed_doc_ids: list[str] = []
+
+    try:
+        with get_session_with_current_tenant() as db_session:
+            active_search_settings = get_active_search_settings(db_session)
+            doc_index = get_default_document_index(
+                search_settings=active_search_settings.primary,
+                secondary_search_settings=active_search_settings.secondary,
+                httpx_client=HttpxPool.get("vespa"),
+            )
+
+            retry_index = RetryDocumentIndex(doc_index)
+
+            docs = get_documents_by_ids(db_session, document_ids)
+            found_doc_ids = [doc.id for doc in docs]
+            doc_id_to_doc_sets = dict(
+                fetch_document_sets_for_documents(found_doc_ids, db_session)
+            )
+            doc_id_to_access = get_access_for_documents(
+                document_ids=found_doc_ids, db_session=db_session
+            )
+
+            doc_id_to_op: dict[str, Callable[[], int]] = {}
+            for doc in docs:
+                fields = VespaDocumentFields(
+                    document_sets=set(doc_id_to_doc_sets.get(doc.id, [])),
+                    access=doc_id_to_access[doc.id],
+                    boost=doc.boost,
+                    hidden=doc.hidden,
+                )
+
+                # update Vespa. OK if doc doesn't exist. Raises exception otherwise.
+                doc_id_to_op[doc.id] = partial(
+                    retry_index.update_single,
+                    doc.id,
+                    tenant_id=tenant_id,
+                    chunk_count=doc.chunk_count,
+                    fields=fields,
+                    user_fields=None,
+                )
+
+            result = run_document_index_ops_in_parallel(doc_id_to_op)
+            failed_doc_ids = result.failed
+
+            # update db last. Worst case = we crash right before this and
+            # the sync might repeat again later
+            mark_documents_as_synced(list(result.succeeded), db_session)
+
+            elapsed = time.monotonic() - start
+            task_logger.info(
+                f"docs={len(document_ids)} "
+                f"action=sync "
+                f"synced={len(result.succeeded)} "
+                f"missing={len(document_ids) - len(docs)} "
+                f"failed={len(result.failed)} "
+                f"non_retryable={len(result.non_retryable)} "
+                f"chunks={sum(result.succeeded.values())} "
+                f"elapsed={elapsed:.2f}"
+            )
+
+            if result.last_exception is not None:
+                raise result.last_exception
+
+            # documents that failed for good are left unsynced, same as
+            # document_by_cc_pair_cleanup_batch_task
+            if result.non_retryable:
+                completion_status = (
+                    OnyxCeleryTaskCompletionStatus.NON_RETRYABLE_EXCEPTION
+                )
+            else:
+                completion_status = OnyxCeleryTaskCompletionStatus.SUCCEEDED
+    except SoftTimeLimitExceeded:
+        task_logger.info(f"SoftTimeLimitExceeded exception. docs={len(document_ids)}")
+        completion_status = OnyxCeleryTaskCompletionStatus.SOFT_TIME_LIMIT
+    except Exception as e:
+        task_logger.exception(
+            f"vespa_metadata_sync_batch_task exceptioned: docs={len(document_ids)}"
+        )
+
+        completion_status = OnyxCeleryTaskCompletionStatus.RETRYABLE_EXCEPTION
+        if self.max_retries is not None and self.request.retries >= self.max_retries:
+            completion_status = OnyxCeleryTaskCompletionStatus.NON_RETRYABLE_EXCEPTION
+
+        # only retry the documents that still need a sync (all of them if we
+        # failed before touching Vespa)
+        retry_doc_ids = failed_doc_ids or document_ids
+
+        # Exponential backoff from 2^4 to 2^6 ... i.e. 16, 32, 64
+        countdown = 2 ** (self.request.retries + 4)
+        self.retry(
+            exc=e,
+            countdown=countdown,
+            kwargs=dict(document_ids=retry_doc_ids, tenant_id=tenant_id),
+        )  # this will raise a celery exception
+    finally:
+        task_logger.info(
+            f"vespa_metadata_sync_batch_task completed: "
+            f"status={completion_status.value} docs={len(document_ids)}"
+        )
+
+    return completion_status == OnyxCeleryTaskCompletionStatus.SUCCEEDED
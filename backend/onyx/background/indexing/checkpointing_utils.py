@@ -1,3 +1,5 @@
+import gzip
+import time
 from datetime import datetime
 from datetime import timedelta
 from io import BytesIO
@@ -5,10 +7,14 @@ from io import BytesIO
 from sqlalchemy import and_
 from sqlalchemy.orm import Session
 
+from onyx.configs.app_configs import INDEXING_CHECKPOINT_COMPRESSION_LEVEL
+from onyx.configs.app_configs import INDEXING_CHECKPOINT_SAVE_INTERVAL_SECONDS
+from onyx.configs.app_configs import INDEXING_CHECKPOINT_SAVE_MAX_BATCHES
 from onyx.configs.constants import FileOrigin
 from onyx.connectors.interfaces import BaseConnector
 from onyx.connectors.interfaces import CheckpointedConnector
 from onyx.connectors.models import ConnectorCheckpoint
+from onyx.db.engine.sql_engine import get_session_with_current_tenant
 from onyx.db.engine.time_utils import get_db_current_time
 from onyx.db.index_attempt import get_index_attempt
 from onyx.db.index_attempt import get_recent_completed_attempts_for_cc_pair
@@ -16,38 +22,80 @@ from onyx.db.models import IndexAttempt
 from onyx.db.models import IndexingStatus
 from onyx.file_store.file_store import get_default_file_store
 from onyx.utils.logger import setup_logger
-from onyx.utils.object_size_check import deep_getsizeof
 
 logger = setup_logger()
 
 _NUM_RECENT_ATTEMPTS_TO_CONSIDER = 50
 
+# limit on the size of the serialized (uncompressed) checkpoint
+_MAX_CHECKPOINT_SIZE_BYTES = 200_000_000  # 200MB
+
+# stored checkpoints start with this header followed by the codec and a newline.
+# Checkpoints written before the header existed are plain JSON.
+_CHECKPOINT_HEADER = b"onyx-checkpoint:"
+_GZIP_CODEC = b"gzip"
+
 
 def _build_checkpoint_pointer(index_attempt_id: int) -> str:
     return f"checkpoint_{index_attempt_id}.json"
 
 
+def _encode_checkpoint(checkpoint_json: bytes) -> bytes:
+    return (
+        _CHECKPOINT_HEADER
+        + _GZIP_CODEC
+        + b"\n"
+        + gzip.compress(
+            checkpoint_json, compresslevel=INDEXING_CHECKPOINT_COMPRESSION_LEVEL
+        )
+    )
+
+
+def _decode_checkpoint(stored: bytes) -> bytes:
+    if not stored.startswith(_CHECKPOINT_HEADER):
+        return stored
+
+    codec, _, payload = stored[len(_CHECKPOINT_HEADER) :].partition(b"\n")
+    if codec == _GZIP_CODEC:
+        return gzip.decompress(payload)
+    raise ValueError(f"Unknown checkpoint codec: {codec!r}")
+
+
+def check_checkpoint_size(checkpoint_json: bytes) -> None:
+    """Check if the serialized checkpoint exceeds the limit (200MB)"""
+    content_size = len(checkpoint_json)
+    if content_size > _MAX_CHECKPOINT_SIZE_BYTES:
+        raise ValueError(
+            f"Checkpoint content size ({content_size} bytes) exceeds 200MB limit"
+        )
+
+
 def save_checkpoint(
     db_session: Session, index_attempt_id: int, checkpoint: ConnectorCheckpoint
 ) -> str:
     """Save a checkpoint for a given index attempt to the file store"""
     checkpoint_pointer = _build_checkpoint_pointer(index_attempt_id)
 
+    checkpoint_json = checkpoint.model_dump_json().encode()
+    check_checkpoint_size(checkpoint_json)
+
     file_store = get_default_file_store(db_session)
     file_store.save_file(
-        content=BytesIO(checkpoint.model_dump_json().encode()),
+        content=BytesIO(_encode_checkpoint(checkpoint_json)),
         display_name=checkpoint_pointer,
         file_origin=FileOrigin.INDEXING_CHECKPOINT,
-        file_type="application/json",
+        file_type="application/octet-stream",
         file_id=checkpoint_pointer,
     )
 
     index_attempt = get_index_attempt(db_session, index_attempt_id)
     if not index_attempt:
         raise RuntimeError(f"Index attempt {index_attempt_id} not found in DB.")
-    index_attempt.checkpoint_pointer = checkpoint_pointer
-    db_session.add(index_attempt)
-    db_session.commit()
+    # the pointer only depends on the attempt, so it is only written once
+    if index_attempt.checkpoint_pointer != checkpoint_pointer:
+        index_attempt.checkpoint_pointer = checkpoint_pointer
+        db_session.add(index_attempt)
+        db_session.commit()
     return checkpoint_pointer
 
 
@@ -58,12 +106,61 @@ def load_checkpoint(
     checkpoint_pointer = _build_checkpoint_pointer(index_attempt_id)
     file_store = get_default_file_store(db_session)
     checkpoint_io = file_store.read_file(checkpoint_pointer, mode="rb")
-    checkpoint_data = checkpoint_io.read().decode("utf-8")
+    checkpoint_data = _decode_checkpoint(checkpoint_io.read()).decode("utf-8")
     if isinstance(connector, CheckpointedConnector):
         return connector.validate_checkpoint_json(checkpoint_data)
     return ConnectorCheckpoint.model_validate_json(checkpoint_data)
 
 
+class CoalescingCheckpointSaver:
+    """Saves the checkpoints of a running index attempt without writing every one
+    of them. A new checkpoint is written once `min_interval_seconds` have passed
+    since the last write, or earlier if `max_batches` document batches were indexed
+    since then. `flush` writes the latest pending checkpoint and must be called when
+    the run ends, whether it succeeded or not."""
+
+    def __init__(
+        self,
+        index_attempt_id: int,
+        min_interval_seconds: float = INDEXING_CHECKPOINT_SAVE_INTERVAL_SECONDS,
+        max_batches: int = INDEXING_CHECKPOINT_SAVE_MAX_BATCHES,
+    ) -> None:
+        self.index_attempt_id = index_attempt_id
+        self.min_interval_seconds = min_interval_seconds
+        self.max_batches = max_batches
+
+        self._pending: ConnectorCheckpoint | None = None
+        self._batches_since_save = 0
+        self._last_save_time = time.monotonic()
+
+    def mark_batch_indexed(self) -> None:
+        self._batches_since_save += 1
+
+    def update(self, checkpoint: ConnectorCheckpoint) -> None:
+        self._pending = checkpoint
+
+        if (
+            time.monotonic() - self._last_save_time >= self.min_interval_seconds
+            or self._batches_since_save >= self.max_batches
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending is None:
+            return
+
+        with get_session_with_current_tenant() as db_session:
+            save_checkpoint(
+                db_session=db_session,
+                index_attempt_id=self.index_attempt_id,
+                checkpoint=self._pending,
+            )
+
+        self._pending = None
+        self._batches_since_save = 0
+        self._last_save_time = time.monotonic()
+
+
 def get_latest_valid_checkpoint(
     db_session: Session,
     cc_pair_id: int,
@@ -209,12 +306,3 @@ def cleanup_checkpoint(db_session: Session, index_attempt_id: int) -> None:
     db_session.commit()
 
     return None
-
-
-def check_checkpoint_size(checkpoint: ConnectorCheckpoint) -> None:
-    """Check if the checkpoint content size exceeds the limit (200MB)"""
-    content_size = deep_getsizeof(checkpoint.model_dump())
-    if content_size > 200_000_000:  # 200MB in bytes
-        raise ValueError(
-            f"Checkpoint content size ({content_size} bytes) exceeds 200MB limit"
-        )
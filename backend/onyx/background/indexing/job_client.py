@@ -5,8 +5,11 @@ not follow the expected behavior, etc.
 NOTE: cannot use Celery directly due to
 https://github.com/celery/celery/issues/7007#issuecomment-1740139367"""
 
+import contextvars
+import importlib
 import multiprocessing as mp
 import sys
+import threading
 import traceback
 from collections.abc import Callable
 from dataclasses import dataclass
@@ -15,9 +18,14 @@ from typing import Any
 from typing import Literal
 from typing import Optional
 
+from onyx.configs.app_configs import INDEXING_WARM_WORKER_MAX_ATTEMPTS
+from onyx.configs.app_configs import INDEXING_WARM_WORKER_MAX_MEMORY_MB
+from onyx.configs.app_configs import INDEXING_WARM_WORKER_POOL_SIZE
 from onyx.configs.constants import POSTGRES_CELERY_WORKER_INDEXING_CHILD_APP_NAME
 from onyx.db.engine.sql_engine import SqlEngine
 from onyx.utils.logger import setup_logger
+from onyx.utils.spawned_worker_pool import SpawnedWorker
+from onyx.utils.spawned_worker_pool import SpawnedWorkerPool
 from shared_configs.configs import POSTGRES_DEFAULT_SCHEMA
 from shared_configs.configs import TENANT_ID_PREFIX
 from shared_configs.contextvars import CURRENT_TENANT_ID_CONTEXTVAR
@@ -43,6 +51,28 @@ JobStatusType = (
 )
 
 
+def _get_tenant_id_from_args(args: list | tuple) -> str:
+    tenant_id = POSTGRES_DEFAULT_SCHEMA
+    for arg in reversed(args):
+        if isinstance(arg, str) and arg.startswith(TENANT_ID_PREFIX):
+            tenant_id = arg
+            break
+    return tenant_id
+
+
+def _init_child_engine() -> None:
+    # Reset the engine in the child process
+    SqlEngine.reset_engine()
+
+    # Optionally set a custom app name for database logging purposes
+    SqlEngine.set_app_name(POSTGRES_CELERY_WORKER_INDEXING_CHILD_APP_NAME)
+
+    # Initialize a new engine with desired parameters
+    SqlEngine.init_engine(
+        pool_size=4, max_overflow=12, pool_recycle=60, pool_pre_ping=True
+    )
+
+
 def _initializer(
     func: Callable,
     queue: mp.Queue,
@@ -59,25 +89,12 @@ def _initializer(
 
     logger.info("Initializing spawned worker child process.")
     # 1. Get tenant_id from args or fallback to default
-    tenant_id = POSTGRES_DEFAULT_SCHEMA
-    for arg in reversed(args):
-        if isinstance(arg, str) and arg.startswith(TENANT_ID_PREFIX):
-            tenant_id = arg
-            break
+    tenant_id = _get_tenant_id_from_args(args)
 
     # 2. Set the tenant context before running anything
     token = CURRENT_TENANT_ID_CONTEXTVAR.set(tenant_id)
 
-    # Reset the engine in the child process
-    SqlEngine.reset_engine()
-
-    # Optionally set a custom app name for database logging purposes
-    SqlEngine.set_app_name(POSTGRES_CELERY_WORKER_INDEXING_CHILD_APP_NAME)
-
-    # Initialize a new engine with desired parameters
-    SqlEngine.init_engine(
-        pool_size=4, max_overflow=12, pool_recycle=60, pool_pre_ping=True
-    )
+    _init_child_engine()
 
     # Proceed with executing the target function
     try:
@@ -116,6 +133,10 @@ class SimpleJob:
     queue: Optional[mp.Queue] = None
     _exception: Optional[str] = None
 
+    @property
+    def exit_code(self) -> int | None:
+        return self.process.exitcode if self.process else None
+
     def cancel(self) -> bool:
         return self.release()
 
@@ -201,3 +222,235 @@ class SimpleJobClient:
         self.jobs[job_id] = job
 
         return job
+
+
+def _init_warm_worker(preload_modules: list[str]) -> None:
+    """The expensive imports and the engine setup are done once per warm worker"""
+    for module_name in preload_modules:
+        importlib.import_module(module_name)
+    _init_child_engine()
+    logger.info(f"Warm worker ready: preloaded={preload_modules}")
+
+
+def _run_warm_job(func: Callable, args: list | tuple) -> tuple[int, str | None, bool]:
+    """Runs a job on a warm worker. Returns the exit code the job would have exited
+    with in its own process, the exception string and whether the worker has to be
+    recycled."""
+    # each job gets its own copy of the context so that context vars set by one
+    # job (tenant, index attempt info, ...) never leak into the next one
+    context = contextvars.copy_context()
+    try:
+        context.run(_run_with_tenant, func, args)
+    except SimpleJobException as e:
+        logger.exception("SimpleJob raised a SimpleJobException")
+        return e.code if e.code is not None else 255, traceback.format_exc(), False
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 255, None, True
+    except Exception:
+        logger.exception("SimpleJob raised an exception")
+        return 255, traceback.format_exc(), False
+
+    return 0, None, False
+
+
+def _run_with_tenant(func: Callable, args: list | tuple) -> None:
+    CURRENT_TENANT_ID_CONTEXTVAR.set(_get_tenant_id_from_args(args))
+    func(*args)
+
+
+@dataclass
+class WarmJob(SimpleJob):
+    """A job running on a worker of a `WarmJobPool`. `process` is the worker's
+    process, so pid based monitoring and termination work as for `SimpleJob`, but
+    the exit code and exception are the ones reported for this job."""
+
+    worker: Optional[SpawnedWorker] = None
+    pool: Optional["WarmJobPool"] = None
+    _exit_code: Optional[int] = None
+    _recycle_worker: bool = False
+    _reported: bool = False
+
+    def _poll(self) -> None:
+        if self._reported or self.worker is None:
+            return
+
+        try:
+            if not self.worker.poll():
+                return
+            success, value = self.worker.recv()
+        except (EOFError, OSError):
+            return
+
+        self._reported = True
+        if success:
+            self._exit_code, self._exception, self._recycle_worker = value
+        else:
+            self._exit_code, self._exception = 255, value
+
+    @property
+    def exit_code(self) -> int | None:
+        self._poll()
+        if self._reported:
+            return self._exit_code
+        return super().exit_code
+
+    @property
+    def status(self) -> JobStatusType:
+        self._poll()
+        if self._reported:
+            return "finished" if self._exit_code == 0 else "error"
+
+        if not self.process:
+            return "pending"
+        if self.process.is_alive():
+            return "running"
+
+        # the worker died while running the job, the result might have been
+        # written right before it exited
+        self._poll()
+        if self._reported:
+            return "finished" if self._exit_code == 0 else "error"
+        if self.process.exitcode is None:
+            return "cancelled"
+        # a worker only exits cleanly after reporting, so this is an error as well
+        return "error"
+
+    def release(self) -> bool:
+        terminated = False
+        if not self.done():
+            terminated = super().release()
+
+        if self.pool is not None:
+            self.pool._return_worker(self)
+        return terminated
+
+    def exception(self) -> str:
+        self._poll()
+        if self._exception:
+            return self._exception
+
+        return f"Job with ID '{self.id}' did not report an exception."
+
+
+class WarmJobPool:
+    """Alternative to `SimpleJobClient` that runs jobs on long lived spawned
+    processes instead of spawning a new process for every job.
+
+    `size` idle workers are kept ready, with `preload_modules` already imported. A
+    worker runs one job at a time and is recycled (exits and gets replaced) after
+    `max_jobs_per_worker` jobs, or once its memory use exceeds `max_memory_mb` after
+    a job. A worker whose job is terminated is discarded. Thread safe, the pool is
+    shared by all the watchdog threads of the worker process."""
+
+    def __init__(
+        self,
+        size: int,
+        preload_modules: list[str],
+        max_jobs_per_worker: int = INDEXING_WARM_WORKER_MAX_ATTEMPTS,
+        max_memory_mb: int = INDEXING_WARM_WORKER_MAX_MEMORY_MB,
+    ) -> None:
+        self.size = size
+
+        self._lock = threading.Lock()
+        self._workers = SpawnedWorkerPool(
+            initializer=_init_warm_worker,
+            initializer_args=(preload_modules,),
+            max_tasks_per_worker=max_jobs_per_worker,
+            max_memory_mb=max_memory_mb,
+        )
+        self._busy: list[WarmJob] = []
+        self._job_id_counter = 0
+
+        self._workers.prestart(size)
+
+    def _reclaim_finished(self) -> list[WarmJob]:
+        """Finished jobs that were never released. Must be called with the lock
+        held."""
+        finished = [job for job in self._busy if job.done()]
+        for job in finished:
+            self._busy.remove(job)
+        return finished
+
+    def _release_job_worker(self, job: WarmJob) -> None:
+        if job.worker is not None:
+            self._workers.release(
+                job.worker, reusable=job._reported and not job._recycle_worker
+            )
+
+    def _return_worker(self, job: WarmJob) -> None:
+        with self._lock:
+            if job not in self._busy:
+                return
+            self._busy.remove(job)
+
+        self._release_job_worker(job)
+        self._workers.prestart(self.size)
+
+    def submit(self, func: Callable, *args: Any, pure: bool = True) -> WarmJob | None:
+        """Same interface as `SimpleJobClient.submit`, `func` must be picklable"""
+        with self._lock:
+            finished = self._reclaim_finished()
+        for finished_job in finished:
+            self._release_job_worker(finished_job)
+
+        # a cold worker is spawned if no warm one is available, the job just waits
+        # for it to be ready
+        worker = self._workers.acquire()
+        with self._lock:
+            job = WarmJob(
+                id=self._job_id_counter,
+                process=worker.process,
+                queue=None,
+                worker=worker,
+                pool=self,
+            )
+            self._job_id_counter += 1
+            self._busy.append(job)
+        worker.send(_run_warm_job, (func, args))
+
+        self._workers.prestart(self.size)
+        return job
+
+    def shutdown(self) -> None:
+        with self._lock:
+            busy = self._busy
+            self._busy = []
+
+        self._workers.shutdown()
+        for job in busy:
+            if job.worker is not None:
+                job.worker.kill()
+
+
+# imported by warm workers before they take any job. This pulls in the indexing
+# task and with it the connectors, tokenizers and the indexing pipeline
+_WARM_WORKER_PRELOAD_MODULES = ["onyx.background.celery.tasks.indexing.tasks"]
+
+_warm_job_pool: WarmJobPool | None = None
+_warm_job_pool_lock = threading.Lock()
+
+
+def get_warm_job_pool() -> WarmJobPool | None:
+    """Returns the process wide warm pool, or None if it is disabled
+    (INDEXING_WARM_WORKER_POOL_SIZE is 0)."""
+    global _warm_job_pool
+
+    if INDEXING_WARM_WORKER_POOL_SIZE <= 0:
+        return None
+
+    with _warm_job_pool_lock:
+        if _warm_job_pool is None:
+            _warm_job_pool = WarmJobPool(
+                size=INDEXING_WARM_WORKER_POOL_SIZE,
+                preload_modules=_WARM_WORKER_PRELOAD_MODULES,
+            )
+        return _warm_job_pool
+
+
+def shutdown_warm_job_pool() -> None:
+    global _warm_job_pool
+
+    with _warm_job_pool_lock:
+        if _warm_job_pool is not None:
+            _warm_job_pool.shutdown()
+            _warm_job_pool = None
@@ -1,6 +1,7 @@
 import time
 import traceback
 from collections import defaultdict
+from collections.abc import Generator
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
@@ -9,11 +10,12 @@ from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from onyx.access.access import source_should_fetch_permissions_during_indexing
-from onyx.background.indexing.checkpointing_utils import check_checkpoint_size
+from onyx.background.indexing.checkpointing_utils import CoalescingCheckpointSaver
 from onyx.background.indexing.checkpointing_utils import get_latest_valid_checkpoint
 from onyx.background.indexing.checkpointing_utils import save_checkpoint
 from onyx.background.indexing.memory_tracer import MemoryTracer
 from onyx.configs.app_configs import INDEX_BATCH_SIZE
+from onyx.configs.app_configs import INDEXING_CONNECTOR_PREFETCH_BATCHES
 from onyx.configs.app_configs import INDEXING_SIZE_WARNING_THRESHOLD
 from onyx.configs.app_configs import INDEXING_TRACER_INTERVAL
 from onyx.configs.app_configs import INTEGRATION_TESTS_MODE
@@ -25,6 +27,7 @@ from onyx.connectors.connector_runner import ConnectorRunner
 from onyx.connectors.exceptions import ConnectorValidationError
 from onyx.connectors.exceptions import UnexpectedValidationError
 from onyx.connectors.factory import instantiate_connector
+from onyx.connectors.models import ConnectorCheckpoint
 from onyx.connectors.models import ConnectorFailure
 from onyx.connectors.models import Document
 from onyx.connectors.models import IndexAttemptMetadata
@@ -65,6 +68,7 @@ from onyx.utils.middleware import make_randomized_onyx_request_id
 from onyx.utils.telemetry import create_milestone_and_report
 from onyx.utils.telemetry import optional_telemetry
 from onyx.utils.telemetry import RecordType
+from onyx.utils.threadpool_concurrency import prefetch_generator
 from onyx.utils.variable_functionality import global_version
 from shared_configs.configs import MULTI_TENANT
 
@@ -143,6 +147,35 @@ def _get_connector_runner(
     )
 
 
+def _run_connector_until_done(
+    connector_runner: ConnectorRunner,
+    checkpoint: ConnectorCheckpoint,
+    source: DocumentSource,
+    copy_checkpoints: bool = False,
+) -> Generator[
+    tuple[list[Document] | None, ConnectorFailure | None, ConnectorCheckpoint | None],
+    None,
+    None,
+]:
+    """Runs the connector from the given checkpoint until it has no more to give.
+    Every connector run ends with its new checkpoint, which is then used to start
+    the next run.
+
+    If `copy_checkpoints` is set, the yielded checkpoints are copies so that the
+    consumer can safely save them while the next run is already in progress."""
+    while checkpoint.has_more:
+        logger.info(f"Running '{source.value}' connector with checkpoint: {checkpoint}")
+        for document_batch, failure, next_checkpoint in connector_runner.run(
+            checkpoint
+        ):
+            if next_checkpoint:
+                checkpoint = next_checkpoint
+                if copy_checkpoints:
+                    next_checkpoint = next_checkpoint.model_copy(deep=True)
+
+            yield document_batch, failure, next_checkpoint
+
+
 def strip_null_characters(doc_batch: list[Document]) -> list[Document]:
     cleaned_batch = []
     for doc in doc_batch:
@@ -472,13 +505,24 @@ def _run_indexing(
                 error for error in unresolved_errors if error.entity_id
             ]
 
-        while checkpoint.has_more:
-            logger.info(
-                f"Running '{ctx.source.value}' connector with checkpoint: {checkpoint}"
+        connector_output = _run_connector_until_done(
+            connector_runner,
+            checkpoint,
+            source=ctx.source,
+            copy_checkpoints=INDEXING_CONNECTOR_PREFETCH_BATCHES > 0,
+        )
+        if INDEXING_CONNECTOR_PREFETCH_BATCHES > 0:
+            # fetch from the connector in a background thread while the current
+            # batch is being indexed. Outputs are still processed strictly in
+            # order, so a checkpoint is only saved after every batch that
+            # preceded it has been indexed.
+            connector_output = prefetch_generator(
+                connector_output, max_prefetch=INDEXING_CONNECTOR_PREFETCH_BATCHES
             )
-            for document_batch, failure, next_checkpoint in connector_runner.run(
-                checkpoint
-            ):
+
+        checkpoint_saver = CoalescingCheckpointSaver(index_attempt_id)
+        try:
+            for document_batch, failure, next_checkpoint in connector_output:
                 # Check if connector is disabled mid run and stop if so unless it's the secondary
                 # index being built. We want to populate it even for paused connectors
                 # Often paused connectors are sources that aren't updated frequently but the
@@ -514,9 +558,12 @@ def _run_indexing(
                         total_failures, document_count, batch_num, failure
                     )
 
-                # save the new checkpoint (if one is provided)
+                # a new checkpoint marks the end of a connector run, everything
+                # before it has been indexed so it is safe to save. Writes are
+                # coalesced, the saver also checks that the checkpoint isn't too large
                 if next_checkpoint:
                     checkpoint = next_checkpoint
+                    checkpoint_saver.update(checkpoint)
 
                 # below is all document processing logic, so if no batch we can just continue
                 if document_batch is None:
@@ -560,6 +607,7 @@ def _run_indexing(
                 )
 
                 batch_num += 1
+                checkpoint_saver.mark_batch_indexed()
                 net_doc_change += index_pipeline_result.new_docs
                 chunk_count += index_pipeline_result.total_chunks
                 document_count += index_pipeline_result.total_docs
@@ -635,18 +683,18 @@ def _run_indexing(
 
                 memory_tracer.increment_and_maybe_trace()
 
-            # `make sure the checkpoints aren't getting too large`at some regular interval
-            CHECKPOINT_SIZE_CHECK_INTERVAL = 100
-            if batch_num % CHECKPOINT_SIZE_CHECK_INTERVAL == 0:
-                check_checkpoint_size(checkpoint)
-
-            # save latest checkpoint
-            with get_session_with_current_tenant() as db_session_temp:
-                save_checkpoint(
-                    db_session=db_session_temp,
-                    index_attempt_id=index_attempt_id,
-                    checkpoint=checkpoint,
-                )
+            checkpoint_saver.flush()
+        except Exception:
+            # the latest checkpoint only covers batches that were fully indexed, so
+            # it is saved to let the next attempt resume from it
+            try:
+                checkpoint_saver.flush()
+            except Exception:
+                logger.exception("Failed to save the latest checkpoint")
+            raise
+        finally:
+            # stops the prefetching thread (if any) when exiting early
+            connector_output.close()
 
         optional_telemetry(
             record_type=RecordType.INDEXING_COMPLETE,
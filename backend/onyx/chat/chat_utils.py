@@ -23,7 +23,7 @@ from onyx.context.search.models import InferenceSection
 from onyx.context.search.models import RerankingDetails
 from onyx.context.search.models import RetrievalDetails
 from onyx.db.chat import create_chat_session
-from onyx.db.chat import get_chat_messages_by_session
+from onyx.db.chat import get_mainline_chat_messages
 from onyx.db.kg_config import get_kg_config_settings
 from onyx.db.kg_config import is_kg_config_settings_enabled_valid
 from onyx.db.llm import fetch_existing_doc_sets
@@ -158,47 +158,35 @@ def create_chat_chain(
     prefetch_tool_calls: bool = True,
     # Optional id at which we finish processing
     stop_at_message_id: int | None = None,
+    # Optional cap on the number of history messages returned (the most recent ones)
+    max_history_messages: int | None = None,
 ) -> tuple[ChatMessage, list[ChatMessage]]:
     """Build the linear chain of messages without including the root message"""
     mainline_messages: list[ChatMessage] = []
 
-    all_chat_messages = get_chat_messages_by_session(
+    chain_messages = get_mainline_chat_messages(
         chat_session_id=chat_session_id,
-        user_id=None,
         db_session=db_session,
-        skip_permission_check=True,
         prefetch_tool_calls=prefetch_tool_calls,
+        stop_at_message_id=stop_at_message_id,
+        # consecutive assistant messages (refined answers) collapse into one, so
+        # load enough rows to still fill the history after collapsing
+        max_messages=(
+            2 * (max_history_messages + 1) if max_history_messages is not None else None
+        ),
     )
-    id_to_msg = {msg.id: msg for msg in all_chat_messages}
 
-    if not all_chat_messages:
+    if not chain_messages:
         raise RuntimeError("No messages in Chat Session")
 
-    root_message = all_chat_messages[0]
+    root_message = chain_messages[0]
     if root_message.parent_message is not None:
         raise RuntimeError(
             "Invalid root message, unable to fetch valid chat message sequence"
         )
 
-    current_message: ChatMessage | None = root_message
     previous_message: ChatMessage | None = None
-    while current_message is not None:
-        child_msg = current_message.latest_child_message
-
-        # Break if at the end of the chain
-        # or have reached the `final_id` of the submitted message
-        if not child_msg or (
-            stop_at_message_id and current_message.id == stop_at_message_id
-        ):
-            break
-        current_message = id_to_msg.get(child_msg)
-
-        if current_message is None:
-            raise RuntimeError(
-                "Invalid message chain,"
-                "could not find next message in the same session"
-            )
-
+    for current_message in chain_messages[1:]:
         if (
             current_message.message_type == MessageType.ASSISTANT
             and previous_message is not None
@@ -215,7 +203,13 @@ def create_chat_chain(
     if not mainline_messages:
         raise RuntimeError("Could not trace chat message history")
 
-    return mainline_messages[-1], mainline_messages[:-1]
+    history_messages = mainline_messages[:-1]
+    if max_history_messages is not None:
+        history_messages = history_messages[
+            max(0, len(history_messages) - max_history_messages) :
+        ]
+
+    return mainline_messages[-1], history_messages
 
 
 def combine_message_chain(
@@ -17,6 +17,44 @@ def in_code_block(llm_text: str) -> bool:
     return count % 2 != 0
 
 
+class CodeFenceTracker:
+    """Incrementally tracks whether streamed text is inside a code block.
+
+    Equivalent to calling `in_code_block` on the concatenation of everything fed
+    so far, but O(len(token)) per token instead of O(len(text)). Since the fence
+    is made of a single repeated character, `str.count` finds `len(run) // 3`
+    fences in every maximal run of backticks, so only the length of the run at
+    the end of the text needs to be carried over to the next token.
+    """
+
+    def __init__(self) -> None:
+        self.fence_count = 0  # fences in backtick runs that have ended
+        self.trailing_backticks = 0  # length of the backtick run at the end
+
+    def feed(self, token: str) -> None:
+        if not token:
+            return
+
+        stripped = token.lstrip("`")
+        if not stripped:
+            self.trailing_backticks += len(token)
+            return
+
+        # the run at the end of the previous text is closed by this token
+        leading_backticks = len(token) - len(stripped)
+        self.fence_count += (self.trailing_backticks + leading_backticks) // 3
+
+        # the middle starts and ends with a non-backtick, so its runs are complete
+        middle = stripped.rstrip("`")
+        self.fence_count += middle.count(TRIPLE_BACKTICK)
+        self.trailing_backticks = len(stripped) - len(middle)
+
+    @property
+    def in_code_block(self) -> bool:
+        count = self.fence_count + self.trailing_backticks // 3
+        return count % 2 != 0
+
+
 class CitationProcessor:
     def __init__(
         self,
@@ -31,7 +69,7 @@ class CitationProcessor:
         self.max_citation_num = len(context_docs)
         self.stop_stream = stop_stream
 
-        self.llm_out = ""  # entire output so far
+        self.code_fence_tracker = CodeFenceTracker()  # code blocks in the output so far
         self.curr_segment = ""  # tokens held for citation processing
         self.hold = ""  # tokens held for stop token processing
 
@@ -65,7 +103,7 @@ class CitationProcessor:
             self.hold = ""
 
         self.curr_segment += token
-        self.llm_out += token
+        self.code_fence_tracker.feed(token)
 
         # Handle code blocks without language tags
         if "`" in self.curr_segment:
@@ -73,7 +111,10 @@ class CitationProcessor:
                 pass
             elif "```" in self.curr_segment:
                 piece_that_comes_after = self.curr_segment.split("```")[1][0]
-                if piece_that_comes_after == "\n" and in_code_block(self.llm_out):
+                if (
+                    piece_that_comes_after == "\n"
+                    and self.code_fence_tracker.in_code_block
+                ):
                     self.curr_segment = self.curr_segment.replace("```", "```plaintext")
 
         citation_matches = list(self.citation_pattern.finditer(self.curr_segment))
@@ -82,7 +123,7 @@ class CitationProcessor:
         )
 
         result = ""
-        if citation_matches and not in_code_block(self.llm_out):
+        if citation_matches and not self.code_fence_tracker.in_code_block:
             match_idx = 0
             for match in citation_matches:
                 match_span = match.span()
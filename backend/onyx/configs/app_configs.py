@@ -273,6 +273,19 @@ REDIS_POOL_MAX_CONNECTIONS = int(os.environ.get("REDIS_POOL_MAX_CONNECTIONS", 12
 REDIS_SSL_CERT_REQS = os.getenv("REDIS_SSL_CERT_REQS", "none")
 REDIS_SSL_CA_CERTS = os.getenv("REDIS_SSL_CA_CERTS", None)
 
+# Keep recently loaded key-value store entries in process memory in front of Redis.
+# Entries are dropped after KV_STORE_LOCAL_CACHE_TTL_SECONDS or as soon as another
+# process stores / deletes the key (via Redis pub/sub), whichever comes first.
+ENABLE_KV_STORE_LOCAL_CACHE = (
+    os.environ.get("ENABLE_KV_STORE_LOCAL_CACHE", "").lower() == "true"
+)
+KV_STORE_LOCAL_CACHE_TTL_SECONDS = int(
+    os.environ.get("KV_STORE_LOCAL_CACHE_TTL_SECONDS") or 60
+)
+KV_STORE_LOCAL_CACHE_MAX_ENTRIES = int(
+    os.environ.get("KV_STORE_LOCAL_CACHE_MAX_ENTRIES") or 1000
+)
+
 CELERY_RESULT_EXPIRES = int(os.environ.get("CELERY_RESULT_EXPIRES", 86400))  # seconds
 
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#broker-pool-limit
@@ -328,6 +341,17 @@ CELERY_WORKER_KG_PROCESSING_CONCURRENCY = int(
 # The maximum number of tasks that can be queued up to sync to Vespa in a single pass
 VESPA_SYNC_MAX_TASKS = 1024
 
+# Number of documents synced to Vespa by a single vespa_metadata_sync_batch_task.
+# Document set, user group and stale document syncs are split into tasks of this
+# many documents, each counting as one task in the taskset / fence accounting
+VESPA_SYNC_BATCH_SIZE = int(os.environ.get("VESPA_SYNC_BATCH_SIZE") or 64)
+# Number of documents of a sync or cleanup batch that are updated in Vespa concurrently
+VESPA_SYNC_BATCH_NUM_THREADS = int(os.environ.get("VESPA_SYNC_BATCH_NUM_THREADS") or 8)
+
+# Number of documents cleaned up by a single document_by_cc_pair_cleanup_batch_task
+# during connector deletion and pruning
+DOCUMENT_CLEANUP_BATCH_SIZE = int(os.environ.get("DOCUMENT_CLEANUP_BATCH_SIZE") or 64)
+
 DB_YIELD_PER_DEFAULT = 64
 
 #####
@@ -369,6 +393,30 @@ NOTION_CONNECTOR_DISABLE_RECURSIVE_PAGE_LOOKUP = (
     == "true"
 )
 
+# Files downloaded by connectors (pdf, docx, xlsx, ...) can be parsed in a pool of
+# FILE_EXTRACTION_PROCESS_POOL_SIZE processes instead of in the indexing process itself
+# (0 parses files inline). Each file (or range of PDF pages) is killed if it takes more
+# than FILE_EXTRACTION_TIMEOUT_SECONDS or if the worker's RSS grows past
+# FILE_EXTRACTION_MAX_MEMORY_MB (0 disables either limit).
+FILE_EXTRACTION_PROCESS_POOL_SIZE = int(
+    os.environ.get("FILE_EXTRACTION_PROCESS_POOL_SIZE") or 0
+)
+FILE_EXTRACTION_TIMEOUT_SECONDS = float(
+    os.environ.get("FILE_EXTRACTION_TIMEOUT_SECONDS") or 300
+)
+FILE_EXTRACTION_MAX_MEMORY_MB = int(
+    os.environ.get("FILE_EXTRACTION_MAX_MEMORY_MB") or 2048
+)
+# Workers are replaced after this many files to bound leaks in the parsers
+FILE_EXTRACTION_MAX_TASKS_PER_WORKER = int(
+    os.environ.get("FILE_EXTRACTION_MAX_TASKS_PER_WORKER") or 100
+)
+# PDFs with more pages than this are split into ranges that are parsed in parallel
+# (0 parses PDFs as a whole)
+FILE_EXTRACTION_PDF_PAGES_PER_TASK = int(
+    os.environ.get("FILE_EXTRACTION_PDF_PAGES_PER_TASK") or 50
+)
+
 
 #####
 # Confluence Connector Configs
@@ -547,6 +595,21 @@ LARGE_CHUNK_RATIO = 4
 # Include the document level metadata in each chunk. If the metadata is too long, then it is thrown out
 # We don't want the metadata to overwhelm the actual contents of the chunk
 SKIP_METADATA_IN_CHUNK = os.environ.get("SKIP_METADATA_IN_CHUNK", "").lower() == "true"
+# Number of idle, already initialized processes the indexing worker keeps ready to run
+# index attempts, instead of spawning a new process for every attempt. Each process is
+# reused for up to INDEXING_WARM_WORKER_MAX_ATTEMPTS attempts, or until its memory use
+# exceeds INDEXING_WARM_WORKER_MAX_MEMORY_MB after an attempt (0 disables either
+# limit). 0 disables the pool and every attempt gets its own process.
+INDEXING_WARM_WORKER_POOL_SIZE = int(
+    os.environ.get("INDEXING_WARM_WORKER_POOL_SIZE") or 0
+)
+INDEXING_WARM_WORKER_MAX_ATTEMPTS = int(
+    os.environ.get("INDEXING_WARM_WORKER_MAX_ATTEMPTS") or 20
+)
+INDEXING_WARM_WORKER_MAX_MEMORY_MB = int(
+    os.environ.get("INDEXING_WARM_WORKER_MAX_MEMORY_MB") or 2048
+)
+
 # Timeout to wait for job's last update before killing it, in hours
 CLEANUP_INDEXING_JOBS_TIMEOUT = int(
     os.environ.get("CLEANUP_INDEXING_JOBS_TIMEOUT") or 3
@@ -561,6 +624,30 @@ INDEXING_SIZE_WARNING_THRESHOLD = int(
 # 0 disables this behavior and is the default.
 INDEXING_TRACER_INTERVAL = int(os.environ.get("INDEXING_TRACER_INTERVAL") or 0)
 
+# Number of connector outputs (document batches / failures / checkpoints) to fetch
+# ahead of the indexing pipeline in a background thread, so that connector I/O
+# overlaps with embedding and writing to the document index. 0 disables prefetching
+# and runs the connector and the pipeline sequentially.
+INDEXING_CONNECTOR_PREFETCH_BATCHES = int(
+    os.environ.get("INDEXING_CONNECTOR_PREFETCH_BATCHES") or 0
+)
+
+# Checkpoint writes during indexing are coalesced: the latest checkpoint is written at
+# most once every INDEXING_CHECKPOINT_SAVE_INTERVAL_SECONDS, unless
+# INDEXING_CHECKPOINT_SAVE_MAX_BATCHES document batches were indexed since the last
+# write. The latest checkpoint is always written when the run ends. Setting the
+# interval to 0 writes every checkpoint.
+INDEXING_CHECKPOINT_SAVE_INTERVAL_SECONDS = float(
+    os.environ.get("INDEXING_CHECKPOINT_SAVE_INTERVAL_SECONDS") or 30
+)
+INDEXING_CHECKPOINT_SAVE_MAX_BATCHES = int(
+    os.environ.get("INDEXING_CHECKPOINT_SAVE_MAX_BATCHES") or 10
+)
+# gzip level used for stored checkpoints (1 is fastest, 9 is smallest)
+INDEXING_CHECKPOINT_COMPRESSION_LEVEL = int(
+    os.environ.get("INDEXING_CHECKPOINT_COMPRESSION_LEVEL") or 3
+)
+
 # Enable multi-threaded embedding model calls for parallel processing
 # Note: only applies for API-based embedding models
 INDEXING_EMBEDDING_MODEL_NUM_THREADS = int(
@@ -571,6 +658,47 @@ INDEXING_EMBEDDING_MODEL_NUM_THREADS = int(
 # exception without aborting the attempt.
 INDEXING_EXCEPTION_LIMIT = int(os.environ.get("INDEXING_EXCEPTION_LIMIT") or 0)
 
+# Cache passage embeddings by content hash so that re-indexing unchanged chunks
+# does not go back to the model server. Entries live in Redis for
+# EMBEDDING_CACHE_TTL_SECONDS and the most recent EMBEDDING_CACHE_LOCAL_MAX_ENTRIES
+# are also kept in process memory.
+ENABLE_EMBEDDING_CACHE = os.environ.get("ENABLE_EMBEDDING_CACHE", "").lower() == "true"
+EMBEDDING_CACHE_TTL_SECONDS = int(
+    os.environ.get("EMBEDDING_CACHE_TTL_SECONDS") or 60 * 60 * 24 * 7
+)
+EMBEDDING_CACHE_LOCAL_MAX_ENTRIES = int(
+    os.environ.get("EMBEDDING_CACHE_LOCAL_MAX_ENTRIES") or 10_000
+)
+
+# Same as above for search query embeddings, so repeated queries (Slack follow ups,
+# agent sub-queries, starter messages, ...) skip the model server. Entries are keyed
+# by the embedding settings of the current search settings, so switching models or
+# prefixes never serves stale vectors.
+ENABLE_QUERY_EMBEDDING_CACHE = (
+    os.environ.get("ENABLE_QUERY_EMBEDDING_CACHE", "").lower() == "true"
+)
+QUERY_EMBEDDING_CACHE_TTL_SECONDS = int(
+    os.environ.get("QUERY_EMBEDDING_CACHE_TTL_SECONDS") or 60 * 60 * 24
+)
+QUERY_EMBEDDING_CACHE_LOCAL_MAX_ENTRIES = int(
+    os.environ.get("QUERY_EMBEDDING_CACHE_LOCAL_MAX_ENTRIES") or 2_000
+)
+# Number of embedding configurations (e.g. tenants with different models or
+# prefixes) whose in-process query caches are kept, least recently used go first
+QUERY_EMBEDDING_CACHE_MAX_NAMESPACES = int(
+    os.environ.get("QUERY_EMBEDDING_CACHE_MAX_NAMESPACES") or 8
+)
+
+# Cache the user group / external group part of each user's ACL (used to build the
+# search filters) in process memory and Redis. Entries are dropped as soon as group
+# membership changes through the user group APIs or an external group sync, the TTL
+# only bounds staleness for changes made outside of those paths.
+ENABLE_USER_ACL_CACHE = os.environ.get("ENABLE_USER_ACL_CACHE", "").lower() == "true"
+USER_ACL_CACHE_TTL_SECONDS = int(os.environ.get("USER_ACL_CACHE_TTL_SECONDS") or 300)
+USER_ACL_CACHE_LOCAL_MAX_ENTRIES = int(
+    os.environ.get("USER_ACL_CACHE_LOCAL_MAX_ENTRIES") or 10_000
+)
+
 # Maximum file size in a document to be indexed
 MAX_DOCUMENT_CHARS = int(os.environ.get("MAX_DOCUMENT_CHARS") or 5_000_000)
 MAX_FILE_SIZE_BYTES = int(
@@ -581,6 +709,11 @@ MAX_FILE_SIZE_BYTES = int(
 USE_DOCUMENT_SUMMARY = os.environ.get("USE_DOCUMENT_SUMMARY", "true").lower() == "true"
 # Use chunk summary for contextual rag
 USE_CHUNK_SUMMARY = os.environ.get("USE_CHUNK_SUMMARY", "true").lower() == "true"
+# Max number of contextual rag LLM calls in flight at once, across all documents of
+# an indexing batch
+CONTEXTUAL_RAG_MAX_CONCURRENT_LLM_CALLS = int(
+    os.environ.get("CONTEXTUAL_RAG_MAX_CONCURRENT_LLM_CALLS") or 16
+)
 # Average summary embeddings for contextual rag (not yet implemented)
 AVERAGE_SUMMARY_EMBEDDINGS = (
     os.environ.get("AVERAGE_SUMMARY_EMBEDDINGS", "false").lower() == "true"
@@ -633,6 +766,32 @@ CUSTOM_ANSWER_VALIDITY_CONDITIONS = json.loads(
 
 VESPA_REQUEST_TIMEOUT = int(os.environ.get("VESPA_REQUEST_TIMEOUT") or "15")
 
+# Limits of the pooled client used for Vespa queries (search and visit requests).
+# Idle connections are kept alive for VESPA_QUERY_KEEPALIVE_EXPIRY seconds so that
+# consecutive queries don't pay for connection (and TLS) setup
+VESPA_QUERY_MAX_CONNECTIONS = int(os.environ.get("VESPA_QUERY_MAX_CONNECTIONS") or 100)
+VESPA_QUERY_MAX_KEEPALIVE_CONNECTIONS = int(
+    os.environ.get("VESPA_QUERY_MAX_KEEPALIVE_CONNECTIONS") or 20
+)
+VESPA_QUERY_KEEPALIVE_EXPIRY = float(
+    os.environ.get("VESPA_QUERY_KEEPALIVE_EXPIRY") or 60
+)
+
+# Max number of id based batch search queries (e.g. for section expansion) sent to
+# Vespa concurrently for a single retrieval
+VESPA_BATCH_SEARCH_MAX_CONCURRENCY = int(
+    os.environ.get("VESPA_BATCH_SEARCH_MAX_CONCURRENCY") or 8
+)
+# Chunks fetched by id based batch search are cached in process for this many seconds
+# so that repeated expansions of the same documents skip Vespa. Entries are keyed by
+# the query filters (incl. the user's ACL) as well. 0 disables the cache.
+VESPA_ID_CHUNK_CACHE_TTL_SECONDS = float(
+    os.environ.get("VESPA_ID_CHUNK_CACHE_TTL_SECONDS") or 30
+)
+VESPA_ID_CHUNK_CACHE_MAX_ENTRIES = int(
+    os.environ.get("VESPA_ID_CHUNK_CACHE_MAX_ENTRIES") or 10_000
+)
+
 SYSTEM_RECURSION_LIMIT = int(os.environ.get("SYSTEM_RECURSION_LIMIT") or "1000")
 
 PARSE_WITH_TRAFILATURA = os.environ.get("PARSE_WITH_TRAFILATURA", "").lower() == "true"
@@ -765,6 +924,17 @@ IMAGE_SUMMARIZATION_USER_PROMPT = os.environ.get(
     DEFAULT_IMAGE_SUMMARIZATION_USER_PROMPT,
 )
 
+# Max number of images of an indexing batch that are read and summarized at once
+IMAGE_SUMMARIZATION_MAX_CONCURRENCY = int(
+    os.environ.get("IMAGE_SUMMARIZATION_MAX_CONCURRENCY") or 8
+)
+
+# Cached LLM results of indexing (e.g. image summaries) are deleted this many days
+# after they were stored, 0 keeps them forever
+LLM_RESULT_CACHE_RETENTION_DAYS = int(
+    os.environ.get("LLM_RESULT_CACHE_RETENTION_DAYS") or 30
+)
+
 IMAGE_ANALYSIS_SYSTEM_PROMPT = os.environ.get(
     "IMAGE_ANALYSIS_SYSTEM_PROMPT",
     DEFAULT_IMAGE_ANALYSIS_SYSTEM_PROMPT,
@@ -793,6 +963,18 @@ S3_VERIFY_SSL = os.environ.get("S3_VERIFY_SSL", "").lower() == "true"
 S3_AWS_ACCESS_KEY_ID = os.environ.get("S3_AWS_ACCESS_KEY_ID")
 S3_AWS_SECRET_ACCESS_KEY = os.environ.get("S3_AWS_SECRET_ACCESS_KEY")
 
+# Files at least this large are uploaded with multipart uploads and downloaded in
+# chunks (spilling to disk) instead of being held in memory in full
+FILE_STORE_STREAMING_THRESHOLD_BYTES = int(
+    os.environ.get("FILE_STORE_STREAMING_THRESHOLD_BYTES") or 16 * 1024 * 1024
+)
+# Part size for multipart uploads and chunk size for streamed downloads.
+# S3 requires parts of at least 5 MiB.
+FILE_STORE_MULTIPART_CHUNK_SIZE_BYTES = max(
+    int(os.environ.get("FILE_STORE_MULTIPART_CHUNK_SIZE_BYTES") or 8 * 1024 * 1024),
+    5 * 1024 * 1024,
+)
+
 # Forcing Vespa Language
 # English: en, German:de, etc. See: https://docs.vespa.ai/en/linguistics.html
 VESPA_LANGUAGE_OVERRIDE = os.environ.get("VESPA_LANGUAGE_OVERRIDE")
@@ -46,6 +46,12 @@ EMBEDDING_BATCH_SIZE = int(os.environ.get("EMBEDDING_BATCH_SIZE") or 0) or None
 BATCH_SIZE_ENCODE_CHUNKS = EMBEDDING_BATCH_SIZE or 8
 # don't send over too many chunks at once, as sending too many could cause timeouts
 BATCH_SIZE_ENCODE_CHUNKS_FOR_API_EMBEDDING_SERVICES = EMBEDDING_BATCH_SIZE or 512
+# How embeddings are sent back from the model server: "float32" and "float16" use a
+# raw binary buffer (float16 halves the size at some precision loss), "json" sends
+# float lists. Model servers that don't support the binary formats answer in JSON
+EMBEDDING_TRANSPORT_FORMAT = (
+    os.environ.get("EMBEDDING_TRANSPORT_FORMAT") or "float32"
+).lower()
 # For score display purposes, only way is to know the expected ranges
 CROSS_ENCODER_RANGE_MAX = 1
 CROSS_ENCODER_RANGE_MIN = 0
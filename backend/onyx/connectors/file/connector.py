@@ -1,6 +1,7 @@
 import os
 from datetime import datetime
 from datetime import timezone
+from io import BytesIO
 from pathlib import Path
 from typing import Any
 from typing import IO
@@ -19,12 +20,18 @@ from onyx.connectors.models import Document
 from onyx.connectors.models import ImageSection
 from onyx.connectors.models import TextSection
 from onyx.db.engine.sql_engine import get_session_with_current_tenant
-from onyx.file_processing.extract_file_text import extract_text_and_images
+from onyx.file_processing.extract_file_text import ExtractionResult
 from onyx.file_processing.extract_file_text import get_file_ext
 from onyx.file_processing.extract_file_text import is_accepted_file_ext
 from onyx.file_processing.extract_file_text import OnyxExtensionType
+from onyx.file_processing.extraction_executor import batch_extract_text_and_images
+from onyx.file_processing.extraction_executor import (
+    extract_text_and_images_sandboxed,
+)
+from onyx.file_processing.extraction_executor import ExtractionInput
 from onyx.file_processing.image_utils import store_image_and_create_section
 from onyx.file_store.file_store import get_default_file_store
+from onyx.utils.batching import batch_generator
 from onyx.utils.logger import setup_logger
 
 logger = setup_logger()
@@ -71,6 +78,15 @@ def _create_image_section(
         raise e
 
 
+def _needs_text_extraction(file_name: str) -> bool:
+    """Whether _process_file extracts the text (and embedded images) of the file"""
+    extension = get_file_ext(file_name)
+    return (
+        is_accepted_file_ext(extension, OnyxExtensionType.All)
+        and extension not in LoadConnector.IMAGE_EXTENSIONS
+    )
+
+
 def _process_file(
     file_id: str,
     file_name: str,
@@ -78,11 +94,13 @@ def _process_file(
     metadata: dict[str, Any] | None,
     pdf_pass: str | None,
     db_session: Session,
+    extraction_result: ExtractionResult | None = None,
 ) -> list[Document]:
     """
     Process a file and return a list of Documents.
     For images, creates ImageSection objects without summarization.
     For documents with embedded images, extracts and stores the images.
+    `extraction_result` can be passed if the file was already extracted.
     """
     if metadata is None:
         metadata = {}
@@ -148,14 +166,15 @@ def _process_file(
             return []
 
     # 2) Otherwise: text-based approach. Possibly with embedded images.
-    file.seek(0)
-
-    # Extract text and images from the file
-    extraction_result = extract_text_and_images(
-        file=file,
-        file_name=file_name,
-        pdf_pass=pdf_pass,
-    )
+    if extraction_result is None:
+        file.seek(0)
+
+        # Extract text and images from the file
+        extraction_result = extract_text_and_images_sandboxed(
+            file=file,
+            file_name=file_name,
+            pdf_pass=pdf_pass,
+        )
 
     # Each file may have file-specific ONYX_METADATA https://docs.onyx.app/connectors/file
     # If so, we should add it to any metadata processed so far
@@ -261,32 +280,61 @@ class LocalFileConnector(LoadConnector):
         documents: list[Document] = []
 
         with get_session_with_current_tenant() as db_session:
-            for file_id in self.file_locations:
-                file_store = get_default_file_store(db_session)
-                file_record = file_store.read_file_record(file_id=file_id)
-                if not file_record:
-                    # typically an unsupported extension
-                    logger.warning(
-                        f"No file record found for '{file_id}' in PG; skipping."
+            file_store = get_default_file_store(db_session)
+            for file_ids in batch_generator(self.file_locations, self.batch_size):
+                # (file_id, file_name, content)
+                files: list[tuple[str, str, bytes]] = []
+                for file_id in file_ids:
+                    file_record = file_store.read_file_record(file_id=file_id)
+                    if not file_record:
+                        # typically an unsupported extension
+                        logger.warning(
+                            f"No file record found for '{file_id}' in PG; skipping."
+                        )
+                        continue
+
+                    file_io = file_store.read_file(file_id=file_id, mode="b")
+                    files.append((file_id, file_record.display_name, file_io.read()))
+
+                # the text based files of the batch are extracted together so they
+                # can be parsed in parallel by the extraction process pool
+                to_extract = [
+                    ind
+                    for ind, (_, file_name, _) in enumerate(files)
+                    if _needs_text_extraction(file_name)
+                ]
+                extraction_results = dict(
+                    zip(
+                        to_extract,
+                        batch_extract_text_and_images(
+                            [
+                                ExtractionInput(
+                                    content=files[ind][2],
+                                    file_name=files[ind][1],
+                                    pdf_pass=self.pdf_pass,
+                                )
+                                for ind in to_extract
+                            ]
+                        ),
                     )
-                    continue
-
-                metadata = self._get_file_metadata(file_id)
-                file_io = file_store.read_file(file_id=file_id, mode="b")
-                new_docs = _process_file(
-                    file_id=file_id,
-                    file_name=file_record.display_name,
-                    file=file_io,
-                    metadata=metadata,
-                    pdf_pass=self.pdf_pass,
-                    db_session=db_session,
                 )
-                documents.extend(new_docs)
 
-                if len(documents) >= self.batch_size:
-                    yield documents
+                for ind, (file_id, file_name, content) in enumerate(files):
+                    new_docs = _process_file(
+                        file_id=file_id,
+                        file_name=file_name,
+                        file=BytesIO(content),
+                        metadata=self._get_file_metadata(file_id),
+                        pdf_pass=self.pdf_pass,
+                        db_session=db_session,
+                        extraction_result=extraction_results.get(ind),
+                    )
+                    documents.extend(new_docs)
+
+                    if len(documents) >= self.batch_size:
+                        yield documents
 
-                    documents = []
+                        documents = []
 
             if documents:
                 yield documents
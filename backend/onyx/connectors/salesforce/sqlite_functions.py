@@ -3,6 +3,7 @@ import json
 import os
 import sqlite3
 import time
+from collections import defaultdict
 from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
@@ -15,6 +16,15 @@ from shared_configs.utils import batch_list
 
 logger = setup_logger()
 
+# SQLite typically has a limit of 999 variables
+SQLITE_MAX_VARIABLES = 500
+
+# rows normalized and written per executemany / commit in update_from_csv
+UPDATE_FROM_CSV_BATCH_SIZE = 10_000
+
+# cache size used while bulk loading, in KB
+SALESFORCE_SQLITE_CACHE_SIZE_KB = 2_000_000  # 2GB, same as at db creation
+
 
 class OnyxSalesforceSQLite:
     """Notes on context management using 'with self.conn':
@@ -512,16 +522,39 @@ class OnyxSalesforceSQLite:
 
         return record, parent_ids
 
+    def _apply_bulk_load_pragmas(self) -> None:
+        """Tunes the connection for large writes. WAL is persistent, the rest of the
+        pragmas only apply to this connection. Must not be called while a
+        transaction is open."""
+        if self._conn is None:
+            raise RuntimeError("Database connection is closed")
+
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # with WAL, NORMAL only risks losing the last commits on power loss, which
+        # is fine for a cache that gets rebuilt from Salesforce anyway
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute(f"PRAGMA cache_size=-{SALESFORCE_SQLITE_CACHE_SIZE_KB}")
+
     def update_from_csv(
-        self, object_type: str, csv_download_path: str, remove_ids: bool = True
+        self,
+        object_type: str,
+        csv_download_path: str,
+        remove_ids: bool = True,
+        batch_size: int = UPDATE_FROM_CSV_BATCH_SIZE,
     ) -> list[str]:
-        """Update the SF DB with a CSV file using SQLite storage."""
+        """Update the SF DB with a CSV file using SQLite storage.
+
+        Rows are normalized and written in batches of batch_size, with one
+        executemany per table per batch and a commit after each batch."""
         if self._conn is None:
             raise RuntimeError("Database connection is closed")
 
         # some customers need this to be larger than the default 128KB, go with 16MB
         csv.field_size_limit(16 * 1024 * 1024)
 
+        self._apply_bulk_load_pragmas()
+
         updated_ids = []
 
         with self._conn:
@@ -529,7 +562,11 @@ class OnyxSalesforceSQLite:
 
             with open(csv_download_path, "r", newline="", encoding="utf-8") as f:
                 reader = csv.DictReader(f)
-                uncommitted_rows = 0
+
+                # child id -> parent ids, later rows for the same id win
+                object_rows: list[tuple[str, str, str]] = []
+                child_to_parent_ids: dict[str, set[str]] = {}
+                wrote_partial_batch = False
                 for row in reader:
                     if "Id" not in row:
                         logger.warning(
@@ -542,29 +579,34 @@ class OnyxSalesforceSQLite:
                     normalized_record, parent_ids = (
                         OnyxSalesforceSQLite.normalize_record(row, remove_ids)
                     )
-                    normalized_record_json_str = json.dumps(normalized_record)
-
-                    # Update main object data
                     # NOTE(rkuo): looks like we take a list and dump it as json into the db
-                    cursor.execute(
-                        """
-                        INSERT OR REPLACE INTO salesforce_objects (id, object_type, data)
-                        VALUES (?, ?, ?)
-                        """,
-                        (row_id, object_type, normalized_record_json_str),
-                    )
-
-                    # Update relationships using the same connection
-                    OnyxSalesforceSQLite._update_relationship_tables(
-                        cursor, row_id, parent_ids
+                    object_rows.append(
+                        (row_id, object_type, json.dumps(normalized_record))
                     )
+                    child_to_parent_ids[row_id] = parent_ids
                     updated_ids.append(row_id)
 
                     # periodically commit or else memory will balloon
-                    uncommitted_rows += 1
-                    if uncommitted_rows >= 1024:
+                    if len(object_rows) >= batch_size:
+                        OnyxSalesforceSQLite._write_batch(
+                            cursor, object_rows, child_to_parent_ids
+                        )
                         self._conn.commit()
-                        uncommitted_rows = 0
+                        object_rows = []
+                        child_to_parent_ids = {}
+                        wrote_partial_batch = True
+
+                if object_rows:
+                    OnyxSalesforceSQLite._write_batch(
+                        cursor, object_rows, child_to_parent_ids
+                    )
+
+                # a parent in a later batch than its child didn't exist yet when the
+                # child's relationships were written, so its type is filled in now
+                if wrote_partial_batch:
+                    OnyxSalesforceSQLite._add_missing_relationship_types(
+                        cursor, updated_ids
+                    )
 
             # If we're updating User objects, update the email map
             if object_type == "User":
@@ -572,6 +614,25 @@ class OnyxSalesforceSQLite:
 
         return updated_ids
 
+    @staticmethod
+    def _write_batch(
+        cursor: sqlite3.Cursor,
+        object_rows: list[tuple[str, str, str]],
+        child_to_parent_ids: dict[str, set[str]],
+    ) -> None:
+        """Writes a batch of (id, object_type, data) rows and replaces the
+        relationships of each child with the given parent ids."""
+        cursor.executemany(
+            """
+            INSERT OR REPLACE INTO salesforce_objects (id, object_type, data)
+            VALUES (?, ?, ?)
+            """,
+            object_rows,
+        )
+        OnyxSalesforceSQLite._bulk_update_relationship_tables(
+            cursor, child_to_parent_ids
+        )
+
     def get_child_ids(self, parent_id: str) -> set[str]:
         """Get all child IDs for a given parent ID."""
         if self._conn is None:
@@ -672,72 +733,126 @@ class OnyxSalesforceSQLite:
             return [row[0] for row in cursor.fetchall()]
 
     @staticmethod
-    def _update_relationship_tables(
-        cursor: sqlite3.Cursor, child_id: str, parent_ids: set[str]
+    def _bulk_update_relationship_tables(
+        cursor: sqlite3.Cursor, child_to_parent_ids: dict[str, set[str]]
     ) -> None:
-        """Given a child id and a set of parent id's, updates the
-        relationships of the child to the parents in the db and removes old relationships.
+        """Given a map of child id to parent ids, updates the relationships of the
+        children to the parents in the db and removes old relationships.
 
         Args:
-            conn: The database connection to use (must be in a transaction)
-            child_id: The ID of the child record
-            parent_ids: Set of parent IDs to link to
+            cursor: The cursor to use (must be in a transaction)
+            child_to_parent_ids: Map of child ID to the set of parent IDs to link to
         """
+        if not child_to_parent_ids:
+            return
 
         try:
             # Get existing parent IDs
-            cursor.execute(
-                "SELECT parent_id FROM relationships WHERE child_id = ?", (child_id,)
-            )
-            old_parent_ids = {row[0] for row in cursor.fetchall()}
+            old_parent_ids: dict[str, set[str]] = defaultdict(set)
+            for child_ids in batch_list(
+                list(child_to_parent_ids), SQLITE_MAX_VARIABLES
+            ):
+                id_placeholders = ",".join(["?" for _ in child_ids])
+                cursor.execute(
+                    f"""
+                    SELECT child_id, parent_id FROM relationships
+                    WHERE child_id IN ({id_placeholders})
+                    """,
+                    child_ids,
+                )
+                for child_id, parent_id in cursor.fetchall():
+                    old_parent_ids[child_id].add(parent_id)
 
             # Calculate differences
-            parent_ids_to_remove = old_parent_ids - parent_ids
-            parent_ids_to_add = parent_ids - old_parent_ids
+            relationships_to_remove: list[tuple[str, str]] = []
+            relationships_to_add: list[tuple[str, str]] = []
+            for child_id, parent_ids in child_to_parent_ids.items():
+                existing_parent_ids = old_parent_ids.get(child_id, set())
+                relationships_to_remove.extend(
+                    (child_id, parent_id)
+                    for parent_id in existing_parent_ids - parent_ids
+                )
+                relationships_to_add.extend(
+                    (child_id, parent_id)
+                    for parent_id in parent_ids - existing_parent_ids
+                )
 
             # Remove old relationships
-            if parent_ids_to_remove:
+            if relationships_to_remove:
                 cursor.executemany(
                     "DELETE FROM relationships WHERE child_id = ? AND parent_id = ?",
-                    [(child_id, parent_id) for parent_id in parent_ids_to_remove],
+                    relationships_to_remove,
                 )
                 # Also remove from relationship_types
                 cursor.executemany(
                     "DELETE FROM relationship_types WHERE child_id = ? AND parent_id = ?",
-                    [(child_id, parent_id) for parent_id in parent_ids_to_remove],
+                    relationships_to_remove,
                 )
 
+            if not relationships_to_add:
+                return
+
             # Add new relationships
-            if parent_ids_to_add:
-                # First add to relationships table
-                cursor.executemany(
-                    "INSERT INTO relationships (child_id, parent_id) VALUES (?, ?)",
-                    [(child_id, parent_id) for parent_id in parent_ids_to_add],
+            cursor.executemany(
+                "INSERT OR IGNORE INTO relationships (child_id, parent_id) VALUES (?, ?)",
+                relationships_to_add,
+            )
+
+            # Then get the types of the parent objects and add to relationship_types
+            parent_types: dict[str, str] = {}
+            new_parent_ids = list({parent_id for _, parent_id in relationships_to_add})
+            for parent_ids_batch in batch_list(new_parent_ids, SQLITE_MAX_VARIABLES):
+                id_placeholders = ",".join(["?" for _ in parent_ids_batch])
+                cursor.execute(
+                    f"""
+                    SELECT id, object_type FROM salesforce_objects
+                    WHERE id IN ({id_placeholders})
+                    """,
+                    parent_ids_batch,
+                )
+                parent_types.update(
+                    (parent_id, parent_type)
+                    for parent_id, parent_type in cursor.fetchall()
                 )
 
-                # Then get the types of the parent objects and add to relationship_types
-                for parent_id in parent_ids_to_add:
-                    cursor.execute(
-                        "SELECT object_type FROM salesforce_objects WHERE id = ?",
-                        (parent_id,),
-                    )
-                    result = cursor.fetchone()
-                    if result:
-                        parent_type = result[0]
-                        cursor.execute(
-                            """
-                            INSERT INTO relationship_types (child_id, parent_id, parent_type)
-                            VALUES (?, ?, ?)
-                            """,
-                            (child_id, parent_id, parent_type),
-                        )
+            cursor.executemany(
+                """
+                INSERT OR IGNORE INTO relationship_types (child_id, parent_id, parent_type)
+                VALUES (?, ?, ?)
+                """,
+                [
+                    (child_id, parent_id, parent_types[parent_id])
+                    for child_id, parent_id in relationships_to_add
+                    if parent_id in parent_types
+                ],
+            )
 
         except Exception:
             logger.exception(
-                f"Error updating relationship tables: child_id={child_id} parent_ids={parent_ids}"
+                f"Error bulk updating relationship tables: "
+                f"num_children={len(child_to_parent_ids)}"
             )
             raise
 
+    @staticmethod
+    def _add_missing_relationship_types(
+        cursor: sqlite3.Cursor, child_ids: list[str]
+    ) -> None:
+        """Adds the relationship_types rows of the children's relationships whose
+        parents have been written since the relationships were."""
+        for child_ids_batch in batch_list(list(set(child_ids)), SQLITE_MAX_VARIABLES):
+            id_placeholders = ",".join(["?" for _ in child_ids_batch])
+            cursor.execute(
+                f"""
+                INSERT OR IGNORE INTO relationship_types (child_id, parent_id, parent_type)
+                SELECT r.child_id, r.parent_id, o.object_type
+                FROM relationships r
+                JOIN salesforce_objects o ON o.id = r.parent_id
+                WHERE r.child_id IN ({id_placeholders})
+                """,
+                child_ids_batch,
+            )
+
     @staticmethod
     def _update_user_email_map(cursor: sqlite3.Cursor) -> None:
         """Update the user_email_map table with current User objects.
@@ -7,6 +7,7 @@ from nltk.tokenize import word_tokenize  # type:ignore
 from sqlalchemy.orm import Session
 
 from onyx.chat.models import SectionRelevancePiece
+from onyx.configs.app_configs import ENABLE_QUERY_EMBEDDING_CACHE
 from onyx.context.search.models import InferenceChunk
 from onyx.context.search.models import InferenceSection
 from onyx.context.search.models import SavedSearchDoc
@@ -14,10 +15,12 @@ from onyx.context.search.models import SavedSearchDocWithContent
 from onyx.context.search.models import SearchDoc
 from onyx.db.models import SearchDoc as DBSearchDoc
 from onyx.db.search_settings import get_current_search_settings
+from onyx.indexing.embedding_cache import get_query_embedding_cache
 from onyx.natural_language_processing.search_nlp_models import EmbeddingModel
 from onyx.utils.logger import setup_logger
 from shared_configs.configs import MODEL_SERVER_HOST
 from shared_configs.configs import MODEL_SERVER_PORT
+from shared_configs.contextvars import get_current_tenant_id
 from shared_configs.enums import EmbedTextType
 from shared_configs.model_server_models import Embedding
 
@@ -172,15 +175,25 @@ def remove_stop_words_and_punctuation(keywords: list[str]) -> list[str]:
 def get_query_embeddings(queries: list[str], db_session: Session) -> list[Embedding]:
     search_settings = get_current_search_settings(db_session)
 
-    model = EmbeddingModel.from_db_model(
-        search_settings=search_settings,
-        # The below are globally set, this flow always uses the indexing one
-        server_host=MODEL_SERVER_HOST,
-        server_port=MODEL_SERVER_PORT,
-    )
+    def _encode(texts: list[str]) -> list[Embedding]:
+        # only built when something actually needs to be embedded
+        model = EmbeddingModel.from_db_model(
+            search_settings=search_settings,
+            # The below are globally set, this flow always uses the indexing one
+            server_host=MODEL_SERVER_HOST,
+            server_port=MODEL_SERVER_PORT,
+        )
+        return model.encode(texts, text_type=EmbedTextType.QUERY)
 
-    query_embedding = model.encode(queries, text_type=EmbedTextType.QUERY)
-    return query_embedding
+    if not ENABLE_QUERY_EMBEDDING_CACHE:
+        return _encode(queries)
+
+    # whitespace differences don't change the meaning of a query, normalizing them
+    # lets more repeated queries share a cache entry
+    normalized_queries = [" ".join(query.split()) or query for query in queries]
+    return get_query_embedding_cache(search_settings).embed_with_cache(
+        normalized_queries, _encode, tenant_id=get_current_tenant_id()
+    )
 
 
 def get_query_embedding(query: str, db_session: Session) -> Embedding:
@@ -10,6 +10,7 @@ from fastapi import HTTPException
 from sqlalchemy import delete
 from sqlalchemy import desc
 from sqlalchemy import func
+from sqlalchemy import literal
 from sqlalchemy import nullsfirst
 from sqlalchemy import or_
 from sqlalchemy import Row
@@ -563,6 +564,77 @@ def get_chat_messages_by_session(
     return list(result)
 
 
+def get_mainline_chat_messages(
+    chat_session_id: UUID,
+    db_session: Session,
+    prefetch_tool_calls: bool = False,
+    stop_at_message_id: int | None = None,
+    max_messages: int | None = None,
+) -> list[ChatMessage]:
+    """Returns the root message followed by the mainline of the session, i.e. the
+    messages reached by following `latest_child_message` from the root (optionally
+    stopping at `stop_at_message_id`). Abandoned branches are never loaded.
+
+    The chain is walked in postgres with a recursive CTE over (id, child pointer)
+    only. If `max_messages` is set, only the root and the last `max_messages`
+    messages of the chain are loaded as full rows."""
+    chain = (
+        select(
+            ChatMessage.id,
+            ChatMessage.latest_child_message,
+            literal(0).label("depth"),
+        )
+        .where(
+            ChatMessage.chat_session_id == chat_session_id,
+            ChatMessage.parent_message.is_(None),
+        )
+        .cte("mainline_chain", recursive=True)
+    )
+    next_message_stmt = (
+        select(
+            ChatMessage.id,
+            ChatMessage.latest_child_message,
+            (chain.c.depth + 1).label("depth"),
+        )
+        .join(chain, ChatMessage.id == chain.c.latest_child_message)
+        .where(ChatMessage.chat_session_id == chat_session_id)
+    )
+    if stop_at_message_id is not None:
+        next_message_stmt = next_message_stmt.where(chain.c.id != stop_at_message_id)
+    chain = chain.union_all(next_message_stmt)
+
+    chain_rows = db_session.execute(
+        select(chain.c.id, chain.c.latest_child_message).order_by(chain.c.depth)
+    ).all()
+    if not chain_rows:
+        return []
+
+    last_id, last_child_id = chain_rows[-1]
+    if last_child_id is not None and last_id != stop_at_message_id:
+        raise RuntimeError(
+            "Invalid message chain," "could not find next message in the same session"
+        )
+
+    chain_ids = [row[0] for row in chain_rows]
+    if max_messages is not None and len(chain_ids) > max_messages + 1:
+        chain_ids = [chain_ids[0]] + chain_ids[len(chain_ids) - max_messages :]
+
+    stmt = select(ChatMessage).where(ChatMessage.id.in_(chain_ids))
+    if prefetch_tool_calls:
+        stmt = stmt.options(
+            joinedload(ChatMessage.tool_call),
+            joinedload(ChatMessage.sub_questions).joinedload(
+                AgentSubQuestion.sub_queries
+            ),
+        )
+        messages = db_session.scalars(stmt).unique().all()
+    else:
+        messages = db_session.scalars(stmt).all()
+
+    id_to_position = {message_id: i for i, message_id in enumerate(chain_ids)}
+    return sorted(messages, key=lambda message: id_to_position[message.id])
+
+
 def get_or_create_root_message(
     chat_session_id: UUID,
     db_session: Session,
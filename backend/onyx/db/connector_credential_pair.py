@@ -202,16 +202,6 @@ def get_cc_pair_groups_for_ids(
     return list(db_session.scalars(stmt).all())
 
 
-# For use with our thread-level parallelism utils. Note that any relationships
-# you wish to use MUST be eagerly loaded, as the session will not be available
-# after this function to allow lazy loading.
-def get_cc_pair_groups_for_ids_parallel(
-    cc_pair_ids: list[int],
-) -> list[UserGroup__ConnectorCredentialPair]:
-    with get_session_with_current_tenant() as db_session:
-        return get_cc_pair_groups_for_ids(db_session, cc_pair_ids)
-
-
 def get_connector_credential_pair_for_user(
     db_session: Session,
     connector_id: int,
@@ -606,6 +596,9 @@ def remove_credential_from_connector(
         )
         db_session.delete(association)
         db_session.commit()
+        fetch_ee_implementation_or_noop(
+            "onyx.access.user_acl_cache", "bump_user_acl_version"
+        )()
         return StatusResponse(
             success=True,
             message=f"Credential {credential_id} removed from Connector",
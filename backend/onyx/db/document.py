@@ -28,7 +28,6 @@ from onyx.configs.constants import DocumentSource
 from onyx.configs.kg_configs import KG_SIMPLE_ANSWER_MAX_DISPLAYED_SOURCES
 from onyx.db.chunk import delete_chunk_stats_by_connector_credential_pair__no_commit
 from onyx.db.connector_credential_pair import get_connector_credential_pair_from_id
-from onyx.db.engine.sql_engine import get_session_with_current_tenant
 from onyx.db.entities import delete_from_kg_entities__no_commit
 from onyx.db.entities import delete_from_kg_entities_extraction_staging__no_commit
 from onyx.db.enums import AccessType
@@ -292,14 +291,28 @@ def get_document_counts_for_cc_pairs(
     return db_session.execute(stmt).all()  # type: ignore
 
 
-# For use with our thread-level parallelism utils. Note that any relationships
-# you wish to use MUST be eagerly loaded, as the session will not be available
-# after this function to allow lazy loading.
-def get_document_counts_for_cc_pairs_parallel(
-    cc_pairs: list[ConnectorCredentialPairIdentifier],
-) -> Sequence[tuple[int, int, int]]:
-    with get_session_with_current_tenant() as db_session:
-        return get_document_counts_for_cc_pairs(db_session, cc_pairs)
+def _adjust_indexed_document_counts__no_commit(
+    db_session: Session, cc_pair_to_delta: dict[tuple[int, int], int]
+) -> None:
+    """Applies the (connector_id, credential_id) -> delta changes to the indexed
+    document counters. Rows are updated in a fixed order so that concurrent
+    transactions touching the same cc pairs can't deadlock."""
+    for (connector_id, credential_id), delta in sorted(cc_pair_to_delta.items()):
+        if delta == 0:
+            continue
+
+        db_session.execute(
+            update(ConnectorCredentialPair)
+            .where(
+                ConnectorCredentialPair.connector_id == connector_id,
+                ConnectorCredentialPair.credential_id == credential_id,
+            )
+            .values(
+                indexed_document_count=func.greatest(
+                    ConnectorCredentialPair.indexed_document_count + delta, 0
+                )
+            )
+        )
 
 
 def get_access_info_for_document(
@@ -480,16 +493,24 @@ def mark_document_as_indexed_for_cc_pair__no_commit(
     document_ids: Iterable[str],
 ) -> None:
     """Should be called only after a successful index operation for a batch."""
-    db_session.execute(
+    # only rows that weren't indexed yet are touched, so the returned rows are
+    # exactly the ones the indexed document count has to be incremented by
+    newly_indexed_ids = db_session.scalars(
         update(DocumentByConnectorCredentialPair)
         .where(
             and_(
                 DocumentByConnectorCredentialPair.connector_id == connector_id,
                 DocumentByConnectorCredentialPair.credential_id == credential_id,
                 DocumentByConnectorCredentialPair.id.in_(document_ids),
+                DocumentByConnectorCredentialPair.has_been_indexed.is_not(True),
             )
         )
         .values(has_been_indexed=True)
+        .returning(DocumentByConnectorCredentialPair.id)
+    ).all()
+
+    _adjust_indexed_document_counts__no_commit(
+        db_session, {(connector_id, credential_id): len(newly_indexed_ids)}
     )
 
 
@@ -556,6 +577,41 @@ def mark_document_as_synced(document_id: str, db_session: Session) -> None:
     db_session.commit()
 
 
+def mark_documents_as_synced__no_commit(
+    document_ids: list[str], db_session: Session
+) -> None:
+    """Documents that don't exist (anymore) are ignored."""
+    if not document_ids:
+        return
+
+    stmt = (
+        update(DbDocument)
+        .where(DbDocument.id.in_(document_ids))
+        .values(last_synced=datetime.now(timezone.utc))
+    )
+    db_session.execute(stmt)
+
+
+def mark_documents_as_synced(document_ids: list[str], db_session: Session) -> None:
+    mark_documents_as_synced__no_commit(document_ids, db_session)
+    db_session.commit()
+
+
+def mark_documents_as_modified__no_commit(
+    document_ids: list[str], db_session: Session
+) -> None:
+    """Documents that don't exist (anymore) are ignored."""
+    if not document_ids:
+        return
+
+    stmt = (
+        update(DbDocument)
+        .where(DbDocument.id.in_(document_ids))
+        .values(last_modified=datetime.now(timezone.utc))
+    )
+    db_session.execute(stmt)
+
+
 def delete_document_by_connector_credential_pair__no_commit(
     db_session: Session,
     document_id: str,
@@ -599,7 +655,20 @@ def delete_documents_by_connector_credential_pair__no_commit(
                 == connector_credential_pair_identifier.credential_id,
             )
         )
-    db_session.execute(stmt)
+    deleted_rows = db_session.execute(
+        stmt.returning(
+            DocumentByConnectorCredentialPair.connector_id,
+            DocumentByConnectorCredentialPair.credential_id,
+            DocumentByConnectorCredentialPair.has_been_indexed,
+        )
+    ).all()
+
+    cc_pair_to_delta: dict[tuple[int, int], int] = {}
+    for connector_id, credential_id, has_been_indexed in deleted_rows:
+        if has_been_indexed:
+            key = (connector_id, credential_id)
+            cc_pair_to_delta[key] = cc_pair_to_delta.get(key, 0) - 1
+    _adjust_indexed_document_counts__no_commit(db_session, cc_pair_to_delta)
 
 
 def delete_all_documents_by_connector_credential_pair__no_commit(
@@ -622,6 +691,14 @@ def delete_all_documents_by_connector_credential_pair__no_commit(
         )
     )
     db_session.execute(stmt)
+    db_session.execute(
+        update(ConnectorCredentialPair)
+        .where(
+            ConnectorCredentialPair.connector_id == connector_id,
+            ConnectorCredentialPair.credential_id == credential_id,
+        )
+        .values(indexed_document_count=0)
+    )
 
 
 def delete_documents__no_commit(db_session: Session, document_ids: list[str]) -> None:
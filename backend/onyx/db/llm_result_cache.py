@@ -0,0 +1,79 @@
+import hashlib
+from datetime import datetime
+
+from sqlalchemy import delete
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from onyx.db.models import LLMResultCache
+
+# rows deleted per statement when cleaning up, so the table is never locked for long
+_DELETE_BATCH_SIZE = 1000
+
+
+def build_llm_cache_key(kind: str, *parts: str | bytes) -> str:
+    """Builds the key of an LLM result from the kind of call (e.g. "image_summary")
+    and everything its result depends on (content, model, prompts, ...)."""
+    hasher = hashlib.sha256(kind.encode("utf-8"))
+    for part in parts:
+        part_bytes = part.encode("utf-8") if isinstance(part, str) else part
+        # length prefixed so that different splits of the same bytes don't collide
+        hasher.update(len(part_bytes).to_bytes(8, "big"))
+        hasher.update(part_bytes)
+    return f"{kind}:{hasher.hexdigest()}"
+
+
+def fetch_llm_results(db_session: Session, cache_keys: list[str]) -> dict[str, str]:
+    """Returns the cached results for the keys that have one"""
+    if not cache_keys:
+        return {}
+
+    rows = db_session.execute(
+        select(LLMResultCache.cache_key, LLMResultCache.result).where(
+            LLMResultCache.cache_key.in_(cache_keys)
+        )
+    ).all()
+    return {cache_key: result for cache_key, result in rows}
+
+
+def store_llm_results(db_session: Session, results: dict[str, str]) -> None:
+    """Stores results by cache key. Keys that already have a result keep it, the
+    result of a key never changes."""
+    if not results:
+        return
+
+    db_session.execute(
+        insert(LLMResultCache)
+        .values(
+            [
+                {"cache_key": cache_key, "result": results[cache_key]}
+                # sorted to avoid deadlocks between concurrent inserts
+                for cache_key in sorted(results)
+            ]
+        )
+        .on_conflict_do_nothing(index_elements=["cache_key"])
+    )
+    db_session.commit()
+
+
+def delete_llm_results_older_than(db_session: Session, cutoff: datetime) -> int:
+    """Deletes the results stored before `cutoff`, returns the number deleted.
+
+    Results are deleted by age even if they are still hit, they are simply computed
+    and stored again the next time they are needed."""
+    num_deleted = 0
+    while True:
+        cache_keys = (
+            select(LLMResultCache.cache_key)
+            .where(LLMResultCache.time_created < cutoff)
+            .limit(_DELETE_BATCH_SIZE)
+        )
+        result = db_session.execute(
+            delete(LLMResultCache).where(LLMResultCache.cache_key.in_(cache_keys))
+        )
+        db_session.commit()
+
+        num_deleted += result.rowcount
+        if result.rowcount < _DELETE_BATCH_SIZE:
+            return num_deleted
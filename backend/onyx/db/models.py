@@ -490,6 +490,13 @@ class ConnectorCredentialPair(Base):
 
     total_docs_indexed: Mapped[int] = mapped_column(Integer, default=0)
 
+    # number of document by cc pair rows with has_been_indexed set. Kept exact by the
+    # functions in onyx.db.document that mark, prune and delete those rows so that
+    # the indexing status page doesn't need to count them on every load
+    indexed_document_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0"
+    )
+
     indexing_trigger: Mapped[IndexingMode | None] = mapped_column(
         Enum(IndexingMode, native_enum=False), nullable=True
     )
@@ -2798,6 +2805,20 @@ class FileRecord(Base):
     )
 
 
+class LLMResultCache(Base):
+    """Results of LLM calls made while indexing (e.g. image summaries), so the same
+    input is only sent to the LLM once. The key is a hash of everything the result
+    depends on, see `build_llm_cache_key`."""
+
+    __tablename__ = "llm_result_cache"
+
+    cache_key: Mapped[str] = mapped_column(String, primary_key=True)
+    result: Mapped[str] = mapped_column(Text)
+    time_created: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), index=True
+    )
+
+
 class AgentSearchMetrics(Base):
     __tablename__ = "agent__search_metrics"
 
@@ -1,5 +1,8 @@
 import json
 import string
+import threading
+import time
+from collections import OrderedDict
 from collections.abc import Callable
 from collections.abc import Mapping
 from datetime import datetime
@@ -8,14 +11,18 @@ from typing import Any
 from typing import cast
 
 import httpx
+from prometheus_client import Histogram
 from retry import retry
 
 from onyx.configs.app_configs import LOG_VESPA_TIMING_INFORMATION
+from onyx.configs.app_configs import VESPA_BATCH_SEARCH_MAX_CONCURRENCY
+from onyx.configs.app_configs import VESPA_ID_CHUNK_CACHE_MAX_ENTRIES
+from onyx.configs.app_configs import VESPA_ID_CHUNK_CACHE_TTL_SECONDS
 from onyx.configs.app_configs import VESPA_LANGUAGE_OVERRIDE
 from onyx.context.search.models import IndexFilters
 from onyx.context.search.models import InferenceChunkUncleaned
 from onyx.document_index.interfaces import VespaChunkRequest
-from onyx.document_index.vespa.shared_utils.utils import get_vespa_http_client
+from onyx.document_index.vespa.shared_utils.utils import get_vespa_query_http_client
 from onyx.document_index.vespa.shared_utils.vespa_request_builders import (
     build_vespa_filters,
 )
@@ -57,6 +64,13 @@ from shared_configs.configs import MULTI_TENANT
 
 logger = setup_logger()
 
+vespa_query_latency = Histogram(
+    "onyx_vespa_query_latency_seconds",
+    "Latency of Vespa queries by type (search or visit)",
+    ["query_type"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
 
 def _process_dynamic_summary(
     dynamic_summary: str, max_summary_length: int = 400
@@ -220,9 +234,10 @@ def get_chunks_via_visit_api(
     while True:
         try:
             filtered_params = {k: v for k, v in params.items() if v is not None}
-            with get_vespa_http_client() as http_client:
-                response = http_client.get(url, params=filtered_params)
-                response.raise_for_status()
+            start = time.monotonic()
+            response = get_vespa_query_http_client().get(url, params=filtered_params)
+            vespa_query_latency.labels("visit").observe(time.monotonic() - start)
+            response.raise_for_status()
         except httpx.HTTPError as e:
             error_base = "Failed to query Vespa"
             logger.error(
@@ -343,9 +358,10 @@ def query_vespa(
         params["language"] = VESPA_LANGUAGE_OVERRIDE
 
     try:
-        with get_vespa_http_client() as http_client:
-            response = http_client.post(SEARCH_ENDPOINT, json=params)
-            response.raise_for_status()
+        start = time.monotonic()
+        response = get_vespa_query_http_client().post(SEARCH_ENDPOINT, json=params)
+        vespa_query_latency.labels("search").observe(time.monotonic() - start)
+        response.raise_for_status()
     except httpx.HTTPError as e:
         error_base = "Failed to query Vespa"
         logger.error(
@@ -437,6 +453,93 @@ def _get_chunks_via_batch_search(
     return inference_chunks
 
 
+# (index name, filters, get large chunks, document id, chunk id)
+_ChunkCacheKey = tuple[str, str, bool, str, int]
+
+
+class _IdBasedChunkCache:
+    """Short lived in process cache for chunks fetched by id based batch search.
+    Every chunk id of a fetched range gets an entry, ids without a chunk (e.g. past
+    the end of the document) get an empty one, so later requests for overlapping
+    ranges can be answered without Vespa."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[
+            _ChunkCacheKey, tuple[float, list[InferenceChunkUncleaned]]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get_range(
+        self, key_prefix: tuple[str, str, bool], request: VespaChunkRequest
+    ) -> list[InferenceChunkUncleaned] | None:
+        """Returns the chunks of the (capped) request if every chunk id in its range
+        is cached, None otherwise"""
+        if not self.enabled or request.max_chunk_ind is None:
+            return None
+
+        chunks: list[InferenceChunkUncleaned] = []
+        now = time.monotonic()
+        with self._lock:
+            for chunk_id in range(
+                request.min_chunk_ind or 0, request.max_chunk_ind + 1
+            ):
+                key = (*key_prefix, request.document_id, chunk_id)
+                entry = self._entries.get(key)
+                if entry is None:
+                    return None
+
+                expires_at, cached_chunks = entry
+                if expires_at <= now:
+                    del self._entries[key]
+                    return None
+
+                self._entries.move_to_end(key)
+                chunks.extend(cached_chunks)
+
+        # copies, callers are free to modify the chunks they get back
+        return [chunk.model_copy() for chunk in chunks]
+
+    def put_range(
+        self,
+        key_prefix: tuple[str, str, bool],
+        request: VespaChunkRequest,
+        chunks: list[InferenceChunkUncleaned],
+    ) -> None:
+        """`chunks` are the fetched chunks of the request's document"""
+        if not self.enabled or request.max_chunk_ind is None or not chunks:
+            # nothing is cached if the document had no chunks at all, it may just be
+            # stored under a slightly different id than the requested one
+            return
+
+        chunk_id_to_chunks: dict[int, list[InferenceChunkUncleaned]] = {}
+        for chunk in chunks:
+            chunk_id_to_chunks.setdefault(chunk.chunk_id, []).append(chunk.model_copy())
+
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            for chunk_id in range(
+                request.min_chunk_ind or 0, request.max_chunk_ind + 1
+            ):
+                key = (*key_prefix, request.document_id, chunk_id)
+                self._entries[key] = (expires_at, chunk_id_to_chunks.get(chunk_id, []))
+                self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_id_based_chunk_cache = _IdBasedChunkCache(
+    ttl_seconds=VESPA_ID_CHUNK_CACHE_TTL_SECONDS,
+    max_entries=VESPA_ID_CHUNK_CACHE_MAX_ENTRIES,
+)
+
+
 def batch_search_api_retrieval(
     index_name: str,
     chunk_requests: list[VespaChunkRequest],
@@ -444,43 +547,84 @@ def batch_search_api_retrieval(
     get_large_chunks: bool = False,
 ) -> list[InferenceChunkUncleaned]:
     retrieved_chunks: list[InferenceChunkUncleaned] = []
-    capped_requests: list[VespaChunkRequest] = []
     uncapped_requests: list[VespaChunkRequest] = []
-    chunk_count = 0
-    for req_ind, request in enumerate(chunk_requests, start=1):
+    requests_to_fetch: list[VespaChunkRequest] = []
+
+    cache_key_prefix = (
+        index_name,
+        build_vespa_filters(filters=filters, include_hidden=True),
+        get_large_chunks,
+    )
+    for request in chunk_requests:
         # All requests without a chunk range are uncapped
         # Uncapped requests are retrieved using the Visit API
-        range = request.range
-        if range is None:
+        if request.range is None:
             uncapped_requests.append(request)
             continue
 
+        cached_chunks = _id_based_chunk_cache.get_range(cache_key_prefix, request)
+        if cached_chunks is not None:
+            retrieved_chunks.extend(cached_chunks)
+        else:
+            requests_to_fetch.append(request)
+
+    # group the capped requests into as few queries as the limits allow
+    request_groups: list[list[VespaChunkRequest]] = []
+    capped_requests: list[VespaChunkRequest] = []
+    chunk_count = 0
+    for req_ind, request in enumerate(requests_to_fetch, start=1):
+        request_range = cast(int, request.range)
         if (
-            chunk_count + range > MAX_ID_SEARCH_QUERY_SIZE
+            chunk_count + request_range > MAX_ID_SEARCH_QUERY_SIZE
             or req_ind % MAX_OR_CONDITIONS == 0
-        ):
-            retrieved_chunks.extend(
-                _get_chunks_via_batch_search(
-                    index_name=index_name,
-                    chunk_requests=capped_requests,
-                    filters=filters,
-                    get_large_chunks=get_large_chunks,
-                )
-            )
+        ) and capped_requests:
+            request_groups.append(capped_requests)
             capped_requests = []
             chunk_count = 0
         capped_requests.append(request)
-        chunk_count += range
+        chunk_count += request_range
 
     if capped_requests:
-        retrieved_chunks.extend(
-            _get_chunks_via_batch_search(
-                index_name=index_name,
-                chunk_requests=capped_requests,
-                filters=filters,
-                get_large_chunks=get_large_chunks,
-            )
+        request_groups.append(capped_requests)
+
+    # the group queries are independent, run them concurrently
+    group_results: list[list[InferenceChunkUncleaned]] = (
+        run_functions_tuples_in_parallel(
+            [
+                (
+                    _get_chunks_via_batch_search,
+                    # copy, the list is consumed by the function
+                    (index_name, list(group), filters, get_large_chunks),
+                )
+                for group in request_groups
+            ],
+            max_workers=VESPA_BATCH_SEARCH_MAX_CONCURRENCY,
         )
+        if request_groups
+        else []
+    )
+
+    for group, group_chunks in zip(request_groups, group_results):
+        retrieved_chunks.extend(group_chunks)
+
+        if not _id_based_chunk_cache.enabled:
+            continue
+
+        doc_id_to_chunks: dict[str, list[InferenceChunkUncleaned]] = {}
+        for chunk in group_chunks:
+            doc_id_to_chunks.setdefault(chunk.document_id, []).append(chunk)
+        for request in group:
+            request_min = request.min_chunk_ind or 0
+            request_max = cast(int, request.max_chunk_ind)
+            _id_based_chunk_cache.put_range(
+                cache_key_prefix,
+                request,
+                [
+                    chunk
+                    for chunk in doc_id_to_chunks.get(request.document_id, [])
+                    if request_min <= chunk.chunk_id <= request_max
+                ],
+            )
 
     if uncapped_requests:
         logger.debug(f"Retrieving {len(uncapped_requests)} uncapped requests")
@@ -461,16 +461,16 @@ class VespaIndex(DocumentIndex):
             # documents that have `chunk_count` in the database, but not for
             # `old_version` documents.
 
-            enriched_doc_infos: list[EnrichedDocumentIndexingInfo] = [
-                VespaIndex.enrich_basic_chunk_info(
-                    index_name=self.index_name,
-                    http_client=http_client,
-                    document_id=doc_id,
-                    previous_chunk_count=doc_id_to_previous_chunk_cnt.get(doc_id, 0),
-                    new_chunk_count=doc_id_to_new_chunk_cnt.get(doc_id, 0),
-                )
-                for doc_id in doc_id_to_new_chunk_cnt.keys()
-            ]
+            enriched_doc_infos = VespaIndex.enrich_basic_chunk_info_batch(
+                index_name=self.index_name,
+                http_client=http_client,
+                doc_id_to_previous_chunk_cnt={
+                    doc_id: doc_id_to_previous_chunk_cnt.get(doc_id, 0)
+                    for doc_id in doc_id_to_new_chunk_cnt.keys()
+                },
+                doc_id_to_new_chunk_cnt=doc_id_to_new_chunk_cnt,
+                executor=executor,
+            )
 
             for cleaned_doc_info in enriched_doc_infos:
                 # If the document has previously indexed chunks, we know it previously existed
@@ -621,23 +621,28 @@ class VespaIndex(DocumentIndex):
             index_names.append(self.secondary_index_name)
 
         chunk_id_start_time = time.monotonic()
-        with self.httpx_client_context as http_client:
-            for update_request in update_requests:
-                for doc_info in update_request.minimal_document_indexing_info:
-                    for index_name in index_names:
-                        doc_chunk_info = VespaIndex.enrich_basic_chunk_info(
-                            index_name=index_name,
-                            http_client=http_client,
-                            document_id=doc_info.doc_id,
-                            previous_chunk_count=doc_info.chunk_start_index,
-                            new_chunk_count=0,
-                        )
-                        doc_chunk_ids = get_document_chunk_ids(
-                            enriched_document_info_list=[doc_chunk_info],
-                            tenant_id=tenant_id,
-                            large_chunks_enabled=False,
-                        )
-                        all_doc_chunk_ids[doc_info.doc_id] = doc_chunk_ids
+        doc_id_to_previous_chunk_cnt: dict[str, int | None] = {
+            doc_info.doc_id: doc_info.chunk_start_index
+            for update_request in update_requests
+            for doc_info in update_request.minimal_document_indexing_info
+        }
+        with (
+            concurrent.futures.ThreadPoolExecutor(max_workers=NUM_THREADS) as executor,
+            self.httpx_client_context as http_client,
+        ):
+            for index_name in index_names:
+                enriched_doc_infos = VespaIndex.enrich_basic_chunk_info_batch(
+                    index_name=index_name,
+                    http_client=http_client,
+                    doc_id_to_previous_chunk_cnt=doc_id_to_previous_chunk_cnt,
+                    executor=executor,
+                )
+                for doc_chunk_info in enriched_doc_infos:
+                    all_doc_chunk_ids[doc_chunk_info.doc_id] = get_document_chunk_ids(
+                        enriched_document_info_list=[doc_chunk_info],
+                        tenant_id=tenant_id,
+                        large_chunks_enabled=False,
+                    )
 
         logger.debug(
             f"Took {time.monotonic() - chunk_id_start_time:.2f} seconds to fetch all Vespa chunk IDs"
@@ -1055,6 +1060,63 @@ class VespaIndex(DocumentIndex):
         )
         return enriched_doc_info
 
+    @classmethod
+    def enrich_basic_chunk_info_batch(
+        cls,
+        index_name: str,
+        http_client: httpx.Client,
+        doc_id_to_previous_chunk_cnt: dict[str, int | None],
+        doc_id_to_new_chunk_cnt: dict[str, int] | None = None,
+        executor: concurrent.futures.ThreadPoolExecutor | None = None,
+    ) -> list[EnrichedDocumentIndexingInfo]:
+        """Same as `enrich_basic_chunk_info` but for a whole batch of documents.
+        Documents with a known previous chunk count are resolved without any
+        requests, the final chunk probes for `old_version` documents are run
+        concurrently. Results are in the order of `doc_id_to_previous_chunk_cnt`."""
+        doc_id_to_new_chunk_cnt = doc_id_to_new_chunk_cnt or {}
+
+        doc_id_to_enriched_info: dict[str, EnrichedDocumentIndexingInfo] = {}
+        old_version_doc_ids: list[str] = []
+        for doc_id, previous_chunk_count in doc_id_to_previous_chunk_cnt.items():
+            if previous_chunk_count is None:
+                old_version_doc_ids.append(doc_id)
+                continue
+
+            doc_id_to_enriched_info[doc_id] = cls.enrich_basic_chunk_info(
+                index_name=index_name,
+                http_client=http_client,
+                document_id=doc_id,
+                previous_chunk_count=previous_chunk_count,
+                new_chunk_count=doc_id_to_new_chunk_cnt.get(doc_id, 0),
+            )
+
+        if old_version_doc_ids:
+            own_executor = executor is None
+            executor = executor or concurrent.futures.ThreadPoolExecutor(
+                max_workers=NUM_THREADS
+            )
+            try:
+                future_to_doc_id = {
+                    executor.submit(
+                        cls.enrich_basic_chunk_info,
+                        index_name=index_name,
+                        http_client=http_client,
+                        document_id=doc_id,
+                        previous_chunk_count=None,
+                        new_chunk_count=doc_id_to_new_chunk_cnt.get(doc_id, 0),
+                    ): doc_id
+                    for doc_id in old_version_doc_ids
+                }
+                for future in concurrent.futures.as_completed(future_to_doc_id):
+                    doc_id_to_enriched_info[future_to_doc_id[future]] = future.result()
+            finally:
+                if own_executor:
+                    executor.shutdown(wait=True)
+
+        return [
+            doc_id_to_enriched_info[doc_id] for doc_id in doc_id_to_previous_chunk_cnt
+        ]
+
     @classmethod
     def delete_entries_by_tenant_id(
         cls,
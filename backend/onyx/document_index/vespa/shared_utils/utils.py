@@ -7,8 +7,12 @@ import httpx
 from onyx.configs.app_configs import MANAGED_VESPA
 from onyx.configs.app_configs import VESPA_CLOUD_CERT_PATH
 from onyx.configs.app_configs import VESPA_CLOUD_KEY_PATH
+from onyx.configs.app_configs import VESPA_QUERY_KEEPALIVE_EXPIRY
+from onyx.configs.app_configs import VESPA_QUERY_MAX_CONNECTIONS
+from onyx.configs.app_configs import VESPA_QUERY_MAX_KEEPALIVE_CONNECTIONS
 from onyx.configs.app_configs import VESPA_REQUEST_TIMEOUT
 from onyx.document_index.vespa_constants import VESPA_APP_CONTAINER_URL
+from onyx.httpx.httpx_pool import HttpxPool
 from onyx.utils.logger import setup_logger
 
 logger = setup_logger()
@@ -80,6 +84,31 @@ def get_vespa_http_client(no_timeout: bool = False, http2: bool = True) -> httpx
     )
 
 
+VESPA_QUERY_HTTPX_POOL_NAME = "vespa_query"
+
+
+def get_vespa_query_http_client() -> httpx.Client:
+    """Returns the process wide pooled client used for Vespa queries. Connections are
+    kept alive and shared between threads, so callers must not close it."""
+    HttpxPool.init_client(
+        name=VESPA_QUERY_HTTPX_POOL_NAME,
+        cert=(
+            cast(tuple[str, str], (VESPA_CLOUD_CERT_PATH, VESPA_CLOUD_KEY_PATH))
+            if MANAGED_VESPA
+            else None
+        ),
+        verify=False if not MANAGED_VESPA else True,
+        timeout=VESPA_REQUEST_TIMEOUT,
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=VESPA_QUERY_MAX_CONNECTIONS,
+            max_keepalive_connections=VESPA_QUERY_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=VESPA_QUERY_KEEPALIVE_EXPIRY,
+        ),
+    )
+    return HttpxPool.get(VESPA_QUERY_HTTPX_POOL_NAME)
+
+
 def wait_for_vespa_with_timeout(wait_interval: int = 5, wait_limit: int = 60) -> bool:
     """Waits for Vespa to become ready subject to a timeout.
     Returns True if Vespa is ready, False otherwise."""
@@ -243,6 +243,23 @@ def read_pdf_file(
     """
     Returns the text, basic PDF metadata, and optionally extracted images.
     """
+    text, metadata, extracted_images, _ = read_pdf_pages(
+        file, pdf_pass, extract_images=extract_images
+    )
+    return text, metadata, extracted_images
+
+
+def read_pdf_pages(
+    file: IO[Any],
+    pdf_pass: str | None = None,
+    extract_images: bool = False,
+    start_page: int = 0,
+    end_page: int | None = None,
+) -> tuple[str, dict[str, Any], Sequence[tuple[bytes, str]], int]:
+    """
+    Same as read_pdf_file, but only for the pages in [start_page, end_page). Also
+    returns the total number of pages in the PDF so large files can be read in ranges.
+    """
     metadata: dict[str, Any] = {}
     extracted_images: list[tuple[bytes, str]] = []
     try:
@@ -256,10 +273,10 @@ def read_pdf_file(
                 logger.error("Unable to decrypt pdf")
 
             if not decrypt_success:
-                return "", metadata, []
+                return "", metadata, [], 0
         elif pdf_reader.is_encrypted:
             logger.warning("No Password for an encrypted PDF, returning empty text.")
-            return "", metadata, []
+            return "", metadata, [], 0
 
         # Basic PDF metadata
         if pdf_reader.metadata is not None:
@@ -272,13 +289,18 @@ def read_pdf_file(
                 ):
                     metadata[clean_key] = ", ".join(value)
 
+        page_count = len(pdf_reader.pages)
+        page_nums = range(
+            start_page, page_count if end_page is None else min(end_page, page_count)
+        )
+
         text = TEXT_SECTION_SEPARATOR.join(
-            page.extract_text() for page in pdf_reader.pages
+            pdf_reader.pages[page_num].extract_text() for page_num in page_nums
         )
 
         if extract_images:
-            for page_num, page in enumerate(pdf_reader.pages):
-                for image_file_object in page.images:
+            for page_num in page_nums:
+                for image_file_object in pdf_reader.pages[page_num].images:
                     image = Image.open(io.BytesIO(image_file_object.data))
                     img_byte_arr = io.BytesIO()
                     image.save(img_byte_arr, format=image.format)
@@ -290,14 +312,14 @@ def read_pdf_file(
                     )
                     extracted_images.append((img_bytes, image_name))
 
-        return text, metadata, extracted_images
+        return text, metadata, extracted_images, page_count
 
     except PdfStreamError:
         logger.exception("Invalid PDF file")
     except Exception:
         logger.exception("Failed to read PDF")
 
-    return "", metadata, []
+    return "", metadata, [], 0
 
 
 def docx_to_text_and_images(
@@ -446,16 +468,6 @@ def extract_file_text(
     NOTE: Ignoring seems to be defined as returning an empty string for files it can't
     handle (such as images).
     """
-    extension_to_function: dict[str, Callable[[IO[Any]], str]] = {
-        ".pdf": pdf_to_text,
-        ".docx": lambda f: docx_to_text_and_images(f)[0],  # no images
-        ".pptx": pptx_to_text,
-        ".xlsx": xlsx_to_text,
-        ".eml": eml_to_text,
-        ".epub": epub_to_text,
-        ".html": parse_html_page_basic,
-    }
-
     try:
         if get_unstructured_api_key():
             try:
@@ -465,22 +477,7 @@ def extract_file_text(
                     f"Failed to process with Unstructured: {str(unstructured_error)}. "
                     "Falling back to normal processing."
                 )
-        if extension is None:
-            extension = get_file_ext(file_name)
-
-        if is_accepted_file_ext(
-            extension, OnyxExtensionType.Plain | OnyxExtensionType.Document
-        ):
-            func = extension_to_function.get(extension, file_io_to_text)
-            file.seek(0)
-            return func(file)
-
-        # If unknown extension, maybe it's a text file
-        file.seek(0)
-        if is_text_file(file):
-            return file_io_to_text(file)
-
-        raise ValueError("Unknown file extension or not recognized as text data")
+        return parse_file_text(file, file_name, extension)
 
     except Exception as e:
         if break_on_unprocessable:
@@ -491,6 +488,43 @@ def extract_file_text(
         return ""
 
 
+def parse_file_text(
+    file: IO[Any],
+    file_name: str,
+    extension: str | None = None,
+) -> str:
+    """
+    The parsing part of extract_file_text. Only uses local parsers (never Unstructured)
+    and raises if the file can't be handled, so it is safe to run in a separate process.
+    """
+    extension_to_function: dict[str, Callable[[IO[Any]], str]] = {
+        ".pdf": pdf_to_text,
+        ".docx": lambda f: docx_to_text_and_images(f)[0],  # no images
+        ".pptx": pptx_to_text,
+        ".xlsx": xlsx_to_text,
+        ".eml": eml_to_text,
+        ".epub": epub_to_text,
+        ".html": parse_html_page_basic,
+    }
+
+    if extension is None:
+        extension = get_file_ext(file_name)
+
+    if is_accepted_file_ext(
+        extension, OnyxExtensionType.Plain | OnyxExtensionType.Document
+    ):
+        func = extension_to_function.get(extension, file_io_to_text)
+        file.seek(0)
+        return func(file)
+
+    # If unknown extension, maybe it's a text file
+    file.seek(0)
+    if is_text_file(file):
+        return file_io_to_text(file)
+
+    raise ValueError("Unknown file extension or not recognized as text data")
+
+
 class ExtractionResult(NamedTuple):
     """Structured result from text and image extraction from various file types."""
 
@@ -519,88 +553,107 @@ def extract_text_and_images(
                 text_content=text_content, embedded_images=[], metadata={}
             )
 
-        extension = get_file_ext(file_name)
+        return parse_text_and_images(
+            file,
+            file_name,
+            pdf_pass,
+            extract_pdf_images=get_image_extraction_and_analysis_enabled(),
+        )
 
-        # docx example for embedded images
-        if extension == ".docx":
-            file.seek(0)
-            text_content, images = docx_to_text_and_images(file)
-            return ExtractionResult(
-                text_content=text_content, embedded_images=images, metadata={}
-            )
+    except Exception as e:
+        logger.exception(f"Failed to extract text/images from {file_name}: {e}")
+        return ExtractionResult(text_content="", embedded_images=[], metadata={})
 
-        # PDF example: we do not show complicated PDF image extraction here
-        # so we simply extract text for now and skip images.
-        if extension == ".pdf":
-            file.seek(0)
-            text_content, pdf_metadata, images = read_pdf_file(
-                file,
-                pdf_pass,
-                extract_images=get_image_extraction_and_analysis_enabled(),
-            )
-            return ExtractionResult(
-                text_content=text_content, embedded_images=images, metadata=pdf_metadata
-            )
 
-        # For PPTX, XLSX, EML, etc., we do not show embedded image logic here.
-        # You can do something similar to docx if needed.
-        if extension == ".pptx":
-            file.seek(0)
-            return ExtractionResult(
-                text_content=pptx_to_text(file, file_name=file_name),
-                embedded_images=[],
-                metadata={},
-            )
+def parse_text_and_images(
+    file: IO[Any],
+    file_name: str,
+    pdf_pass: str | None = None,
+    extract_pdf_images: bool = False,
+) -> ExtractionResult:
+    """
+    The parsing part of extract_text_and_images. Only uses local parsers (never
+    Unstructured) and doesn't read any settings, so it is safe to run in a separate
+    process. Raises on failure.
+    """
+    extension = get_file_ext(file_name)
 
-        if extension == ".xlsx":
-            file.seek(0)
-            return ExtractionResult(
-                text_content=xlsx_to_text(file, file_name=file_name),
-                embedded_images=[],
-                metadata={},
-            )
+    # docx example for embedded images
+    if extension == ".docx":
+        file.seek(0)
+        text_content, images = docx_to_text_and_images(file)
+        return ExtractionResult(
+            text_content=text_content, embedded_images=images, metadata={}
+        )
 
-        if extension == ".eml":
-            file.seek(0)
-            return ExtractionResult(
-                text_content=eml_to_text(file), embedded_images=[], metadata={}
-            )
+    # PDF example: we do not show complicated PDF image extraction here
+    # so we simply extract text for now and skip images.
+    if extension == ".pdf":
+        file.seek(0)
+        text_content, pdf_metadata, images = read_pdf_file(
+            file,
+            pdf_pass,
+            extract_images=extract_pdf_images,
+        )
+        return ExtractionResult(
+            text_content=text_content, embedded_images=images, metadata=pdf_metadata
+        )
 
-        if extension == ".epub":
-            file.seek(0)
-            return ExtractionResult(
-                text_content=epub_to_text(file), embedded_images=[], metadata={}
-            )
+    # For PPTX, XLSX, EML, etc., we do not show embedded image logic here.
+    # You can do something similar to docx if needed.
+    if extension == ".pptx":
+        file.seek(0)
+        return ExtractionResult(
+            text_content=pptx_to_text(file, file_name=file_name),
+            embedded_images=[],
+            metadata={},
+        )
 
-        if extension == ".html":
-            file.seek(0)
-            return ExtractionResult(
-                text_content=parse_html_page_basic(file),
-                embedded_images=[],
-                metadata={},
-            )
+    if extension == ".xlsx":
+        file.seek(0)
+        return ExtractionResult(
+            text_content=xlsx_to_text(file, file_name=file_name),
+            embedded_images=[],
+            metadata={},
+        )
 
-        # If we reach here and it's a recognized text extension
-        if is_text_file_extension(file_name):
-            file.seek(0)
-            encoding = detect_encoding(file)
-            text_content_raw, file_metadata = read_text_file(
-                file, encoding=encoding, ignore_onyx_metadata=False
-            )
-            return ExtractionResult(
-                text_content=text_content_raw,
-                embedded_images=[],
-                metadata=file_metadata,
-            )
+    if extension == ".eml":
+        file.seek(0)
+        return ExtractionResult(
+            text_content=eml_to_text(file), embedded_images=[], metadata={}
+        )
 
-        # If it's an image file or something else, we do not parse embedded images from them
-        # just return empty text
+    if extension == ".epub":
         file.seek(0)
-        return ExtractionResult(text_content="", embedded_images=[], metadata={})
+        return ExtractionResult(
+            text_content=epub_to_text(file), embedded_images=[], metadata={}
+        )
 
-    except Exception as e:
-        logger.exception(f"Failed to extract text/images from {file_name}: {e}")
-        return ExtractionResult(text_content="", embedded_images=[], metadata={})
+    if extension == ".html":
+        file.seek(0)
+        return ExtractionResult(
+            text_content=parse_html_page_basic(file),
+            embedded_images=[],
+            metadata={},
+        )
+
+    # If we reach here and it's a recognized text extension
+    if is_text_file_extension(file_name):
+        file.seek(0)
+        encoding = detect_encoding(file)
+        text_content_raw, file_metadata = read_text_file(
+            file, encoding=encoding, ignore_onyx_metadata=False
+        )
+        return ExtractionResult(
+            text_content=text_content_raw,
+            embedded_images=[],
+            metadata=file_metadata,
+        )
+
+    # If it's an image file or something else, we do not parse embedded images from them
+    # just return empty text
+    file.seek(0)
+    return ExtractionResult(text_content="", embedded_images=[], metadata={})
 
 
 def convert_docx_to_txt(file: UploadFile, file_store: FileStore) -> str:
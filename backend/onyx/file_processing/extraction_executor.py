@@ -0,0 +1,428 @@
+"""Runs the file parsers of extract_file_text in a pool of worker processes.
+
+Parsers like pypdf, python-docx and openpyxl run arbitrary (often pathological) user
+files. Running them in separate processes lets us kill a file that takes too long or
+uses too much memory without taking down the indexing attempt, and lets a batch of
+files (or the pages of a large PDF) use more than one core."""
+
+import threading
+import time
+from collections.abc import Callable
+from collections.abc import Sequence
+from io import BytesIO
+from typing import Any
+from typing import IO
+from typing import NamedTuple
+
+from onyx.configs.app_configs import FILE_EXTRACTION_MAX_MEMORY_MB
+from onyx.configs.app_configs import FILE_EXTRACTION_MAX_TASKS_PER_WORKER
+from onyx.configs.app_configs import FILE_EXTRACTION_PDF_PAGES_PER_TASK
+from onyx.configs.app_configs import FILE_EXTRACTION_PROCESS_POOL_SIZE
+from onyx.configs.app_configs import FILE_EXTRACTION_TIMEOUT_SECONDS
+from onyx.configs.llm_configs import get_image_extraction_and_analysis_enabled
+from onyx.file_processing.extract_file_text import extract_file_text
+from onyx.file_processing.extract_file_text import extract_text_and_images
+from onyx.file_processing.extract_file_text import ExtractionResult
+from onyx.file_processing.extract_file_text import get_file_ext
+from onyx.file_processing.extract_file_text import parse_file_text
+from onyx.file_processing.extract_file_text import parse_text_and_images
+from onyx.file_processing.extract_file_text import read_pdf_pages
+from onyx.file_processing.extract_file_text import TEXT_SECTION_SEPARATOR
+from onyx.file_processing.unstructured import get_unstructured_api_key
+from onyx.utils.logger import setup_logger
+from onyx.utils.spawned_worker_pool import SpawnedWorkerPool
+from onyx.utils.threadpool_concurrency import run_functions_tuples_in_parallel
+
+logger = setup_logger()
+
+# how often a waiting task checks the worker's liveness, deadline and memory
+_POLL_INTERVAL_SECONDS = 0.1
+
+
+class ExtractionInput(NamedTuple):
+    """A file to extract, already read into memory"""
+
+    content: bytes
+    file_name: str
+    pdf_pass: str | None = None
+
+
+class _TaskOutcome(NamedTuple):
+    result: Any
+    error: str | None
+
+
+# The functions below run inside the worker processes. They are module level so
+# they can be pickled by reference.
+
+
+def _parse_text_and_images(
+    content: bytes, file_name: str, pdf_pass: str | None, extract_pdf_images: bool
+) -> ExtractionResult:
+    return parse_text_and_images(
+        BytesIO(content), file_name, pdf_pass, extract_pdf_images=extract_pdf_images
+    )
+
+
+def _parse_file_text(content: bytes, file_name: str, extension: str | None) -> str:
+    return parse_file_text(BytesIO(content), file_name, extension)
+
+
+def _read_pdf_pages(
+    content: bytes,
+    pdf_pass: str | None,
+    extract_images: bool,
+    start_page: int,
+    end_page: int | None,
+) -> tuple[str, dict[str, Any], Sequence[tuple[bytes, str]], int]:
+    return read_pdf_pages(
+        BytesIO(content),
+        pdf_pass,
+        extract_images=extract_images,
+        start_page=start_page,
+        end_page=end_page,
+    )
+
+
+class FileExtractionExecutor:
+    """Parses files in up to `max_workers` worker processes.
+
+    Every task (a file, or a range of pages of a large PDF) gets `timeout_seconds` of
+    wall clock time, and its worker may use up to `max_memory_mb` of RSS. A worker
+    that exceeds either limit is killed and replaced, and only that task fails.
+    Failed files are treated the same way as files the parsers can't handle."""
+
+    def __init__(
+        self,
+        max_workers: int,
+        timeout_seconds: float = FILE_EXTRACTION_TIMEOUT_SECONDS,
+        max_memory_mb: int = FILE_EXTRACTION_MAX_MEMORY_MB,
+        max_tasks_per_worker: int = FILE_EXTRACTION_MAX_TASKS_PER_WORKER,
+        pdf_pages_per_task: int = FILE_EXTRACTION_PDF_PAGES_PER_TASK,
+    ) -> None:
+        self.max_workers = max_workers
+        self.timeout_seconds = timeout_seconds
+        self.max_memory_mb = max_memory_mb
+        self.pdf_pages_per_task = pdf_pages_per_task
+
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._workers = SpawnedWorkerPool(
+            max_tasks_per_worker=max_tasks_per_worker, max_memory_mb=max_memory_mb
+        )
+
+    def _run_task(self, func: Callable, args: tuple[Any, ...]) -> _TaskOutcome:
+        with self._slots:
+            worker = self._workers.acquire()
+            reusable = False
+            try:
+                worker.send(func, args)
+
+                deadline = time.monotonic() + self.timeout_seconds
+                while not worker.poll(_POLL_INTERVAL_SECONDS):
+                    if not worker.is_alive():
+                        return _TaskOutcome(
+                            None,
+                            "extraction process exited with code "
+                            f"{worker.process.exitcode}",
+                        )
+                    if self.timeout_seconds > 0 and time.monotonic() > deadline:
+                        return _TaskOutcome(
+                            None, f"timed out after {self.timeout_seconds} seconds"
+                        )
+                    if self._workers.over_memory_limit(worker):
+                        return _TaskOutcome(
+                            None,
+                            f"exceeded the memory limit of {self.max_memory_mb} MB",
+                        )
+
+                success, value = worker.recv()
+                reusable = True
+                return (
+                    _TaskOutcome(value, None) if success else _TaskOutcome(None, value)
+                )
+            except Exception as e:
+                return _TaskOutcome(None, f"{type(e).__name__}: {e}")
+            finally:
+                # a worker that ballooned on this file is replaced by the pool
+                # rather than reused
+                self._workers.release(worker, reusable)
+
+    def _run_tasks(
+        self, tasks: Sequence[tuple[Callable, tuple[Any, ...]]]
+    ) -> list[_TaskOutcome]:
+        if len(tasks) == 1:
+            func, args = tasks[0]
+            return [self._run_task(func, args)]
+
+        return run_functions_tuples_in_parallel(
+            [(self._run_task, task) for task in tasks],
+            max_workers=self.max_workers,
+        )
+
+    def _pdf_range_tasks(
+        self, extraction_input: ExtractionInput, extract_images: bool, page_count: int
+    ) -> list[tuple[Callable, tuple[Any, ...]]]:
+        """The tasks for every page range of a PDF after the first one"""
+        return [
+            (
+                _read_pdf_pages,
+                (
+                    extraction_input.content,
+                    extraction_input.pdf_pass,
+                    extract_images,
+                    start_page,
+                    start_page + self.pdf_pages_per_task,
+                ),
+            )
+            for start_page in range(
+                self.pdf_pages_per_task, page_count, self.pdf_pages_per_task
+            )
+        ]
+
+    def _extract_files(
+        self, extraction_inputs: Sequence[ExtractionInput], extract_pdf_images: bool
+    ) -> list[_TaskOutcome]:
+        """Extracts all files in parallel, the outcomes (with an `ExtractionResult`
+        as result) are in the order of the inputs.
+
+        PDFs are first read up to `pdf_pages_per_task` pages. The remaining pages of
+        longer PDFs are then read in ranges in parallel and stitched back in order.
+        A PDF only fails if its first range does, the text of other failed ranges is
+        left out."""
+        split_pdfs = self.pdf_pages_per_task > 0
+        is_pdf = [
+            split_pdfs and get_file_ext(extraction_input.file_name) == ".pdf"
+            for extraction_input in extraction_inputs
+        ]
+
+        first_tasks: list[tuple[Callable, tuple[Any, ...]]] = [
+            (
+                (
+                    _read_pdf_pages,
+                    (
+                        extraction_input.content,
+                        extraction_input.pdf_pass,
+                        extract_pdf_images,
+                        0,
+                        self.pdf_pages_per_task,
+                    ),
+                )
+                if pdf
+                else (
+                    _parse_text_and_images,
+                    (
+                        extraction_input.content,
+                        extraction_input.file_name,
+                        extraction_input.pdf_pass,
+                        extract_pdf_images,
+                    ),
+                )
+            )
+            for extraction_input, pdf in zip(extraction_inputs, is_pdf)
+        ]
+        first_outcomes = self._run_tasks(first_tasks)
+
+        # the remaining page ranges of all long PDFs go into one more round
+        range_tasks: list[tuple[Callable, tuple[Any, ...]]] = []
+        range_task_indices: list[tuple[int, int]] = []
+        for ind, (extraction_input, pdf, outcome) in enumerate(
+            zip(extraction_inputs, is_pdf, first_outcomes)
+        ):
+            if not pdf or outcome.error is not None:
+                continue
+            tasks = self._pdf_range_tasks(
+                extraction_input, extract_pdf_images, page_count=outcome.result[3]
+            )
+            range_task_indices.append((len(range_tasks), len(range_tasks) + len(tasks)))
+            range_tasks.extend(tasks)
+        range_outcomes = self._run_tasks(range_tasks) if range_tasks else []
+
+        outcomes: list[_TaskOutcome] = []
+        range_task_indices_iter = iter(range_task_indices)
+        for extraction_input, pdf, outcome in zip(
+            extraction_inputs, is_pdf, first_outcomes
+        ):
+            if not pdf or outcome.error is not None:
+                outcomes.append(outcome)
+                continue
+
+            file_name = extraction_input.file_name
+            text, metadata, images, _ = outcome.result
+            texts = [text]
+            all_images = list(images)
+            start, end = next(range_task_indices_iter)
+            for range_outcome in range_outcomes[start:end]:
+                if range_outcome.error is not None:
+                    logger.warning(
+                        f"Failed to extract a page range of {file_name}, its text "
+                        f"will be missing: {range_outcome.error}"
+                    )
+                    continue
+                range_text, _, range_images, _ = range_outcome.result
+                texts.append(range_text)
+                all_images.extend(range_images)
+
+            outcomes.append(
+                _TaskOutcome(
+                    ExtractionResult(
+                        text_content=TEXT_SECTION_SEPARATOR.join(texts),
+                        embedded_images=all_images,
+                        metadata=metadata,
+                    ),
+                    None,
+                )
+            )
+
+        return outcomes
+
+    def extract_text_and_images(
+        self, extraction_inputs: Sequence[ExtractionInput], extract_pdf_images: bool
+    ) -> list[ExtractionResult]:
+        """Extracts all files in parallel, results are in the order of the inputs.
+        Files that couldn't be extracted get an empty result, like files the parsers
+        can't handle."""
+        results: list[ExtractionResult] = []
+        for extraction_input, outcome in zip(
+            extraction_inputs,
+            self._extract_files(extraction_inputs, extract_pdf_images),
+        ):
+            if outcome.error is not None:
+                logger.warning(
+                    "Failed to extract text/images from "
+                    f"{extraction_input.file_name}: {outcome.error}"
+                )
+                results.append(
+                    ExtractionResult(text_content="", embedded_images=[], metadata={})
+                )
+                continue
+            results.append(outcome.result)
+
+        return results
+
+    def extract_file_text(
+        self, content: bytes, file_name: str, extension: str | None = None
+    ) -> str:
+        """Same as `parse_file_text`, raises if the file couldn't be extracted"""
+        if extension is None:
+            extension = get_file_ext(file_name)
+
+        if extension == ".pdf":
+            # goes through the page range splitting. The parser itself never raises
+            # on a pdf, but the worker can still time out or die
+            [outcome] = self._extract_files(
+                [ExtractionInput(content=content, file_name=file_name)],
+                extract_pdf_images=False,
+            )
+            if outcome.error is not None:
+                raise RuntimeError(outcome.error)
+            return outcome.result.text_content
+
+        [outcome] = self._run_tasks(
+            [(_parse_file_text, (content, file_name, extension))]
+        )
+        if outcome.error is not None:
+            raise RuntimeError(outcome.error)
+        return outcome.result
+
+    def shutdown(self) -> None:
+        self._workers.shutdown()
+
+
+_file_extraction_executor: FileExtractionExecutor | None = None
+_file_extraction_executor_lock = threading.Lock()
+
+
+def get_file_extraction_executor() -> FileExtractionExecutor | None:
+    """Returns the process wide executor, or None if files should be parsed inline
+    (FILE_EXTRACTION_PROCESS_POOL_SIZE is 0)."""
+    global _file_extraction_executor
+
+    if FILE_EXTRACTION_PROCESS_POOL_SIZE <= 0:
+        return None
+
+    with _file_extraction_executor_lock:
+        if _file_extraction_executor is None:
+            _file_extraction_executor = FileExtractionExecutor(
+                max_workers=FILE_EXTRACTION_PROCESS_POOL_SIZE
+            )
+        return _file_extraction_executor
+
+
+def batch_extract_text_and_images(
+    extraction_inputs: Sequence[ExtractionInput],
+) -> list[ExtractionResult]:
+    """Same as calling `extract_text_and_images` for every input, but the files are
+    parsed in parallel in the extraction process pool if it is enabled."""
+    executor = get_file_extraction_executor()
+    # Unstructured is a remote API, there is nothing to isolate
+    if executor is None or get_unstructured_api_key():
+        return [
+            extract_text_and_images(
+                BytesIO(extraction_input.content),
+                extraction_input.file_name,
+                pdf_pass=extraction_input.pdf_pass,
+            )
+            for extraction_input in extraction_inputs
+        ]
+
+    return executor.extract_text_and_images(
+        extraction_inputs,
+        extract_pdf_images=get_image_extraction_and_analysis_enabled(),
+    )
+
+
+def extract_text_and_images_sandboxed(
+    file: IO[Any],
+    file_name: str,
+    pdf_pass: str | None = None,
+) -> ExtractionResult:
+    """Drop-in replacement for `extract_text_and_images` that parses the file in the
+    extraction process pool if it is enabled."""
+    if get_file_extraction_executor() is None:
+        return extract_text_and_images(file, file_name, pdf_pass=pdf_pass)
+
+    file.seek(0)
+    [result] = batch_extract_text_and_images(
+        [ExtractionInput(content=file.read(), file_name=file_name, pdf_pass=pdf_pass)]
+    )
+    return result
+
+
+def parse_file_text_sandboxed(
+    file: IO[Any], file_name: str, extension: str | None = None
+) -> str:
+    """Drop-in replacement for `parse_file_text` (local parsers only, raises on
+    failure) that parses the file in the extraction process pool if it is enabled."""
+    executor = get_file_extraction_executor()
+    if executor is None:
+        return parse_file_text(file, file_name, extension)
+
+    file.seek(0)
+    return executor.extract_file_text(file.read(), file_name, extension)
+
+
+def extract_file_text_sandboxed(
+    file: IO[Any],
+    file_name: str,
+    break_on_unprocessable: bool = True,
+    extension: str | None = None,
+) -> str:
+    """Drop-in replacement for `extract_file_text` that parses the file in the
+    extraction process pool if it is enabled."""
+    if get_file_extraction_executor() is None or get_unstructured_api_key():
+        return extract_file_text(
+            file,
+            file_name,
+            break_on_unprocessable=break_on_unprocessable,
+            extension=extension,
+        )
+
+    try:
+        return parse_file_text_sandboxed(file, file_name, extension)
+    except Exception as e:
+        if break_on_unprocessable:
+            raise RuntimeError(
+                f"Failed to process file {file_name or 'Unknown'}: {str(e)}"
+            ) from e
+        logger.warning(f"Failed to process file {file_name or 'Unknown'}: {str(e)}")
+        return ""
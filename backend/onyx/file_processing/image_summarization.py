@@ -1,4 +1,5 @@
 import base64
+import hashlib
 from io import BytesIO
 
 from langchain_core.messages import BaseMessage
@@ -8,6 +9,7 @@ from PIL import Image
 
 from onyx.configs.app_configs import IMAGE_SUMMARIZATION_SYSTEM_PROMPT
 from onyx.configs.app_configs import IMAGE_SUMMARIZATION_USER_PROMPT
+from onyx.db.llm_result_cache import build_llm_cache_key
 from onyx.llm.interfaces import LLM
 from onyx.llm.utils import message_to_string
 from onyx.utils.logger import setup_logger
@@ -77,6 +79,25 @@ def summarize_image_with_error_handling(
     return summarize_image_pipeline(llm, image_data, user_prompt, system_prompt)
 
 
+def get_image_summary_cache_key(
+    llm: LLM,
+    image_data: bytes,
+    system_prompt: str = IMAGE_SUMMARIZATION_SYSTEM_PROMPT,
+    user_prompt_template: str = IMAGE_SUMMARIZATION_USER_PROMPT,
+) -> str:
+    """Key of the summary of an image in the LLM result cache. Images are keyed by
+    their content, so the same image is summarized once per model and prompt no
+    matter how many documents (or file names) it appears under."""
+    return build_llm_cache_key(
+        "image_summary",
+        llm.config.model_provider,
+        llm.config.model_name,
+        system_prompt,
+        user_prompt_template,
+        hashlib.sha256(image_data).digest(),
+    )
+
+
 def _summarize_image(
     encoded_image: str,
     llm: LLM,
@@ -9,12 +9,15 @@ from typing import IO
 
 import boto3
 import puremagic
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from botocore.exceptions import ClientError
 from mypy_boto3_s3 import S3Client
 from sqlalchemy.orm import Session
 
 from onyx.configs.app_configs import AWS_REGION_NAME
+from onyx.configs.app_configs import FILE_STORE_MULTIPART_CHUNK_SIZE_BYTES
+from onyx.configs.app_configs import FILE_STORE_STREAMING_THRESHOLD_BYTES
 from onyx.configs.app_configs import S3_AWS_ACCESS_KEY_ID
 from onyx.configs.app_configs import S3_AWS_SECRET_ACCESS_KEY
 from onyx.configs.app_configs import S3_ENDPOINT_URL
@@ -34,6 +37,23 @@ from shared_configs.contextvars import get_current_tenant_id
 
 logger = setup_logger()
 
+# keeps the memory used by a multipart upload to a few parts
+_MULTIPART_MAX_CONCURRENCY = 4
+
+
+def _get_remaining_size(content: IO) -> int | None:
+    """Number of bytes left to read in `content`, None if it can't be determined
+    without reading it (e.g. non-seekable streams)."""
+    try:
+        if not content.seekable():
+            return None
+        position = content.tell()
+        end = content.seek(0, 2)
+        content.seek(position)
+        return end - position
+    except (AttributeError, OSError, ValueError):
+        return None
+
 
 class FileStore(ABC):
     """
@@ -108,6 +128,36 @@ class FileStore(ABC):
             Contents of the file and metadata dict
         """
 
+    @abstractmethod
+    def read_file_stream(self, file_id: str) -> IO[bytes]:
+        """
+        Open a stream over the content of a given file without downloading it first.
+        The stream is not seekable and must be closed by the caller.
+
+        Parameters:
+        - file_id: Unique ID of file to read
+
+        Returns:
+            Non-seekable file-like object over the contents of the file
+        """
+
+    @abstractmethod
+    def read_file_range(
+        self, file_id: str, start: int, end: int | None = None
+    ) -> bytes:
+        """
+        Read a byte range of a given file
+
+        Parameters:
+        - file_id: Unique ID of file to read
+        - start: Offset of the first byte to read
+        - end: Offset of the last byte to read (inclusive). Reads to the end of the
+               file if not provided.
+
+        Returns:
+            The requested bytes
+        """
+
     @abstractmethod
     def read_file_record(self, file_id: str) -> FileStoreModel:
         """
@@ -143,6 +193,8 @@ class S3BackedFileStore(FileStore):
         s3_endpoint_url: str | None = None,
         s3_prefix: str | None = None,
         s3_verify_ssl: bool = True,
+        streaming_threshold_bytes: int = FILE_STORE_STREAMING_THRESHOLD_BYTES,
+        multipart_chunk_size_bytes: int = FILE_STORE_MULTIPART_CHUNK_SIZE_BYTES,
     ) -> None:
         self.db_session = db_session
         self._s3_client: S3Client | None = None
@@ -153,6 +205,8 @@ class S3BackedFileStore(FileStore):
         self._s3_endpoint_url = s3_endpoint_url
         self._s3_prefix = s3_prefix or "onyx-files"
         self._s3_verify_ssl = s3_verify_ssl
+        self._streaming_threshold_bytes = streaming_threshold_bytes
+        self._multipart_chunk_size_bytes = multipart_chunk_size_bytes
 
     def _get_s3_client(self) -> S3Client:
         """Initialize S3 client if not already done"""
@@ -298,21 +352,43 @@ class S3BackedFileStore(FileStore):
         bucket_name = self._get_bucket_name()
         s3_key = self._get_s3_key(file_id)
 
-        # Read content from IO object
-        if hasattr(content, "read"):
-            file_content = content.read()
-            if hasattr(content, "seek"):
+        content_size = (
+            _get_remaining_size(content) if hasattr(content, "read") else None
+        )
+        if hasattr(content, "read") and (
+            content_size is None or content_size >= self._streaming_threshold_bytes
+        ):
+            # Large (or unknown size) content is streamed as a multipart upload
+            # so that it never has to be fully held in memory
+            s3_client.upload_fileobj(
+                Fileobj=content,
+                Bucket=bucket_name,
+                Key=s3_key,
+                ExtraArgs={"ContentType": file_type},
+                Config=TransferConfig(
+                    multipart_threshold=self._streaming_threshold_bytes,
+                    multipart_chunksize=self._multipart_chunk_size_bytes,
+                    max_concurrency=_MULTIPART_MAX_CONCURRENCY,
+                ),
+            )
+            if content_size is not None:
                 content.seek(0)  # Reset position for potential re-reads
         else:
-            file_content = content
-
-        # Upload to S3
-        s3_client.put_object(
-            Bucket=bucket_name,
-            Key=s3_key,
-            Body=file_content,
-            ContentType=file_type,
-        )
+            # Read content from IO object
+            if hasattr(content, "read"):
+                file_content = content.read()
+                if hasattr(content, "seek"):
+                    content.seek(0)  # Reset position for potential re-reads
+            else:
+                file_content = content
+
+            # Upload to S3
+            s3_client.put_object(
+                Bucket=bucket_name,
+                Key=s3_key,
+                Body=file_content,
+                ContentType=file_type,
+            )
 
         # Save metadata to database
         upsert_filerecord(
@@ -329,32 +405,67 @@ class S3BackedFileStore(FileStore):
 
         return file_id
 
-    def read_file(
-        self, file_id: str, mode: str | None = None, use_tempfile: bool = False
-    ) -> IO[bytes]:
+    def _get_object(self, file_id: str, byte_range: str | None = None) -> Any:
         file_record = get_filerecord_by_file_id(
             file_id=file_id, db_session=self.db_session
         )
 
         s3_client = self._get_s3_client()
+        get_object_kwargs: dict[str, Any] = {
+            "Bucket": file_record.bucket_name,
+            "Key": file_record.object_key,
+        }
+        if byte_range is not None:
+            get_object_kwargs["Range"] = byte_range
+
         try:
-            response = s3_client.get_object(
-                Bucket=file_record.bucket_name, Key=file_record.object_key
-            )
+            return s3_client.get_object(**get_object_kwargs)
         except ClientError:
             logger.error(f"Failed to read file {file_id} from S3")
             raise
 
-        file_content = response["Body"].read()
+    def read_file(
+        self, file_id: str, mode: str | None = None, use_tempfile: bool = False
+    ) -> IO[bytes]:
+        response = self._get_object(file_id)
+        body = response["Body"]
 
         if use_tempfile:
             # Always open in binary mode for temp files since we're writing bytes
             temp_file = tempfile.NamedTemporaryFile(mode="w+b", delete=False)
-            temp_file.write(file_content)
+            for chunk in body.iter_chunks(chunk_size=self._multipart_chunk_size_bytes):
+                temp_file.write(chunk)
             temp_file.seek(0)
             return temp_file
-        else:
-            return BytesIO(file_content)
+
+        content_length = response.get("ContentLength")
+        if content_length is not None and (
+            content_length < self._streaming_threshold_bytes
+        ):
+            return BytesIO(body.read())
+
+        # Large files are downloaded in chunks and spill to disk past the threshold
+        spooled_file = tempfile.SpooledTemporaryFile(
+            max_size=self._streaming_threshold_bytes, mode="w+b"
+        )
+        for chunk in body.iter_chunks(chunk_size=self._multipart_chunk_size_bytes):
+            spooled_file.write(chunk)
+        spooled_file.seek(0)
+        return cast(IO[bytes], spooled_file)
+
+    def read_file_stream(self, file_id: str) -> IO[bytes]:
+        response = self._get_object(file_id)
+        return cast(IO[bytes], response["Body"])
+
+    def read_file_range(
+        self, file_id: str, start: int, end: int | None = None
+    ) -> bytes:
+        if start < 0 or (end is not None and end < start):
+            raise ValueError(f"Invalid byte range: start={start}, end={end}")
+
+        byte_range = f"bytes={start}-{end if end is not None else ''}"
+        response = self._get_object(file_id, byte_range=byte_range)
+        return response["Body"].read()
 
     def read_file_record(self, file_id: str) -> FileStoreModel:
         file_record = get_filerecord_by_file_id(
@@ -2,10 +2,13 @@ import time
 from abc import ABC
 from abc import abstractmethod
 from collections import defaultdict
+from collections.abc import Callable
 
+from onyx.configs.app_configs import ENABLE_EMBEDDING_CACHE
 from onyx.connectors.models import ConnectorFailure
 from onyx.connectors.models import DocumentFailure
 from onyx.db.models import SearchSettings
+from onyx.indexing.embedding_cache import EmbeddingCache
 from onyx.indexing.indexing_heartbeat import IndexingHeartbeatInterface
 from onyx.indexing.models import ChunkEmbedding
 from onyx.indexing.models import DocAwareChunk
@@ -15,6 +18,7 @@ from onyx.utils.logger import setup_logger
 from onyx.utils.timing import log_function_time
 from shared_configs.configs import INDEXING_MODEL_SERVER_HOST
 from shared_configs.configs import INDEXING_MODEL_SERVER_PORT
+from shared_configs.contextvars import get_current_tenant_id
 from shared_configs.enums import EmbeddingProvider
 from shared_configs.enums import EmbedTextType
 from shared_configs.model_server_models import Embedding
@@ -40,6 +44,7 @@ class IndexingEmbedder(ABC):
         deployment_name: str | None,
         reduced_dimension: int | None,
         callback: IndexingHeartbeatInterface | None,
+        embedding_cache: EmbeddingCache | None = None,
     ):
         self.model_name = model_name
         self.normalize = normalize
@@ -69,6 +74,37 @@ class IndexingEmbedder(ABC):
             callback=callback,
         )
 
+        # Passage embeddings only depend on the model settings and the text, so
+        # unchanged chunks can reuse previously computed embeddings
+        if embedding_cache is None and ENABLE_EMBEDDING_CACHE:
+            embedding_cache = EmbeddingCache(
+                model_name=model_name,
+                normalize=normalize,
+                prefix=passage_prefix,
+                provider_type=provider_type,
+                reduced_dimension=reduced_dimension,
+            )
+        self.embedding_cache = embedding_cache
+
+    def _encode_with_cache(
+        self,
+        texts: list[str],
+        encode: Callable[[list[str]], list[Embedding]],
+        tenant_id: str | None,
+        large_chunks_present: bool = False,
+    ) -> list[Embedding]:
+        """Looks up the texts in the embedding cache (if enabled) and only sends
+        the misses to `encode`. Output order matches the input order."""
+        if self.embedding_cache is None:
+            return encode(texts)
+
+        return self.embedding_cache.embed_with_cache(
+            texts,
+            encode,
+            tenant_id=tenant_id or get_current_tenant_id(),
+            large_chunks_present=large_chunks_present,
+        )
+
     @abstractmethod
     def embed_chunks(
         self,
@@ -93,6 +129,7 @@ class DefaultIndexingEmbedder(IndexingEmbedder):
         deployment_name: str | None = None,
         reduced_dimension: int | None = None,
         callback: IndexingHeartbeatInterface | None = None,
+        embedding_cache: EmbeddingCache | None = None,
     ):
         super().__init__(
             model_name,
@@ -106,6 +143,7 @@ class DefaultIndexingEmbedder(IndexingEmbedder):
             deployment_name,
             reduced_dimension,
             callback,
+            embedding_cache,
         )
 
     @log_function_time()
@@ -143,12 +181,17 @@ class DefaultIndexingEmbedder(IndexingEmbedder):
                     raise RuntimeError("Large chunk contains mini chunks")
                 flat_chunk_texts.extend(chunk.mini_chunk_texts)
 
-        embeddings = self.embedding_model.encode(
-            texts=flat_chunk_texts,
-            text_type=EmbedTextType.PASSAGE,
-            large_chunks_present=large_chunks_present,
+        embeddings = self._encode_with_cache(
+            flat_chunk_texts,
+            lambda texts: self.embedding_model.encode(
+                texts=texts,
+                text_type=EmbedTextType.PASSAGE,
+                large_chunks_present=large_chunks_present,
+                tenant_id=tenant_id,
+                request_id=request_id,
+            ),
             tenant_id=tenant_id,
-            request_id=request_id,
+            large_chunks_present=large_chunks_present,
         )
 
         chunk_titles = {
@@ -163,11 +206,15 @@ class DefaultIndexingEmbedder(IndexingEmbedder):
         # Cache the Title embeddings to only have to do it once
         title_embed_dict: dict[str, Embedding] = {}
         if chunk_titles_list:
-            title_embeddings = self.embedding_model.encode(
+            title_embeddings = self._encode_with_cache(
                 chunk_titles_list,
-                text_type=EmbedTextType.PASSAGE,
+                lambda texts: self.embedding_model.encode(
+                    texts,
+                    text_type=EmbedTextType.PASSAGE,
+                    tenant_id=tenant_id,
+                    request_id=request_id,
+                ),
                 tenant_id=tenant_id,
-                request_id=request_id,
             )
             title_embed_dict.update(
                 {
@@ -224,6 +271,7 @@ class DefaultIndexingEmbedder(IndexingEmbedder):
         cls,
         search_settings: SearchSettings,
         callback: IndexingHeartbeatInterface | None = None,
+        embedding_cache: EmbeddingCache | None = None,
     ) -> "DefaultIndexingEmbedder":
         return cls(
             model_name=search_settings.model_name,
@@ -237,6 +285,7 @@ class DefaultIndexingEmbedder(IndexingEmbedder):
             deployment_name=search_settings.deployment_name,
             reduced_dimension=search_settings.reduced_dimension,
             callback=callback,
+            embedding_cache=embedding_cache,
         )
 
 
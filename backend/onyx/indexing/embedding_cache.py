@@ -0,0 +1,281 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import cast
+
+import numpy as np
+from redis.client import Redis
+
+from onyx.configs.app_configs import EMBEDDING_CACHE_LOCAL_MAX_ENTRIES
+from onyx.configs.app_configs import EMBEDDING_CACHE_TTL_SECONDS
+from onyx.configs.app_configs import QUERY_EMBEDDING_CACHE_LOCAL_MAX_ENTRIES
+from onyx.configs.app_configs import QUERY_EMBEDDING_CACHE_MAX_NAMESPACES
+from onyx.configs.app_configs import QUERY_EMBEDDING_CACHE_TTL_SECONDS
+from onyx.db.models import SearchSettings
+from onyx.redis.redis_pool import get_raw_redis_client
+from onyx.utils.logger import setup_logger
+from shared_configs.enums import EmbeddingProvider
+from shared_configs.enums import EmbedTextType
+from shared_configs.model_server_models import Embedding
+
+logger = setup_logger()
+
+
+EMBEDDING_CACHE_REDIS_PREFIX = "embedding_cache"
+
+
+def hash_embedding_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Content-addressed cache of passage (or query) embeddings.
+
+    Entries are keyed by everything that influences the resulting vector (model,
+    provider, normalization, text type and its prefix, reduced dimension and the max
+    sequence length bucket) plus the sha256 of the exact text sent to the model
+    server. Redis is the shared tier so that separate processes benefit from each
+    other, a bounded in-process LRU sits in front of it. Vectors are stored as
+    float32 bytes.
+
+    Redis failures are logged and treated as misses, the cache must never cause
+    indexing or search to fail."""
+
+    def __init__(
+        self,
+        model_name: str,
+        normalize: bool,
+        prefix: str | None,
+        provider_type: EmbeddingProvider | None,
+        reduced_dimension: int | None,
+        text_type: EmbedTextType = EmbedTextType.PASSAGE,
+        redis_client: Redis | None = None,
+        ttl_seconds: int = EMBEDDING_CACHE_TTL_SECONDS,
+        max_local_entries: int = EMBEDDING_CACHE_LOCAL_MAX_ENTRIES,
+    ) -> None:
+        self.namespace = self.build_namespace(
+            model_name=model_name,
+            normalize=normalize,
+            prefix=prefix,
+            provider_type=provider_type,
+            reduced_dimension=reduced_dimension,
+            text_type=text_type,
+        )
+
+        # keys are prefixed manually (in the same format as TenantRedis) since
+        # pipelines on the tenant client are not prefixed
+        self.redis_client = redis_client or get_raw_redis_client()
+        self.ttl_seconds = ttl_seconds
+        self.max_local_entries = max_local_entries
+
+        self._local: OrderedDict[str, Embedding] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def build_namespace(
+        model_name: str,
+        normalize: bool,
+        prefix: str | None,
+        provider_type: EmbeddingProvider | None,
+        reduced_dimension: int | None,
+        text_type: EmbedTextType = EmbedTextType.PASSAGE,
+    ) -> str:
+        namespace_parts = [
+            model_name,
+            str(provider_type.value if provider_type else None),
+            str(normalize),
+            prefix or "",
+            str(reduced_dimension),
+        ]
+        # passage namespaces predate query caching, keep them as they were
+        if text_type != EmbedTextType.PASSAGE:
+            namespace_parts.append(text_type.value)
+
+        # the namespace is hashed since prefixes may contain arbitrary characters
+        return hash_embedding_text("|".join(namespace_parts))[:16]
+
+    def _cache_key(
+        self, tenant_id: str, text_hash: str, large_chunks_present: bool
+    ) -> str:
+        # large chunk batches are trimmed to a longer max length before embedding
+        length_bucket = "large" if large_chunks_present else "regular"
+        return (
+            f"{tenant_id}:{EMBEDDING_CACHE_REDIS_PREFIX}:"
+            f"{self.namespace}:{length_bucket}:{text_hash}"
+        )
+
+    def _get_local(self, key: str) -> Embedding | None:
+        with self._lock:
+            embedding = self._local.get(key)
+            if embedding is not None:
+                self._local.move_to_end(key)
+            return embedding
+
+    def _set_local(self, key: str, embedding: Embedding) -> None:
+        if self.max_local_entries <= 0:
+            return
+
+        with self._lock:
+            self._local[key] = embedding
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_local_entries:
+                self._local.popitem(last=False)
+
+    def get_many(
+        self,
+        texts: list[str],
+        tenant_id: str,
+        large_chunks_present: bool = False,
+    ) -> list[Embedding | None]:
+        """Returns the cached embedding for each text, or None for misses.
+        Output order matches the input order."""
+        keys = [
+            self._cache_key(tenant_id, hash_embedding_text(text), large_chunks_present)
+            for text in texts
+        ]
+        results: list[Embedding | None] = [self._get_local(key) for key in keys]
+
+        remote_indices = [i for i, result in enumerate(results) if result is None]
+        if remote_indices:
+            try:
+                raw_values = self.redis_client.mget([keys[i] for i in remote_indices])
+                for i, raw_value in zip(remote_indices, raw_values):
+                    if not raw_value:
+                        continue
+
+                    embedding = np.frombuffer(
+                        raw_value, dtype=np.float32  # type: ignore[arg-type]
+                    ).tolist()
+                    results[i] = embedding
+                    self._set_local(keys[i], embedding)
+            except Exception:
+                logger.exception("Failed to read embeddings from the cache")
+
+        num_hits = sum(1 for result in results if result is not None)
+        with self._lock:
+            self.hits += num_hits
+            self.misses += len(results) - num_hits
+
+        return results
+
+    def set_many(
+        self,
+        texts: list[str],
+        embeddings: list[Embedding],
+        tenant_id: str,
+        large_chunks_present: bool = False,
+    ) -> None:
+        if len(texts) != len(embeddings):
+            raise ValueError(
+                f"Number of texts ({len(texts)}) does not match "
+                f"number of embeddings ({len(embeddings)})"
+            )
+
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for text, embedding in zip(texts, embeddings):
+                key = self._cache_key(
+                    tenant_id, hash_embedding_text(text), large_chunks_present
+                )
+                self._set_local(key, embedding)
+                pipe.set(
+                    key,
+                    np.asarray(embedding, dtype=np.float32).tobytes(),
+                    ex=self.ttl_seconds,
+                )
+            pipe.execute()
+        except Exception:
+            logger.exception("Failed to write embeddings to the cache")
+
+    def embed_with_cache(
+        self,
+        texts: list[str],
+        encode: Callable[[list[str]], list[Embedding]],
+        tenant_id: str,
+        large_chunks_present: bool = False,
+    ) -> list[Embedding]:
+        """Looks up the texts in the cache and only sends the misses to `encode`,
+        storing its results. Output order matches the input order."""
+        embeddings = self.get_many(
+            texts, tenant_id=tenant_id, large_chunks_present=large_chunks_present
+        )
+
+        # identical texts within the batch only need to be embedded once
+        miss_texts = list(
+            dict.fromkeys(
+                text for text, embedding in zip(texts, embeddings) if embedding is None
+            )
+        )
+        logger.debug(
+            f"Embedding cache: {len(texts) - len(miss_texts)} hits, "
+            f"{len(miss_texts)} texts to embed "
+            f"(lifetime hit rate {self.hit_rate:.2%})"
+        )
+        if not miss_texts:
+            return cast(list[Embedding], embeddings)
+
+        miss_embeddings = encode(miss_texts)
+        self.set_many(
+            miss_texts,
+            miss_embeddings,
+            tenant_id=tenant_id,
+            large_chunks_present=large_chunks_present,
+        )
+
+        new_embeddings = dict(zip(miss_texts, miss_embeddings))
+        return [
+            embedding if embedding is not None else new_embeddings[text]
+            for text, embedding in zip(texts, embeddings)
+        ]
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+_query_embedding_caches: OrderedDict[str, EmbeddingCache] = OrderedDict()
+_query_embedding_caches_lock = threading.Lock()
+
+
+def get_query_embedding_cache(search_settings: SearchSettings) -> EmbeddingCache:
+    """Process wide query embedding cache for the given search settings. One cache
+    is kept per embedding configuration so the in-memory tier survives across
+    requests. Tenants with different settings are served from the same process, so
+    the caches of the QUERY_EMBEDDING_CACHE_MAX_NAMESPACES most recently used
+    configurations are kept."""
+    namespace = EmbeddingCache.build_namespace(
+        model_name=search_settings.model_name,
+        normalize=search_settings.normalize,
+        prefix=search_settings.query_prefix,
+        provider_type=search_settings.provider_type,
+        reduced_dimension=search_settings.reduced_dimension,
+        text_type=EmbedTextType.QUERY,
+    )
+
+    with _query_embedding_caches_lock:
+        cache = _query_embedding_caches.get(namespace)
+        if cache is not None:
+            _query_embedding_caches.move_to_end(namespace)
+            return cache
+
+        cache = EmbeddingCache(
+            model_name=search_settings.model_name,
+            normalize=search_settings.normalize,
+            prefix=search_settings.query_prefix,
+            provider_type=search_settings.provider_type,
+            reduced_dimension=search_settings.reduced_dimension,
+            text_type=EmbedTextType.QUERY,
+            ttl_seconds=QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+            max_local_entries=QUERY_EMBEDDING_CACHE_LOCAL_MAX_ENTRIES,
+        )
+        _query_embedding_caches[namespace] = cache
+        while len(_query_embedding_caches) > max(
+            1, QUERY_EMBEDDING_CACHE_MAX_NAMESPACES
+        ):
+            _query_embedding_caches.popitem(last=False)
+        return cache
@@ -1,17 +1,22 @@
+import threading
 from collections import defaultdict
 from collections.abc import Callable
 from functools import partial
 from typing import Protocol
 
+from langchain.schema.language_model import LanguageModelInput
+from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 from pydantic import ConfigDict
 from sqlalchemy.orm import Session
 
 from onyx.access.access import get_access_for_documents
 from onyx.access.models import DocumentAccess
+from onyx.configs.app_configs import CONTEXTUAL_RAG_MAX_CONCURRENT_LLM_CALLS
 from onyx.configs.app_configs import DEFAULT_CONTEXTUAL_RAG_LLM_NAME
 from onyx.configs.app_configs import DEFAULT_CONTEXTUAL_RAG_LLM_PROVIDER
 from onyx.configs.app_configs import ENABLE_CONTEXTUAL_RAG
+from onyx.configs.app_configs import IMAGE_SUMMARIZATION_MAX_CONCURRENCY
 from onyx.configs.app_configs import MAX_DOCUMENT_CHARS
 from onyx.configs.app_configs import MAX_TOKENS_FOR_FULL_INCLUSION
 from onyx.configs.app_configs import USE_CHUNK_SUMMARY
@@ -42,6 +47,9 @@ from onyx.db.document import upsert_document_by_connector_credential_pair
 from onyx.db.document import upsert_documents
 from onyx.db.document_set import fetch_document_sets_for_documents
 from onyx.db.engine.sql_engine import get_session_with_current_tenant
+from onyx.db.llm_result_cache import build_llm_cache_key
+from onyx.db.llm_result_cache import fetch_llm_results
+from onyx.db.llm_result_cache import store_llm_results
 from onyx.db.models import Document as DBDocument
 from onyx.db.models import IndexModelStatus
 from onyx.db.search_settings import get_active_search_settings
@@ -56,6 +64,7 @@ from onyx.document_index.document_index_utils import (
 from onyx.document_index.interfaces import DocumentIndex
 from onyx.document_index.interfaces import DocumentMetadata
 from onyx.document_index.interfaces import IndexBatchParams
+from onyx.file_processing.image_summarization import get_image_summary_cache_key
 from onyx.file_processing.image_summarization import summarize_image_with_error_handling
 from onyx.file_store.file_store import get_default_file_store
 from onyx.file_store.utils import store_user_file_plaintext
@@ -75,6 +84,7 @@ from onyx.llm.factory import get_llm_for_contextual_rag
 from onyx.llm.interfaces import LLM
 from onyx.llm.utils import MAX_CONTEXT_TOKENS
 from onyx.llm.utils import message_to_string
+from onyx.llm.utils import model_supports_explicit_prompt_caching
 from onyx.natural_language_processing.search_nlp_models import (
     InformationContentClassificationModel,
 )
@@ -94,6 +104,10 @@ from shared_configs.configs import (
 
 logger = setup_logger()
 
+# kinds of contextual RAG results in the LLM result cache
+_DOC_SUMMARY_KIND = "contextual_rag_doc_summary"
+_CHUNK_CONTEXT_KIND = "contextual_rag_chunk_context"
+
 
 class DocumentBatchPrepareContext(BaseModel):
     updatable_docs: list[Document]
@@ -479,6 +493,16 @@ def process_image_sections(documents: list[Document]) -> list[IndexingDocument]:
             for document in documents
         ]
 
+    image_file_ids = list(
+        {
+            section.image_file_id
+            for document in documents
+            for section in document.sections
+            if isinstance(section, ImageSection)
+        }
+    )
+    image_texts = _summarize_images(image_file_ids, llm)
+
     indexed_documents: list[IndexingDocument] = []
 
     for document in documents:
@@ -487,49 +511,11 @@ def process_image_sections(documents: list[Document]) -> list[IndexingDocument]:
         for section in document.sections:
             # For ImageSection, process and create base Section with both text and image_file_id
             if isinstance(section, ImageSection):
-                # Default section with image path preserved - ensure text is always a string
                 processed_section = Section(
                     link=section.link,
                     image_file_id=section.image_file_id,
-                    text="",  # Initialize with empty string
+                    text=image_texts[section.image_file_id],
                 )
-
-                # Try to get image summary
-                try:
-                    with get_session_with_current_tenant() as db_session:
-                        file_store = get_default_file_store(db_session)
-
-                        file_record = file_store.read_file_record(
-                            file_id=section.image_file_id
-                        )
-                        if not file_record:
-                            logger.warning(
-                                f"Image file {section.image_file_id} not found in FileStore"
-                            )
-
-                            processed_section.text = "[Image could not be processed]"
-                        else:
-                            # Get the image data
-                            image_data_io = file_store.read_file(
-                                file_id=section.image_file_id
-                            )
-                            image_data = image_data_io.read()
-                            summary = summarize_image_with_error_handling(
-                                llm=llm,
-                                image_data=image_data,
-                                context_name=file_record.display_name or "Image",
-                            )
-
-                            if summary:
-                                processed_section.text = summary
-                            else:
-                                processed_section.text = (
-                                    "[Image could not be summarized]"
-                                )
-                except Exception as e:
-                    logger.error(f"Error processing image section: {e}")
-                    processed_section.text = "[Error processing image]"
-
                 processed_sections.append(processed_section)
 
             # For TextSection, create a base Section with text and link
@@ -550,9 +536,209 @@ def process_image_sections(documents: list[Document]) -> list[IndexingDocument]:
     return indexed_documents
 
 
+def _read_image(image_file_id: str) -> tuple[bytes, str] | None:
+    """Returns the image data and display name, or None if the file doesn't exist"""
+    with get_session_with_current_tenant() as db_session:
+        file_store = get_default_file_store(db_session)
+
+        file_record = file_store.read_file_record(file_id=image_file_id)
+        if not file_record:
+            return None
+
+        image_data = file_store.read_file(file_id=image_file_id).read()
+        return image_data, file_record.display_name or "Image"
+
+
+def _summarize_images(image_file_ids: list[str], llm: LLM) -> dict[str, str]:
+    """
+    Returns the text of the section of each image: its summary, or a placeholder if
+    it couldn't be read or summarized.
+
+    Images are read and summarized concurrently (up to
+    IMAGE_SUMMARIZATION_MAX_CONCURRENCY at once). Identical images are only
+    summarized once, and summaries are kept in the LLM result cache so images
+    repeated across documents (logos, icons, ...) aren't summarized again.
+    """
+    image_texts: dict[str, str] = {}
+
+    def read_image(image_file_id: str) -> tuple[bytes, str] | None:
+        try:
+            image = _read_image(image_file_id)
+        except Exception as e:
+            logger.error(f"Error processing image section: {e}")
+            image_texts[image_file_id] = "[Error processing image]"
+            return None
+
+        if image is None:
+            logger.warning(f"Image file {image_file_id} not found in FileStore")
+            image_texts[image_file_id] = "[Image could not be processed]"
+        return image
+
+    images = run_functions_tuples_in_parallel(
+        [(read_image, (image_file_id,)) for image_file_id in image_file_ids],
+        max_workers=IMAGE_SUMMARIZATION_MAX_CONCURRENCY,
+    )
+
+    # identical images share a cache key and are summarized once
+    cache_key_to_file_ids: dict[str, list[str]] = defaultdict(list)
+    cache_key_to_image: dict[str, tuple[bytes, str]] = {}
+    for image_file_id, image in zip(image_file_ids, images):
+        if image is None:
+            continue
+        cache_key = get_image_summary_cache_key(llm, image[0])
+        cache_key_to_file_ids[cache_key].append(image_file_id)
+        cache_key_to_image.setdefault(cache_key, image)
+
+    try:
+        with get_session_with_current_tenant() as db_session:
+            summaries = fetch_llm_results(db_session, list(cache_key_to_file_ids))
+    except Exception as e:
+        logger.warning(f"Failed to read cached image summaries: {e}")
+        summaries = {}
+
+    def summarize(cache_key: str) -> str | None:
+        image_data, display_name = cache_key_to_image[cache_key]
+        try:
+            return summarize_image_with_error_handling(
+                llm=llm,
+                image_data=image_data,
+                context_name=display_name,
+            )
+        except Exception as e:
+            logger.error(f"Error processing image section: {e}")
+            for image_file_id in cache_key_to_file_ids[cache_key]:
+                image_texts[image_file_id] = "[Error processing image]"
+            return None
+
+    uncached_keys = [key for key in cache_key_to_file_ids if key not in summaries]
+    new_summaries = {
+        cache_key: summary
+        for cache_key, summary in zip(
+            uncached_keys,
+            run_functions_tuples_in_parallel(
+                [(summarize, (cache_key,)) for cache_key in uncached_keys],
+                max_workers=IMAGE_SUMMARIZATION_MAX_CONCURRENCY,
+            ),
+        )
+        if summary
+    }
+
+    if new_summaries:
+        try:
+            with get_session_with_current_tenant() as db_session:
+                store_llm_results(db_session, new_summaries)
+        except Exception as e:
+            logger.warning(f"Failed to cache image summaries: {e}")
+    summaries.update(new_summaries)
+
+    for cache_key, file_ids in cache_key_to_file_ids.items():
+        for image_file_id in file_ids:
+            if image_file_id in image_texts:
+                continue
+            image_texts[image_file_id] = (
+                summaries.get(cache_key) or "[Image could not be summarized]"
+            )
+
+    return image_texts
+
+
+class _ContextualRAGInvoker:
+    """
+    Makes the LLM calls of contextual RAG for one indexing batch.
+
+    - At most `max_concurrent_calls` calls are in flight at once, across all
+      documents of the batch.
+    - Results are reused from the LLM result cache, keyed by the model and the
+      full prompt (i.e. the document content, the chunk and the prompt template),
+      so re-indexing unchanged documents doesn't call the LLM again. Lookups are
+      done up front with `prefetch`, new results are stored with
+      `store_new_results` once the batch is done.
+    - The document part of chunk context prompts, which is the same for every chunk
+      of a document, is marked for prompt caching on providers that need it to be
+      marked explicitly.
+    """
+
+    def __init__(self, llm: LLM, max_concurrent_calls: int) -> None:
+        self.llm = llm
+        self._model_provider = str(llm.config.model_provider)
+        self._model_name = str(llm.config.model_name)
+        self._explicit_prompt_caching = model_supports_explicit_prompt_caching(
+            model_name=self._model_name, model_provider=self._model_provider
+        )
+
+        self._semaphore = threading.BoundedSemaphore(max_concurrent_calls)
+        self._lock = threading.Lock()
+        self._cached_results: dict[str, str] = {}
+        self._new_results: dict[str, str] = {}
+
+    def cache_key(self, kind: str, prompt_prefix: str, prompt: str) -> str:
+        return build_llm_cache_key(
+            kind,
+            self._model_provider,
+            self._model_name,
+            str(MAX_CONTEXT_TOKENS),
+            prompt_prefix + prompt,
+        )
+
+    def prefetch(self, cache_keys: list[str]) -> None:
+        try:
+            with get_session_with_current_tenant() as db_session:
+                cached_results = fetch_llm_results(db_session, cache_keys)
+        except Exception as e:
+            logger.warning(f"Failed to read cached contextual RAG results: {e}")
+            return
+
+        with self._lock:
+            self._cached_results.update(cached_results)
+
+    def invoke(self, kind: str, prompt: str, prompt_prefix: str = "") -> str:
+        """Returns the result for the prompt `prompt_prefix + prompt`. Only results
+        that were prefetched are reused."""
+        cache_key = self.cache_key(kind, prompt_prefix, prompt)
+        with self._lock:
+            cached_result = self._cached_results.get(cache_key)
+        if cached_result is not None:
+            return cached_result
+
+        llm_input: LanguageModelInput = prompt_prefix + prompt
+        if prompt_prefix and self._explicit_prompt_caching:
+            llm_input = [
+                HumanMessage(
+                    content=[
+                        {
+                            "type": "text",
+                            "text": prompt_prefix,
+                            "cache_control": {"type": "ephemeral"},
+                        },
+                        {"type": "text", "text": prompt},
+                    ]
+                )
+            ]
+
+        with self._semaphore:
+            result = message_to_string(
+                self.llm.invoke(llm_input, max_tokens=MAX_CONTEXT_TOKENS)
+            )
+
+        with self._lock:
+            self._new_results[cache_key] = result
+        return result
+
+    def store_new_results(self) -> None:
+        with self._lock:
+            new_results = dict(self._new_results)
+            self._new_results = {}
+
+        try:
+            with get_session_with_current_tenant() as db_session:
+                store_llm_results(db_session, new_results)
+        except Exception as e:
+            logger.warning(f"Failed to cache contextual RAG results: {e}")
+
+
 def add_document_summaries(
     chunks_by_doc: list[DocAwareChunk],
-    llm: LLM,
+    invoker: _ContextualRAGInvoker,
     tokenizer: BaseTokenizer,
     trunc_doc_tokens: int,
 ) -> list[int] | None:
@@ -571,9 +757,8 @@ def add_document_summaries(
     doc_tokens = tokenizer.encode(chunks_by_doc[0].source_document.get_text_content())
     doc_content = tokenizer_trim_middle(doc_tokens, trunc_doc_tokens, tokenizer)
     summary_prompt = DOCUMENT_SUMMARY_PROMPT.format(document=doc_content)
-    doc_summary = message_to_string(
-        llm.invoke(summary_prompt, max_tokens=MAX_CONTEXT_TOKENS)
-    )
+    invoker.prefetch([invoker.cache_key(_DOC_SUMMARY_KIND, "", summary_prompt)])
+    doc_summary = invoker.invoke(_DOC_SUMMARY_KIND, summary_prompt)
 
     for chunk in chunks_by_doc:
         chunk.doc_summary = doc_summary
@@ -583,7 +768,7 @@ def add_document_summaries(
 
 def add_chunk_summaries(
     chunks_by_doc: list[DocAwareChunk],
-    llm: LLM,
+    invoker: _ContextualRAGInvoker,
     tokenizer: BaseTokenizer,
     trunc_doc_chunk_tokens: int,
     doc_tokens: list[int] | None,
@@ -612,23 +797,26 @@ def add_chunk_summaries(
     if not doc_info:
         # This happens if the document is too long AND document summaries are turned off
         # In this case we compute a doc summary using the LLM
-        doc_info = message_to_string(
-            llm.invoke(
-                DOCUMENT_SUMMARY_PROMPT.format(document=doc_content),
-                max_tokens=MAX_CONTEXT_TOKENS,
-            )
-        )
+        summary_prompt = DOCUMENT_SUMMARY_PROMPT.format(document=doc_content)
+        invoker.prefetch([invoker.cache_key(_DOC_SUMMARY_KIND, "", summary_prompt)])
+        doc_info = invoker.invoke(_DOC_SUMMARY_KIND, summary_prompt)
 
+    # the same for every chunk of the document
     context_prompt1 = CONTEXTUAL_RAG_PROMPT1.format(document=doc_info)
+    context_prompts2 = [
+        CONTEXTUAL_RAG_PROMPT2.format(chunk=chunk.content) for chunk in chunks_by_doc
+    ]
+    invoker.prefetch(
+        [
+            invoker.cache_key(_CHUNK_CONTEXT_KIND, context_prompt1, context_prompt2)
+            for context_prompt2 in context_prompts2
+        ]
+    )
 
-    def assign_context(chunk: DocAwareChunk) -> None:
-        context_prompt2 = CONTEXTUAL_RAG_PROMPT2.format(chunk=chunk.content)
+    def assign_context(chunk: DocAwareChunk, context_prompt2: str) -> None:
         try:
-            chunk.chunk_context = message_to_string(
-                llm.invoke(
-                    context_prompt1 + context_prompt2,
-                    max_tokens=MAX_CONTEXT_TOKENS,
-                )
+            chunk.chunk_context = invoker.invoke(
+                _CHUNK_CONTEXT_KIND, context_prompt2, prompt_prefix=context_prompt1
             )
         except LLMRateLimitError as e:
             # Erroring during chunker is undesirable, so we log the error and continue
@@ -640,7 +828,11 @@ def add_chunk_summaries(
             chunk.chunk_context = ""
 
     run_functions_tuples_in_parallel(
-        [(assign_context, (chunk,)) for chunk in chunks_by_doc]
+        [
+            (assign_context, (chunk, context_prompt2))
+            for chunk, context_prompt2 in zip(chunks_by_doc, context_prompts2)
+        ],
+        max_workers=CONTEXTUAL_RAG_MAX_CONCURRENT_LLM_CALLS,
     )
 
 
@@ -652,7 +844,8 @@ def add_contextual_summaries(
 ) -> list[DocAwareChunk]:
     """
     Adds Document summary and chunk-within-document context to the chunks
-    based on which environment variables are set.
+    based on which environment variables are set. Documents are processed
+    concurrently, sharing a budget of CONTEXTUAL_RAG_MAX_CONCURRENT_LLM_CALLS.
     """
     doc2chunks = defaultdict(list)
     for chunk in chunks:
@@ -671,18 +864,29 @@ def add_contextual_summaries(
     trunc_doc_chunk_tokens = (
         llm.config.max_input_tokens - prompt_tokens - chunk_token_limit
     )
-    for chunks_by_doc in doc2chunks.values():
+
+    invoker = _ContextualRAGInvoker(
+        llm, max_concurrent_calls=CONTEXTUAL_RAG_MAX_CONCURRENT_LLM_CALLS
+    )
+
+    def add_summaries(chunks_by_doc: list[DocAwareChunk]) -> None:
         doc_tokens = None
         if USE_DOCUMENT_SUMMARY:
             doc_tokens = add_document_summaries(
-                chunks_by_doc, llm, tokenizer, trunc_doc_summary_tokens
+                chunks_by_doc, invoker, tokenizer, trunc_doc_summary_tokens
             )
 
         if USE_CHUNK_SUMMARY:
             add_chunk_summaries(
-                chunks_by_doc, llm, tokenizer, trunc_doc_chunk_tokens, doc_tokens
+                chunks_by_doc, invoker, tokenizer, trunc_doc_chunk_tokens, doc_tokens
             )
 
+    run_functions_tuples_in_parallel(
+        [(add_summaries, (chunks_by_doc,)) for chunks_by_doc in doc2chunks.values()],
+        max_workers=CONTEXTUAL_RAG_MAX_CONCURRENT_LLM_CALLS,
+    )
+    invoker.store_new_results()
+
     return chunks
 
 
@@ -21,3 +21,19 @@ class KeyValueStore:
     @abc.abstractmethod
     def delete(self, key: str) -> None:
         raise NotImplementedError
+
+    def store_many(self, vals: dict[str, JSON_ro], encrypt: bool = False) -> None:
+        for key, val in vals.items():
+            self.store(key, val, encrypt=encrypt)
+
+    def load_many(
+        self, keys: list[str], refresh_cache: bool = False
+    ) -> dict[str, JSON_ro]:
+        """Returns the values of the keys that exist, missing keys are omitted."""
+        results: dict[str, JSON_ro] = {}
+        for key in keys:
+            try:
+                results[key] = self.load(key, refresh_cache=refresh_cache)
+            except KvKeyNotFoundError:
+                continue
+        return results
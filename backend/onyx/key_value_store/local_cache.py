@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import OrderedDict
+
+from onyx.configs.app_configs import KV_STORE_LOCAL_CACHE_MAX_ENTRIES
+from onyx.configs.app_configs import KV_STORE_LOCAL_CACHE_TTL_SECONDS
+from onyx.redis.redis_pool import get_raw_redis_client
+from onyx.utils.logger import setup_logger
+
+
+logger = setup_logger()
+
+
+KV_STORE_INVALIDATION_CHANNEL = "onyx_kv_store:invalidate"
+_LISTENER_RETRY_DELAY_SECONDS = 5
+
+
+class LocalKVCache:
+    """Per-process TTL + LRU cache of serialized key-value store entries.
+
+    Values are kept as JSON strings so that callers mutating a loaded value can't
+    corrupt the cache. Keys are namespaced by the Redis tenant prefix, the same way
+    the Redis tier is.
+
+    Writes in any process publish the namespaced key on
+    KV_STORE_INVALIDATION_CHANNEL, a background thread in every process that uses
+    the cache evicts it on receipt. If the subscription drops, the whole cache is
+    cleared since messages may have been missed; the TTL bounds staleness either
+    way."""
+
+    def __init__(
+        self,
+        ttl_seconds: int = KV_STORE_LOCAL_CACHE_TTL_SECONDS,
+        max_entries: int = KV_STORE_LOCAL_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        # namespaced key -> (expiry time, serialized value)
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._listener: threading.Thread | None = None
+
+    @staticmethod
+    def namespaced_key(namespace: str, key: str) -> str:
+        return f"{namespace}:{key}"
+
+    def get(self, namespaced_key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(namespaced_key)
+            if entry is None:
+                return None
+
+            expires_at, serialized_value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[namespaced_key]
+                return None
+
+            self._entries.move_to_end(namespaced_key)
+            return serialized_value
+
+    def set(self, namespaced_key: str, serialized_value: str) -> None:
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+
+        with self._lock:
+            self._entries[namespaced_key] = (
+                time.monotonic() + self.ttl_seconds,
+                serialized_value,
+            )
+            self._entries.move_to_end(namespaced_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, namespaced_key: str) -> None:
+        with self._lock:
+            self._entries.pop(namespaced_key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def publish_invalidations(self, namespaced_keys: list[str]) -> None:
+        """Evicts the keys locally and tells the other processes to do the same."""
+        for namespaced_key in namespaced_keys:
+            self.invalidate(namespaced_key)
+
+        try:
+            pipe = get_raw_redis_client().pipeline(transaction=False)
+            for namespaced_key in namespaced_keys:
+                pipe.publish(KV_STORE_INVALIDATION_CHANNEL, namespaced_key)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to publish key-value store invalidations: {str(e)}")
+
+    def ensure_listener(self) -> None:
+        if self._listener is not None and self._listener.is_alive():
+            return
+
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+
+            self._listener = threading.Thread(
+                target=self._listen, name="kv-store-invalidation", daemon=True
+            )
+            self._listener.start()
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = get_raw_redis_client().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(KV_STORE_INVALIDATION_CHANNEL)
+                for message in pubsub.listen():
+                    data = message.get("data")
+                    if isinstance(data, bytes):
+                        self.invalidate(data.decode("utf-8"))
+            except Exception as e:
+                logger.warning(
+                    f"Key-value store invalidation listener failed, retrying: {str(e)}"
+                )
+
+            # invalidations may have been missed while not subscribed
+            self.clear()
+            time.sleep(_LISTENER_RETRY_DELAY_SECONDS)
+
+
+_local_kv_cache: LocalKVCache | None = None
+_local_kv_cache_lock = threading.Lock()
+
+
+def get_local_kv_cache() -> LocalKVCache:
+    global _local_kv_cache
+
+    if _local_kv_cache is None:
+        with _local_kv_cache_lock:
+            if _local_kv_cache is None:
+                _local_kv_cache = LocalKVCache()
+
+    _local_kv_cache.ensure_listener()
+    return _local_kv_cache
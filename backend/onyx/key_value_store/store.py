@@ -3,11 +3,15 @@ from typing import cast
 
 from redis.client import Redis
 
+from onyx.configs.app_configs import ENABLE_KV_STORE_LOCAL_CACHE
 from onyx.db.engine.sql_engine import get_session_with_current_tenant
 from onyx.db.models import KVStore
 from onyx.key_value_store.interface import KeyValueStore
 from onyx.key_value_store.interface import KvKeyNotFoundError
+from onyx.key_value_store.local_cache import get_local_kv_cache
+from onyx.key_value_store.local_cache import LocalKVCache
 from onyx.redis.redis_pool import get_redis_client
+from onyx.redis.redis_pool import TenantRedis
 from onyx.utils.logger import setup_logger
 from onyx.utils.special_types import JSON_ro
 
@@ -20,13 +24,43 @@ KV_REDIS_KEY_EXPIRATION = 60 * 60 * 24  # 1 Day
 
 
 class PgRedisKVStore(KeyValueStore):
-    def __init__(self, redis_client: Redis | None = None) -> None:
+    def __init__(
+        self,
+        redis_client: Redis | None = None,
+        local_cache: LocalKVCache | None = None,
+    ) -> None:
         # If no redis_client is provided, fall back to the context var
         if redis_client is not None:
             self.redis_client = redis_client
         else:
             self.redis_client = get_redis_client()
 
+        # the local cache and pipelines are not prefixed by TenantRedis, so keys are
+        # namespaced with the same prefix manually
+        self.namespace = (
+            self.redis_client.tenant_id
+            if isinstance(self.redis_client, TenantRedis)
+            else ""
+        )
+
+        if local_cache is None and ENABLE_KV_STORE_LOCAL_CACHE:
+            local_cache = get_local_kv_cache()
+        self.local_cache = local_cache
+
+    def _full_redis_key(self, key: str) -> str:
+        if self.namespace:
+            return f"{self.namespace}:{REDIS_KEY_PREFIX}{key}"
+        return REDIS_KEY_PREFIX + key
+
+    def _local_key(self, key: str) -> str:
+        return LocalKVCache.namespaced_key(self.namespace, key)
+
+    def _invalidate_local(self, keys: list[str]) -> None:
+        if self.local_cache is not None:
+            self.local_cache.publish_invalidations(
+                [self._local_key(key) for key in keys]
+            )
+
     def store(self, key: str, val: JSON_ro, encrypt: bool = False) -> None:
         # Not encrypted in Redis, but encrypted in Postgres
         try:
@@ -52,7 +86,63 @@ class PgRedisKVStore(KeyValueStore):
                 db_session.add(obj)
             db_session.commit()
 
+        self._invalidate_local([key])
+
+    def store_many(self, vals: dict[str, JSON_ro], encrypt: bool = False) -> None:
+        if not vals:
+            return
+
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, val in vals.items():
+                pipe.set(
+                    self._full_redis_key(key),
+                    json.dumps(val),
+                    ex=KV_REDIS_KEY_EXPIRATION,
+                )
+            pipe.execute()
+        except Exception as e:
+            logger.error(
+                f"Failed to set values in Redis for keys {list(vals)}: {str(e)}"
+            )
+
+        with get_session_with_current_tenant() as db_session:
+            existing_objs = {
+                obj.key: obj
+                for obj in db_session.query(KVStore)
+                .filter(KVStore.key.in_(list(vals)))
+                .all()
+            }
+            new_keys = [key for key in vals if key not in existing_objs]
+            if new_keys:
+                # just in case, same as `store`
+                db_session.query(KVStore).filter(KVStore.key.in_(new_keys)).delete(
+                    synchronize_session=False
+                )
+
+            for key, val in vals.items():
+                encrypted_val = val if encrypt else None
+                plain_val = val if not encrypt else None
+                obj = existing_objs.get(key)
+                if obj:
+                    obj.value = plain_val
+                    obj.encrypted_value = encrypted_val
+                else:
+                    db_session.add(
+                        KVStore(
+                            key=key, value=plain_val, encrypted_value=encrypted_val
+                        )  # type: ignore
+                    )
+            db_session.commit()
+
+        self._invalidate_local(list(vals))
+
     def load(self, key: str, refresh_cache: bool = False) -> JSON_ro:
+        if not refresh_cache and self.local_cache is not None:
+            local_value = self.local_cache.get(self._local_key(key))
+            if local_value is not None:
+                return json.loads(local_value)
+
         if not refresh_cache:
             try:
                 redis_value = self.redis_client.get(REDIS_KEY_PREFIX + key)
@@ -61,7 +151,10 @@ class PgRedisKVStore(KeyValueStore):
                         raise ValueError(
                             f"Redis value for key '{key}' is not a bytes object"
                         )
-                    return json.loads(redis_value.decode("utf-8"))
+                    serialized_value = redis_value.decode("utf-8")
+                    if self.local_cache is not None:
+                        self.local_cache.set(self._local_key(key), serialized_value)
+                    return json.loads(serialized_value)
             except Exception as e:
                 logger.error(
                     f"Failed to get value from Redis for key '{key}': {str(e)}"
@@ -72,19 +165,83 @@ class PgRedisKVStore(KeyValueStore):
             if not obj:
                 raise KvKeyNotFoundError
 
-            if obj.value is not None:
-                value = obj.value
-            elif obj.encrypted_value is not None:
-                value = obj.encrypted_value
-            else:
-                value = None
+            value = self._value_from_obj(obj)
+            self._cache_loaded_values({key: value})
+            return cast(JSON_ro, value)
+
+    def load_many(
+        self, keys: list[str], refresh_cache: bool = False
+    ) -> dict[str, JSON_ro]:
+        results: dict[str, JSON_ro] = {}
+        remaining_keys = list(dict.fromkeys(keys))
+
+        if not refresh_cache and self.local_cache is not None:
+            for key in remaining_keys:
+                local_value = self.local_cache.get(self._local_key(key))
+                if local_value is not None:
+                    results[key] = json.loads(local_value)
+            remaining_keys = [key for key in remaining_keys if key not in results]
 
+        if not refresh_cache and remaining_keys:
             try:
-                self.redis_client.set(REDIS_KEY_PREFIX + key, json.dumps(value))
+                pipe = self.redis_client.pipeline(transaction=False)
+                for key in remaining_keys:
+                    pipe.get(self._full_redis_key(key))
+                for key, redis_value in zip(remaining_keys, pipe.execute()):
+                    if not redis_value:
+                        continue
+                    serialized_value = redis_value.decode("utf-8")
+                    if self.local_cache is not None:
+                        self.local_cache.set(self._local_key(key), serialized_value)
+                    results[key] = json.loads(serialized_value)
             except Exception as e:
-                logger.error(f"Failed to set value in Redis for key '{key}': {str(e)}")
+                logger.error(
+                    f"Failed to get values from Redis for keys {remaining_keys}: {str(e)}"
+                )
+            remaining_keys = [key for key in remaining_keys if key not in results]
 
-            return cast(JSON_ro, value)
+        if not remaining_keys:
+            return results
+
+        with get_session_with_current_tenant() as db_session:
+            db_values = {
+                obj.key: self._value_from_obj(obj)
+                for obj in db_session.query(KVStore)
+                .filter(KVStore.key.in_(remaining_keys))
+                .all()
+            }
+
+        self._cache_loaded_values(db_values)
+        results.update(db_values)
+        return results
+
+    @staticmethod
+    def _value_from_obj(obj: KVStore) -> JSON_ro:
+        if obj.value is not None:
+            return obj.value
+        elif obj.encrypted_value is not None:
+            return obj.encrypted_value
+        return None
+
+    def _cache_loaded_values(self, vals: dict[str, JSON_ro]) -> None:
+        """Writes values loaded from Postgres back to Redis and the local cache."""
+        if not vals:
+            return
+
+        serialized_vals = {key: json.dumps(val) for key, val in vals.items()}
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, serialized_value in serialized_vals.items():
+                pipe.set(self._full_redis_key(key), serialized_value)
+            pipe.execute()
+        except Exception as e:
+            logger.error(
+                f"Failed to set values in Redis for keys {list(vals)}: {str(e)}"
+            )
+
+        if self.local_cache is not None:
+            for key, serialized_value in serialized_vals.items():
+                self.local_cache.set(self._local_key(key), serialized_value)
 
     def delete(self, key: str) -> None:
         try:
@@ -92,8 +249,11 @@ class PgRedisKVStore(KeyValueStore):
         except Exception as e:
             logger.error(f"Failed to delete value from Redis for key '{key}': {str(e)}")
 
-        with get_session_with_current_tenant() as db_session:
-            result = db_session.query(KVStore).filter_by(key=key).delete()  # type: ignore
-            if result == 0:
-                raise KvKeyNotFoundError
-            db_session.commit()
+        try:
+            with get_session_with_current_tenant() as db_session:
+                result = db_session.query(KVStore).filter_by(key=key).delete()  # type: ignore
+                if result == 0:
+                    raise KvKeyNotFoundError
+                db_session.commit()
+        finally:
+            self._invalidate_local([key])
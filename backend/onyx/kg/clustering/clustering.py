@@ -1,11 +1,19 @@
+import re
 import time
+from collections import defaultdict
 from collections.abc import Generator
 from typing import cast
 
 from rapidfuzz.fuzz import ratio
 from redis.lock import Lock as RedisLock
+from sqlalchemy import and_
 from sqlalchemy import func
+from sqlalchemy import literal
+from sqlalchemy import select
+from sqlalchemy import String
 from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
 
 from onyx.background.celery.tasks.kg_processing.utils import extend_lock
 from onyx.configs.constants import CELERY_GENERIC_BEAT_LOCK_TIMEOUT
@@ -144,78 +152,202 @@ def _get_batch_kg_processed_documents(
             offset += batch_size
 
 
-def _cluster_one_grounded_entity(
-    entity: KGEntityExtractionStaging,
-) -> tuple[KGEntity, bool]:
+def _trigrams(name: str) -> set[str]:
     """
-    Cluster a single grounded entity.
+    The trigrams pg_trgm extracts from a name: each alphanumeric word is lowercased
+    and padded with two spaces in front and one behind.
     """
+    trigrams: set[str] = set()
+    for word in re.findall(r"[^\W_]+", name.lower()):
+        padded_word = f"  {word} "
+        trigrams.update(padded_word[i : i + 3] for i in range(len(padded_word) - 2))
+    return trigrams
+
+
+def _trigram_similarity(name: str, other_name: str) -> float:
+    """
+    Same as pg_trgm's similarity(), for entities that are matched in memory.
+    """
+    trigrams = _trigrams(name)
+    other_trigrams = _trigrams(other_name)
+    num_shared = len(trigrams & other_trigrams)
+    num_total = len(trigrams) + len(other_trigrams) - num_shared
+    return num_shared / num_total if num_total else 0.0
+
+
+def _get_clustering_candidates(
+    db_session: Session, entity_type_id_name: str, entity_names: list[str]
+) -> dict[str, list[KGEntity]]:
+    """
+    Find the entities of the given type with a name similar to each of the entity
+    names, in a single query. Uses the GIN index, very efficient.
+    Assumes pg_trgm.similarity_threshold has been set on the session.
+    """
+    query_names = select(
+        func.unnest(literal(entity_names, ARRAY(String))).label("name")
+    ).subquery("query_names")
+
+    rows = db_session.execute(
+        select(query_names.c.name, KGEntity)
+        .select_from(query_names)
+        .join(
+            KGEntity,
+            and_(
+                KGEntity.entity_type_id_name == entity_type_id_name,
+                getattr(func, POSTGRES_DEFAULT_SCHEMA_STANDARD_VALUE).similarity_op(
+                    KGEntity.name, query_names.c.name
+                ),
+            ),
+        )
+    ).all()
+
+    candidates_by_name: dict[str, list[KGEntity]] = defaultdict(list)
+    for entity_name, similar_entity in rows:
+        candidates_by_name[entity_name].append(similar_entity)
+    return candidates_by_name
+
+
+def _cluster_grounded_entities(
+    entities: list[KGEntityExtractionStaging],
+) -> list[tuple[KGEntity, bool]]:
+    """
+    Cluster a batch of grounded entities in a single session.
+
+    Similar entities are retrieved with one query per entity type for the whole
+    batch. Entities are still merged/transferred one after the other, so entities
+    transferred earlier in the batch are also considered as matches for later ones.
+    """
+    results: list[tuple[KGEntity, bool]] = []
+    if not entities:
+        return results
+
     with get_session_with_current_tenant() as db_session:
-        # get entity name and filtering conditions
-        if entity.document_id is not None:
-            entity_name = cast(
-                str,
-                db_session.query(Document.semantic_id)
-                .filter(Document.id == entity.document_id)
-                .scalar(),
-            ).lower()
-            filtering = [KGEntity.document_id.is_(None)]
-        else:
-            entity_name = entity.name.lower()
-            filtering = []
-
-        # skip those with numbers so we don't cluster version1 and version2, etc.
-        similar_entities: list[KGEntity] = []
-        if not any(char.isdigit() for char in entity_name):
-            # find similar entities, uses GIN index, very efficient
-            db_session.execute(
-                text(
-                    "SET pg_trgm.similarity_threshold = "
-                    + str(KG_CLUSTERING_RETRIEVE_THRESHOLD)
-                )
-            )
-            similar_entities = (
-                db_session.query(KGEntity)
-                .filter(
-                    # find entities of the same type with a similar name
-                    *filtering,
-                    KGEntity.entity_type_id_name == entity.entity_type_id_name,
-                    getattr(func, POSTGRES_DEFAULT_SCHEMA_STANDARD_VALUE).similarity_op(
-                        KGEntity.name, entity_name
-                    ),
-                )
+        # get entity names
+        document_ids = {
+            entity.document_id for entity in entities if entity.document_id is not None
+        }
+        semantic_ids: dict[str, str] = (
+            dict(
+                db_session.query(Document.id, Document.semantic_id)
+                .filter(Document.id.in_(document_ids))
                 .all()
             )
-
-    # find best match
-    best_score = -1.0
-    best_entity = None
-    for similar in similar_entities:
-        # skip those with numbers so we don't cluster version1 and version2, etc.
-        if any(char.isdigit() for char in similar.name):
-            continue
-        score = ratio(similar.name, entity_name)
-        if score >= KG_CLUSTERING_THRESHOLD * 100 and score > best_score:
-            best_score = score
-            best_entity = similar
-
-    # if there is a match, update the entity, otherwise create a new one
-    with get_session_with_current_tenant() as db_session:
-        if best_entity:
-            logger.debug(f"Merged {entity.name} with {best_entity.name}")
-            update_vespa = (
-                best_entity.document_id is None and entity.document_id is not None
+            if document_ids
+            else {}
+        )
+        entity_names = [
+            (
+                cast(str, semantic_ids.get(entity.document_id)).lower()
+                if entity.document_id is not None
+                else entity.name.lower()
             )
-            transferred_entity = merge_entities(
-                db_session=db_session, parent=best_entity, child=entity
+            for entity in entities
+        ]
+
+        # find similar entities for each entity type, skipping names with numbers
+        # so we don't cluster version1 and version2, etc.
+        names_by_type: dict[str, set[str]] = defaultdict(set)
+        for entity, entity_name in zip(entities, entity_names):
+            if not any(char.isdigit() for char in entity_name):
+                names_by_type[entity.entity_type_id_name].add(entity_name)
+
+        db_session.execute(
+            text(
+                "SET pg_trgm.similarity_threshold = "
+                + str(KG_CLUSTERING_RETRIEVE_THRESHOLD)
             )
-        else:
-            update_vespa = entity.document_id is not None
-            transferred_entity = transfer_entity(db_session=db_session, entity=entity)
+        )
+        candidates_by_type = {
+            entity_type_id_name: _get_clustering_candidates(
+                db_session, entity_type_id_name, list(names)
+            )
+            for entity_type_id_name, names in names_by_type.items()
+        }
+
+        # latest state of the entities that may be matched (merges update them)
+        known_entities: dict[str, KGEntity] = {
+            similar.id_name: similar
+            for candidates_by_name in candidates_by_type.values()
+            for similar_entities in candidates_by_name.values()
+            for similar in similar_entities
+        }
+        # entities transferred earlier in this batch weren't retrieved above,
+        # so they are matched against in memory with the same similarity threshold
+        transferred_id_names: dict[str, list[str]] = defaultdict(list)
+
+        for entity, entity_name in zip(entities, entity_names):
+            similar_entities: list[KGEntity] = []
+            if not any(char.isdigit() for char in entity_name):
+                similar_id_names = dict.fromkeys(
+                    [
+                        similar.id_name
+                        for similar in candidates_by_type[
+                            entity.entity_type_id_name
+                        ].get(entity_name, [])
+                    ]
+                    + [
+                        id_name
+                        for id_name in transferred_id_names[entity.entity_type_id_name]
+                        if _trigram_similarity(
+                            known_entities[id_name].name, entity_name
+                        )
+                        >= KG_CLUSTERING_RETRIEVE_THRESHOLD
+                    ]
+                )
+                similar_entities = [
+                    known_entities[id_name] for id_name in similar_id_names
+                ]
+                if entity.document_id is not None:
+                    similar_entities = [
+                        similar
+                        for similar in similar_entities
+                        if similar.document_id is None
+                    ]
+
+            # find best match
+            best_score = -1.0
+            best_entity = None
+            for similar in similar_entities:
+                # skip those with numbers so we don't cluster version1 and version2, etc.
+                if any(char.isdigit() for char in similar.name):
+                    continue
+                score = ratio(similar.name, entity_name)
+                if score >= KG_CLUSTERING_THRESHOLD * 100 and score > best_score:
+                    best_score = score
+                    best_entity = similar
+
+            # if there is a match, update the entity, otherwise create a new one.
+            # each entity gets a savepoint, if one fails the entities clustered
+            # before it are still committed
+            try:
+                with db_session.begin_nested():
+                    if best_entity:
+                        logger.debug(f"Merged {entity.name} with {best_entity.name}")
+                        update_vespa = (
+                            best_entity.document_id is None
+                            and entity.document_id is not None
+                        )
+                        transferred_entity = merge_entities(
+                            db_session=db_session, parent=best_entity, child=entity
+                        )
+                    else:
+                        update_vespa = entity.document_id is not None
+                        transferred_entity = transfer_entity(
+                            db_session=db_session, entity=entity
+                        )
+            except Exception:
+                db_session.commit()
+                raise
+
+            known_entities[transferred_entity.id_name] = transferred_entity
+            transferred_id_names[transferred_entity.entity_type_id_name].append(
+                transferred_entity.id_name
+            )
+            results.append((transferred_entity, update_vespa))
 
         db_session.commit()
 
-    return transferred_entity, update_vespa
+    return results
 
 
 def _create_one_parent_child_relationship(entity: KGEntityExtractionStaging) -> None:
@@ -327,8 +459,7 @@ def kg_clustering(
             batch_size=processing_chunk_batch_size
         )
     ):
-        for entity in untransferred_grounded_entities:
-            _cluster_one_grounded_entity(entity)
+        _cluster_grounded_entities(untransferred_grounded_entities)
         last_lock_time = extend_lock(
             lock, CELERY_GENERIC_BEAT_LOCK_TIMEOUT, last_lock_time
         )
@@ -1,18 +1,22 @@
 import re
 from collections import defaultdict
-from typing import cast
+from functools import lru_cache
 
 import numpy as np
 from nltk import ngrams  # type: ignore
 from rapidfuzz.distance.DamerauLevenshtein import normalized_similarity
+from rapidfuzz.process import cdist
 from sqlalchemy import desc
 from sqlalchemy import Float
 from sqlalchemy import func
+from sqlalchemy import literal
 from sqlalchemy import MetaData
 from sqlalchemy import select
 from sqlalchemy import String
 from sqlalchemy import Table
+from sqlalchemy import true
 from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
 
 from onyx.configs.kg_configs import KG_NORMALIZATION_RERANK_LEVENSHTEIN_WEIGHT
 from onyx.configs.kg_configs import KG_NORMALIZATION_RERANK_NGRAM_WEIGHTS
@@ -32,7 +36,6 @@ from onyx.kg.utils.formatting_utils import make_relationship_id
 from onyx.kg.utils.formatting_utils import split_entity_id
 from onyx.kg.utils.formatting_utils import split_relationship_id
 from onyx.utils.logger import setup_logger
-from onyx.utils.threadpool_concurrency import run_functions_tuples_in_parallel
 from shared_configs.configs import POSTGRES_DEFAULT_SCHEMA_STANDARD_VALUE
 
 logger = setup_logger()
@@ -54,141 +57,222 @@ def _clean_name(entity_name: str) -> str:
     )
 
 
-def _normalize_one_entity(
-    entity: str,
-    attributes: dict[str, str],
-    allowed_docs_temp_view_name: str | None = None,
-) -> str | None:
+@lru_cache(maxsize=4096)
+def _get_ngrams(cleaned_name: str) -> tuple[set[tuple[str, ...]], ...]:
+    return (
+        set(ngrams(cleaned_name, 1)),
+        set(ngrams(cleaned_name, 2)),
+        set(ngrams(cleaned_name, 3)),
+    )
+
+
+def _get_allowed_docs_temp_view(
+    db_session: Session, allowed_docs_temp_view_name: str | None
+) -> Table:
     """
-    Matches a single entity to the best matching entity of the same type.
+    Reflect the allowed docs temp view. Done once per normalization call.
     """
-    entity_type, entity_name = split_entity_id(entity)
-    if entity_name == "*":
-        return entity
+    if allowed_docs_temp_view_name is None:
+        raise ValueError("allowed_docs_temp_view_name is not available")
+
+    effective_schema_allowed_docs_temp_view_name = allowed_docs_temp_view_name.split(
+        "."
+    )[-1]
+
+    return Table(
+        effective_schema_allowed_docs_temp_view_name,
+        MetaData(),
+        autoload_with=db_session.get_bind(),
+    )
 
-    cleaned_entity = _clean_name(entity_name)
 
+def _get_normalization_candidates(
+    db_session: Session,
+    cleaned_entities: list[str],
+    entity_type: str,
+    subtype: str | None,
+    allowed_docs_temp_view: Table,
+) -> dict[str, list[tuple[str, str]]]:
+    """
+    Finds the entities of the given (sub)type with the highest trigram overlap for
+    each of the cleaned entity names, in a single query.
+    Returns a map of cleaned entity name to (id_name, name) candidates.
+    """
     # narrow filter to subtype if requested
     type_filters = [KGEntity.entity_type_id_name == entity_type]
-    if "subtype" in attributes:
-        type_filters.append(
-            KGEntity.attributes.op("@>")({"subtype": attributes["subtype"]})
+    if subtype is not None:
+        type_filters.append(KGEntity.attributes.op("@>")({"subtype": subtype}))
+
+    # generate trigrams of the queried entities Q
+    query_names = select(
+        func.unnest(literal(cleaned_entities, ARRAY(String))).label("name")
+    ).subquery("query_names")
+    query_trigrams = select(
+        query_names.c.name,
+        getattr(func, POSTGRES_DEFAULT_SCHEMA_STANDARD_VALUE)
+        .show_trgm(query_names.c.name)
+        .cast(ARRAY(String(3)))
+        .label("trigrams"),
+    ).subquery("query_trigrams")
+
+    # top candidates per queried entity
+    candidates = (
+        select(
+            KGEntity.id_name,
+            KGEntity.name,
+            (
+                # for each entity E, compute score = | Q ∩ E | / min(|Q|, |E|)
+                func.cardinality(
+                    func.array(
+                        select(func.unnest(KGEntity.name_trigrams))
+                        .correlate(KGEntity)
+                        .intersect(
+                            select(func.unnest(query_trigrams.c.trigrams)).correlate(
+                                query_trigrams
+                            )
+                        )
+                        .scalar_subquery()
+                    )
+                ).cast(Float)
+                / func.least(
+                    func.cardinality(query_trigrams.c.trigrams),
+                    func.cardinality(KGEntity.name_trigrams),
+                )
+            ).label("score"),
         )
-
-    # step 1: find entities containing the entity_name or something similar
-    with get_session_with_current_tenant() as db_session:
-
-        # get allowed documents
-        metadata = MetaData()
-        if allowed_docs_temp_view_name is None:
-            raise ValueError("allowed_docs_temp_view_name is not available")
-
-        effective_schema_allowed_docs_temp_view_name = (
-            allowed_docs_temp_view_name.split(".")[-1]
+        .select_from(KGEntity)
+        .outerjoin(
+            allowed_docs_temp_view,
+            KGEntity.document_id == allowed_docs_temp_view.c.allowed_doc_id,
         )
-
-        allowed_docs_temp_view = Table(
-            effective_schema_allowed_docs_temp_view_name,
-            metadata,
-            autoload_with=db_session.get_bind(),
+        .where(
+            *type_filters,
+            KGEntity.name_trigrams.overlap(query_trigrams.c.trigrams),
+            # Add filter for allowed docs - either document_id is NULL or it's in allowed_docs
+            (
+                KGEntity.document_id.is_(None)
+                | allowed_docs_temp_view.c.allowed_doc_id.isnot(None)
+            ),
         )
+        .order_by(desc("score"))
+        .limit(KG_NORMALIZATION_RETRIEVE_ENTITIES_LIMIT)
+        .correlate(query_trigrams)
+        .lateral("candidates")
+    )
 
-        # generate trigrams of the queried entity Q
-        query_trigrams = db_session.query(
-            getattr(func, POSTGRES_DEFAULT_SCHEMA_STANDARD_VALUE)
-            .show_trgm(cleaned_entity)
-            .cast(ARRAY(String(3)))
-            .label("trigrams")
-        ).cte("query")
-
-        candidates = cast(
-            list[tuple[str, str, float]],
-            db_session.query(
-                KGEntity.id_name,
-                KGEntity.name,
-                (
-                    # for each entity E, compute score = | Q ∩ E | / min(|Q|, |E|)
-                    func.cardinality(
-                        func.array(
-                            select(func.unnest(KGEntity.name_trigrams))
-                            .correlate(KGEntity)
-                            .intersect(
-                                select(
-                                    func.unnest(query_trigrams.c.trigrams)
-                                ).correlate(query_trigrams)
-                            )
-                            .scalar_subquery()
-                        )
-                    ).cast(Float)
-                    / func.least(
-                        func.cardinality(query_trigrams.c.trigrams),
-                        func.cardinality(KGEntity.name_trigrams),
-                    )
-                ).label("score"),
-            )
-            .select_from(KGEntity, query_trigrams)
-            .outerjoin(
-                allowed_docs_temp_view,
-                KGEntity.document_id == allowed_docs_temp_view.c.allowed_doc_id,
-            )
-            .filter(
-                *type_filters,
-                KGEntity.name_trigrams.overlap(query_trigrams.c.trigrams),
-                # Add filter for allowed docs - either document_id is NULL or it's in allowed_docs
-                (
-                    KGEntity.document_id.is_(None)
-                    | allowed_docs_temp_view.c.allowed_doc_id.isnot(None)
-                ),
-            )
-            .order_by(desc("score"))
-            .limit(KG_NORMALIZATION_RETRIEVE_ENTITIES_LIMIT)
-            .all(),
+    rows = db_session.execute(
+        select(
+            query_trigrams.c.name,
+            candidates.c.id_name,
+            candidates.c.name,
         )
+        .select_from(query_trigrams)
+        .join(candidates, true())
+        .order_by(query_trigrams.c.name, desc(candidates.c.score))
+    ).all()
+
+    candidates_by_entity: dict[str, list[tuple[str, str]]] = defaultdict(list)
+    for cleaned_entity, candidate_id_name, candidate_name in rows:
+        candidates_by_entity[cleaned_entity].append((candidate_id_name, candidate_name))
+    return candidates_by_entity
+
+
+def _rerank_candidates(
+    cleaned_entity: str, candidates: list[tuple[str, str]]
+) -> str | None:
+    """
+    Rerank the retrieved candidates with a weighted ngram analysis and the damerau
+    levenshtein distance. Returns the id_name of the best candidate above the
+    threshold, if any.
+    """
     if not candidates:
         return None
 
-    # step 2: do a weighted ngram analysis and damerau levenshtein distance to rerank
-    n1, n2, n3 = (
-        set(ngrams(cleaned_entity, 1)),
-        set(ngrams(cleaned_entity, 2)),
-        set(ngrams(cleaned_entity, 3)),
-    )
-    for i, (candidate_id_name, candidate_name, _) in enumerate(candidates):
-        cleaned_candidate = _clean_name(candidate_name)
-        h_n1, h_n2, h_n3 = (
-            set(ngrams(cleaned_candidate, 1)),
-            set(ngrams(cleaned_candidate, 2)),
-            set(ngrams(cleaned_candidate, 3)),
-        )
+    cleaned_candidates = [
+        _clean_name(candidate_name) for _, candidate_name in candidates
+    ]
 
-        # compute ngram overlap, renormalize scores if the names are too short for larger ngrams
+    # compute ngram overlap, renormalize scores if the names are too short for larger ngrams
+    W_n1, W_n2, W_n3 = KG_NORMALIZATION_RERANK_NGRAM_WEIGHTS
+    n1, n2, n3 = _get_ngrams(cleaned_entity)
+    ngram_scores = np.empty(len(candidates))
+    for i, cleaned_candidate in enumerate(cleaned_candidates):
+        h_n1, h_n2, h_n3 = _get_ngrams(cleaned_candidate)
         grams_used = min(2, len(cleaned_entity) - 1, len(cleaned_candidate) - 1)
-        W_n1, W_n2, W_n3 = KG_NORMALIZATION_RERANK_NGRAM_WEIGHTS
-        ngram_score = (
-            # compute | Q ∩ E | / min(|Q|, |E|) for unigrams and bigrams (trigrams already computed)
+        ngram_scores[i] = (
+            # compute | Q ∩ E | / min(|Q|, |E|) for unigrams, bigrams, and trigrams
             W_n1 * len(n1 & h_n1) / max(1, min(len(n1), len(h_n1)))
             + W_n2 * len(n2 & h_n2) / max(1, min(len(n2), len(h_n2)))
             + W_n3 * len(n3 & h_n3) / max(1, min(len(n3), len(h_n3)))
         ) / (W_n1, W_n1 + W_n2, 1.0)[grams_used]
 
-        # compute damerau levenshtein distance to fuzzy match against typos
-        W_leven = KG_NORMALIZATION_RERANK_LEVENSHTEIN_WEIGHT
-        leven_score = normalized_similarity(cleaned_entity, cleaned_candidate)
-
-        # combine scores
-        score = (1.0 - W_leven) * ngram_score + W_leven * leven_score
-        candidates[i] = (candidate_id_name, candidate_name, score)
-    candidates = list(
-        sorted(
-            filter(lambda x: x[2] > KG_NORMALIZATION_RERANK_THRESHOLD, candidates),
-            key=lambda x: x[2],
-            reverse=True,
-        )
-    )
-    if not candidates:
+    # compute damerau levenshtein distance to fuzzy match against typos
+    W_leven = KG_NORMALIZATION_RERANK_LEVENSHTEIN_WEIGHT
+    leven_scores = cdist(
+        [cleaned_entity], cleaned_candidates, scorer=normalized_similarity
+    )[0]
+
+    # combine scores, the first of the best scoring candidates wins
+    scores = (1.0 - W_leven) * ngram_scores + W_leven * leven_scores
+    best_idx = int(np.argmax(scores))
+    if scores[best_idx] <= KG_NORMALIZATION_RERANK_THRESHOLD:
         return None
 
-    return candidates[0][0]
+    return candidates[best_idx][0]
+
+
+def _normalize_entities_batch(
+    entities_w_attributes: list[tuple[str, dict[str, str]]],
+    allowed_docs_temp_view_name: str | None = None,
+) -> list[str | None]:
+    """
+    Matches each entity to the best matching entity of the same type. Candidates
+    are retrieved with one query per (entity type, subtype) in a single session.
+    """
+    mapping: list[str | None] = [None] * len(entities_w_attributes)
+
+    # group the entities to normalize by type and subtype filter
+    cleaned_entities_by_group: dict[tuple[str, str | None], dict[int, str]] = (
+        defaultdict(dict)
+    )
+    for i, (entity, attributes) in enumerate(entities_w_attributes):
+        entity_type, entity_name = split_entity_id(entity)
+        if entity_name == "*":
+            mapping[i] = entity
+            continue
+
+        cleaned_entities_by_group[(entity_type, attributes.get("subtype"))][i] = (
+            _clean_name(entity_name)
+        )
+
+    if not cleaned_entities_by_group:
+        return mapping
+
+    # step 1: find entities containing the entity_name or something similar
+    with get_session_with_current_tenant() as db_session:
+        allowed_docs_temp_view = _get_allowed_docs_temp_view(
+            db_session, allowed_docs_temp_view_name
+        )
+
+        for (
+            entity_type,
+            subtype,
+        ), cleaned_entities in cleaned_entities_by_group.items():
+            candidates_by_entity = _get_normalization_candidates(
+                db_session=db_session,
+                cleaned_entities=list(set(cleaned_entities.values())),
+                entity_type=entity_type,
+                subtype=subtype,
+                allowed_docs_temp_view=allowed_docs_temp_view,
+            )
+
+            # step 2: rerank the candidates in memory
+            for i, cleaned_entity in cleaned_entities.items():
+                mapping[i] = _rerank_candidates(
+                    cleaned_entity, candidates_by_entity.get(cleaned_entity, [])
+                )
+
+    return mapping
 
 
 def _get_existing_normalized_relationships(
@@ -248,11 +332,9 @@ def normalize_entities(
         get_attributes(attr_entity) for attr_entity in raw_entities_w_attributes
     ]
 
-    mapping: list[str | None] = run_functions_tuples_in_parallel(
-        [
-            (_normalize_one_entity, (entity, attributes, allowed_docs_temp_view_name))
-            for entity, attributes in zip(raw_entities, entity_attributes)
-        ]
+    mapping = _normalize_entities_batch(
+        list(zip(raw_entities, entity_attributes)),
+        allowed_docs_temp_view_name=allowed_docs_temp_view_name,
     )
     for entity, attributes, normalized_entity in zip(
         raw_entities, entity_attributes, mapping
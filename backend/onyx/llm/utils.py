@@ -663,6 +663,32 @@ def model_supports_image_input(model_name: str, model_provider: str) -> bool:
         return False
 
 
+# providers where prompt caching has to be requested per message block with
+# `cache_control`. Others (e.g. OpenAI) cache long shared prompt prefixes on their own
+_EXPLICIT_PROMPT_CACHING_PROVIDERS = {"anthropic", "bedrock", "vertex_ai"}
+
+
+def model_supports_explicit_prompt_caching(
+    model_name: str, model_provider: str
+) -> bool:
+    if model_provider not in _EXPLICIT_PROMPT_CACHING_PROVIDERS:
+        return False
+
+    model_map = get_model_map()
+    try:
+        model_obj = find_model_obj(
+            model_map,
+            model_provider,
+            model_name,
+        )
+        return bool(model_obj and model_obj.get("supports_prompt_caching", False))
+    except Exception:
+        logger.exception(
+            f"Failed to get model object for {model_provider}/{model_name}"
+        )
+        return False
+
+
 def model_is_reasoning_model(model_name: str, model_provider: str) -> bool:
     model_map = get_model_map()
     try:
@@ -22,6 +22,7 @@ from onyx.configs.model_configs import (
     BATCH_SIZE_ENCODE_CHUNKS_FOR_API_EMBEDDING_SERVICES,
 )
 from onyx.configs.model_configs import DOC_EMBEDDING_CONTEXT_SIZE
+from onyx.configs.model_configs import EMBEDDING_TRANSPORT_FORMAT
 from onyx.db.models import SearchSettings
 from onyx.indexing.indexing_heartbeat import IndexingHeartbeatInterface
 from onyx.natural_language_processing.exceptions import (
@@ -35,6 +36,7 @@ from shared_configs.configs import INDEXING_MODEL_SERVER_PORT
 from shared_configs.configs import MODEL_SERVER_HOST
 from shared_configs.configs import MODEL_SERVER_PORT
 from shared_configs.enums import EmbeddingProvider
+from shared_configs.enums import EmbeddingTransportFormat
 from shared_configs.enums import EmbedTextType
 from shared_configs.enums import RerankerProvider
 from shared_configs.model_server_models import ConnectorClassificationRequest
@@ -49,6 +51,9 @@ from shared_configs.model_server_models import IntentResponse
 from shared_configs.model_server_models import RerankRequest
 from shared_configs.model_server_models import RerankResponse
 from shared_configs.utils import batch_list
+from shared_configs.utils import decode_embeddings
+from shared_configs.utils import EMBEDDING_BINARY_MEDIA_TYPE
+from shared_configs.utils import EMBEDDING_FORMAT_HEADER
 
 logger = setup_logger()
 
@@ -95,6 +100,7 @@ class EmbeddingModel:
         api_version: str | None = None,
         deployment_name: str | None = None,
         reduced_dimension: int | None = None,
+        transport_format: str = EMBEDDING_TRANSPORT_FORMAT,
     ) -> None:
         self.api_key = api_key
         self.provider_type = provider_type
@@ -112,6 +118,14 @@ class EmbeddingModel:
         )
         self.callback = callback
 
+        try:
+            self.transport_format = EmbeddingTransportFormat(transport_format)
+        except ValueError:
+            logger.warning(
+                f"Unknown embedding transport format '{transport_format}', using JSON"
+            )
+            self.transport_format = EmbeddingTransportFormat.JSON
+
         model_server_url = build_model_server_url(server_host, server_port)
         self.embed_server_endpoint = f"{model_server_url}/encoder/bi-encoder-embed"
 
@@ -129,6 +143,9 @@ class EmbeddingModel:
             if request_id:
                 headers["X-Onyx-Request-ID"] = request_id
 
+            if self.transport_format != EmbeddingTransportFormat.JSON:
+                headers[EMBEDDING_FORMAT_HEADER] = self.transport_format.value
+
             response = requests.post(
                 self.embed_server_endpoint,
                 headers=headers,
@@ -160,7 +177,7 @@ class EmbeddingModel:
 
         try:
             response = final_make_request_func()
-            return EmbedResponse(**response.json())
+            return self._parse_embed_response(response)
         except requests.HTTPError as e:
             if not response:
                 raise HTTPError("HTTP error occurred - response is None.") from e
@@ -173,6 +190,17 @@ class EmbeddingModel:
         except requests.RequestException as e:
             raise HTTPError(f"Request failed: {str(e)}") from e
 
+    @staticmethod
+    def _parse_embed_response(response: Response) -> EmbedResponse:
+        content_type = response.headers.get("Content-Type", "")
+        if not content_type.startswith(EMBEDDING_BINARY_MEDIA_TYPE):
+            return EmbedResponse(**response.json())
+
+        embeddings = decode_embeddings(response.content, response.headers)
+        # the rest of the pipeline works on float lists, tolist is still far cheaper
+        # than parsing the same floats out of JSON
+        return EmbedResponse.model_construct(embeddings=embeddings.tolist())
+
     def _batch_encode_texts(
         self,
         texts: list[str],
@@ -10,6 +10,7 @@ from redis.lock import Lock as RedisLock
 from sqlalchemy.orm import Session
 
 from onyx.configs.app_configs import DB_YIELD_PER_DEFAULT
+from onyx.configs.app_configs import DOCUMENT_CLEANUP_BATCH_SIZE
 from onyx.configs.constants import CELERY_VESPA_SYNC_BEAT_LOCK_TIMEOUT
 from onyx.configs.constants import OnyxCeleryPriority
 from onyx.configs.constants import OnyxCeleryQueues
@@ -112,7 +113,9 @@ class RedisConnectorDelete:
         lock: RedisLock,
     ) -> int | None:
         """Returns None if the cc_pair doesn't exist.
-        Otherwise, returns an int with the number of generated tasks."""
+        Otherwise, returns an int with the number of generated tasks.
+
+        Each task cleans up to DOCUMENT_CLEANUP_BATCH_SIZE documents."""
         last_lock_time = time.monotonic()
 
         cc_pair = get_connector_credential_pair_from_id(
@@ -123,6 +126,7 @@ class RedisConnectorDelete:
             return None
 
         num_tasks_sent = 0
+        doc_id_batch: list[str] = []
 
         stmt = construct_document_id_select_for_connector_credential_pair(
             cc_pair.connector_id, cc_pair.credential_id
@@ -136,31 +140,52 @@ class RedisConnectorDelete:
                 lock.reacquire()
                 last_lock_time = current_time
 
-            custom_task_id = self._generate_task_id()
-
-            # add to the tracking taskset in redis BEFORE creating the celery task.
-            # note that for the moment we are using a single taskset key, not differentiated by cc_pair id
-            self.redis.sadd(self.taskset_key, custom_task_id)
-
-            # Priority on sync's triggered by new indexing should be medium
-            celery_app.send_task(
-                OnyxCeleryTask.DOCUMENT_BY_CC_PAIR_CLEANUP_TASK,
-                kwargs=dict(
-                    document_id=doc_id,
-                    connector_id=cc_pair.connector_id,
-                    credential_id=cc_pair.credential_id,
-                    tenant_id=self.tenant_id,
-                ),
-                queue=OnyxCeleryQueues.CONNECTOR_DELETION,
-                task_id=custom_task_id,
-                priority=OnyxCeleryPriority.MEDIUM,
-                ignore_result=True,
+            doc_id_batch.append(doc_id)
+            if len(doc_id_batch) < DOCUMENT_CLEANUP_BATCH_SIZE:
+                continue
+
+            self._send_cleanup_task(
+                celery_app, doc_id_batch, cc_pair.connector_id, cc_pair.credential_id
             )
+            num_tasks_sent += 1
+            doc_id_batch = []
 
+        if doc_id_batch:
+            self._send_cleanup_task(
+                celery_app, doc_id_batch, cc_pair.connector_id, cc_pair.credential_id
+            )
             num_tasks_sent += 1
 
         return num_tasks_sent
 
+    def _send_cleanup_task(
+        self,
+        celery_app: Celery,
+        document_ids: list[str],
+        connector_id: int,
+        credential_id: int,
+    ) -> None:
+        custom_task_id = self._generate_task_id()
+
+        # add to the tracking taskset in redis BEFORE creating the celery task.
+        # note that for the moment we are using a single taskset key, not differentiated by cc_pair id
+        self.redis.sadd(self.taskset_key, custom_task_id)
+
+        # Priority on sync's triggered by new indexing should be medium
+        celery_app.send_task(
+            OnyxCeleryTask.DOCUMENT_BY_CC_PAIR_CLEANUP_BATCH_TASK,
+            kwargs=dict(
+                document_ids=document_ids,
+                connector_id=connector_id,
+                credential_id=credential_id,
+                tenant_id=self.tenant_id,
+            ),
+            queue=OnyxCeleryQueues.CONNECTOR_DELETION,
+            task_id=custom_task_id,
+            priority=OnyxCeleryPriority.MEDIUM,
+            ignore_result=True,
+        )
+
     def reset(self) -> None:
         self.redis.srem(OnyxRedisConstants.ACTIVE_FENCES, self.fence_key)
         self.redis.delete(self.active_key)
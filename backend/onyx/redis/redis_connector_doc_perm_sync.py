@@ -173,8 +173,7 @@ class RedisConnectorPermissionSync:
             "document_update_permissions",
         )
 
-        num_permissions = 0
-        # Create a task for each document permission sync
+        valid_permissions: list[DocExternalAccess] = []
         for permissions in new_permissions:
             current_time = time.monotonic()
             if lock and current_time - last_lock_time >= (
@@ -200,21 +199,27 @@ class RedisConnectorPermissionSync:
                     )
                 continue
 
-            # NOTE(rkuo): this used to fire a task instead of directly writing to the DB,
-            # but the permissions can be excessively large if sent over the wire.
-            # On the other hand, the downside of doing db updates here is that we can
-            # block and fail if we can't make the calls to the DB ... but that's probably
-            # a rare enough case to be acceptable.
-
-            # This can internally exception due to db issues but still continue
-            # we may want to change this
-            document_update_permissions_fn(
-                self.tenant_id, permissions, source_string, connector_id, credential_id
-            )
-
-            num_permissions += 1
+            valid_permissions.append(permissions)
+
+        # NOTE(rkuo): this used to fire a task instead of directly writing to the DB,
+        # but the permissions can be excessively large if sent over the wire.
+        # On the other hand, the downside of doing db updates here is that we can
+        # block and fail if we can't make the calls to the DB ... but that's probably
+        # a rare enough case to be acceptable.
+
+        # The whole batch is compared against the stored permissions at once and
+        # only the documents that changed are written.
+        # This can internally exception due to db issues but still continue
+        # we may want to change this
+        document_update_permissions_fn(
+            self.tenant_id,
+            valid_permissions,
+            source_string,
+            connector_id,
+            credential_id,
+        )
 
-        return num_permissions
+        return len(valid_permissions)
 
     def reset(self) -> None:
         self.redis.srem(OnyxRedisConstants.ACTIVE_FENCES, self.fence_key)
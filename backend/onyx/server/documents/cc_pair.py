@@ -29,7 +29,6 @@ from onyx.db.connector_credential_pair import remove_credential_from_connector
 from onyx.db.connector_credential_pair import (
     update_connector_credential_pair_from_id,
 )
-from onyx.db.document import get_document_counts_for_cc_pairs
 from onyx.db.document import get_documents_for_cc_pair
 from onyx.db.engine.sql_engine import get_session
 from onyx.db.enums import AccessType
@@ -49,7 +48,6 @@ from onyx.redis.redis_pool import get_redis_client
 from onyx.server.documents.models import CCPairFullInfo
 from onyx.server.documents.models import CCPropertyUpdateRequest
 from onyx.server.documents.models import CCStatusUpdateRequest
-from onyx.server.documents.models import ConnectorCredentialPairIdentifier
 from onyx.server.documents.models import ConnectorCredentialPairMetadata
 from onyx.server.documents.models import DocumentSyncStatus
 from onyx.server.documents.models import IndexAttemptSnapshot
@@ -117,20 +115,7 @@ def get_cc_pair_full_info(
     )
     is_editable_for_current_user = editable_cc_pair is not None
 
-    document_count_info_list = list(
-        get_document_counts_for_cc_pairs(
-            db_session=db_session,
-            cc_pairs=[
-                ConnectorCredentialPairIdentifier(
-                    connector_id=cc_pair.connector_id,
-                    credential_id=cc_pair.credential_id,
-                )
-            ],
-        )
-    )
-    documents_indexed = (
-        document_count_info_list[0][-1] if document_count_info_list else 0
-    )
+    documents_indexed = cc_pair.indexed_document_count
 
     latest_attempt = get_latest_index_attempt_for_cc_pair_id(
         db_session=db_session,
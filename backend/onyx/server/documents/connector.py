@@ -77,7 +77,6 @@ from onyx.db.connector_credential_pair import (
     fetch_connector_credential_pair_for_connector,
 )
 from onyx.db.connector_credential_pair import get_cc_pair_groups_for_ids
-from onyx.db.connector_credential_pair import get_cc_pair_groups_for_ids_parallel
 from onyx.db.connector_credential_pair import get_connector_credential_pair
 from onyx.db.connector_credential_pair import get_connector_credential_pairs_for_user
 from onyx.db.connector_credential_pair import (
@@ -89,7 +88,6 @@ from onyx.db.credentials import create_credential
 from onyx.db.credentials import delete_service_account_credentials
 from onyx.db.credentials import fetch_credential_by_id_for_user
 from onyx.db.deletion_attempt import check_deletion_attempt_is_allowed
-from onyx.db.document import get_document_counts_for_cc_pairs_parallel
 from onyx.db.engine.sql_engine import get_session
 from onyx.db.enums import AccessType
 from onyx.db.enums import IndexingMode
@@ -100,13 +98,13 @@ from onyx.db.models import ConnectorCredentialPair
 from onyx.db.models import IndexAttempt
 from onyx.db.models import IndexingStatus
 from onyx.db.models import User
-from onyx.db.models import UserGroup__ConnectorCredentialPair
 from onyx.db.search_settings import get_current_search_settings
 from onyx.db.search_settings import get_secondary_search_settings
 from onyx.file_processing.extract_file_text import convert_docx_to_txt
 from onyx.file_store.file_store import get_default_file_store
 from onyx.key_value_store.interface import KvKeyNotFoundError
-from onyx.redis.redis_connector import RedisConnector
+from onyx.redis.redis_connector_index import RedisConnectorIndex
+from onyx.redis.redis_pool import get_raw_redis_client
 from onyx.server.documents.models import AuthStatus
 from onyx.server.documents.models import AuthUrl
 from onyx.server.documents.models import ConnectorCredentialPairIdentifier
@@ -125,6 +123,7 @@ from onyx.server.documents.models import GoogleServiceAccountCredentialRequest
 from onyx.server.documents.models import GoogleServiceAccountKey
 from onyx.server.documents.models import IndexAttemptSnapshot
 from onyx.server.documents.models import ObjectCreationIdResponse
+from onyx.server.documents.models import PaginatedReturn
 from onyx.server.documents.models import RunConnectorRequest
 from onyx.server.models import StatusResponse
 from onyx.utils.logger import setup_logger
@@ -656,17 +655,17 @@ def get_connector_status(
     ]
 
 
-@router.get("/admin/connector/indexing-status")
-def get_connector_indexing_status(
-    secondary_index: bool = False,
-    user: User = Depends(current_curator_or_admin_user),
-    db_session: Session = Depends(get_session),
-    get_editable: bool = Query(
-        False, description="If true, return editable document sets"
-    ),
-) -> list[ConnectorIndexingStatus]:
+def _get_connector_indexing_statuses(
+    secondary_index: bool,
+    user: User,
+    db_session: Session,
+    get_editable: bool,
+    page_num: int | None = None,
+    page_size: int | None = None,
+) -> tuple[list[ConnectorIndexingStatus], int]:
+    """Returns the indexing statuses (of the requested page if `page_num` and
+    `page_size` are set, ordered by cc pair id) and the total number of statuses."""
     tenant_id = get_current_tenant_id()
-    indexing_statuses: list[ConnectorIndexingStatus] = []
 
     if MOCK_CONNECTOR_FILE_PATH:
         import json
@@ -676,7 +675,14 @@ def get_connector_indexing_status(
             connector_indexing_statuses = [
                 ConnectorIndexingStatus(**status) for status in raw_data
             ]
-        return connector_indexing_statuses
+        if page_num is not None and page_size is not None:
+            return (
+                connector_indexing_statuses[
+                    page_num * page_size : (page_num + 1) * page_size
+                ],
+                len(connector_indexing_statuses),
+            )
+        return connector_indexing_statuses, len(connector_indexing_statuses)
 
     # NOTE: If the connector is deleting behind the scenes,
     # accessing cc_pairs can be inconsistent and members like
@@ -730,69 +736,51 @@ def get_connector_indexing_status(
         for index_attempt in latest_finished_index_attempts
     }
 
-    document_count_info, group_cc_pair_relationships = run_functions_tuples_in_parallel(
-        [
-            (
-                get_document_counts_for_cc_pairs_parallel,
-                (
-                    [
-                        ConnectorCredentialPairIdentifier(
-                            connector_id=cc_pair.connector_id,
-                            credential_id=cc_pair.credential_id,
-                        )
-                        for cc_pair in cc_pairs
-                    ],
-                ),
-            ),
-            (
-                get_cc_pair_groups_for_ids_parallel,
-                ([cc_pair.id for cc_pair in cc_pairs],),
-            ),
-        ]
-    )
-    document_count_info = cast(list[tuple[int, int, int]], document_count_info)
-    group_cc_pair_relationships = cast(
-        list[UserGroup__ConnectorCredentialPair], group_cc_pair_relationships
-    )
+    connector_to_cc_pair_ids: dict[int, list[int]] = {}
+    for cc_pair in cc_pairs:
+        connector_to_cc_pair_ids.setdefault(cc_pair.connector_id, []).append(cc_pair.id)
 
-    cc_pair_to_document_cnt = {
-        (connector_id, credential_id): cnt
-        for connector_id, credential_id, cnt in document_count_info
-    }
+    visible_cc_pairs = [
+        cc_pair
+        for cc_pair in cc_pairs
+        # TODO remove this to enable ingestion API
+        # connector or credential may be missing if background deletion is happening
+        if cc_pair.name != "DefaultCCPair" and cc_pair.connector and cc_pair.credential
+    ]
+    total_items = len(visible_cc_pairs)
+    if page_num is not None and page_size is not None:
+        visible_cc_pairs = sorted(visible_cc_pairs, key=lambda cc_pair: cc_pair.id)[
+            page_num * page_size : (page_num + 1) * page_size
+        ]
+    page_cc_pair_ids = [cc_pair.id for cc_pair in visible_cc_pairs]
 
     group_cc_pair_relationships_dict: dict[int, list[int]] = {}
-    for relationship in group_cc_pair_relationships:
+    for relationship in get_cc_pair_groups_for_ids(db_session, page_cc_pair_ids):
         group_cc_pair_relationships_dict.setdefault(relationship.cc_pair_id, []).append(
             relationship.user_group_id
         )
 
-    connector_to_cc_pair_ids: dict[int, list[int]] = {}
-    for cc_pair in cc_pairs:
-        connector_to_cc_pair_ids.setdefault(cc_pair.connector_id, []).append(cc_pair.id)
-
     get_search_settings = (
         get_secondary_search_settings
         if secondary_index
         else get_current_search_settings
     )
     search_settings = get_search_settings(db_session)
-    for cc_pair in cc_pairs:
-        # TODO remove this to enable ingestion API
-        if cc_pair.name == "DefaultCCPair":
-            continue
 
+    # one pipelined round trip for all fences rather than one call per cc pair
+    fenced_cc_pair_ids: set[int] = set()
+    if search_settings:
+        fenced_cc_pair_ids = RedisConnectorIndex.get_fenced_cc_pair_ids(
+            get_raw_redis_client(),
+            tenant_id,
+            page_cc_pair_ids,
+            search_settings.id,
+        )
+
+    indexing_statuses: list[ConnectorIndexingStatus] = []
+    for cc_pair in visible_cc_pairs:
         connector = cc_pair.connector
         credential = cc_pair.credential
-        if not connector or not credential:
-            # This may happen if background deletion is happening
-            continue
-
-        in_progress = False
-        if search_settings:
-            redis_connector = RedisConnector(tenant_id, cc_pair.id)
-            redis_connector_index = redis_connector.new_index(search_settings.id)
-            if redis_connector_index.fenced:
-                in_progress = True
 
         latest_index_attempt = cc_pair_to_latest_index_attempt.get(
             (connector.id, credential.id)
@@ -816,7 +804,7 @@ def get_connector_indexing_status(
             ConnectorIndexingStatus(
                 cc_pair_id=cc_pair.id,
                 name=cc_pair.name,
-                in_progress=in_progress,
+                in_progress=cc_pair.id in fenced_cc_pair_ids,
                 cc_pair_status=cc_pair.status,
                 in_repeated_error_state=cc_pair.in_repeated_error_state,
                 connector=ConnectorSnapshot.from_connector_db_model(
@@ -833,9 +821,8 @@ def get_connector_indexing_status(
                     latest_index_attempt.status if latest_index_attempt else None
                 ),
                 last_success=cc_pair.last_successful_index_time,
-                docs_indexed=cc_pair_to_document_cnt.get(
-                    (connector.id, credential.id), 0
-                ),
+                # maintained counter, see ConnectorCredentialPair.indexed_document_count
+                docs_indexed=cc_pair.indexed_document_count,
                 latest_index_attempt=(
                     IndexAttemptSnapshot.from_index_attempt_db_model(
                         latest_index_attempt
@@ -855,9 +842,49 @@ def get_connector_indexing_status(
         db_session=db_session,
     )
 
+    return indexing_statuses, total_items
+
+
+@router.get("/admin/connector/indexing-status")
+def get_connector_indexing_status(
+    secondary_index: bool = False,
+    user: User = Depends(current_curator_or_admin_user),
+    db_session: Session = Depends(get_session),
+    get_editable: bool = Query(
+        False, description="If true, return editable document sets"
+    ),
+) -> list[ConnectorIndexingStatus]:
+    indexing_statuses, _ = _get_connector_indexing_statuses(
+        secondary_index=secondary_index,
+        user=user,
+        db_session=db_session,
+        get_editable=get_editable,
+    )
     return indexing_statuses
 
 
+@router.get("/admin/connector/indexing-status/paginated")
+def get_connector_indexing_status_paginated(
+    secondary_index: bool = False,
+    page_num: int = Query(0, ge=0),
+    page_size: int = Query(10, ge=1, le=1000),
+    user: User = Depends(current_curator_or_admin_user),
+    db_session: Session = Depends(get_session),
+    get_editable: bool = Query(
+        False, description="If true, return editable document sets"
+    ),
+) -> PaginatedReturn[ConnectorIndexingStatus]:
+    indexing_statuses, total_items = _get_connector_indexing_statuses(
+        secondary_index=secondary_index,
+        user=user,
+        db_session=db_session,
+        get_editable=get_editable,
+        page_num=page_num,
+        page_size=page_size,
+    )
+    return PaginatedReturn(items=indexing_statuses, total_items=total_items)
+
+
 def _validate_connector_allowed(source: DocumentSource) -> None:
     valid_connectors = [
         x for x in ENABLED_CONNECTOR_TYPES.replace("_", "").split(",") if x
@@ -7,6 +7,7 @@ import time
 from collections.abc import Callable
 from collections.abc import Generator
 from datetime import timedelta
+from typing import IO
 from uuid import UUID
 
 from fastapi import APIRouter
@@ -109,6 +110,8 @@ logger = setup_logger()
 
 router = APIRouter(prefix="/chat")
 
+_FILE_STREAM_CHUNK_SIZE_BYTES = 1024 * 1024
+
 
 @router.get("/get-user-chat-sessions")
 def get_user_chat_sessions(
@@ -844,9 +847,19 @@ def fetch_chat_file(
             file_id = txt_file_id
 
     media_type = file_record.file_type
-    file_io = file_store.read_file(file_id, mode="b")
+    file_stream = file_store.read_file_stream(file_id)
+
+    return StreamingResponse(_stream_file(file_stream), media_type=media_type)
 
-    return StreamingResponse(file_io, media_type=media_type)
+
+def _stream_file(file_stream: IO[bytes]) -> Generator[bytes, None, None]:
+    # iterating the stream directly reads it in tiny (1 KiB) chunks. The stream is
+    # closed even if the client disconnects so the connection goes back to the pool
+    try:
+        while chunk := file_stream.read(_FILE_STREAM_CHUNK_SIZE_BYTES):
+            yield chunk
+    finally:
+        file_stream.close()
 
 
 @router.get("/search")
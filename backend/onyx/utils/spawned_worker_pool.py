@@ -0,0 +1,236 @@
+"""A pool of long lived spawned worker processes that run picklable functions.
+
+Spawning a process and importing the heavy parts of onyx in it takes seconds, so
+workers are kept around and reused. A worker runs one task at a time and is replaced
+after a number of tasks or once it uses too much memory, so leaks in the code it runs
+can't accumulate."""
+
+import multiprocessing as mp
+import os
+import threading
+import time
+from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from multiprocessing.connection import Connection
+from typing import Any
+
+import psutil
+
+from onyx.utils.logger import setup_logger
+
+logger = setup_logger()
+
+# how long a worker asked to stop gets to exit before it is killed
+_STOP_TIMEOUT_SECONDS = 5
+
+# how often a worker checks that the process that spawned it is still alive
+_PARENT_CHECK_INTERVAL_SECONDS = 1
+
+
+def _exit_with_parent(parent_pid: int) -> None:
+    """Exits the worker once its parent is gone, even in the middle of a task.
+
+    Daemonic children are only terminated by an atexit handler of the parent, which
+    doesn't run when the parent is killed by a signal (e.g. the SIGTERM the indexing
+    watchdog sends to a stuck attempt). An orphaned worker is reparented, so its
+    parent pid changes. PR_SET_PDEATHSIG is not used as it fires when the spawning
+    thread exits, and workers are spawned from short lived threads."""
+    while True:
+        time.sleep(_PARENT_CHECK_INTERVAL_SECONDS)
+        if os.getppid() != parent_pid:
+            os._exit(1)
+
+
+def _run_worker(
+    conn: Connection,
+    parent_pid: int,
+    initializer: Callable[..., None] | None,
+    initializer_args: tuple[Any, ...],
+) -> None:
+    """Main loop of a worker process. For every (func, args) task received, a
+    (True, result) or (False, error) tuple is sent back. None stops the worker."""
+    threading.Thread(target=_exit_with_parent, args=(parent_pid,), daemon=True).start()
+
+    if initializer is not None:
+        initializer(*initializer_args)
+
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+
+        if task is None:
+            return
+
+        func, args = task
+        try:
+            conn.send((True, func(*args)))
+        except BaseException as e:
+            conn.send((False, f"{type(e).__name__}: {e}"))
+
+
+# multiprocessing's daemon flag of the current process is global state, so it is
+# only ever lifted by one thread at a time
+_daemon_flag_lock = threading.Lock()
+
+
+@contextmanager
+def _allow_daemon_children() -> Iterator[None]:
+    """Pools are also used from daemonic processes (e.g. indexing attempts), which
+    multiprocessing doesn't allow to start children. The flag is lifted while
+    starting a worker. Workers don't rely on being daemonic to go away with their
+    parent, see `_exit_with_parent`."""
+    with _daemon_flag_lock:
+        current_process = mp.current_process()
+        config = current_process._config  # type: ignore[attr-defined]
+        daemon = config.get("daemon")
+        config["daemon"] = False
+        try:
+            yield
+        finally:
+            config["daemon"] = daemon
+
+
+class SpawnedWorker:
+    def __init__(self, process: mp.process.BaseProcess, conn: Connection) -> None:
+        self.process = process
+        self.conn = conn
+        self.tasks_run = 0
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def send(self, func: Callable, args: tuple[Any, ...]) -> None:
+        """Starts running `func(*args)` in the worker"""
+        self.conn.send((func, args))
+
+    def poll(self, timeout: float = 0) -> bool:
+        """Whether the result of the running task is ready"""
+        return self.conn.poll(timeout)
+
+    def recv(self) -> tuple[bool, Any]:
+        """The (success, result or error) of the task, blocks until it is ready"""
+        success, value = self.conn.recv()
+        self.tasks_run += 1
+        return success, value
+
+    def rss_mb(self) -> float:
+        try:
+            return psutil.Process(self.process.pid).memory_info().rss / (1024 * 1024)
+        except psutil.Error:
+            return 0
+
+    def stop(self) -> None:
+        """Lets an idle worker exit by itself, kills it if it doesn't"""
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=_STOP_TIMEOUT_SECONDS)
+        self.kill()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=_STOP_TIMEOUT_SECONDS)
+        self.conn.close()
+
+
+class SpawnedWorkerPool:
+    """Idle spawned workers, ready to be handed out.
+
+    Every worker runs `initializer(*initializer_args)` once when it starts. A worker
+    is not reused after `max_tasks_per_worker` tasks, or once its RSS exceeds
+    `max_memory_mb` (0 disables either limit). A worker released as not reusable
+    (e.g. its task timed out) is killed. Thread safe."""
+
+    def __init__(
+        self,
+        initializer: Callable[..., None] | None = None,
+        initializer_args: tuple[Any, ...] = (),
+        max_tasks_per_worker: int = 0,
+        max_memory_mb: int = 0,
+    ) -> None:
+        self.initializer = initializer
+        self.initializer_args = initializer_args
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.max_memory_mb = max_memory_mb
+
+        self._lock = threading.Lock()
+        self._idle: list[SpawnedWorker] = []
+        self._shut_down = False
+
+    def _spawn_worker(self) -> SpawnedWorker:
+        ctx = mp.get_context("spawn")
+        parent_conn, child_conn = ctx.Pipe()
+        process = ctx.Process(
+            target=_run_worker,
+            args=(child_conn, os.getpid(), self.initializer, self.initializer_args),
+            daemon=True,
+        )
+        with _allow_daemon_children():
+            process.start()
+        child_conn.close()
+        return SpawnedWorker(process=process, conn=parent_conn)
+
+    def over_memory_limit(self, worker: SpawnedWorker) -> bool:
+        return self.max_memory_mb > 0 and worker.rss_mb() > self.max_memory_mb
+
+    def acquire(self) -> SpawnedWorker:
+        """An idle worker, or a newly spawned one if there is none. Raises once the
+        pool is shut down."""
+        with self._lock:
+            if self._shut_down:
+                raise RuntimeError("Spawned worker pool is shut down")
+
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.is_alive():
+                    return worker
+                worker.kill()
+            return self._spawn_worker()
+
+    def release(self, worker: SpawnedWorker, reusable: bool = True) -> None:
+        """Hands back a worker that is done with its task. `reusable` is False if
+        the task didn't finish, the worker is then killed."""
+        if not reusable or not worker.is_alive():
+            worker.kill()
+            return
+
+        if (
+            self.max_tasks_per_worker > 0
+            and worker.tasks_run >= self.max_tasks_per_worker
+        ) or self.over_memory_limit(worker):
+            logger.info(
+                f"Recycling spawned worker: tasks={worker.tasks_run} "
+                f"rss_mb={worker.rss_mb():.2f}"
+            )
+            worker.stop()
+            return
+
+        with self._lock:
+            if not self._shut_down:
+                self._idle.append(worker)
+                return
+        worker.stop()
+
+    def prestart(self, num_workers: int) -> None:
+        """Spawns workers until `num_workers` are idle"""
+        with self._lock:
+            if self._shut_down:
+                return
+            self._idle = [worker for worker in self._idle if worker.is_alive()]
+            while len(self._idle) < num_workers:
+                self._idle.append(self._spawn_worker())
+
+    def shutdown(self) -> None:
+        """Stops the idle workers, workers released afterwards are stopped as well"""
+        with self._lock:
+            idle = self._idle
+            self._idle = []
+            self._shut_down = True
+
+        for worker in idle:
+            worker.stop()
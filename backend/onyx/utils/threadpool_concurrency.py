@@ -1,9 +1,11 @@
 import collections.abc
 import contextvars
 import copy
+import queue
 import threading
 import uuid
 from collections.abc import Callable
+from collections.abc import Generator
 from collections.abc import Iterator
 from collections.abc import MutableMapping
 from collections.abc import Sequence
@@ -384,3 +386,66 @@ def parallel_yield(gens: list[Iterator[R]], max_workers: int = 10) -> Iterator[R
                     )
                     next_ind += 1
                 del future_to_index[future]
+
+
+_PREFETCH_DONE = object()
+_PREFETCH_PUT_POLL_INTERVAL = 0.1
+
+
+def prefetch_generator(gen: Iterator[R], max_prefetch: int) -> Generator[R, None, None]:
+    """
+    Runs the generator in a background thread, keeping up to `max_prefetch` items
+    buffered ahead of the consumer. Useful to overlap an I/O bound producer (e.g. a
+    connector) with an I/O bound consumer (e.g. indexing). Items are yielded in the
+    order they were produced and exceptions raised by the input generator are
+    re-raised in the consumer. Contextvars are propagated to the producer thread.
+
+    When the returned generator is closed (or garbage collected) before being
+    exhausted, the producer stops after the item it is currently producing. Up to
+    `max_prefetch` + 1 items may be produced and never yielded in that case.
+    """
+    if max_prefetch < 1:
+        raise ValueError(f"max_prefetch must be at least 1. Got {max_prefetch}")
+
+    buffer: queue.Queue[tuple[Any, BaseException | None]] = queue.Queue(
+        maxsize=max_prefetch
+    )
+    stop_event = threading.Event()
+
+    def _put(entry: tuple[Any, BaseException | None]) -> bool:
+        while not stop_event.is_set():
+            try:
+                buffer.put(entry, timeout=_PREFETCH_PUT_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce() -> None:
+        try:
+            for item in gen:
+                if not _put((item, None)):
+                    break
+        except BaseException as e:
+            _put((_PREFETCH_DONE, e))
+            return
+
+        _put((_PREFETCH_DONE, None))
+
+    producer = threading.Thread(
+        target=contextvars.copy_context().run, args=(_produce,), daemon=True
+    )
+    producer.start()
+
+    try:
+        while True:
+            item, exception = buffer.get()
+            if item is _PREFETCH_DONE:
+                if exception is not None:
+                    raise exception
+                return
+
+            yield cast(R, item)
+    finally:
+        # the producer may be blocked on I/O, so don't wait for it here
+        stop_event.set()
@@ -0,0 +1,149 @@
+"""
+Benchmark for loading the message chain of long chat sessions.
+
+Seeds a chat session with thousands of mainline messages, each assistant turn also
+having abandoned branches (regenerated answers), then compares loading every
+message of the session and walking the child pointers in Python against
+`create_chat_chain`, which only loads the mainline. Requires a running postgres.
+The seeded session is hard deleted at the end.
+
+Usage:
+    python -m scripts.chat_chain_benchmark --turns 2000 --branches 2
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from uuid import UUID
+
+from onyx.chat.chat_utils import create_chat_chain
+from onyx.configs.constants import MessageType
+from onyx.db.chat import create_chat_session
+from onyx.db.chat import create_new_chat_message
+from onyx.db.chat import delete_chat_session
+from onyx.db.chat import get_chat_messages_by_session
+from onyx.db.chat import get_or_create_root_message
+from onyx.db.engine.sql_engine import get_session_with_current_tenant
+from onyx.db.engine.sql_engine import SqlEngine
+
+COMMIT_EVERY = 256
+
+
+def _seed_session(num_turns: int, num_branches: int) -> UUID:
+    with get_session_with_current_tenant() as db_session:
+        chat_session = create_chat_session(
+            db_session, "chat_chain_benchmark", None, None
+        )
+        parent_message = get_or_create_root_message(chat_session.id, db_session)
+
+        for turn in range(num_turns):
+            user_message = create_new_chat_message(
+                chat_session.id,
+                parent_message,
+                f"benchmark user message {turn}",
+                None,
+                0,
+                MessageType.USER,
+                db_session,
+                commit=False,
+            )
+            # the abandoned answers are created first, the last one created is the
+            # latest child and so stays on the mainline
+            for branch in range(num_branches + 1):
+                parent_message = create_new_chat_message(
+                    chat_session.id,
+                    user_message,
+                    f"benchmark assistant message {turn}.{branch}",
+                    None,
+                    0,
+                    MessageType.ASSISTANT,
+                    db_session,
+                    commit=False,
+                )
+
+            if turn % COMMIT_EVERY == 0:
+                db_session.commit()
+
+        db_session.commit()
+        return chat_session.id
+
+
+def _load_full_session(chat_session_id: UUID) -> int:
+    """The previous approach: load the whole session and walk it in Python"""
+    with get_session_with_current_tenant() as db_session:
+        messages = get_chat_messages_by_session(
+            chat_session_id=chat_session_id,
+            user_id=None,
+            db_session=db_session,
+            skip_permission_check=True,
+            prefetch_tool_calls=True,
+        )
+        id_to_msg = {msg.id: msg for msg in messages}
+        num_mainline = 0
+        current = messages[0]
+        while current.latest_child_message:
+            current = id_to_msg[current.latest_child_message]
+            num_mainline += 1
+        return num_mainline
+
+
+def _load_chain(chat_session_id: UUID, max_history_messages: int | None) -> int:
+    with get_session_with_current_tenant() as db_session:
+        _, history = create_chat_chain(
+            chat_session_id=chat_session_id,
+            db_session=db_session,
+            max_history_messages=max_history_messages,
+        )
+        return len(history) + 1
+
+
+def _time(name: str, fn: Callable[[], int], iterations: int) -> None:
+    num_messages = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        num_messages = fn()
+    elapsed = (time.perf_counter() - start) / iterations
+    print(f"{name}: {elapsed * 1000:.1f}ms per load ({num_messages} messages)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark chat chain loading")
+    parser.add_argument("--turns", type=int, default=2000)
+    parser.add_argument(
+        "--branches",
+        type=int,
+        default=2,
+        help="Number of abandoned assistant answers per turn",
+    )
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--history", type=int, default=20)
+    args = parser.parse_args()
+
+    SqlEngine.init_engine(pool_size=5, max_overflow=0)
+
+    print(f"Seeding {args.turns} turns with {args.branches} abandoned branches each...")
+    chat_session_id = _seed_session(args.turns, args.branches)
+    try:
+        _time(
+            "full session load",
+            lambda: _load_full_session(chat_session_id),
+            args.iterations,
+        )
+        _time(
+            "mainline chain",
+            lambda: _load_chain(chat_session_id, None),
+            args.iterations,
+        )
+        _time(
+            f"mainline chain (last {args.history} messages)",
+            lambda: _load_chain(chat_session_id, args.history),
+            args.iterations,
+        )
+    finally:
+        with get_session_with_current_tenant() as db_session:
+            delete_chat_session(
+                user_id=None,
+                chat_session_id=chat_session_id,
+                db_session=db_session,
+                hard_delete=True,
+            )
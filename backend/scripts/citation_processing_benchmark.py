@@ -0,0 +1,90 @@
+"""
+Micro-benchmark for the streaming citation processor.
+
+Streams long synthetic answers (prose, citations and code blocks) token by token
+through CitationProcessor and reports the per-token cost. The time per token
+should stay flat as the answer gets longer.
+
+Usage:
+    python -m scripts.citation_processing_benchmark --num-tokens 20000
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime
+
+from onyx.chat.models import LlmDoc
+from onyx.chat.stream_processing.citation_processing import CitationProcessor
+from onyx.chat.stream_processing.utils import DocumentIdOrderMapping
+from onyx.configs.constants import DocumentSource
+
+NUM_DOCS = 10
+
+
+def _make_docs() -> list[LlmDoc]:
+    return [
+        LlmDoc(
+            document_id=f"doc_{i}",
+            content="Document is a doc",
+            blurb=f"Document #{i}",
+            semantic_identifier=f"Doc {i}",
+            source_type=DocumentSource.WEB,
+            metadata={},
+            updated_at=datetime.now(),
+            link=f"https://{i}.com",
+            source_links=None,
+            match_highlights=[],
+        )
+        for i in range(NUM_DOCS)
+    ]
+
+
+def _make_tokens(num_tokens: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    tokens: list[str] = []
+    while len(tokens) < num_tokens:
+        roll = rng.random()
+        if roll < 0.05:
+            tokens.extend(["[", str(rng.randint(1, NUM_DOCS)), "]"])
+        elif roll < 0.06:
+            tokens.extend(["``", "`python\n", "x = [1, 2]", "\n", "```\n"])
+        else:
+            tokens.append(rng.choice(["The", " answer", " is", " here", ".", "\n"]))
+    return tokens[:num_tokens]
+
+
+def run_benchmark(num_tokens: int, seed: int) -> float:
+    docs = _make_docs()
+    mapping = DocumentIdOrderMapping(
+        order_mapping={doc.document_id: i + 1 for i, doc in enumerate(docs)}
+    )
+    processor = CitationProcessor(
+        context_docs=docs,
+        final_doc_id_to_rank_map=mapping,
+        display_doc_id_to_rank_map=mapping,
+        stop_stream=None,
+    )
+    tokens = _make_tokens(num_tokens, seed)
+
+    start = time.perf_counter()
+    for token in tokens:
+        for _ in processor.process_token(token):
+            pass
+    for _ in processor.process_token(None):
+        pass
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark CitationProcessor")
+    parser.add_argument("--num-tokens", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for num_tokens in (args.num_tokens // 4, args.num_tokens // 2, args.num_tokens):
+        elapsed = run_benchmark(num_tokens, args.seed)
+        print(
+            f"{num_tokens} tokens: {elapsed:.3f}s total, "
+            f"{elapsed / num_tokens * 1e6:.1f}us per token"
+        )
@@ -0,0 +1,92 @@
+"""
+Ingest benchmark for the Salesforce SQLite cache.
+
+Generates a synthetic CSV of Salesforce-like records (with parent id columns so the
+relationship tables are exercised) and times OnyxSalesforceSQLite.update_from_csv
+on it, first into an empty db and then again as an update of every row.
+
+Usage:
+    python -m scripts.salesforce_sqlite_ingest_benchmark --num-rows 2000000
+"""
+
+import argparse
+import csv
+import os
+import random
+import string
+import tempfile
+import time
+
+from onyx.connectors.salesforce.sqlite_functions import OnyxSalesforceSQLite
+from onyx.connectors.salesforce.sqlite_functions import UPDATE_FROM_CSV_BATCH_SIZE
+
+_ID_CHARS = string.ascii_letters + string.digits
+
+
+def _make_id(prefix: str, rng: random.Random) -> str:
+    return prefix + "".join(rng.choices(_ID_CHARS, k=15))
+
+
+def write_synthetic_csv(path: str, num_rows: int, seed: int) -> None:
+    rng = random.Random(seed)
+    owner_ids = [_make_id("005", rng) for _ in range(100)]
+    account_ids: list[str] = []
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(
+            f,
+            fieldnames=["Id", "Name", "Description", "ParentId", "OwnerId"],
+        )
+        writer.writeheader()
+        for i in range(num_rows):
+            row_id = _make_id("001", rng)
+            writer.writerow(
+                {
+                    "Id": row_id,
+                    "Name": f"Account {i}",
+                    "Description": " ".join(rng.choices(_ID_CHARS, k=20)),
+                    "ParentId": rng.choice(account_ids) if account_ids else "",
+                    "OwnerId": rng.choice(owner_ids),
+                }
+            )
+            if len(account_ids) < 10_000:
+                account_ids.append(row_id)
+
+
+def run_benchmark(num_rows: int, batch_size: int, seed: int) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_path = os.path.join(temp_dir, "Account.csv")
+        start = time.monotonic()
+        write_synthetic_csv(csv_path, num_rows, seed)
+        print(
+            f"Generated {num_rows} rows "
+            f"({os.path.getsize(csv_path) / 1024 / 1024:.1f} MB) "
+            f"in {time.monotonic() - start:.2f}s"
+        )
+
+        sf_db = OnyxSalesforceSQLite(os.path.join(temp_dir, "salesforce_db.sqlite"))
+        sf_db.connect()
+        try:
+            sf_db.apply_schema()
+            for phase in ("initial load", "update"):
+                start = time.monotonic()
+                sf_db.update_from_csv("Account", csv_path, batch_size=batch_size)
+                elapsed = time.monotonic() - start
+                print(
+                    f"{phase}: {elapsed:.2f}s ({num_rows / elapsed:.0f} rows/s), "
+                    f"db size {sf_db.file_size / 1024 / 1024:.1f} MB"
+                )
+        finally:
+            sf_db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark Salesforce SQLite CSV ingestion"
+    )
+    parser.add_argument("--num-rows", type=int, default=2_000_000)
+    parser.add_argument("--batch-size", type=int, default=UPDATE_FROM_CSV_BATCH_SIZE)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    run_benchmark(args.num_rows, args.batch_size, args.seed)
@@ -54,6 +54,18 @@ MIN_THREADS_ML_MODELS = int(os.environ.get("MIN_THREADS_ML_MODELS") or 1)
 # or intent classification
 INDEXING_ONLY = os.environ.get("INDEXING_ONLY", "").lower() == "true"
 
+# Concurrent requests to the same local embedding / reranking model are coalesced
+# into one forward pass. A batch is run once it holds MODEL_SERVER_MAX_BATCH_SIZE
+# texts (or document pairs) or MODEL_SERVER_BATCH_MAX_WAIT_MS has passed since the
+# first request in it arrived
+DISABLE_MODEL_SERVER_MICRO_BATCHING = (
+    os.environ.get("DISABLE_MODEL_SERVER_MICRO_BATCHING", "").lower() == "true"
+)
+MODEL_SERVER_MAX_BATCH_SIZE = int(os.environ.get("MODEL_SERVER_MAX_BATCH_SIZE") or 128)
+MODEL_SERVER_BATCH_MAX_WAIT_MS = int(
+    os.environ.get("MODEL_SERVER_BATCH_MAX_WAIT_MS") or 5
+)
+
 # The process needs to have this for the log file to write to
 # otherwise, it will not create additional log files
 # This should just be the filename base without extension or path.
@@ -19,3 +19,12 @@ class RerankerProvider(str, Enum):
 class EmbedTextType(str, Enum):
     QUERY = "query"
     PASSAGE = "passage"
+
+
+class EmbeddingTransportFormat(str, Enum):
+    """How embeddings are sent back from the model server. The binary formats are
+    raw little-endian buffers, see shared_configs.utils"""
+
+    JSON = "json"
+    FLOAT32 = "float32"
+    FLOAT16 = "float16"
@@ -1,11 +1,68 @@
+from collections.abc import Mapping
 from typing import TypeVar
 
+import numpy as np
+
+from shared_configs.enums import EmbeddingTransportFormat
+from shared_configs.model_server_models import Embedding
+
 
 T = TypeVar("T")
 
+# Binary embedding responses: the body is the raw row-major little-endian buffer of
+# a (num_embeddings, dim) array, the dtype and shape are sent as headers
+EMBEDDING_BINARY_MEDIA_TYPE = "application/x-onyx-embeddings"
+# sent by the client to ask for a binary response, older model servers ignore it and
+# respond with JSON
+EMBEDDING_FORMAT_HEADER = "X-Onyx-Embedding-Format"
+EMBEDDING_DTYPE_HEADER = "X-Onyx-Embedding-Dtype"
+EMBEDDING_SHAPE_HEADER = "X-Onyx-Embedding-Shape"
+
+_BINARY_EMBEDDING_DTYPES = {
+    EmbeddingTransportFormat.FLOAT32: np.dtype("<f4"),
+    EmbeddingTransportFormat.FLOAT16: np.dtype("<f2"),
+}
+
 
 def batch_list(
     lst: list[T],
     batch_size: int,
 ) -> list[list[T]]:
     return [lst[i : i + batch_size] for i in range(0, len(lst), batch_size)]
+
+
+def encode_embeddings(
+    embeddings: list[Embedding] | np.ndarray,
+    transport_format: EmbeddingTransportFormat,
+) -> tuple[bytes, dict[str, str]] | None:
+    """Returns the binary body and headers for the embeddings, or None if they
+    should be sent as JSON instead (JSON requested or embeddings aren't a 2D
+    array of equal length vectors)."""
+    dtype = _BINARY_EMBEDDING_DTYPES.get(transport_format)
+    if dtype is None:
+        return None
+
+    try:
+        array = np.asarray(embeddings, dtype=dtype)
+    except ValueError:
+        return None
+    if array.ndim != 2:
+        return None
+
+    headers = {
+        EMBEDDING_DTYPE_HEADER: transport_format.value,
+        EMBEDDING_SHAPE_HEADER: ",".join(str(dim) for dim in array.shape),
+    }
+    return np.ascontiguousarray(array).tobytes(), headers
+
+
+def decode_embeddings(body: bytes, headers: Mapping[str, str]) -> np.ndarray:
+    """Inverse of encode_embeddings. The returned array is a read-only view over
+    `body`, no copy is made."""
+    transport_format = EmbeddingTransportFormat(headers[EMBEDDING_DTYPE_HEADER])
+    dtype = _BINARY_EMBEDDING_DTYPES.get(transport_format)
+    if dtype is None:
+        raise ValueError(f"Unsupported binary embedding format: {transport_format}")
+
+    shape = tuple(int(dim) for dim in headers[EMBEDDING_SHAPE_HEADER].split(","))
+    return np.frombuffer(body, dtype=dtype).reshape(shape)
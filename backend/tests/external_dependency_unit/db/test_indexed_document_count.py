@@ -0,0 +1,171 @@
+from uuid import uuid4
+
+from sqlalchemy.orm import Session
+
+from onyx.configs.constants import DocumentSource
+from onyx.connectors.models import InputType
+from onyx.db.document import (
+    delete_all_documents_by_connector_credential_pair__no_commit,
+)
+from onyx.db.document import delete_documents_by_connector_credential_pair__no_commit
+from onyx.db.document import delete_documents_complete__no_commit
+from onyx.db.document import get_document_counts_for_cc_pairs
+from onyx.db.document import mark_document_as_indexed_for_cc_pair__no_commit
+from onyx.db.document import upsert_document_by_connector_credential_pair
+from onyx.db.document import upsert_documents
+from onyx.db.enums import AccessType
+from onyx.db.enums import ConnectorCredentialPairStatus
+from onyx.db.models import Connector
+from onyx.db.models import ConnectorCredentialPair
+from onyx.db.models import Credential
+from onyx.document_index.interfaces import DocumentMetadata
+from onyx.server.documents.models import ConnectorCredentialPairIdentifier
+
+
+def _create_test_connector_credential_pair(
+    db_session: Session,
+) -> ConnectorCredentialPair:
+    connector = Connector(
+        name="Test Connector",
+        source=DocumentSource.FILE,
+        input_type=InputType.LOAD_STATE,
+        connector_specific_config={},
+        refresh_freq=None,
+        prune_freq=None,
+        indexing_start=None,
+    )
+    db_session.add(connector)
+    db_session.flush()  # To get the connector ID
+
+    credential = Credential(
+        source=DocumentSource.FILE,
+        credential_json={},
+        user_id=None,
+    )
+    db_session.add(credential)
+    db_session.flush()  # To get the credential ID
+
+    cc_pair = ConnectorCredentialPair(
+        connector_id=connector.id,
+        credential_id=credential.id,
+        name="Test CC Pair",
+        status=ConnectorCredentialPairStatus.ACTIVE,
+        access_type=AccessType.PUBLIC,
+        auto_sync_options=None,
+    )
+    db_session.add(cc_pair)
+    db_session.commit()
+    db_session.refresh(cc_pair)
+    return cc_pair
+
+
+def _add_documents(
+    db_session: Session, cc_pair: ConnectorCredentialPair, document_ids: list[str]
+) -> None:
+    upsert_documents(
+        db_session,
+        [
+            DocumentMetadata(
+                connector_id=cc_pair.connector_id,
+                credential_id=cc_pair.credential_id,
+                document_id=document_id,
+                semantic_identifier=document_id,
+                first_link="",
+            )
+            for document_id in document_ids
+        ],
+    )
+    upsert_document_by_connector_credential_pair(
+        db_session, cc_pair.connector_id, cc_pair.credential_id, document_ids
+    )
+
+
+def _mark_indexed(
+    db_session: Session, cc_pair: ConnectorCredentialPair, document_ids: list[str]
+) -> None:
+    mark_document_as_indexed_for_cc_pair__no_commit(
+        db_session, cc_pair.connector_id, cc_pair.credential_id, document_ids
+    )
+    db_session.commit()
+
+
+def _assert_counter_matches_rows(
+    db_session: Session, cc_pair: ConnectorCredentialPair, expected: int
+) -> None:
+    """The maintained counter must always equal the number of indexed rows"""
+    db_session.refresh(cc_pair)
+    counts = {
+        (connector_id, credential_id): count
+        for connector_id, credential_id, count in get_document_counts_for_cc_pairs(
+            db_session,
+            [
+                ConnectorCredentialPairIdentifier(
+                    connector_id=cc_pair.connector_id,
+                    credential_id=cc_pair.credential_id,
+                )
+            ],
+        )
+    }
+    row_count = counts.get((cc_pair.connector_id, cc_pair.credential_id), 0)
+
+    assert row_count == expected
+    assert cc_pair.indexed_document_count == row_count
+
+
+def test_indexed_document_count_follows_rows(
+    db_session: Session, tenant_context: None
+) -> None:
+    cc_pair = _create_test_connector_credential_pair(db_session)
+    other_cc_pair = _create_test_connector_credential_pair(db_session)
+
+    doc_ids = [f"indexed_count_test_{uuid4().hex}" for _ in range(4)]
+    shared_doc_ids = doc_ids[2:]
+    _add_documents(db_session, cc_pair, doc_ids)
+    _add_documents(db_session, other_cc_pair, shared_doc_ids)
+    _assert_counter_matches_rows(db_session, cc_pair, 0)
+
+    # index
+    _mark_indexed(db_session, cc_pair, doc_ids[:3])
+    _mark_indexed(db_session, other_cc_pair, shared_doc_ids[:1])
+    _assert_counter_matches_rows(db_session, cc_pair, 3)
+    _assert_counter_matches_rows(db_session, other_cc_pair, 1)
+
+    # re-marking already indexed documents only counts the new ones
+    _mark_indexed(db_session, cc_pair, doc_ids)
+    _mark_indexed(db_session, cc_pair, doc_ids)
+    _assert_counter_matches_rows(db_session, cc_pair, 4)
+
+    # prune an indexed document from one cc pair and a never indexed one from the
+    # other
+    delete_documents_by_connector_credential_pair__no_commit(
+        db_session,
+        doc_ids[:1],
+        ConnectorCredentialPairIdentifier(
+            connector_id=cc_pair.connector_id,
+            credential_id=cc_pair.credential_id,
+        ),
+    )
+    delete_documents_by_connector_credential_pair__no_commit(
+        db_session,
+        shared_doc_ids[1:],
+        ConnectorCredentialPairIdentifier(
+            connector_id=other_cc_pair.connector_id,
+            credential_id=other_cc_pair.credential_id,
+        ),
+    )
+    db_session.commit()
+    _assert_counter_matches_rows(db_session, cc_pair, 3)
+    _assert_counter_matches_rows(db_session, other_cc_pair, 1)
+
+    # completely deleting a document shared by both cc pairs updates both
+    delete_documents_complete__no_commit(db_session, shared_doc_ids[:1])
+    db_session.commit()
+    _assert_counter_matches_rows(db_session, cc_pair, 2)
+    _assert_counter_matches_rows(db_session, other_cc_pair, 0)
+
+    # connector deletion drops all of the cc pair's rows
+    delete_all_documents_by_connector_credential_pair__no_commit(
+        db_session, cc_pair.connector_id, cc_pair.credential_id
+    )
+    db_session.commit()
+    _assert_counter_matches_rows(db_session, cc_pair, 0)
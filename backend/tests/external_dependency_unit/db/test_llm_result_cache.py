@@ -0,0 +1,41 @@
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from unittest.mock import patch
+from uuid import uuid4
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from onyx.db.llm_result_cache import build_llm_cache_key
+from onyx.db.llm_result_cache import delete_llm_results_older_than
+from onyx.db.llm_result_cache import fetch_llm_results
+from onyx.db.llm_result_cache import store_llm_results
+from onyx.db.models import LLMResultCache
+
+
+def test_delete_llm_results_older_than(
+    db_session: Session, tenant_context: None
+) -> None:
+    old_keys = [build_llm_cache_key("test", uuid4().hex) for _ in range(5)]
+    new_keys = [build_llm_cache_key("test", uuid4().hex) for _ in range(2)]
+    store_llm_results(db_session, {key: "result" for key in old_keys + new_keys})
+
+    now = datetime.now(timezone.utc)
+    db_session.execute(
+        update(LLMResultCache)
+        .where(LLMResultCache.cache_key.in_(old_keys))
+        .values(time_created=now - timedelta(days=60))
+    )
+    db_session.commit()
+
+    # small batches so that the deletion takes several rounds
+    with patch("onyx.db.llm_result_cache._DELETE_BATCH_SIZE", 2):
+        num_deleted = delete_llm_results_older_than(
+            db_session, now - timedelta(days=30)
+        )
+
+    assert num_deleted >= len(old_keys)
+    assert fetch_llm_results(db_session, old_keys + new_keys) == {
+        key: "result" for key in new_keys
+    }
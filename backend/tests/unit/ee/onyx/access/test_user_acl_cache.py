@@ -0,0 +1,71 @@
+from collections.abc import Generator
+from unittest.mock import Mock
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from ee.onyx.access import user_acl_cache
+from ee.onyx.access.user_acl_cache import bump_user_acl_version
+from ee.onyx.access.user_acl_cache import get_cached_group_acl_for_user
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, bytes] = {}
+
+    def get(self, key: str) -> bytes | None:
+        return self.store.get(key)
+
+    def set(self, key: str, value: str, ex: int | None = None) -> None:
+        self.store[key] = value.encode("utf-8")
+
+    def incr(self, key: str) -> None:
+        self.store[key] = str(int(self.store.get(key, b"0")) + 1).encode("utf-8")
+
+
+@pytest.fixture
+def fake_redis() -> Generator[_FakeRedis, None, None]:
+    redis_client = _FakeRedis()
+    user_acl_cache._local_acl_cache.clear()
+    with patch(
+        "ee.onyx.access.user_acl_cache.get_redis_client", return_value=redis_client
+    ):
+        yield redis_client
+    user_acl_cache._local_acl_cache.clear()
+
+
+def test_group_acl_is_cached_until_the_version_is_bumped(
+    fake_redis: _FakeRedis,
+) -> None:
+    user_id = uuid4()
+    fetch_group_acl = Mock(return_value={"group:eng"})
+
+    assert get_cached_group_acl_for_user(user_id, fetch_group_acl) == {"group:eng"}
+    assert get_cached_group_acl_for_user(user_id, fetch_group_acl) == {"group:eng"}
+    assert fetch_group_acl.call_count == 1
+
+    # another process only has the Redis tier
+    user_acl_cache._local_acl_cache.clear()
+    assert get_cached_group_acl_for_user(user_id, fetch_group_acl) == {"group:eng"}
+    assert fetch_group_acl.call_count == 1
+
+    fetch_group_acl.return_value = {"group:eng", "external_group:sales"}
+    bump_user_acl_version()
+    assert get_cached_group_acl_for_user(user_id, fetch_group_acl) == {
+        "group:eng",
+        "external_group:sales",
+    }
+    assert fetch_group_acl.call_count == 2
+
+
+def test_redis_failures_fall_back_to_postgres() -> None:
+    failing_redis = Mock()
+    failing_redis.get.side_effect = ConnectionError("redis down")
+    fetch_group_acl = Mock(return_value={"group:eng"})
+
+    with patch(
+        "ee.onyx.access.user_acl_cache.get_redis_client", return_value=failing_redis
+    ):
+        assert get_cached_group_acl_for_user(uuid4(), fetch_group_acl) == {"group:eng"}
+    fetch_group_acl.assert_called_once()
@@ -0,0 +1,65 @@
+from unittest.mock import MagicMock
+
+from ee.onyx.db.document import bulk_upsert_document_external_perms
+from onyx.access.models import ExternalAccess
+from onyx.access.utils import build_ext_group_name_for_onyx
+from onyx.configs.constants import DocumentSource
+
+
+def _access(emails: set[str], groups: set[str], is_public: bool) -> ExternalAccess:
+    return ExternalAccess(
+        external_user_emails=emails,
+        external_user_group_ids=groups,
+        is_public=is_public,
+    )
+
+
+def test_only_changed_and_new_docs_are_written() -> None:
+    source = DocumentSource.GOOGLE_DRIVE
+    group = build_ext_group_name_for_onyx(ext_group_name="eng", source=source)
+
+    db_session = MagicMock()
+    # stored (id, external_user_emails, external_user_group_ids, is_public)
+    db_session.execute.return_value.all.return_value = [
+        ("unchanged", ["a@x.com"], [group], False),
+        ("changed", ["a@x.com"], [], False),
+    ]
+    db_session.scalars.return_value.all.return_value = ["new"]
+
+    updated, created = bulk_upsert_document_external_perms(
+        db_session=db_session,
+        doc_id_to_external_access={
+            "unchanged": _access({"a@x.com"}, {"eng"}, False),
+            "changed": _access({"a@x.com"}, set(), True),
+            "new": _access(set(), {"eng"}, False),
+        },
+        source_type=source,
+    )
+
+    assert updated == ["changed"]
+    assert created == ["new"]
+
+    # one select for the diff and one bulk update for the changed docs only
+    assert db_session.execute.call_count == 2
+    update_rows = db_session.execute.call_args_list[1].args[1]
+    assert [row["id"] for row in update_rows] == ["changed"]
+    assert update_rows[0]["is_public"] is True
+    assert "last_modified" in update_rows[0]
+    db_session.commit.assert_called_once()
+
+
+def test_no_writes_when_nothing_changed() -> None:
+    db_session = MagicMock()
+    db_session.execute.return_value.all.return_value = [
+        ("doc", ["a@x.com"], [], True),
+    ]
+
+    updated, created = bulk_upsert_document_external_perms(
+        db_session=db_session,
+        doc_id_to_external_access={"doc": _access({"a@x.com"}, set(), True)},
+        source_type=DocumentSource.CONFLUENCE,
+    )
+
+    assert (updated, created) == ([], [])
+    assert db_session.execute.call_count == 1
+    db_session.scalars.assert_not_called()
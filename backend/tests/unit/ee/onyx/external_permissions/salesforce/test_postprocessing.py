@@ -1,4 +1,5 @@
 from datetime import datetime
+from unittest.mock import patch
 
 from ee.onyx.external_permissions.salesforce.postprocessing import (
     censor_salesforce_chunks,
@@ -201,3 +202,62 @@ def test_validate_salesforce_access_blurb_update() -> None:
     assert len(filtered_chunks) == 1
     assert len(filtered_chunks[0].blurb) <= BLURB_SIZE
     assert filtered_chunks[0].blurb.startswith(section)
+
+
+class _FakePipeline:
+    def __init__(self, store: dict[str, bytes]) -> None:
+        self.store = store
+
+    def set(self, key: str, value: bytes, ex: int | None = None) -> None:
+        self.store[key] = value
+
+    def execute(self) -> None:
+        pass
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, bytes] = {}
+
+    def mget(self, keys: list[str]) -> list[bytes | None]:
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self, transaction: bool = True) -> _FakePipeline:
+        return _FakePipeline(self.store)
+
+
+def test_salesforce_object_access_is_cached_across_queries() -> None:
+    chunk = create_test_chunk(
+        doc_id="doc1",
+        chunk_id=1,
+        content="Object 1. Object 2.",
+        source_links={
+            0: "https://salesforce.com/object1",
+            10: "https://salesforce.com/object2",
+        },
+    )
+    postprocessing_module = "ee.onyx.external_permissions.salesforce.postprocessing"
+
+    with (
+        patch(
+            "ee.onyx.external_permissions.censoring_access_cache.get_raw_redis_client",
+            return_value=_FakeRedis(),
+        ),
+        patch(f"{postprocessing_module}.get_session_with_current_tenant"),
+        patch(f"{postprocessing_module}.get_any_salesforce_client_for_doc_id"),
+        patch(
+            f"{postprocessing_module}.get_salesforce_user_id_from_email",
+            return_value="sf_user",
+        ),
+        patch(
+            f"{postprocessing_module}.get_objects_access_for_user_id",
+            side_effect=lambda _, __, record_ids: {
+                record_id: record_id == "object1" for record_id in record_ids
+            },
+        ) as mock_get_access,
+    ):
+        first = censor_salesforce_chunks([chunk], "test@example.com")
+        second = censor_salesforce_chunks([chunk], "test@example.com")
+
+    assert mock_get_access.call_count == 1
+    assert first[0].content == second[0].content == "Object 1. "
@@ -0,0 +1,85 @@
+import time
+from datetime import datetime
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from ee.onyx.external_permissions.post_query_censoring import (
+    _post_query_chunk_censoring,
+)
+from onyx.configs.constants import DocumentSource
+from onyx.context.search.models import InferenceChunk
+
+
+def _create_chunk(doc_id: str, source: DocumentSource) -> InferenceChunk:
+    return InferenceChunk(
+        document_id=doc_id,
+        chunk_id=0,
+        blurb="blurb",
+        content=f"{doc_id} content",
+        source_links={},
+        section_continuation=False,
+        source_type=source,
+        semantic_identifier=doc_id,
+        title=doc_id,
+        boost=1,
+        recency_bias=1.0,
+        score=None,
+        hidden=False,
+        metadata={},
+        match_highlights=[],
+        updated_at=datetime.now(),
+        image_file_id=None,
+        doc_summary="",
+        chunk_context="",
+    )
+
+
+def _sync_config(censor_func: MagicMock) -> MagicMock:
+    sync_config = MagicMock()
+    sync_config.censoring_config.chunk_censoring_func = censor_func
+    return sync_config
+
+
+def test_sources_are_censored_in_parallel_with_a_deadline() -> None:
+    salesforce_chunk = _create_chunk("sf", DocumentSource.SALESFORCE)
+    slack_chunk = _create_chunk("slack", DocumentSource.SLACK)
+    web_chunk = _create_chunk("web", DocumentSource.WEB)
+
+    def slow_censor(
+        chunks: list[InferenceChunk], user_email: str
+    ) -> list[InferenceChunk]:
+        time.sleep(1)
+        return chunks
+
+    sync_configs = {
+        DocumentSource.SALESFORCE: _sync_config(MagicMock(side_effect=slow_censor)),
+        DocumentSource.SLACK: _sync_config(
+            MagicMock(side_effect=lambda chunks, _: chunks)
+        ),
+    }
+
+    with (
+        patch(
+            "ee.onyx.external_permissions.post_query_censoring._get_all_censoring_enabled_sources",
+            return_value={DocumentSource.SALESFORCE, DocumentSource.SLACK},
+        ),
+        patch(
+            "ee.onyx.external_permissions.post_query_censoring.get_source_perm_sync_config",
+            side_effect=sync_configs.get,
+        ),
+        patch(
+            "ee.onyx.external_permissions.post_query_censoring.POST_QUERY_CENSORING_TIMEOUT_SECONDS",
+            0.2,
+        ),
+    ):
+        start = time.monotonic()
+        result = _post_query_chunk_censoring(
+            [salesforce_chunk, slack_chunk, web_chunk],
+            MagicMock(email="test@example.com"),
+        )
+        elapsed = time.monotonic() - start
+
+    # the slow source is dropped once the deadline passes, the others are kept in
+    # their original order
+    assert result == [slack_chunk, web_chunk]
+    assert elapsed < 1
@@ -244,6 +244,71 @@ class TestExternalStorageFileStore:
                 assert call_args[1]["Key"] == "onyx-files/public/test-file.txt"
                 assert call_args[1]["ContentType"] == "text/plain"
 
+    @patch("boto3.client")
+    def test_s3_save_large_file_uses_multipart_upload(
+        self, mock_boto3: MagicMock, sample_content: bytes
+    ) -> None:
+        """Test that content above the streaming threshold is not read into memory"""
+        mock_s3_client: Mock = Mock()
+        mock_boto3.return_value = mock_s3_client
+
+        with patch("onyx.file_store.file_store.upsert_filerecord"):
+            file_store = S3BackedFileStore(
+                Mock(),
+                bucket_name="test-bucket",
+                streaming_threshold_bytes=len(sample_content) - 1,
+            )
+            content = BytesIO(sample_content)
+            file_store.save_file(
+                file_id="large-file.pdf",
+                content=content,
+                display_name="Large File",
+                file_origin=FileOrigin.OTHER,
+                file_type="application/pdf",
+            )
+
+        mock_s3_client.put_object.assert_not_called()
+        mock_s3_client.upload_fileobj.assert_called_once()
+        call_kwargs = mock_s3_client.upload_fileobj.call_args[1]
+        assert call_kwargs["Fileobj"] is content
+        assert call_kwargs["Key"] == "onyx-files/public/large-file.pdf"
+        assert call_kwargs["ExtraArgs"] == {"ContentType": "application/pdf"}
+        assert content.tell() == 0
+
+    @patch("boto3.client")
+    def test_s3_read_file_large_and_ranged(
+        self, mock_boto3: MagicMock, sample_content: bytes
+    ) -> None:
+        """Test chunked downloads of large files and ranged reads"""
+        mock_s3_client: Mock = Mock()
+        mock_boto3.return_value = mock_s3_client
+
+        body = Mock()
+        body.iter_chunks.return_value = iter([sample_content[:5], sample_content[5:]])
+        body.read.return_value = sample_content[2:6]
+        mock_s3_client.get_object.return_value = {
+            "Body": body,
+            "ContentLength": len(sample_content),
+        }
+
+        file_record = Mock(bucket_name="test-bucket", object_key="key")
+        with patch(
+            "onyx.file_store.file_store.get_filerecord_by_file_id",
+            return_value=file_record,
+        ):
+            file_store = S3BackedFileStore(
+                Mock(), bucket_name="test-bucket", streaming_threshold_bytes=10
+            )
+            file_io = file_store.read_file("test-file")
+            assert file_io.read() == sample_content
+            body.read.assert_not_called()
+
+            assert file_store.read_file_range("test-file", 2, 5) == sample_content[2:6]
+            assert mock_s3_client.get_object.call_args[1]["Range"] == "bytes=2-5"
+
+            file_store.read_file_range("test-file", 2)
+            assert mock_s3_client.get_object.call_args[1]["Range"] == "bytes=2-"
+
     def test_minio_client_initialization(self, db_session: Session) -> None:
         """Test S3 client initialization with MinIO endpoint"""
         with (
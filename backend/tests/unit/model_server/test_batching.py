@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from model_server.batching import MicroBatcher
+
+
+class _RecordingBatchFn:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.batches: list[list[int]] = []
+        self.lock = threading.Lock()
+
+    def __call__(self, items: list[int]) -> list[int]:
+        with self.lock:
+            self.batches.append(list(items))
+        time.sleep(self.delay)
+        return [item * 10 for item in items]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_batch() -> None:
+    batcher: MicroBatcher[int, int] = MicroBatcher(
+        "test", max_batch_size=100, max_wait_ms=50
+    )
+    batch_fn = _RecordingBatchFn()
+
+    results = await asyncio.gather(
+        batcher.submit("key", [1, 2], batch_fn),
+        batcher.submit("key", [3], batch_fn),
+        batcher.submit("key", [4, 5, 6], batch_fn),
+    )
+
+    assert results == [[10, 20], [30], [40, 50, 60]]
+    assert batch_fn.batches == [[1, 2, 3, 4, 5, 6]]
+
+
+@pytest.mark.asyncio
+async def test_batches_are_capped_at_max_batch_size() -> None:
+    batcher: MicroBatcher[int, int] = MicroBatcher(
+        "test", max_batch_size=3, max_wait_ms=50
+    )
+    batch_fn = _RecordingBatchFn()
+
+    results = await asyncio.gather(
+        batcher.submit("key", [1, 2], batch_fn),
+        batcher.submit("key", [3, 4], batch_fn),
+        batcher.submit("key", [5], batch_fn),
+        # larger than the max batch size, runs on its own
+        batcher.submit("key", [6, 7, 8, 9], batch_fn),
+    )
+
+    assert results == [[10, 20], [30, 40], [50], [60, 70, 80, 90]]
+    assert batch_fn.batches == [[1, 2], [3, 4, 5], [6, 7, 8, 9]]
+
+
+@pytest.mark.asyncio
+async def test_different_keys_are_not_batched_together() -> None:
+    batcher: MicroBatcher[int, int] = MicroBatcher(
+        "test", max_batch_size=100, max_wait_ms=50
+    )
+    batch_fn = _RecordingBatchFn()
+
+    results = await asyncio.gather(
+        batcher.submit("a", [1], batch_fn),
+        batcher.submit("b", [2], batch_fn),
+    )
+
+    assert results == [[10], [20]]
+    assert sorted(batch_fn.batches) == [[1], [2]]
+
+
+@pytest.mark.asyncio
+async def test_requests_queue_while_a_batch_is_running() -> None:
+    batcher: MicroBatcher[int, int] = MicroBatcher(
+        "test", max_batch_size=100, max_wait_ms=0
+    )
+    batch_fn = _RecordingBatchFn(delay=0.2)
+
+    first = asyncio.create_task(batcher.submit("key", [1], batch_fn))
+    await asyncio.sleep(0.05)
+    rest = [batcher.submit("key", [item], batch_fn) for item in (2, 3, 4)]
+
+    assert await first == [10]
+    assert await asyncio.gather(*rest) == [[20], [30], [40]]
+    assert batch_fn.batches == [[1], [2, 3, 4]]
+
+
+@pytest.mark.asyncio
+async def test_batch_errors_are_raised_to_every_caller() -> None:
+    batcher: MicroBatcher[int, int] = MicroBatcher(
+        "test", max_batch_size=100, max_wait_ms=50
+    )
+
+    def failing_fn(items: list[int]) -> list[int]:
+        raise RuntimeError("model failed")
+
+    results = await asyncio.gather(
+        batcher.submit("key", [1], failing_fn),
+        batcher.submit("key", [2], failing_fn),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    # the worker survives a failed batch
+    assert await batcher.submit("key", [3], _RecordingBatchFn()) == [30]
@@ -7,7 +7,9 @@ from unittest.mock import AsyncMock
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
+import numpy as np
 import pytest
+from fastapi import Response
 from httpx import AsyncClient
 from litellm.exceptions import RateLimitError
 
@@ -15,9 +17,15 @@ from model_server.encoders import CloudEmbedding
 from model_server.encoders import embed_text
 from model_server.encoders import local_rerank
 from model_server.encoders import process_embed_request
+from model_server.encoders import route_bi_encoder_embed
 from shared_configs.enums import EmbeddingProvider
+from shared_configs.enums import EmbeddingTransportFormat
 from shared_configs.enums import EmbedTextType
 from shared_configs.model_server_models import EmbedRequest
+from shared_configs.model_server_models import EmbedResponse
+from shared_configs.utils import decode_embeddings
+from shared_configs.utils import EMBEDDING_FORMAT_HEADER
+from shared_configs.utils import encode_embeddings
 
 
 @pytest.fixture
@@ -118,7 +126,9 @@ async def test_embed_text_local_model() -> None:
             reduced_dimension=None,
         )
 
-        assert result == [[0.1, 0.2], [0.3, 0.4]]
+        # local models keep the array returned by encode
+        assert isinstance(result, np.ndarray)
+        assert result.tolist() == [[0.1, 0.2], [0.3, 0.4]]
         mock_model.encode.assert_called_once()
 
 
@@ -165,9 +175,9 @@ async def test_rate_limit_handling() -> None:
 
 @pytest.mark.asyncio
 async def test_concurrent_embeddings() -> None:
-    def mock_encode(*args: Any, **kwargs: Any) -> List[List[float]]:
+    def mock_encode(texts: List[str], **kwargs: Any) -> List[List[float]]:
         time.sleep(5)
-        return [[0.1, 0.2, 0.3]]
+        return [[0.1, 0.2, 0.3] for _ in texts]
 
     test_req = EmbedRequest(
         texts=["test"],
@@ -200,3 +210,77 @@ async def test_concurrent_embeddings() -> None:
         # However, the developer may still introduce unnecessary blocking above the mock and this test will
         # still pass as long as it's less than (7 - 5) / 5 seconds
         assert end_time - start_time < 7
+
+
+@pytest.mark.parametrize(
+    "transport_format,atol",
+    [(EmbeddingTransportFormat.FLOAT32, 0), (EmbeddingTransportFormat.FLOAT16, 1e-3)],
+)
+def test_binary_embedding_round_trip(
+    transport_format: EmbeddingTransportFormat, atol: float
+) -> None:
+    embeddings = [[0.1, -0.2, 0.3], [0.4, 0.5, -0.6]]
+
+    encoded = encode_embeddings(embeddings, transport_format)
+    assert encoded is not None
+    body, headers = encoded
+
+    decoded = decode_embeddings(body, headers)
+    assert decoded.shape == (2, 3)
+    np.testing.assert_allclose(
+        decoded, np.asarray(embeddings, dtype=np.float32), atol=atol
+    )
+
+
+def test_binary_embedding_falls_back_to_json() -> None:
+    assert encode_embeddings([[0.1, 0.2]], EmbeddingTransportFormat.JSON) is None
+    # ragged embeddings can't be sent as one buffer
+    assert (
+        encode_embeddings([[0.1, 0.2], [0.3]], EmbeddingTransportFormat.FLOAT32) is None
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("requested_format", [None, "float32", "not-a-format"])
+async def test_route_bi_encoder_embed_negotiates_format(
+    requested_format: str | None,
+) -> None:
+    embed_request = EmbedRequest(
+        texts=["test1", "test2"],
+        model_name="fake-local-model",
+        max_context_length=512,
+        normalize_embeddings=True,
+        text_type=EmbedTextType.QUERY,
+    )
+    request = MagicMock()
+    request.headers = (
+        {EMBEDDING_FORMAT_HEADER: requested_format} if requested_format else {}
+    )
+    request.app.state.gpu_type = "UNKNOWN"
+
+    with (
+        patch("model_server.encoders.get_embedding_model") as mock_get_model,
+        patch(
+            "model_server.encoders.encode_embeddings", wraps=encode_embeddings
+        ) as mock_encode_embeddings,
+    ):
+        mock_model = MagicMock()
+        mock_model.encode.return_value = np.array(
+            [[0.1, 0.2], [0.3, 0.4]], dtype=np.float32
+        )
+        mock_get_model.return_value = mock_model
+
+        result = await route_bi_encoder_embed(request, embed_request)
+
+    if requested_format == "float32":
+        # the encoded array goes straight into the binary body, no float lists
+        [(embeddings, _)] = [call.args for call in mock_encode_embeddings.mock_calls]
+        assert isinstance(embeddings, np.ndarray)
+        assert isinstance(result, Response)
+        decoded = decode_embeddings(result.body, result.headers)
+        np.testing.assert_allclose(decoded, [[0.1, 0.2], [0.3, 0.4]], rtol=1e-6)
+    else:
+        assert isinstance(result, EmbedResponse)
+        np.testing.assert_allclose(
+            result.embeddings, [[0.1, 0.2], [0.3, 0.4]], rtol=1e-6
+        )
@@ -0,0 +1,162 @@
+from collections.abc import Generator
+from contextlib import ExitStack
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import httpx
+import pytest
+from celery.exceptions import Retry
+
+from onyx.background.celery.tasks.shared.tasks import (
+    document_by_cc_pair_cleanup_batch_task,
+)
+from onyx.background.celery.tasks.shared.tasks import (
+    DOCUMENT_BY_CC_PAIR_CLEANUP_MAX_RETRIES,
+)
+
+_TASKS_MODULE = "onyx.background.celery.tasks.shared.tasks"
+
+_PATCHED_NAMES = [
+    "get_session_with_current_tenant",
+    "get_active_search_settings",
+    "get_default_document_index",
+    "HttpxPool",
+    "RetryDocumentIndex",
+    "get_document_connector_counts",
+    "fetch_chunk_counts_for_documents",
+    "get_access_for_documents",
+    "fetch_document_sets_for_documents",
+    "get_documents_by_ids",
+    "delete_documents_complete__no_commit",
+    "delete_documents_by_connector_credential_pair__no_commit",
+    "mark_documents_as_synced__no_commit",
+    "mark_documents_as_modified__no_commit",
+]
+
+
+@pytest.fixture
+def mocks() -> Generator[SimpleNamespace, None, None]:
+    with ExitStack() as stack:
+        patched = {
+            name: stack.enter_context(patch(f"{_TASKS_MODULE}.{name}"))
+            for name in _PATCHED_NAMES
+        }
+        mocks = SimpleNamespace(**patched)
+        mocks.db_session = (
+            mocks.get_session_with_current_tenant.return_value.__enter__.return_value
+        )
+        mocks.index = mocks.RetryDocumentIndex.return_value
+        mocks.retry = stack.enter_context(
+            patch.object(
+                document_by_cc_pair_cleanup_batch_task, "retry", side_effect=Retry()
+            )
+        )
+        yield mocks
+
+
+def _set_connector_counts(mocks: SimpleNamespace, counts: dict[str, int]) -> None:
+    mocks.get_document_connector_counts.return_value = list(counts.items())
+    mocks.fetch_chunk_counts_for_documents.side_effect = lambda doc_ids, _: [
+        (doc_id, 4) for doc_id in doc_ids
+    ]
+    mocks.get_access_for_documents.side_effect = lambda document_ids, db_session: {
+        doc_id: MagicMock() for doc_id in document_ids
+    }
+    mocks.fetch_document_sets_for_documents.return_value = []
+    mocks.get_documents_by_ids.side_effect = lambda _, doc_ids: [
+        MagicMock(id=doc_id, chunk_count=4, boost=0, hidden=False) for doc_id in doc_ids
+    ]
+
+
+def _fail_for(doc_id_to_fail: str) -> object:
+    def op(doc_id: str, **kwargs: object) -> int:
+        if doc_id == doc_id_to_fail:
+            raise httpx.ConnectError("connection refused")
+        return 4
+
+    return op
+
+
+def _run_cleanup(document_ids: list[str], retries: int = 0) -> bool:
+    document_by_cc_pair_cleanup_batch_task.push_request(retries=retries)
+    try:
+        return document_by_cc_pair_cleanup_batch_task.run(
+            document_ids, connector_id=1, credential_id=2, tenant_id="public"
+        )
+    finally:
+        document_by_cc_pair_cleanup_batch_task.pop_request()
+
+
+def _called_doc_ids(mock: MagicMock) -> list[str]:
+    return sorted(call.args[0] for call in mock.call_args_list)
+
+
+def _document_ids_kwarg(mock: MagicMock) -> list[str]:
+    [call] = mock.call_args_list
+    return sorted(call.kwargs["document_ids"])
+
+
+def test_docs_are_split_into_deletes_and_updates(mocks: SimpleNamespace) -> None:
+    # "gone" no longer exists, it has no connector count
+    _set_connector_counts(mocks, {"last_ref": 1, "shared_1": 2, "shared_2": 3})
+    mocks.index.delete_single.return_value = 4
+    mocks.index.update_single.return_value = 4
+
+    assert _run_cleanup(["last_ref", "shared_1", "gone", "shared_2"])
+
+    assert _called_doc_ids(mocks.index.delete_single) == ["last_ref"]
+    assert _called_doc_ids(mocks.index.update_single) == ["shared_1", "shared_2"]
+    assert _document_ids_kwarg(mocks.delete_documents_complete__no_commit) == [
+        "last_ref"
+    ]
+    assert _document_ids_kwarg(
+        mocks.delete_documents_by_connector_credential_pair__no_commit
+    ) == ["shared_1", "shared_2"]
+    [synced_call] = mocks.mark_documents_as_synced__no_commit.call_args_list
+    assert sorted(synced_call.args[0]) == ["shared_1", "shared_2"]
+
+    # the db changes of the whole batch are committed once
+    mocks.db_session.commit.assert_called_once()
+    mocks.retry.assert_not_called()
+
+
+def test_retry_only_sends_failed_docs(mocks: SimpleNamespace) -> None:
+    _set_connector_counts(mocks, {"a": 1, "b": 1, "c": 2})
+    mocks.index.delete_single.side_effect = _fail_for("b")
+    mocks.index.update_single.return_value = 4
+
+    with pytest.raises(Retry):
+        _run_cleanup(["a", "b", "c"])
+
+    # the docs that succeeded are cleaned up before retrying
+    assert _document_ids_kwarg(mocks.delete_documents_complete__no_commit) == ["a"]
+    mocks.db_session.commit.assert_called_once()
+
+    [retry_call] = mocks.retry.call_args_list
+    assert retry_call.kwargs["kwargs"] == {
+        "document_ids": ["b"],
+        "connector_id": 1,
+        "credential_id": 2,
+        "tenant_id": "public",
+    }
+    mocks.mark_documents_as_modified__no_commit.assert_not_called()
+
+
+def test_final_retry_marks_failed_docs_dirty(mocks: SimpleNamespace) -> None:
+    _set_connector_counts(mocks, {"a": 1, "b": 1})
+    mocks.index.delete_single.side_effect = _fail_for("b")
+
+    assert not _run_cleanup(["a", "b"], retries=DOCUMENT_BY_CC_PAIR_CLEANUP_MAX_RETRIES)
+
+    mocks.retry.assert_not_called()
+    # "b" is detached from the cc pair and left to stale document reconciliation
+    detached_doc_ids = [
+        call.kwargs["document_ids"]
+        for call in (
+            mocks.delete_documents_by_connector_credential_pair__no_commit
+        ).call_args_list
+    ]
+    assert ["b"] in detached_doc_ids
+    [modified_call] = mocks.mark_documents_as_modified__no_commit.call_args_list
+    assert modified_call.args[0] == ["b"]
@@ -0,0 +1,54 @@
+from functools import partial
+from http import HTTPStatus
+
+import httpx
+import pytest
+
+from onyx.background.celery.tasks.shared.tasks import (
+    run_document_index_ops_in_parallel,
+)
+
+
+def _raise(exception: Exception) -> int:
+    raise exception
+
+
+def _bad_request_error() -> httpx.HTTPStatusError:
+    request = httpx.Request("PUT", "http://vespa/document")
+    return httpx.HTTPStatusError(
+        "bad request",
+        request=request,
+        response=httpx.Response(HTTPStatus.BAD_REQUEST, request=request),
+    )
+
+
+def test_ops_are_sorted_by_outcome() -> None:
+    connection_error = httpx.ConnectError("connection refused")
+
+    result = run_document_index_ops_in_parallel(
+        {
+            "ok_1": lambda: 3,
+            "ok_2": lambda: 0,
+            "retryable": lambda: _raise(connection_error),
+            "bad_request": lambda: _raise(_bad_request_error()),
+        },
+        num_threads=4,
+    )
+
+    assert result.succeeded == {"ok_1": 3, "ok_2": 0}
+    assert result.failed == ["retryable"]
+    assert result.non_retryable == ["bad_request"]
+    assert result.last_exception is connection_error
+
+
+@pytest.mark.parametrize("num_threads", [0, 1, 8])
+def test_all_ops_run(num_threads: int) -> None:
+    result = run_document_index_ops_in_parallel(
+        {f"doc_{i}": partial(int, i) for i in range(20)},
+        num_threads=num_threads,
+    )
+
+    assert result.succeeded == {f"doc_{i}": i for i in range(20)}
+    assert not result.failed
+    assert not result.non_retryable
+    assert result.last_exception is None
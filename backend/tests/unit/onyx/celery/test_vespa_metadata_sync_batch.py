@@ -0,0 +1,99 @@
+from collections.abc import Generator
+from contextlib import ExitStack
+from http import HTTPStatus
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import httpx
+import pytest
+from celery.exceptions import Retry
+
+from onyx.background.celery.tasks.vespa.tasks import vespa_metadata_sync_batch_task
+
+_TASKS_MODULE = "onyx.background.celery.tasks.vespa.tasks"
+
+_PATCHED_NAMES = [
+    "get_session_with_current_tenant",
+    "get_active_search_settings",
+    "get_default_document_index",
+    "HttpxPool",
+    "RetryDocumentIndex",
+    "get_documents_by_ids",
+    "fetch_document_sets_for_documents",
+    "get_access_for_documents",
+    "mark_documents_as_synced",
+]
+
+
+@pytest.fixture
+def mocks() -> Generator[SimpleNamespace, None, None]:
+    with ExitStack() as stack:
+        patched = {
+            name: stack.enter_context(patch(f"{_TASKS_MODULE}.{name}"))
+            for name in _PATCHED_NAMES
+        }
+        mocks = SimpleNamespace(**patched)
+        mocks.index = mocks.RetryDocumentIndex.return_value
+        mocks.retry = stack.enter_context(
+            patch.object(vespa_metadata_sync_batch_task, "retry", side_effect=Retry())
+        )
+        yield mocks
+
+
+def _set_docs(mocks: SimpleNamespace, doc_ids: list[str]) -> None:
+    mocks.get_documents_by_ids.return_value = [
+        MagicMock(id=doc_id, chunk_count=4, boost=0, hidden=False) for doc_id in doc_ids
+    ]
+    mocks.fetch_document_sets_for_documents.return_value = []
+    mocks.get_access_for_documents.return_value = {
+        doc_id: MagicMock() for doc_id in doc_ids
+    }
+
+
+def _bad_request_error() -> httpx.HTTPStatusError:
+    request = httpx.Request("PUT", "http://vespa/document")
+    return httpx.HTTPStatusError(
+        "bad request",
+        request=request,
+        response=httpx.Response(HTTPStatus.BAD_REQUEST, request=request),
+    )
+
+
+def _run_sync(document_ids: list[str]) -> bool:
+    vespa_metadata_sync_batch_task.push_request(retries=0)
+    try:
+        return vespa_metadata_sync_batch_task.run(document_ids, tenant_id="public")
+    finally:
+        vespa_metadata_sync_batch_task.pop_request()
+
+
+def test_sync_succeeds(mocks: SimpleNamespace) -> None:
+    _set_docs(mocks, ["a", "b"])
+    mocks.index.update_single.return_value = 4
+
+    assert _run_sync(["a", "b"])
+
+    [synced_call] = mocks.mark_documents_as_synced.call_args_list
+    assert sorted(synced_call.args[0]) == ["a", "b"]
+    mocks.retry.assert_not_called()
+
+
+def test_non_retryable_failure_is_not_reported_as_success(
+    mocks: SimpleNamespace,
+) -> None:
+    _set_docs(mocks, ["a", "bad_request"])
+
+    def update_single(doc_id: str, **kwargs: object) -> int:
+        if doc_id == "bad_request":
+            raise _bad_request_error()
+        return 4
+
+    mocks.index.update_single.side_effect = update_single
+
+    assert not _run_sync(["a", "bad_request"])
+
+    # the document is left unsynced and not retried
+    [synced_call] = mocks.mark_documents_as_synced.call_args_list
+    assert synced_call.args[0] == ["a"]
+    mocks.retry.assert_not_called()
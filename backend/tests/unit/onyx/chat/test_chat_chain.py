@@ -0,0 +1,93 @@
+from typing import Any
+from unittest.mock import MagicMock
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from onyx.chat.chat_utils import create_chat_chain
+from onyx.configs.constants import MessageType
+
+
+def _message(
+    id: int,
+    message_type: MessageType,
+    parent_message: int | None,
+    refined_answer_improvement: bool | None = None,
+) -> MagicMock:
+    message = MagicMock()
+    message.id = id
+    message.message_type = message_type
+    message.parent_message = parent_message
+    message.refined_answer_improvement = refined_answer_improvement
+    return message
+
+
+def _mainline(num_turns: int) -> list[MagicMock]:
+    messages = [_message(0, MessageType.SYSTEM, None)]
+    for i in range(1, 2 * num_turns + 1):
+        message_type = MessageType.USER if i % 2 else MessageType.ASSISTANT
+        messages.append(_message(i, message_type, i - 1))
+    return messages
+
+
+@patch("onyx.chat.chat_utils.get_mainline_chat_messages")
+def test_chain_excludes_root(mock_get_mainline: MagicMock) -> None:
+    messages = _mainline(3)
+    mock_get_mainline.return_value = messages
+
+    final_msg, history = create_chat_chain(uuid4(), MagicMock())
+
+    assert final_msg is messages[-1]
+    assert history == messages[1:-1]
+    assert mock_get_mainline.call_args.kwargs["max_messages"] is None
+
+
+@patch("onyx.chat.chat_utils.get_mainline_chat_messages")
+def test_refined_answer_replaces_previous_answer(mock_get_mainline: MagicMock) -> None:
+    messages = [
+        _message(0, MessageType.SYSTEM, None),
+        _message(1, MessageType.USER, 0),
+        _message(2, MessageType.ASSISTANT, 1),
+        _message(3, MessageType.ASSISTANT, 2, refined_answer_improvement=True),
+    ]
+    mock_get_mainline.return_value = messages
+
+    final_msg, history = create_chat_chain(uuid4(), MagicMock())
+
+    assert final_msg is messages[3]
+    assert history == [messages[1]]
+
+
+@pytest.mark.parametrize("max_history_messages", [0, 2, 100])
+@patch("onyx.chat.chat_utils.get_mainline_chat_messages")
+def test_history_is_capped(
+    mock_get_mainline: MagicMock, max_history_messages: int
+) -> None:
+    messages = _mainline(5)
+
+    def _get_mainline(**kwargs: Any) -> list[MagicMock]:
+        max_messages = kwargs["max_messages"]
+        assert max_messages == 2 * (max_history_messages + 1)
+        return [messages[0]] + messages[1:][-max_messages:]
+
+    mock_get_mainline.side_effect = _get_mainline
+
+    final_msg, history = create_chat_chain(
+        uuid4(), MagicMock(), max_history_messages=max_history_messages
+    )
+
+    assert final_msg is messages[-1]
+    expected_history = messages[1:-1]
+    assert (
+        history
+        == expected_history[max(0, len(expected_history) - max_history_messages) :]
+    )
+
+
+@patch("onyx.chat.chat_utils.get_mainline_chat_messages")
+def test_empty_session_raises(mock_get_mainline: MagicMock) -> None:
+    mock_get_mainline.return_value = []
+
+    with pytest.raises(RuntimeError):
+        create_chat_chain(uuid4(), MagicMock())
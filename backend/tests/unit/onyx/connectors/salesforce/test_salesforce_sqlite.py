@@ -148,6 +148,7 @@ def _create_csv_file_and_update_db(
     object_type: str,
     records: list[dict],
     filename: str = "test_data.csv",
+    batch_size: int | None = None,
 ) -> None:
     """
     Creates a CSV file for the given object type and records.
@@ -156,6 +157,7 @@ def _create_csv_file_and_update_db(
         object_type: The Salesforce object type (e.g. "Account", "Contact")
         records: List of dictionaries containing the record data
         filename: Name of the CSV file to create (default: test_data.csv)
+        batch_size: Batch size of the db update (default: update_from_csv's default)
     """
     if not records:
         return
@@ -176,7 +178,10 @@ def _create_csv_file_and_update_db(
                 writer.writerow(record)
 
         # Update the database with the CSV
-        sf_db.update_from_csv(object_type, csv_path)
+        if batch_size is None:
+            sf_db.update_from_csv(object_type, csv_path)
+        else:
+            sf_db.update_from_csv(object_type, csv_path, batch_size=batch_size)
 
 
 def _create_csv_with_example_data(sf_db: OnyxSalesforceSQLite) -> None:
@@ -802,6 +807,82 @@ def test_salesforce_sqlite() -> None:
         _clear_sf_db(directory)
 
 
+def _ingest_and_fetch_relationships(
+    directory: str, records: list[dict], batch_size: int | None
+) -> tuple[list[tuple], list[tuple]]:
+    sf_db = OnyxSalesforceSQLite(
+        os.path.join(directory, f"salesforce_db_{batch_size}.sqlite")
+    )
+    sf_db.connect()
+    sf_db.apply_schema()
+
+    _create_csv_file_and_update_db(
+        sf_db, "Account", records, "accounts.csv", batch_size=batch_size
+    )
+
+    cursor = sf_db.cursor()
+    cursor.execute("SELECT child_id, parent_id FROM relationships ORDER BY 1, 2")
+    relationships = cursor.fetchall()
+    cursor.execute(
+        "SELECT child_id, parent_id, parent_type FROM relationship_types "
+        "ORDER BY 1, 2, 3"
+    )
+    relationship_types = cursor.fetchall()
+    sf_db.close()
+    return relationships, relationship_types
+
+
+def test_update_from_csv_batches_match_unbatched() -> None:
+    """A parent that arrives in a later batch than its child must end up with the
+    same relationships and relationship types as when both are in one batch."""
+    records = [
+        # children of accounts that are only written in the next batches
+        {
+            "Id": _VALID_SALESFORCE_IDS[0],
+            "ParentId": _VALID_SALESFORCE_IDS[4],
+            "Name": "Child 1",
+        },
+        {
+            "Id": _VALID_SALESFORCE_IDS[1],
+            "ParentId": _VALID_SALESFORCE_IDS[3],
+            "Name": "Child 2",
+        },
+        # child of an account written in an earlier batch
+        {
+            "Id": _VALID_SALESFORCE_IDS[2],
+            "ParentId": _VALID_SALESFORCE_IDS[1],
+            "Name": "Child 3",
+        },
+        {"Id": _VALID_SALESFORCE_IDS[3], "Name": "Parent 1"},
+        {"Id": _VALID_SALESFORCE_IDS[4], "Name": "Parent 2"},
+        # the parent is never written, so there's no type to record
+        {
+            "Id": _VALID_SALESFORCE_IDS[5],
+            "ParentId": _VALID_SALESFORCE_IDS[6],
+            "Name": "Orphan",
+        },
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        relationships, relationship_types = _ingest_and_fetch_relationships(
+            directory, records, batch_size=None
+        )
+        batched_relationships, batched_relationship_types = (
+            _ingest_and_fetch_relationships(directory, records, batch_size=2)
+        )
+
+    assert batched_relationships == relationships
+    assert batched_relationship_types == relationship_types
+    assert (
+        _VALID_SALESFORCE_IDS[0],
+        _VALID_SALESFORCE_IDS[4],
+        "Account",
+    ) in relationship_types
+    assert (_VALID_SALESFORCE_IDS[1], _VALID_SALESFORCE_IDS[3]) in relationships
+    assert len(relationships) == 4
+    assert len(relationship_types) == 3
+
+
 @pytest.mark.skip(reason="Enable when credentials are available")
 def test_salesforce_bulk_retrieve() -> None:
 
@@ -1,4 +1,7 @@
+from onyx.document_index.vespa.shared_utils.utils import get_vespa_query_http_client
 from onyx.document_index.vespa.shared_utils.utils import remove_invalid_unicode_chars
+from onyx.document_index.vespa.shared_utils.utils import VESPA_QUERY_HTTPX_POOL_NAME
+from onyx.httpx.httpx_pool import HttpxPool
 
 
 def test_remove_invalid_unicode_chars() -> None:
@@ -18,3 +21,13 @@ def test_remove_invalid_unicode_chars() -> None:
     sanitized = remove_invalid_unicode_chars(text_with_multiple_illegal)
     assert all(c not in sanitized for c in ["\x00", "\ufddb", "\ufffe"])
     assert sanitized == "Hello World!"
+
+
+def test_vespa_query_http_client_is_shared() -> None:
+    client = get_vespa_query_http_client()
+    try:
+        # every query reuses the same client, and with it its open connections
+        assert get_vespa_query_http_client() is client
+        assert not client.is_closed
+    finally:
+        HttpxPool.close_client(VESPA_QUERY_HTTPX_POOL_NAME)
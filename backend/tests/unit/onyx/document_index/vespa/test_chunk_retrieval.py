@@ -0,0 +1,106 @@
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from onyx.context.search.models import IndexFilters
+from onyx.context.search.models import InferenceChunkUncleaned
+from onyx.document_index.interfaces import VespaChunkRequest
+from onyx.document_index.vespa import chunk_retrieval
+from onyx.document_index.vespa.chunk_retrieval import _IdBasedChunkCache
+from onyx.document_index.vespa.chunk_retrieval import batch_search_api_retrieval
+
+
+def _chunk(document_id: str, chunk_id: int) -> InferenceChunkUncleaned:
+    return InferenceChunkUncleaned.model_construct(
+        document_id=document_id, chunk_id=chunk_id
+    )
+
+
+def _max_chunk_ind(request: VespaChunkRequest) -> int:
+    assert request.max_chunk_ind is not None
+    return request.max_chunk_ind
+
+
+def _fake_batch_search(
+    index_name: str,
+    chunk_requests: list[VespaChunkRequest],
+    filters: IndexFilters,
+    get_large_chunks: bool = False,
+) -> list[InferenceChunkUncleaned]:
+    # every document has chunks 0-4
+    return [
+        _chunk(request.document_id, chunk_id)
+        for request in chunk_requests
+        for chunk_id in range(
+            request.min_chunk_ind or 0, min(_max_chunk_ind(request), 4) + 1
+        )
+    ]
+
+
+@patch.object(chunk_retrieval, "MAX_OR_CONDITIONS", 3)
+@patch.object(
+    chunk_retrieval,
+    "_id_based_chunk_cache",
+    _IdBasedChunkCache(ttl_seconds=0, max_entries=0),
+)
+@patch.object(chunk_retrieval, "_get_chunks_via_batch_search")
+def test_requests_are_split_into_groups(mock_batch_search: MagicMock) -> None:
+    mock_batch_search.side_effect = _fake_batch_search
+    requests = [
+        VespaChunkRequest(document_id=f"doc_{i}", min_chunk_ind=0, max_chunk_ind=1)
+        for i in range(5)
+    ]
+
+    chunks = batch_search_api_retrieval(
+        "index", requests, IndexFilters(access_control_list=None)
+    )
+
+    group_sizes = sorted(len(call.args[1]) for call in mock_batch_search.call_args_list)
+    assert group_sizes == [2, 3]
+    assert len(chunks) == 10
+
+
+@patch.object(
+    chunk_retrieval,
+    "_id_based_chunk_cache",
+    _IdBasedChunkCache(ttl_seconds=60, max_entries=100),
+)
+@patch.object(chunk_retrieval, "_get_chunks_via_batch_search")
+def test_cached_ranges_skip_vespa(mock_batch_search: MagicMock) -> None:
+    mock_batch_search.side_effect = _fake_batch_search
+    filters = IndexFilters(access_control_list=["user_email:a@b.com"])
+
+    first = batch_search_api_retrieval(
+        "index",
+        [VespaChunkRequest(document_id="doc", min_chunk_ind=0, max_chunk_ind=6)],
+        filters,
+    )
+    assert [chunk.chunk_id for chunk in first] == [0, 1, 2, 3, 4]
+    assert mock_batch_search.call_count == 1
+
+    # overlapping range, including ids past the end of the document
+    second = batch_search_api_retrieval(
+        "index",
+        [VespaChunkRequest(document_id="doc", min_chunk_ind=3, max_chunk_ind=6)],
+        filters,
+    )
+    assert [chunk.chunk_id for chunk in second] == [3, 4]
+    assert mock_batch_search.call_count == 1
+
+    # different filters (e.g. another user) never share entries
+    batch_search_api_retrieval(
+        "index",
+        [VespaChunkRequest(document_id="doc", min_chunk_ind=3, max_chunk_ind=6)],
+        IndexFilters(access_control_list=["user_email:c@d.com"]),
+    )
+    assert mock_batch_search.call_count == 2
+
+
+def test_cache_entries_expire() -> None:
+    cache = _IdBasedChunkCache(ttl_seconds=60, max_entries=100)
+    request = VespaChunkRequest(document_id="doc", min_chunk_ind=0, max_chunk_ind=1)
+    cache.put_range(("index", "", False), request, [_chunk("doc", 0)])
+
+    assert cache.get_range(("index", "", False), request) is not None
+
+    with patch.object(chunk_retrieval.time, "monotonic", return_value=1e12):
+        assert cache.get_range(("index", "", False), request) is None
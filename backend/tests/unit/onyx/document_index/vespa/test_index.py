@@ -0,0 +1,45 @@
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from onyx.document_index.vespa.index import VespaIndex
+
+
+def test_enrich_basic_chunk_info_batch() -> None:
+    """Only documents without a known chunk count should be probed, and the
+    results should come back in the input order."""
+    http_client = MagicMock()
+
+    with patch(
+        "onyx.document_index.vespa.index.check_for_final_chunk_existence",
+        side_effect=lambda minimal_doc_info, start_index, **kwargs: start_index + 3,
+    ) as mock_check:
+        enriched_doc_infos = VespaIndex.enrich_basic_chunk_info_batch(
+            index_name="test_index",
+            http_client=http_client,
+            doc_id_to_previous_chunk_cnt={
+                "old_doc_1": None,
+                "new_doc": 5,
+                "old_doc_2": None,
+            },
+            doc_id_to_new_chunk_cnt={"old_doc_1": 2, "new_doc": 4},
+        )
+
+    assert mock_check.call_count == 2
+    assert [info.doc_id for info in enriched_doc_infos] == [
+        "old_doc_1",
+        "new_doc",
+        "old_doc_2",
+    ]
+
+    old_doc_1, new_doc, old_doc_2 = enriched_doc_infos
+    assert old_doc_1.old_version
+    assert old_doc_1.chunk_start_index == 2
+    assert old_doc_1.chunk_end_index == 5
+
+    assert not new_doc.old_version
+    assert new_doc.chunk_start_index == 4
+    assert new_doc.chunk_end_index == 5
+
+    assert old_doc_2.old_version
+    assert old_doc_2.chunk_start_index == 0
+    assert old_doc_2.chunk_end_index == 3
@@ -0,0 +1,83 @@
+import operator
+import time
+from collections.abc import Callable
+from collections.abc import Generator
+from typing import Any
+
+import pytest
+
+from onyx.file_processing.extract_file_text import TEXT_SECTION_SEPARATOR
+from onyx.file_processing.extraction_executor import _read_pdf_pages
+from onyx.file_processing.extraction_executor import _TaskOutcome
+from onyx.file_processing.extraction_executor import ExtractionInput
+from onyx.file_processing.extraction_executor import FileExtractionExecutor
+
+
+@pytest.fixture
+def executor() -> Generator[FileExtractionExecutor, None, None]:
+    executor = FileExtractionExecutor(
+        max_workers=1,
+        timeout_seconds=2,
+        max_memory_mb=0,
+        max_tasks_per_worker=2,
+    )
+    yield executor
+    executor.shutdown()
+
+
+def test_timed_out_task_only_fails_itself(executor: FileExtractionExecutor) -> None:
+    start = time.monotonic()
+    outcome = executor._run_task(time.sleep, (60,))
+
+    assert outcome.error is not None
+    assert "timed out" in outcome.error
+    assert time.monotonic() - start < 30
+
+    # the stuck worker was replaced
+    assert executor._run_task(operator.add, (1, 2)) == _TaskOutcome(3, None)
+
+
+def _fake_run_task(page_count: int) -> Callable[..., _TaskOutcome]:
+    def run_task(func: Callable, args: tuple[Any, ...]) -> _TaskOutcome:
+        assert func is _read_pdf_pages
+        _, _, _, start_page, end_page = args
+        if start_page == 3:
+            return _TaskOutcome(None, "timed out after 2 seconds")
+        metadata = {"Title": "doc"} if start_page == 0 else {}
+        return _TaskOutcome(
+            (f"pages {start_page}-{end_page}", metadata, [], page_count), None
+        )
+
+    return run_task
+
+
+def test_pdf_page_ranges_are_stitched_in_order() -> None:
+    executor = FileExtractionExecutor(max_workers=4, pdf_pages_per_task=3)
+    executor._run_task = _fake_run_task(page_count=11)  # type: ignore[method-assign]
+
+    [result] = executor.extract_text_and_images(
+        [ExtractionInput(content=b"", file_name="doc.pdf")], extract_pdf_images=False
+    )
+
+    # pages 3-6 failed and are left out
+    assert result.text_content == TEXT_SECTION_SEPARATOR.join(
+        ["pages 0-3", "pages 6-9", "pages 9-12"]
+    )
+    assert result.metadata == {"Title": "doc"}
+
+
+def test_pdf_worker_failure_raises_from_extract_file_text() -> None:
+    executor = FileExtractionExecutor(max_workers=1, pdf_pages_per_task=3)
+    executor._run_task = lambda func, args: _TaskOutcome(  # type: ignore[method-assign]
+        None, "timed out after 2 seconds"
+    )
+
+    # callers like the file connector rely on the error to skip the file
+    with pytest.raises(RuntimeError, match="timed out"):
+        executor.extract_file_text(b"", "doc.pdf")
+
+    # the batch API still treats the file as unparseable
+    [result] = executor.extract_text_and_images(
+        [ExtractionInput(content=b"", file_name="doc.pdf")], extract_pdf_images=False
+    )
+    assert result.text_content == ""
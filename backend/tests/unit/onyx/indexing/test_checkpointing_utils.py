@@ -0,0 +1,91 @@
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+
+from onyx.background.indexing.checkpointing_utils import _decode_checkpoint
+from onyx.background.indexing.checkpointing_utils import _encode_checkpoint
+from onyx.background.indexing.checkpointing_utils import check_checkpoint_size
+from onyx.background.indexing.checkpointing_utils import CoalescingCheckpointSaver
+from onyx.connectors.models import ConnectorCheckpoint
+
+
+def test_checkpoint_encoding_roundtrip() -> None:
+    checkpoint_json = ConnectorCheckpoint(has_more=True).model_dump_json().encode()
+
+    encoded = _encode_checkpoint(checkpoint_json)
+
+    assert encoded.startswith(b"onyx-checkpoint:gzip\n")
+    assert _decode_checkpoint(encoded) == checkpoint_json
+
+
+def test_legacy_json_checkpoint_is_decoded_as_is() -> None:
+    legacy = b'{"has_more": false}'
+    assert _decode_checkpoint(legacy) == legacy
+
+
+def test_unknown_checkpoint_codec() -> None:
+    with pytest.raises(ValueError):
+        _decode_checkpoint(b"onyx-checkpoint:lzma\n...")
+
+
+def test_check_checkpoint_size() -> None:
+    check_checkpoint_size(b"{}")
+    with patch(
+        "onyx.background.indexing.checkpointing_utils._MAX_CHECKPOINT_SIZE_BYTES", 1
+    ):
+        with pytest.raises(ValueError):
+            check_checkpoint_size(b"{}")
+
+
+@patch("onyx.background.indexing.checkpointing_utils.get_session_with_current_tenant")
+@patch("onyx.background.indexing.checkpointing_utils.save_checkpoint")
+def test_saver_coalesces_writes(
+    mock_save_checkpoint: MagicMock, mock_get_session: MagicMock
+) -> None:
+    saver = CoalescingCheckpointSaver(1, min_interval_seconds=3600, max_batches=2)
+    checkpoints = [ConnectorCheckpoint(has_more=True) for _ in range(3)]
+
+    saver.update(checkpoints[0])
+    saver.mark_batch_indexed()
+    saver.update(checkpoints[1])
+    mock_save_checkpoint.assert_not_called()
+
+    # enough batches were indexed since the last write
+    saver.mark_batch_indexed()
+    saver.update(checkpoints[2])
+    assert mock_save_checkpoint.call_count == 1
+    assert mock_save_checkpoint.call_args.kwargs["checkpoint"] is checkpoints[2]
+
+    # nothing pending
+    saver.flush()
+    assert mock_save_checkpoint.call_count == 1
+
+
+@patch("onyx.background.indexing.checkpointing_utils.get_session_with_current_tenant")
+@patch("onyx.background.indexing.checkpointing_utils.save_checkpoint")
+def test_saver_flush_writes_latest_checkpoint(
+    mock_save_checkpoint: MagicMock, mock_get_session: MagicMock
+) -> None:
+    saver = CoalescingCheckpointSaver(1, min_interval_seconds=3600, max_batches=100)
+    latest = ConnectorCheckpoint(has_more=False)
+
+    saver.update(ConnectorCheckpoint(has_more=True))
+    saver.update(latest)
+    saver.flush()
+
+    mock_save_checkpoint.assert_called_once()
+    assert mock_save_checkpoint.call_args.kwargs["checkpoint"] is latest
+
+
+@patch("onyx.background.indexing.checkpointing_utils.get_session_with_current_tenant")
+@patch("onyx.background.indexing.checkpointing_utils.save_checkpoint")
+def test_saver_without_interval_writes_every_checkpoint(
+    mock_save_checkpoint: MagicMock, mock_get_session: MagicMock
+) -> None:
+    saver = CoalescingCheckpointSaver(1, min_interval_seconds=0, max_batches=100)
+
+    for _ in range(3):
+        saver.update(ConnectorCheckpoint(has_more=True))
+
+    assert mock_save_checkpoint.call_count == 3
@@ -8,6 +8,8 @@ from onyx.configs.constants import DocumentSource
 from onyx.connectors.models import Document
 from onyx.connectors.models import TextSection
 from onyx.indexing.embedder import DefaultIndexingEmbedder
+from onyx.indexing.embedding_cache import EmbeddingCache
+from onyx.indexing.embedding_cache import get_query_embedding_cache
 from onyx.indexing.models import ChunkEmbedding
 from onyx.indexing.models import DocAwareChunk
 from onyx.indexing.models import IndexChunk
@@ -103,3 +105,172 @@ def test_default_indexing_embedder_embed_chunks(
         tenant_id=None,
         request_id=None,
     )
+
+
+class _FakePipeline:
+    def __init__(self, store: dict[str, bytes]) -> None:
+        self.store = store
+        self.pending: dict[str, bytes] = {}
+
+    def set(self, key: str, value: bytes, ex: int | None = None) -> None:
+        self.pending[key] = value
+
+    def execute(self) -> None:
+        self.store.update(self.pending)
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, bytes] = {}
+
+    def mget(self, keys: list[str]) -> list[bytes | None]:
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self, transaction: bool = True) -> _FakePipeline:
+        return _FakePipeline(self.store)
+
+
+def test_default_indexing_embedder_uses_embedding_cache(
+    mock_embedding_model: Mock,
+) -> None:
+    embedding_cache = EmbeddingCache(
+        model_name="test-model",
+        normalize=True,
+        prefix=None,
+        provider_type=EmbeddingProvider.OPENAI,
+        reduced_dimension=None,
+        redis_client=_FakeRedis(),  # type: ignore[arg-type]
+        max_local_entries=0,
+    )
+    embedder = DefaultIndexingEmbedder(
+        model_name="test-model",
+        normalize=True,
+        query_prefix=None,
+        passage_prefix=None,
+        provider_type=EmbeddingProvider.OPENAI,
+        embedding_cache=embedding_cache,
+    )
+    mock_embedding_model.return_value.encode.side_effect = lambda texts, **_: [
+        [float(len(text)), 0.5] for text in texts
+    ]
+
+    source_doc = Document(
+        id="test_doc",
+        source=DocumentSource.WEB,
+        semantic_identifier="Test Document",
+        metadata={},
+        doc_updated_at=None,
+        sections=[TextSection(text="Some text", link="link1")],
+    )
+
+    def _make_chunk(chunk_id: int, content: str) -> DocAwareChunk:
+        return DocAwareChunk(
+            chunk_id=chunk_id,
+            blurb=content,
+            content=content,
+            source_links={0: "link1"},
+            section_continuation=False,
+            source_document=source_doc,
+            title_prefix="",
+            metadata_suffix_semantic="",
+            metadata_suffix_keyword="",
+            mini_chunk_texts=None,
+            large_chunk_reference_ids=[],
+            large_chunk_id=None,
+            image_file_id=None,
+            chunk_context="",
+            doc_summary="",
+            contextual_rag_reserved_tokens=0,
+        )
+
+    first = embedder.embed_chunks([_make_chunk(0, "abc"), _make_chunk(1, "abcd")])
+    assert mock_embedding_model.return_value.encode.call_count == 2
+    assert embedding_cache.misses == 3
+
+    # re-embedding with one unchanged and one changed chunk only sends the change
+    mock_embedding_model.return_value.encode.reset_mock()
+    second = embedder.embed_chunks([_make_chunk(0, "abc"), _make_chunk(1, "abcde")])
+    mock_embedding_model.return_value.encode.assert_called_once_with(
+        texts=["abcde"],
+        text_type=EmbedTextType.PASSAGE,
+        large_chunks_present=False,
+        tenant_id=None,
+        request_id=None,
+    )
+
+    assert second[0].embeddings == first[0].embeddings
+    assert second[1].embeddings.full_embedding == [5.0, 0.5]
+    assert second[0].title_embedding == first[0].title_embedding
+    assert embedding_cache.hits == 2
+
+
+def test_query_embedding_cache_follows_search_settings() -> None:
+    search_settings = Mock(
+        model_name="test-model",
+        normalize=True,
+        query_prefix="query: ",
+        provider_type=None,
+        reduced_dimension=None,
+    )
+
+    with patch("onyx.indexing.embedding_cache.get_raw_redis_client") as mock_redis:
+        mock_redis.return_value = _FakeRedis()
+
+        cache = get_query_embedding_cache(search_settings)
+        assert get_query_embedding_cache(search_settings) is cache
+
+        # query and passage embeddings of the same text must never be mixed up
+        assert cache.namespace != EmbeddingCache.build_namespace(
+            model_name="test-model",
+            normalize=True,
+            prefix="query: ",
+            provider_type=None,
+            reduced_dimension=None,
+        )
+
+        encode = Mock(side_effect=lambda texts: [[float(len(t))] for t in texts])
+        assert cache.embed_with_cache(["hi", "hello", "hi"], encode, "tenant") == [
+            [2.0],
+            [5.0],
+            [2.0],
+        ]
+        assert cache.embed_with_cache(["hello"], encode, "tenant") == [[5.0]]
+        encode.assert_called_once_with(["hi", "hello"])
+
+        # changing the settings switches to a fresh namespace
+        search_settings.query_prefix = "search_query: "
+        new_cache = get_query_embedding_cache(search_settings)
+        assert new_cache is not cache
+        assert new_cache.namespace != cache.namespace
+
+
+def test_query_embedding_caches_are_kept_per_namespace() -> None:
+    def _search_settings(query_prefix: str) -> Mock:
+        return Mock(
+            model_name="test-model",
+            normalize=True,
+            query_prefix=query_prefix,
+            provider_type=None,
+            reduced_dimension=None,
+        )
+
+    tenant_a = _search_settings("a: ")
+    tenant_b = _search_settings("b: ")
+    tenant_c = _search_settings("c: ")
+
+    with (
+        patch("onyx.indexing.embedding_cache.get_raw_redis_client"),
+        patch("onyx.indexing.embedding_cache.QUERY_EMBEDDING_CACHE_MAX_NAMESPACES", 2),
+    ):
+        cache_a = get_query_embedding_cache(tenant_a)
+        cache_b = get_query_embedding_cache(tenant_b)
+
+        # tenants with different settings alternating don't evict each other
+        assert get_query_embedding_cache(tenant_a) is cache_a
+        assert get_query_embedding_cache(tenant_b) is cache_b
+        assert get_query_embedding_cache(tenant_a) is cache_a
+
+        # a third configuration evicts the least recently used one (b)
+        get_query_embedding_cache(tenant_c)
+        assert get_query_embedding_cache(tenant_a) is cache_a
+        assert get_query_embedding_cache(tenant_b) is not cache_b
@@ -11,8 +11,10 @@ from onyx.connectors.models import Document
 from onyx.connectors.models import DocumentSource
 from onyx.connectors.models import ImageSection
 from onyx.connectors.models import TextSection
+from onyx.file_processing.image_summarization import get_image_summary_cache_key
 from onyx.indexing.chunker import Chunker
 from onyx.indexing.embedder import DefaultIndexingEmbedder
+from onyx.indexing.indexing_pipeline import _ContextualRAGInvoker
 from onyx.indexing.indexing_pipeline import _get_aggregated_chunk_boost_factor
 from onyx.indexing.indexing_pipeline import add_contextual_summaries
 from onyx.indexing.indexing_pipeline import filter_documents
@@ -338,3 +340,115 @@ def test_contextual_rag(
             count += 1
         assert chunk.doc_summary == doc_summary
         assert chunk.chunk_context == chunk_context
+
+
+@patch("onyx.indexing.indexing_pipeline.store_llm_results")
+@patch("onyx.indexing.indexing_pipeline.fetch_llm_results")
+@patch("onyx.indexing.indexing_pipeline.get_session_with_current_tenant")
+@patch("onyx.indexing.indexing_pipeline.summarize_image_with_error_handling")
+@patch("onyx.indexing.indexing_pipeline._read_image")
+@patch("onyx.indexing.indexing_pipeline.get_default_llm_with_vision")
+@patch(
+    "onyx.indexing.indexing_pipeline.get_image_extraction_and_analysis_enabled",
+    return_value=True,
+)
+def test_process_image_sections_summarizes_each_image_once(
+    mock_enabled: Mock,
+    mock_get_llm: Mock,
+    mock_read_image: Mock,
+    mock_summarize: Mock,
+    mock_get_session: Mock,
+    mock_fetch_llm_results: Mock,
+    mock_store_llm_results: Mock,
+) -> None:
+    mock_get_llm.return_value.config.model_provider = "openai"
+    mock_get_llm.return_value.config.model_name = "gpt-4o"
+    images = {
+        "logo_1": (b"logo", "logo.png"),
+        "logo_2": (b"logo", "logo copy.png"),
+        "cached": (b"chart", "chart.png"),
+    }
+    mock_read_image.side_effect = lambda image_file_id: images.get(image_file_id)
+    mock_summarize.return_value = "A logo"
+    # the chart was summarized while indexing an earlier batch
+    mock_fetch_llm_results.side_effect = lambda db_session, cache_keys: {
+        cache_key: "A chart"
+        for cache_key in cache_keys
+        if cache_key == get_image_summary_cache_key(mock_get_llm.return_value, b"chart")
+    }
+
+    documents = [
+        Document(
+            id=f"doc_{i}",
+            source=DocumentSource.CONFLUENCE,
+            semantic_identifier=f"doc {i}",
+            metadata={},
+            sections=[
+                TextSection(text="text", link="link"),
+                ImageSection(image_file_id="logo_1"),
+                ImageSection(image_file_id=other_image_file_id),
+            ],
+        )
+        for i, other_image_file_id in enumerate(["logo_2", "cached", "missing"])
+    ]
+
+    indexing_documents = process_image_sections(documents)
+
+    assert [
+        [section.text for section in document.processed_sections]
+        for document in indexing_documents
+    ] == [
+        ["text", "A logo", "A logo"],
+        ["text", "A logo", "A chart"],
+        ["text", "A logo", "[Image could not be processed]"],
+    ]
+    mock_summarize.assert_called_once()
+    [stored] = [call.args[1] for call in mock_store_llm_results.call_args_list]
+    assert list(stored.values()) == ["A logo"]
+
+
+@patch("onyx.indexing.indexing_pipeline.store_llm_results")
+@patch("onyx.indexing.indexing_pipeline.fetch_llm_results")
+@patch("onyx.indexing.indexing_pipeline.get_session_with_current_tenant")
+@patch(
+    "onyx.indexing.indexing_pipeline.model_supports_explicit_prompt_caching",
+    return_value=True,
+)
+def test_contextual_rag_invoker_reuses_cached_results(
+    mock_supports_prompt_caching: Mock,
+    mock_get_session: Mock,
+    mock_fetch_llm_results: Mock,
+    mock_store_llm_results: Mock,
+) -> None:
+    mock_llm = Mock()
+    mock_llm.config.model_provider = "anthropic"
+    mock_llm.config.model_name = "claude-3-5-sonnet-20241022"
+    mock_llm.invoke.return_value = Mock(content="new context")
+
+    invoker = _ContextualRAGInvoker(mock_llm, max_concurrent_calls=2)
+    cached_key = invoker.cache_key("chunk_context", "document", "chunk 1")
+    mock_fetch_llm_results.return_value = {cached_key: "cached context"}
+    invoker.prefetch([cached_key, invoker.cache_key("chunk_context", "document", "2")])
+
+    assert invoker.invoke("chunk_context", "chunk 1", "document") == "cached context"
+    mock_llm.invoke.assert_not_called()
+
+    assert invoker.invoke("chunk_context", "chunk 2", "document") == "new context"
+    # the document prefix is marked for prompt caching
+    [message] = mock_llm.invoke.call_args.args[0]
+    assert message.content[0] == {
+        "type": "text",
+        "text": "document",
+        "cache_control": {"type": "ephemeral"},
+    }
+    assert message.content[1] == {"type": "text", "text": "chunk 2"}
+
+    # the same prompt with another model doesn't share results
+    mock_llm.config.model_name = "claude-3-7-sonnet-20250219"
+    assert cached_key != _ContextualRAGInvoker(mock_llm, 2).cache_key(
+        "chunk_context", "document", "chunk 1"
+    )
+
+    invoker.store_new_results()
+    mock_store_llm_results.assert_called_once()
+    assert list(mock_store_llm_results.call_args.args[1].values()) == ["new context"]
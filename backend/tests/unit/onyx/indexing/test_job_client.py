@@ -0,0 +1,59 @@
+import sys
+import time
+from collections.abc import Generator
+
+import pytest
+
+from onyx.background.indexing.job_client import WarmJob
+from onyx.background.indexing.job_client import WarmJobPool
+
+
+def _wait_until_done(job: WarmJob, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while not job.done():
+        assert time.monotonic() < deadline, "job did not finish in time"
+        time.sleep(0.1)
+
+
+@pytest.fixture
+def pool() -> Generator[WarmJobPool, None, None]:
+    pool = WarmJobPool(
+        size=1, preload_modules=[], max_jobs_per_worker=2, max_memory_mb=0
+    )
+    yield pool
+    pool.shutdown()
+
+
+def test_job_exit_code_is_reported(pool: WarmJobPool) -> None:
+    job = pool.submit(sys.exit, 3)
+    assert job is not None
+    _wait_until_done(job)
+
+    assert job.status == "error"
+    assert job.exit_code == 3
+    assert job.process is not None
+    exited_pid = job.process.pid
+    job.release()
+
+    # a job that exits takes its worker with it
+    next_job = pool.submit(time.sleep, 0)
+    assert next_job is not None
+    _wait_until_done(next_job)
+    assert next_job.status == "finished"
+    assert next_job.exit_code == 0
+    assert next_job.process is not None
+    assert next_job.process.pid != exited_pid
+    next_job.release()
+
+
+def test_cancel_terminates_worker(pool: WarmJobPool) -> None:
+    job = pool.submit(time.sleep, 60)
+    assert job is not None
+    assert job.process is not None
+    while job.status == "pending":
+        time.sleep(0.1)
+
+    assert job.cancel()
+    job.process.join(timeout=10)
+    assert not job.process.is_alive()
+    assert job.done()
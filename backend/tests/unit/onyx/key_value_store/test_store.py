@@ -0,0 +1,89 @@
+import json
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from onyx.key_value_store.local_cache import LocalKVCache
+from onyx.key_value_store.store import PgRedisKVStore
+
+
+def test_local_kv_cache_lru_and_ttl() -> None:
+    cache = LocalKVCache(ttl_seconds=10, max_entries=2)
+
+    with patch("onyx.key_value_store.local_cache.time.monotonic", return_value=0):
+        cache.set("t:a", "1")
+        cache.set("t:b", "2")
+        # touching "a" makes "b" the least recently used entry
+        assert cache.get("t:a") == "1"
+        cache.set("t:c", "3")
+        assert cache.get("t:b") is None
+        assert cache.get("t:c") == "3"
+
+        cache.invalidate("t:c")
+        assert cache.get("t:c") is None
+
+    with patch("onyx.key_value_store.local_cache.time.monotonic", return_value=11):
+        assert cache.get("t:a") is None
+
+
+def test_load_uses_local_cache() -> None:
+    redis_client = MagicMock()
+    redis_client.get.return_value = json.dumps({"setting": True}).encode("utf-8")
+    store = PgRedisKVStore(redis_client=redis_client, local_cache=LocalKVCache())
+
+    first = store.load("settings")
+    assert first == {"setting": True}
+
+    # mutating a loaded value must not leak into the cache
+    first["setting"] = False  # type: ignore[index]
+    assert store.load("settings") == {"setting": True}
+    assert redis_client.get.call_count == 1
+
+    # refresh_cache always goes to Postgres
+    with patch(
+        "onyx.key_value_store.store.get_session_with_current_tenant"
+    ) as mock_session:
+        db_session = mock_session.return_value.__enter__.return_value
+        db_session.query.return_value.filter_by.return_value.first.return_value = (
+            MagicMock(value={"setting": False}, encrypted_value=None)
+        )
+        assert store.load("settings", refresh_cache=True) == {"setting": False}
+
+    assert store.load("settings") == {"setting": False}
+
+
+def test_load_many_pipelines_redis() -> None:
+    redis_client = MagicMock()
+    pipe = redis_client.pipeline.return_value
+    pipe.execute.return_value = [b'"a_val"', b'"b_val"']
+    store = PgRedisKVStore(redis_client=redis_client, local_cache=LocalKVCache())
+
+    assert store.load_many(["a", "b"]) == {"a": "a_val", "b": "b_val"}
+    assert pipe.get.call_count == 2
+    redis_client.get.assert_not_called()
+
+    # both are now served from the local cache
+    assert store.load_many(["b", "a"]) == {"a": "a_val", "b": "b_val"}
+    assert pipe.execute.call_count == 1
+
+
+def test_store_many_deletes_before_inserting_new_keys() -> None:
+    redis_client = MagicMock()
+    store = PgRedisKVStore(redis_client=redis_client, local_cache=LocalKVCache())
+
+    existing = MagicMock(key="a", value="old", encrypted_value=None)
+    with patch(
+        "onyx.key_value_store.store.get_session_with_current_tenant"
+    ) as mock_session:
+        db_session = mock_session.return_value.__enter__.return_value
+        query = db_session.query.return_value.filter.return_value
+        query.all.return_value = [existing]
+
+        store.store_many({"a": "a_val", "b": "b_val"})
+
+    # the existing row is updated in place, the new one replaces any stale row
+    assert existing.value == "a_val"
+    query.delete.assert_called_once_with(synchronize_session=False)
+    [add_call] = db_session.add.call_args_list
+    assert add_call.args[0].key == "b"
+    assert add_call.args[0].value == "b_val"
+    db_session.commit.assert_called_once()
@@ -0,0 +1,119 @@
+from collections.abc import Generator
+from contextlib import ExitStack
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+
+from onyx.kg.clustering.clustering import _cluster_grounded_entities
+from onyx.kg.clustering.clustering import _trigram_similarity
+
+_CLUSTERING_MODULE = "onyx.kg.clustering.clustering"
+
+
+def _staged_entity(name: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id_name=f"staged::{name}",
+        name=name,
+        entity_type_id_name="ACCOUNT",
+        document_id=None,
+    )
+
+
+def _transfer_entity(db_session: MagicMock, entity: SimpleNamespace) -> object:
+    return SimpleNamespace(
+        id_name=f"ACCOUNT::{entity.name.casefold()}",
+        name=entity.name.casefold(),
+        entity_type_id_name=entity.entity_type_id_name,
+        document_id=entity.document_id,
+    )
+
+
+@pytest.fixture
+def mocks() -> Generator[SimpleNamespace, None, None]:
+    with ExitStack() as stack:
+        mocks = SimpleNamespace(
+            **{
+                name: stack.enter_context(patch(f"{_CLUSTERING_MODULE}.{name}"))
+                for name in [
+                    "get_session_with_current_tenant",
+                    "_get_clustering_candidates",
+                    "merge_entities",
+                    "transfer_entity",
+                ]
+            }
+        )
+        mocks.db_session = (
+            mocks.get_session_with_current_tenant.return_value.__enter__.return_value
+        )
+        mocks.transfer_entity.side_effect = _transfer_entity
+        mocks.merge_entities.side_effect = lambda db_session, parent, child: parent
+        yield mocks
+
+
+def test_trigram_similarity() -> None:
+    # values returned by pg_trgm's similarity()
+    assert _trigram_similarity("word", "two words") == pytest.approx(0.363636, 1e-4)
+    assert _trigram_similarity("Acme Inc.", "acme inc") == 1.0
+    assert _trigram_similarity("acme", "acne") == 0.25
+    assert _trigram_similarity("---", "---") == 0.0
+
+
+# a lower threshold than the default, so that "acne" would be merged into "acme"
+# if it weren't for the trigram similarity threshold of the retrieval
+@patch(f"{_CLUSTERING_MODULE}.KG_CLUSTERING_THRESHOLD", 0.7)
+def test_cluster_grounded_entities(mocks: SimpleNamespace) -> None:
+    existing = SimpleNamespace(
+        id_name="ACCOUNT::existing",
+        name="globex corporation",
+        entity_type_id_name="ACCOUNT",
+        document_id=None,
+    )
+    mocks._get_clustering_candidates.side_effect = lambda _, __, names: {
+        name: [existing] for name in names if name == "globex corporation"
+    }
+
+    results = _cluster_grounded_entities(
+        [
+            # similar to an entity retrieved from the db
+            _staged_entity("Globex Corporation"),
+            _staged_entity("Acme Corporation"),
+            # similar to an entity transferred earlier in the batch
+            _staged_entity("Acme Corporations"),
+            _staged_entity("Acme"),
+            # close enough for the rerank, but not for the retrieval threshold
+            _staged_entity("Acne"),
+        ]
+    )
+
+    assert [entity.id_name for entity, _ in results] == [
+        "ACCOUNT::existing",
+        "ACCOUNT::acme corporation",
+        "ACCOUNT::acme corporation",
+        "ACCOUNT::acme",
+        "ACCOUNT::acne",
+    ]
+    assert [
+        (call.kwargs["parent"].id_name, call.kwargs["child"].name)
+        for call in mocks.merge_entities.call_args_list
+    ] == [
+        ("ACCOUNT::existing", "Globex Corporation"),
+        ("ACCOUNT::acme corporation", "Acme Corporations"),
+    ]
+    mocks.db_session.commit.assert_called_once()
+
+
+def test_failing_entity_keeps_the_entities_before_it(mocks: SimpleNamespace) -> None:
+    mocks._get_clustering_candidates.return_value = {}
+    mocks.transfer_entity.side_effect = [
+        _transfer_entity(mocks.db_session, _staged_entity("Acme")),
+        RuntimeError("Failed to transfer entity"),
+    ]
+
+    with pytest.raises(RuntimeError):
+        _cluster_grounded_entities([_staged_entity("Acme"), _staged_entity("Globex")])
+
+    # each entity ran in its own savepoint, and the first one is committed
+    assert mocks.db_session.begin_nested.call_count == 2
+    mocks.db_session.commit.assert_called_once()
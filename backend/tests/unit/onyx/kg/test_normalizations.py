@@ -0,0 +1,24 @@
+from onyx.kg.clustering.normalizations import _clean_name
+from onyx.kg.clustering.normalizations import _rerank_candidates
+
+
+def test_clean_name() -> None:
+    assert _clean_name("John.Doe@onyx.app") == "johndoe"
+    assert _clean_name("Acme, Inc.") == "acmeinc"
+    assert _clean_name("!!!") == "!!!"
+
+
+def test_rerank_candidates() -> None:
+    candidates = [
+        ("ACCOUNT::1", "Acme Corporation"),
+        ("ACCOUNT::2", "Acme Inc"),
+        ("ACCOUNT::3", "Globex"),
+    ]
+
+    # the closest name wins regardless of the retrieval order
+    assert _rerank_candidates(_clean_name("Acme Inc."), candidates) == "ACCOUNT::2"
+    assert _rerank_candidates(_clean_name("Globex"), candidates) == "ACCOUNT::3"
+
+    # nothing above the threshold
+    assert _rerank_candidates(_clean_name("zzz"), candidates) is None
+    assert _rerank_candidates(_clean_name("Acme"), []) is None
@@ -0,0 +1,87 @@
+from typing import Any
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from onyx.configs.app_configs import DOCUMENT_CLEANUP_BATCH_SIZE
+from onyx.configs.constants import OnyxCeleryTask
+from onyx.redis.redis_connector_delete import RedisConnectorDelete
+from onyx.redis.redis_connector_prune import RedisConnectorPrune
+
+# two full batches and a partial one
+_NUM_DOCS = 2 * DOCUMENT_CLEANUP_BATCH_SIZE + 5
+
+
+def _doc_ids() -> list[str]:
+    return [f"doc_{i}" for i in range(_NUM_DOCS)]
+
+
+def _sent_doc_id_batches(celery_app: MagicMock) -> list[list[str]]:
+    batches: list[list[str]] = []
+    for call in celery_app.send_task.call_args_list:
+        assert call.args[0] == OnyxCeleryTask.DOCUMENT_BY_CC_PAIR_CLEANUP_BATCH_TASK
+        kwargs: dict[str, Any] = call.kwargs["kwargs"]
+        assert kwargs["connector_id"] == 2
+        assert kwargs["credential_id"] == 3
+        batches.append(kwargs["document_ids"])
+    return batches
+
+
+def _mock_cc_pair() -> MagicMock:
+    return MagicMock(connector_id=2, credential_id=3)
+
+
+@patch(
+    "onyx.redis.redis_connector_delete."
+    "construct_document_id_select_for_connector_credential_pair"
+)
+@patch("onyx.redis.redis_connector_delete.get_connector_credential_pair_from_id")
+def test_deletion_sends_full_batches_and_the_rest(
+    mock_get_cc_pair: MagicMock, mock_construct_select: MagicMock
+) -> None:
+    mock_get_cc_pair.return_value = _mock_cc_pair()
+    celery_app = MagicMock()
+    redis_client = MagicMock()
+    db_session = MagicMock()
+    db_session.scalars.return_value.yield_per.return_value = iter(_doc_ids())
+
+    rcd = RedisConnectorDelete("tenant", 1, redis_client)
+    num_tasks = rcd.generate_tasks(celery_app, db_session, MagicMock())
+
+    batches = _sent_doc_id_batches(celery_app)
+    assert num_tasks == 3
+    assert [len(batch) for batch in batches] == [
+        DOCUMENT_CLEANUP_BATCH_SIZE,
+        DOCUMENT_CLEANUP_BATCH_SIZE,
+        5,
+    ]
+    assert [doc_id for batch in batches for doc_id in batch] == _doc_ids()
+
+    # one taskset entry per batch, matching the task id of the batch
+    task_ids = [call.kwargs["task_id"] for call in celery_app.send_task.call_args_list]
+    assert [call.args for call in redis_client.sadd.call_args_list] == [
+        (rcd.taskset_key, task_id) for task_id in task_ids
+    ]
+
+
+@patch("onyx.redis.redis_connector_prune.get_connector_credential_pair_from_id")
+def test_pruning_sends_full_batches_and_the_rest(mock_get_cc_pair: MagicMock) -> None:
+    mock_get_cc_pair.return_value = _mock_cc_pair()
+    celery_app = MagicMock()
+    redis_client = MagicMock()
+
+    rcp = RedisConnectorPrune("tenant", 1, redis_client)
+    num_tasks = rcp.generate_tasks(set(_doc_ids()), celery_app, MagicMock(), None)
+
+    batches = _sent_doc_id_batches(celery_app)
+    assert num_tasks == 3
+    assert sorted(len(batch) for batch in batches) == [
+        5,
+        DOCUMENT_CLEANUP_BATCH_SIZE,
+        DOCUMENT_CLEANUP_BATCH_SIZE,
+    ]
+    assert sorted(doc_id for batch in batches for doc_id in batch) == sorted(_doc_ids())
+
+    task_ids = [call.kwargs["task_id"] for call in celery_app.send_task.call_args_list]
+    assert [call.args for call in redis_client.sadd.call_args_list] == [
+        (rcp.taskset_key, task_id) for task_id in task_ids
+    ]
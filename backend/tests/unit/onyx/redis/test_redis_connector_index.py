@@ -0,0 +1,31 @@
+from unittest.mock import MagicMock
+
+from onyx.redis.redis_connector_index import RedisConnectorIndex
+
+
+def test_get_fenced_cc_pair_ids_uses_one_pipeline() -> None:
+    raw_redis = MagicMock()
+    pipe = raw_redis.pipeline.return_value
+    pipe.execute.return_value = [1, 0, 1]
+
+    fenced = RedisConnectorIndex.get_fenced_cc_pair_ids(
+        raw_redis, "tenant", [3, 5, 8], search_settings_id=2
+    )
+
+    assert fenced == {3, 8}
+    raw_redis.pipeline.assert_called_once_with(transaction=False)
+    pipe.execute.assert_called_once()
+    assert [call.args[0] for call in pipe.exists.call_args_list] == [
+        "tenant:connectorindexing_fence_3/2",
+        "tenant:connectorindexing_fence_5/2",
+        "tenant:connectorindexing_fence_8/2",
+    ]
+
+
+def test_get_fenced_cc_pair_ids_without_cc_pairs() -> None:
+    raw_redis = MagicMock()
+
+    assert RedisConnectorIndex.get_fenced_cc_pair_ids(raw_redis, "tenant", [], 2) == (
+        set()
+    )
+    raw_redis.pipeline.assert_not_called()
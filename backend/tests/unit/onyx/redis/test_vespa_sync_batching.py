@@ -0,0 +1,85 @@
+from typing import Any
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from onyx.configs.constants import OnyxCeleryTask
+from onyx.redis.redis_connector_credential_pair import RedisConnectorCredentialPair
+from onyx.redis.redis_document_set import RedisDocumentSet
+
+
+def _mock_db_session(doc_ids: list[str]) -> MagicMock:
+    db_session = MagicMock()
+    db_session.scalars.return_value.yield_per.return_value = iter(doc_ids)
+    return db_session
+
+
+def _sent_doc_id_batches(celery_app: MagicMock) -> list[list[str]]:
+    batches: list[list[str]] = []
+    for call in celery_app.send_task.call_args_list:
+        assert call.args[0] == OnyxCeleryTask.VESPA_METADATA_SYNC_BATCH_TASK
+        kwargs: dict[str, Any] = call.kwargs["kwargs"]
+        batches.append(kwargs["document_ids"])
+    return batches
+
+
+@patch("onyx.redis.redis_document_set.VESPA_SYNC_BATCH_SIZE", 2)
+@patch("onyx.redis.redis_document_set.construct_document_id_select_by_docset")
+@patch("onyx.redis.redis_object_helper.get_redis_client")
+def test_document_set_sends_one_task_per_batch(
+    mock_get_redis_client: MagicMock, mock_construct_select: MagicMock
+) -> None:
+    celery_app = MagicMock()
+    redis_client = MagicMock()
+
+    rds = RedisDocumentSet("tenant", 1)
+    result = rds.generate_tasks(
+        1024,
+        celery_app,
+        _mock_db_session(["a", "b", "c", "d", "e"]),
+        redis_client,
+        MagicMock(),
+        "tenant",
+    )
+
+    assert result == (3, 3)
+    assert _sent_doc_id_batches(celery_app) == [["a", "b"], ["c", "d"], ["e"]]
+
+    # one taskset entry per batch, matching the task id of the batch
+    task_ids = [call.kwargs["task_id"] for call in celery_app.send_task.call_args_list]
+    assert [call.args for call in redis_client.sadd.call_args_list] == [
+        (rds.taskset_key, task_id) for task_id in task_ids
+    ]
+    assert all(task_id.startswith(rds.task_id_prefix) for task_id in task_ids)
+
+
+@patch("onyx.redis.redis_connector_credential_pair.VESPA_SYNC_BATCH_SIZE", 2)
+@patch(
+    "onyx.redis.redis_connector_credential_pair."
+    "construct_document_id_select_for_connector_credential_pair_by_needs_sync"
+)
+@patch(
+    "onyx.redis.redis_connector_credential_pair.get_connector_credential_pair_from_id"
+)
+@patch("onyx.redis.redis_object_helper.get_redis_client")
+def test_cc_pair_skips_docs_and_limits_tasks(
+    mock_get_redis_client: MagicMock,
+    mock_get_cc_pair: MagicMock,
+    mock_construct_select: MagicMock,
+) -> None:
+    celery_app = MagicMock()
+
+    rc = RedisConnectorCredentialPair("tenant", 1)
+    rc.set_skip_docs({"b"})
+    result = rc.generate_tasks(
+        2,
+        celery_app,
+        _mock_db_session(["a", "b", "c", "d", "e", "f", "g"]),
+        MagicMock(),
+        MagicMock(),
+        "tenant",
+    )
+
+    # "b" is already syncing, generation stops once max_tasks batches were sent
+    assert _sent_doc_id_batches(celery_app) == [["a", "c"], ["d", "e"]]
+    assert result == (2, 6)
+    assert rc.skip_docs == {"a", "b", "c", "d", "e"}
@@ -0,0 +1,129 @@
+import operator
+import os
+import signal
+import subprocess
+import sys
+import time
+from collections.abc import Generator
+
+import psutil
+import pytest
+
+from onyx.utils.spawned_worker_pool import SpawnedWorker
+from onyx.utils.spawned_worker_pool import SpawnedWorkerPool
+
+
+@pytest.fixture
+def pool() -> Generator[SpawnedWorkerPool, None, None]:
+    pool = SpawnedWorkerPool(max_tasks_per_worker=2)
+    yield pool
+    pool.shutdown()
+
+
+def _run(pool: SpawnedWorkerPool, func: object, *args: object) -> tuple[bool, object]:
+    worker = pool.acquire()
+    worker.send(func, args)  # type: ignore[arg-type]
+    result = worker.recv()
+    pool.release(worker)
+    return result
+
+
+def test_workers_are_reused_and_recycled(pool: SpawnedWorkerPool) -> None:
+    _, first_pid = _run(pool, os.getpid)
+    _, second_pid = _run(pool, os.getpid)
+    _, third_pid = _run(pool, os.getpid)
+
+    assert first_pid == second_pid
+    # the worker is replaced after max_tasks_per_worker tasks
+    assert third_pid != first_pid
+    assert first_pid != os.getpid()
+
+
+def test_task_error_is_reported(pool: SpawnedWorkerPool) -> None:
+    success, error = _run(pool, operator.truediv, 1, 0)
+
+    assert not success
+    assert isinstance(error, str)
+    assert error.startswith("ZeroDivisionError")
+
+    # the worker survives the error
+    assert _run(pool, operator.add, 1, 2) == (True, 3)
+
+
+def test_worker_over_memory_limit_is_not_reused() -> None:
+    pool = SpawnedWorkerPool(max_memory_mb=1)
+    try:
+        _, first_pid = _run(pool, os.getpid)
+        _, second_pid = _run(pool, os.getpid)
+    finally:
+        pool.shutdown()
+
+    assert first_pid != second_pid
+
+
+def test_unfinished_worker_is_killed(pool: SpawnedWorkerPool) -> None:
+    worker = pool.acquire()
+    worker.send(operator.add, (1, 2))
+    pool.release(worker, reusable=False)
+
+    assert not worker.is_alive()
+    replacement = pool.acquire()
+    assert replacement is not worker
+    pool.release(replacement)
+
+
+def test_prestart_and_shutdown() -> None:
+    pool = SpawnedWorkerPool()
+    pool.prestart(2)
+    first = pool.acquire()
+    second = pool.acquire()
+    pool.release(first)
+    pool.release(second)
+
+    pool.shutdown()
+    assert not first.is_alive()
+    assert not second.is_alive()
+
+    # no workers are handed out after the shutdown, and workers released
+    # afterwards are stopped
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+    worker: SpawnedWorker = pool._spawn_worker()
+    pool.release(worker)
+    assert not worker.is_alive()
+
+
+# holds a busy worker and prints its pid, then waits to be killed
+_OWNER_SCRIPT = """
+import time
+from onyx.utils.spawned_worker_pool import SpawnedWorkerPool
+
+if __name__ == "__main__":
+    worker = SpawnedWorkerPool().acquire()
+    worker.send(time.sleep, (600,))
+    print(worker.process.pid, flush=True)
+    time.sleep(600)
+"""
+
+
+def test_worker_exits_when_its_parent_is_killed() -> None:
+    owner = subprocess.Popen(
+        [sys.executable, "-c", _OWNER_SCRIPT], stdout=subprocess.PIPE, text=True
+    )
+    try:
+        assert owner.stdout is not None
+        worker_pid = int(owner.stdout.readline())
+    finally:
+        # no atexit handler runs, the busy worker has to notice by itself
+        owner.send_signal(signal.SIGKILL)
+        owner.wait()
+
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            if psutil.Process(worker_pid).status() == psutil.STATUS_ZOMBIE:
+                break
+        except psutil.NoSuchProcess:
+            break
+        assert time.monotonic() < deadline, "orphaned worker is still running"
+        time.sleep(0.1)
@@ -8,6 +8,7 @@ from concurrent.futures import ThreadPoolExecutor
 import pytest
 
 from onyx.utils.threadpool_concurrency import parallel_yield
+from onyx.utils.threadpool_concurrency import prefetch_generator
 from onyx.utils.threadpool_concurrency import run_in_background
 from onyx.utils.threadpool_concurrency import run_with_timeout
 from onyx.utils.threadpool_concurrency import ThreadSafeDict
@@ -389,3 +390,72 @@ def test_parallel_yield_non_blocking() -> None:
     # Verify no values are missing
     assert len(results) == 300  # Should have all values from 0 to 299
     assert sorted(results) == list(range(300))
+
+
+def test_prefetch_generator_preserves_order_and_context() -> None:
+    """Test prefetch_generator yields everything in order with contextvars set."""
+    test_context_var.set("prefetch")
+
+    def gen() -> Iterator[tuple[int, str]]:
+        for i in range(50):
+            yield i, test_context_var.get()
+
+    results = list(prefetch_generator(gen(), max_prefetch=4))
+
+    assert [i for i, _ in results] == list(range(50))
+    assert all(value == "prefetch" for _, value in results)
+
+
+def test_prefetch_generator_overlaps_producer_and_consumer() -> None:
+    """Test the producer runs ahead while the consumer is busy."""
+
+    def slow_gen() -> Iterator[int]:
+        for i in range(5):
+            time.sleep(0.1)
+            yield i
+
+    start = time.monotonic()
+    for _ in prefetch_generator(slow_gen(), max_prefetch=5):
+        time.sleep(0.1)
+    elapsed = time.monotonic() - start
+
+    # sequential would take ~1.0s
+    assert elapsed < 0.9
+
+
+def test_prefetch_generator_propagates_exceptions() -> None:
+    """Test exceptions from the producer are raised after the preceding items."""
+
+    def failing_gen() -> Iterator[int]:
+        yield 1
+        raise ValueError("Generator failure")
+
+    results: list[int] = []
+    with pytest.raises(ValueError, match="Generator failure"):
+        for item in prefetch_generator(failing_gen(), max_prefetch=2):
+            results.append(item)
+
+    assert results == [1]
+
+
+def test_prefetch_generator_stops_producer_on_close() -> None:
+    """Test closing the consumer stops the producer from running far ahead."""
+    produced: list[int] = []
+
+    def infinite_gen() -> Iterator[int]:
+        i = 0
+        while True:
+            produced.append(i)
+            yield i
+            i += 1
+
+    prefetcher = prefetch_generator(infinite_gen(), max_prefetch=2)
+    assert next(prefetcher) == 0
+    prefetcher.close()
+
+    time.sleep(0.3)
+    num_produced = len(produced)
+    time.sleep(0.3)
+
+    assert len(produced) == num_produced
+    assert num_produced <= 5